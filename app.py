@@ -8,12 +8,19 @@ Further infos, see README.md
 # import the app
 import os
 import webbrowser
+from multiprocessing import freeze_support
 
-from miniMoi import app
+from miniMoi import create_app
 
 # starupt
 if __name__ == "__main__":
 
+    # the town workbooks are rendered in child processes (needed for frozen apps)
+    freeze_support()
+
+    # build the app (setup, settings & db)
+    app = create_app()
+
     if not os.environ.get("WERKZEUG_RUN_MAIN"): webbrowser.open_new("http://127.0.0.1:8080/")
     
     app.run(
@@ -2,132 +2,255 @@
 Flask app to assist during administration of
 delivery apps.
 
+Importing the package has no side effects. The
+app is built by the factory 'create_app()':
+
+    from miniMoi import create_app
+    app = create_app()
+
+Each call creates an isolated app instance (own
+config, engine & session). 'app', 'Session' &
+'engine' of this package always point to the
+current app (the app of the active app context,
+else the first created app).
+
 """
 
 # imports
 import os
 import sys
 import json
+import typing
 from pathlib import Path
 from tzlocal import get_localzone_name
 
-from flask import Flask
+from flask import Flask, current_app, has_app_context
+from werkzeug.local import LocalProxy
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.orm import scoped_session, sessionmaker, declarative_base
 
 from . import version
+from .logic.db import sqlite
 
 import miniMoi.setup.setup_process as setup
 
-#region 'app construction' ---------------------
-# grab cwd & home
-cwd = Path().cwd() / "miniMoi"
-home = Path().home()
-
-print("HOME:: ", home)
+# the first created app (used outside of app contexts)
+_default = None
 
-# first startup?
-setupFlag = False
-if not (home / "mini-moi/system/done.txt").is_file(): 
+#region 'private functions'
+def _get_app() -> Flask:
+    """Returns the current app """
 
-    # set flag
-    setupFlag = True
-    
-    print("START:: running app setup")
-    setup.run()
+    if has_app_context(): return current_app._get_current_object()
 
-    print("FINISHED:: app setup done")
+    if _default is None: raise RuntimeError("No miniMoi app available. Create one with 'miniMoi.create_app()' first.")
 
-# init python app
-app = Flask(__name__)
+    return _default
 
-# grab the settings json
-with open(home / "mini-moi/system/settings/settings.json", "r") as file:
-    settings = json.loads(file.read())
+def _database_url(config:dict, settings:dict, db_path:Path) -> str:
+    """Returns the database url
 
-#region 'app config'
-#region 'paths'
-app.config['HOME'] = home
-app.config['MINI_MOI_HOME'] = home / "mini-moi"
-app.config['BLUEPRINT_PATH'] = home /"mini-moi/blueprints"
-app.config['SETTINGS_FILE_PATH'] = home / "mini-moi/system/settings/settings.json"
-app.config['DB_FILE_PATH'] = home / "mini-moi/system/db/app.db"
-app.config['CWD'] = cwd
+    Order: config 'DATABASE_URL', environment variable
+    'MINI_MOI_DATABASE_URL', settings.json 'database_url'
+    and finally the sqlite file of the app storage.
 
-#endregion
-
-#region 'core & settings file'
-app.config['VERSION'] = version.__version__
-app.config['DEFAULT_LANGUAGE'] = settings['default_language']
-app.config['FILE_TYPE'] = "csv" # -> "xlsx" or "csv"
-app.config['ACTION_LOGGING'] = settings['action_logging'] == "True"
-app.config['TZ_INFO'] = get_localzone_name()
-print("TIMEZONE:: ", get_localzone_name())
+    """
 
-#endregion
+    for url in [config.get('DATABASE_URL'), os.environ.get('MINI_MOI_DATABASE_URL'), settings.get('database_url')]:
+        if url: return str(url)
 
+    print("OS:: ", sys.platform)
 
-# add available languages
-from miniMoi.language import language_files
-app.config['AVAILABLE_LANGUAGES'] = [lang for lang in language_files.keys()]
+    return URL.create("sqlite", database=str(db_path)).render_as_string(hide_password=False)
 
 #endregion
 
-#region 'db init'
-# get os
-osName = sys.platform
-
-print("OS:: ", osName)
-
-if osName == "win32": dbPath = "sqlite:///" + str(app.config['DB_FILE_PATH'])
-elif osName == "darwin": dbPath = "sqlite:////" + str(app.config['DB_FILE_PATH'])
-elif osName == "linux": dbPath = "sqlite:///" + str(app.config['DB_FILE_PATH'])
-else: raise Exception("Operating system not detectable: " + str(osName))
+#region 'globals'
+# the current app, session & engine
+app = LocalProxy(_get_app)
+Session = LocalProxy(lambda: _get_app().extensions['miniMoi']['Session'])
+engine = LocalProxy(lambda: _get_app().extensions['miniMoi']['engine'])
 
-print("DB PATH:: ", dbPath)
-
-# create engine
-engine = create_engine(
-    dbPath,
-    echo = False,
-    future = False
-)
-
-# create session maker
-sessionFactory = sessionmaker(
-    autocommit = False,
-    autoflush = False,
-    bind = engine
-)
+# create base (shared by all apps)
+base = declarative_base()
 
-# build session
-Session = scoped_session(sessionFactory)
+#endregion
 
-# create base
-base = declarative_base()
+#region 'app construction' ---------------------
+def create_app(config:typing.Union[dict, None] = None) -> Flask:
+    """Creates a mini-moi app
+
+    Runs the first startup setup (if needed), reads
+    the settings.json, creates the engine & session
+    and creates (or migrates) the database.
+
+    params:
+    -------
+    config : dict | None, optional
+        Overwrites the app config. Additional keys:
+            'HOME' : Path
+                The home directory. The app storage is
+                created at 'HOME/mini-moi'.
+                (default is Path().home())
+            'DATABASE_URL' : str
+                The sqlalchemy database url. Use "sqlite://"
+                for an in memory db.
+                (default is the environment variable
+                'MINI_MOI_DATABASE_URL', else the 'database_url'
+                of the settings.json, else the 'app.db' of
+                the app storage)
+        (default is None)
+
+    returns:
+    --------
+    Flask
+        The app.
+
+    """
+
+    global _default
+
+    config = dict(config or {})
+
+    #region 'paths & setup'
+    home = Path(config.get('HOME', Path().home()))
+    miniMoiHome = Path(config.get('MINI_MOI_HOME', home / "mini-moi"))
+
+    print("HOME:: ", home)
+
+    # first startup?
+    setupFlag = False
+    if not (miniMoiHome / "system/done.txt").is_file():
+
+        # set flag
+        setupFlag = True
+
+        print("START:: running app setup")
+        setup.run(miniMoiHome)
+
+        print("FINISHED:: app setup done")
+
+    # init python app
+    newApp = Flask(__name__)
+
+    # grab the settings json
+    with open(miniMoiHome / "system/settings/settings.json", "r") as file:
+        settings = json.loads(file.read())
+
+    #endregion
+
+    #region 'app config'
+    #region 'paths'
+    newApp.config['HOME'] = home
+    newApp.config['MINI_MOI_HOME'] = miniMoiHome
+    newApp.config['BLUEPRINT_PATH'] = miniMoiHome / "blueprints"
+    newApp.config['SETTINGS_FILE_PATH'] = miniMoiHome / "system/settings/settings.json"
+    newApp.config['DB_FILE_PATH'] = miniMoiHome / "system/db/app.db"
+    newApp.config['CWD'] = Path().cwd() / "miniMoi"
+
+    #endregion
+
+    #region 'core & settings file'
+    newApp.config['VERSION'] = version.__version__
+    newApp.config['DEFAULT_LANGUAGE'] = settings['default_language']
+    newApp.config['FILE_TYPE'] = "csv" # -> "xlsx" or "csv"
+    newApp.config['BULK_CHUNK_SIZE'] = 5000 # -> rows per committed bulk import chunk
+    newApp.config['ACTION_LOGGING'] = settings['action_logging'] == "True"
+    newApp.config['TZ_INFO'] = get_localzone_name()
+    print("TIMEZONE:: ", newApp.config['TZ_INFO'])
+    newApp.config['PAGE_SIZE'] = 500 # -> max. rows per 'get' response
+    newApp.config['SPLIT_TOWNS'] = settings.get('split_towns', "False") == "True" # -> one overview workbook per town
+    newApp.config['EXCEL_WORKERS'] = None # -> processes for the town workbooks (None = number of cpus)
+    newApp.config['JOB_WORKERS'] = 2 # -> threads for the background jobs (booking & excel files)
+    newApp.config['JOB_QUEUE_SIZE'] = 8 # -> max. queued & running jobs
+    newApp.config['JOB_HISTORY'] = 50 # -> finished jobs kept for the status polling
+    newApp.config['API_GZIP_MIN_SIZE'] = 1024 # -> gzip api responses larger than this (bytes, None = off)
+    newApp.config['SQLITE_PROFILE'] = settings.get('sqlite_profile', "performance") # -> see 'logic/db/sqlite.py'
+    newApp.config['SQLITE_PRAGMAS'] = settings.get('sqlite_pragmas', {}) # -> overwrites single pragmas of the profile
+    newApp.config['SQLITE_POOL_SIZE'] = 5 # -> pooled connections (sqlite files)
+    newApp.config['BATCH_MAX_ITEMS'] = 1000 # -> max. ressource calls per 'batch' request
+    newApp.config['AUDIT_QUEUE_SIZE'] = 10000 # -> max. queued log actions (ACTION_LOGGING)
+    newApp.config['AUDIT_BATCH_SIZE'] = 500 # -> log actions per insert
+    newApp.config['AUDIT_FLUSH_INTERVAL'] = 1.0 # -> seconds the flusher waits for new actions
+    newApp.config['AUDIT_MAX_PAYLOAD'] = 500 # -> max. characters of a log action (size of 'Log.action')
+    newApp.config['FORECAST_DAYS'] = 7 # -> default days of the delivery forecast
+    newApp.config['FORECAST_MAX_DAYS'] = 60 # -> max. days of the delivery forecast
+
+    #endregion
+
+    # add available languages
+    from miniMoi.language import language_files
+    newApp.config['AVAILABLE_LANGUAGES'] = [lang for lang in language_files.keys()]
+
+    # explicit config
+    newApp.config.update({key:val for key, val in config.items() if key not in ['HOME', 'DATABASE_URL']})
+
+    #endregion
+
+    #region 'db init'
+    dbPath = _database_url(config, settings, newApp.config['DB_FILE_PATH'])
+
+    print("DB PATH:: ", repr(make_url(dbPath)))
+
+    # create engine (pool & pragmas of the sqlite profile)
+    newEngine = create_engine(
+        dbPath,
+        echo = False,
+        future = False,
+        **sqlite.engine_options(dbPath, newApp.config['SQLITE_POOL_SIZE'])
+    )
+    sqlite.apply(newEngine, sqlite.get_pragmas(newApp.config['SQLITE_PROFILE'], newApp.config['SQLITE_PRAGMAS']))
 
-# check if database is available
-if setupFlag or app.config['DB_FILE_PATH'].is_file() == False:
+    # create session maker
+    sessionFactory = sessionmaker(
+        autocommit = False,
+        autoflush = False,
+        bind = newEngine
+    )
 
-    from .logic.db.init_database import run_creation, create_defaults
-    
-    print("START:: created db")
-    
-    run_creation(engine, base)
+    # build session
+    newApp.extensions['miniMoi'] = {
+        'engine':newEngine,
+        'Session':scoped_session(sessionFactory)
+    }
 
-    print("FINISHED:: db created")
+    # the first app is the default app
+    if _default is None: _default = newApp
+
+    with newApp.app_context():
+
+        from miniMoi.models.Models import Customers
+        from miniMoi.logic.db import init_database
 
-    if not create_defaults(Session): raise Exception("ERROR:: Not able to create db defaults!")
-    else: print("FINISHED:: created db defaults")
+        # check if database is available
+        if setupFlag or not inspect(newEngine).has_table(Customers.__tablename__):
+
+            print("START:: created db")
+
+            init_database.run_creation(newEngine, base)
+
+            print("FINISHED:: db created")
+
+            if not init_database.create_defaults(Session): raise Exception("ERROR:: Not able to create db defaults!")
+            else: print("FINISHED:: created db defaults")
+
+        else:
+
+            # migrate existing db files (adds missing indexes & the sales aggregates)
+            print("MIGRATION:: checked indexes ", init_database.create_indexes(newEngine, base))
+            print("MIGRATION:: backfilled sales aggregates ", init_database.create_aggregates(newEngine, Session))
 
     # write done file
-    setup.set_done()
+    if setupFlag: setup.set_done(miniMoiHome)
 
-#endregion
+    #endregion
 
-# import routes
-from miniMoi import routes
+    # register routes
+    from miniMoi import routes
+    routes.register(newApp)
 
-#endregion
+    return newApp
 
+#endregion
@@ -0,0 +1,134 @@
+"""
+Contains the handler logic for the api
+
+The handlers are grouped by the first path segment
+of the ressource (one module per group). Each module
+registers its handlers at the routing registry
+('logic/helpers/router.py') on its first request.
+
+"""
+
+# imports
+import typing
+
+from miniMoi import app
+from miniMoi.language import language_files
+from miniMoi.logic.helpers import tools, router
+
+# the handler modules (imported on the first request of their group)
+MODULES = {
+    'delivery':"miniMoi.handlers.delivery",
+    'customers':"miniMoi.handlers.customers",
+    'products':"miniMoi.handlers.products",
+    'category':"miniMoi.handlers.categories",
+    'subcategory':"miniMoi.handlers.categories",
+    'abo':"miniMoi.handlers.abo",
+    'system':"miniMoi.handlers.system",
+    'bulk':"miniMoi.handlers.bulk",
+    'reporting':"miniMoi.handlers.reporting",
+    'jobs':"miniMoi.handlers.jobs",
+    'demo':"miniMoi.handlers.demo",
+    'batch':"miniMoi.handlers.batch",
+    'forecast':"miniMoi.handlers.forecast"
+}
+
+for group, moduleName in MODULES.items(): router.register_lazy(group, moduleName)
+
+#region 'helpers'
+def parse_page_size(page_size:typing.Any) -> int:
+    """Parses the page size of a 'get' request
+
+    The page size defaults to and is capped at
+    app.config['PAGE_SIZE'], so responses stay
+    bounded regardless of the table size.
+
+    params:
+    -------
+    page_size : any
+        The requested page size.
+
+    returns:
+    --------
+    int
+
+    """
+
+    if page_size in [None, "", "null"]: return app.config['PAGE_SIZE']
+
+    return max(1, min(int(page_size), app.config['PAGE_SIZE']))
+
+def job_response(response:dict) -> dict:
+    """Adds the 'job running' notification to a submitted job """
+
+    if response['success']:
+        response['data']['msg'] = language_files[app.config['DEFAULT_LANGUAGE']]['notification']['job_running']
+
+    return response
+
+def _translation(request:dict) -> dict:
+    """Returns the language file of the request language """
+
+    language = request.get('language') if isinstance(request, dict) else None
+
+    return language_files.get(language, language_files[app.config['DEFAULT_LANGUAGE']])
+
+def _errors(request:dict) -> dict:
+    """Returns the error codes of the request language """
+
+    return _translation(request)['error_codes']
+
+#endregion
+
+#region 'handler'
+def api(request:dict) -> dict:
+    """Processes the POST request
+
+    Takes the request dict and passes it
+    to the registered handler of the
+    ressource (see 'router.dispatch()').
+
+    params:
+    -------
+    request : dict
+        The post request dict.
+            Format: {
+                'ressource':str,
+                'data':{}
+            }
+
+    returns:
+    --------
+    dict
+        success, error & data
+
+    """
+
+    # grab the ressource
+    ressource = request['ressource']
+
+    try: return router.dispatch(ressource, request)
+
+    except router.NotFound:
+
+        return {'success':False, 'error':_errors(request)['404'].format(ressource=ressource), 'data':{}}
+
+    except router.WrongType as e:
+
+        translation = _translation(request)
+
+        return {'success':False, 'error':translation['error_codes']['wrongType'].format(
+            var = e.key,
+            dtype = translation['type_mapping'].get(e.dtype, e.dtype)
+        ), 'data':{}}
+
+    except Exception as e:
+
+        # get code & msg
+        code, msg = tools._convert_exception(e)
+
+        return {'success':False, 'error':_errors(request)['500'].format(
+            c=str(code),
+            m = str(msg)
+        ), 'data':{}}
+
+#endregion
@@ -0,0 +1,222 @@
+"""
+Contains the api handlers for the 'abo' ressources
+
+"""
+
+# imports
+from miniMoi import app
+from miniMoi.logic.helpers import router
+from miniMoi.logic.functions import abo
+from miniMoi.handlers import parse_page_size
+
+#region 'abo'
+@router.route("abo/get",
+    filter_type = router.param(),
+    what = router.param(),
+    amount = router.param(),
+    page_size = router.param(coerce=parse_page_size, default=None, dtype="int"),
+    cursor = router.param(coerce=router.optional_int, default=None, dtype="int")
+)
+def get(filter_type, what, amount, page_size, cursor):
+    """Returns the requested abos
+
+    params:
+    -------
+    filter_type : str | None
+        Indicates the type of filter to apply.
+            Options: { None, 'abo', 
+                    'customer' }
+                    None: Fetches data by id
+                        interval.
+                    'abo': searches for a single
+                        abo.
+                    'customer': Searches for all
+                                abos for one cust-
+                                omer.
+    what : str | None:
+        Indicates the query phrase.
+            Example: if None, the string indicates
+                    the interval of ids.
+    amount : int | None, optional
+        The number of entries to query.
+        (default is None).
+    page_size : int | None, optional
+        The max. number of entries per page.
+        (default & max. is app.config['PAGE_SIZE'])
+    cursor : int | None, optional
+        The 'next_cursor' of the previous page.
+        (default is None)
+
+    returns:
+    --------
+    dict
+        success, error, data {
+            'result':[
+                {
+                    'id':int
+                    'customer_id':int,
+                    'update_date':str,
+                    'cycle_type':str,
+                    'interval':int,
+                    'next_delivery':str,
+                    'product_id':int
+                    'product_name':str
+                },
+                ...
+            ]
+        }
+
+    """
+
+    response = abo.get(
+        filter_type = filter_type,
+        what = what,
+        amount = amount,
+        page_size = page_size,
+        cursor = cursor,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+@router.route("abo/add",
+    to_add = router.param()
+)
+def add(to_add):
+    """Adds abos to a customer
+
+    This function adds one or
+    multiple abos to a specific
+    customer.
+
+    params:
+    -------
+    to_add : list
+        A list containing every single new
+        abo for the customer.
+            Format: [
+                {
+                    'customer_id':int,
+                    'cycle_type':str,
+                    'interval':int,
+                    'product':int,
+                },
+                ...
+            ]
+    
+    returns:
+    --------
+    dict
+        success, error, data
+
+    """
+
+    response = abo.add(
+        abos = to_add,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+@router.route("abo/delete",
+    abo_id = router.param('id')
+)
+def delete(abo_id):
+    """Deletes one specific abo
+
+    params:
+    -------
+    abo_id : int
+        the abo unique id.
+
+    returns:
+    -------
+    dict
+        success, error & data
+
+    """
+
+    response = abo.delete(
+        abo_id = abo_id,
+        language = app.config['DEFAULT_LANGUAGE'],
+    )
+
+    return response
+
+@router.route("abo/update",
+    abo_id = router.param('id'),
+    data = router.param(source="request")
+)
+def update(abo_id, data):
+    """Updates a single abo for a customer
+
+    params:
+    -------
+    customer_id : int
+        The customer unique id.
+    data : dict
+        A dict containing the data
+        to update.
+            Format: {
+                'cycle_type':str,
+                'interval':int,
+                'product':int,
+                'custom_next_delivery':str | None
+            }
+
+    returns:
+    -------
+    dict
+        success, error & data
+
+    """
+
+    response = abo.update(
+        abo_id = abo_id,
+        data = data,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+@router.route("abo/updateMany",
+    to_update = router.param(coerce=router.json_value)
+)
+def update_many(to_update):
+    """Updates multiple abos at once
+
+    params:
+    -------
+    to_update : list
+        The abos to update (JSON or list).
+            Format: [
+                {
+                    'id':int,
+                    'cycle_type':str,
+                    'interval':int,
+                    'product':int,
+                    'quantity':int,
+                    'subcategory':int,
+                    'next_delivery':str | None
+                },
+                ...
+            ]
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'msg':str,
+            'updated':int
+        }
+
+    """
+
+    response = abo.update_many(
+        abos = to_update,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+#endregion
@@ -0,0 +1,106 @@
+"""
+Contains the api handler for the 'batch' ressource
+
+"""
+
+# imports
+from miniMoi import app, Session
+from miniMoi.language import get_translation
+from miniMoi.logic.helpers import router, batch
+
+# the ressource groups which can be batched (db edits)
+BATCH_GROUPS = ['customers', 'products', 'category', 'subcategory', 'abo']
+
+#region 'batch'
+@router.route("batch",
+    items = router.param(coerce=router.json_value),
+    atomic = router.param(coerce=router.flag, default=False)
+)
+def run(items, atomic):
+    """Runs multiple ressources in one transaction
+
+    The items are executed in order within one
+    session. Each item runs in a savepoint, so a
+    failed item does not affect the others. The
+    transaction is committed once at the end.
+
+    params:
+    -------
+    items : list
+        The ressource calls.
+            Format: [
+                {
+                    'ressource':str, # -> e.g. 'abo/update'
+                    'data':dict # -> the data of the ressource
+                },
+                ...
+            ]
+    atomic : bool, optional
+        If True, nothing is saved if one item
+        fails (all-or-nothing). The items after
+        the failed item are not executed.
+        (default is False)
+
+    returns:
+    --------
+    dict
+        success, error & data {
+            'results':[
+                {
+                    'ressource':str,
+                    'success':bool,
+                    'error':str,
+                    'data':dict
+                },
+                ...
+            ],
+            'committed':bool
+        }
+
+    """
+
+    errors = get_translation(app.config['DEFAULT_LANGUAGE'])['error_codes']
+
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return {'success':False, 'error':errors['wrongType'].format(var="items", dtype="list[dict]"), 'data':{}}
+
+    if len(items) > app.config['BATCH_MAX_ITEMS']:
+        return {'success':False, 'error':errors['batchTooLarge'].format(max=app.config['BATCH_MAX_ITEMS']), 'data':{}}
+
+    # imported here (the package imports this module lazily)
+    from miniMoi.handlers import api
+
+    results = []
+    failed = None
+    with batch.session(Session) as session:
+
+        for idx, item in enumerate(items):
+
+            ressource = str(item.get('ressource', ""))
+
+            if ressource.partition("/")[0] not in BATCH_GROUPS:
+                response = {'success':False, 'error':errors['batchNotAllowed'].format(ressource=ressource), 'data':{}}
+
+            else:
+                with session.item() as state:
+
+                    response = api({'ressource':ressource, 'data':item.get('data', {})})
+                    state['success'] = bool(response.get('success', False))
+
+                response['success'] = state['success']
+
+            results.append({'ressource':ressource, **response})
+
+            if not response['success'] and failed is None: failed = idx
+            if failed is not None and atomic: break
+
+        # one commit for all items
+        committed = failed is None or not atomic
+        if committed: session.commit()
+        else: session.rollback()
+
+    error = "" if committed else errors['batchRolledBack'].format(index=failed, ressource=results[failed]['ressource'])
+
+    return {'success':committed, 'error':error, 'data':{'results':results, 'committed':committed}}
+
+#endregion
@@ -0,0 +1,80 @@
+"""
+Contains the api handlers for the 'bulk' ressources
+
+"""
+
+# imports
+from miniMoi import app
+from miniMoi.logic.helpers import router
+from miniMoi.logic.functions import bulk
+
+#region 'bulk'
+@router.route("bulk/createBlueprint",
+    blueprint = router.param()
+)
+def create_blueprint(blueprint):
+    """Creates a blueprint for given table
+
+    This function creates a blueprint for the
+    given sql table.
+    The blueprint is a empty excel with the correct
+    columns in the specified app.config language.
+    
+    params:
+    -------
+    blueprint : str
+        The name of the blueprint to create.
+            Options: { 'customers', 'category'
+                    'subcategory', 'products',
+                    'abo' }
+
+    returns:
+    --------
+    dict
+        success, error & datat {msg:str}
+    
+    """
+
+    response = bulk.create_blueprint(
+        blueprint = blueprint,
+        file_type=app.config['FILE_TYPE']
+    )
+
+    return response
+
+@router.route("bulk/update")
+def update():
+    """Reads all blueprints and updates the tables
+
+    This function reads all tables in the
+    directory '~/mini-moi/blueprints'
+    and updates the tables.
+    The blueprints are streamed in chunks of
+    app.config['BULK_CHUNK_SIZE'] rows, each
+    chunk is committed on its own.
+    
+    params:
+    -------
+    None
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'msg':str,
+            'report':{name:{
+                'chunks':list[dict],
+                'success_chunks':int,
+                'failure_chunks':int,
+                'success_rows':int,
+                'failure_rows':int
+            }}
+        }
+
+    """
+
+    response = bulk.update(file_type=app.config['FILE_TYPE'], chunk_size=app.config['BULK_CHUNK_SIZE'])
+
+    return response
+
+#endregion
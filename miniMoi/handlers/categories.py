@@ -0,0 +1,278 @@
+"""
+Contains the api handlers for the 'category' & 'subcategory' ressources
+
+"""
+
+# imports
+from miniMoi import app
+from miniMoi.logic.helpers import router
+from miniMoi.logic.functions import categories
+
+#region 'category & subcategory'
+@router.route("category/get",
+    amount = router.param(),
+    category_type = "category"
+)
+def get(amount, category_type):
+    """Gets all product categories
+
+    Fetches all product categories
+    and return them.
+
+    params:
+    -------
+    amount : int | None, optional
+        The number of entries to query.
+        (default is None).
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'result':[
+                {
+                    'id':int,
+                    'name':str
+                },
+                ...
+            ]
+        }
+
+    """
+
+    response = categories.get(
+        category_type = category_type,
+        amount = amount,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+@router.route("category/add",
+    to_add = router.param(),
+    category_type = "category"
+)
+def add(to_add, category_type):
+    """Adds categories to the db
+
+    The add function either adds only one
+    or multiple categories.
+
+    params:
+    -------
+    to_add : list
+        A list containing every single new
+        category.
+            Format: [
+                {"name":'name'},
+                {"name":'name'},
+                ...
+            ]
+
+    returns:
+    --------
+    dict
+        success, error & data {}
+
+    """
+
+    response = categories.add(
+        categories = to_add,
+        category_type = category_type,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+@router.route("category/delete",
+    category_id = router.param('id'),
+    category_type = "category"
+)
+def delete(category_id, category_type):
+    """Deletes a category
+
+    params:
+    -------
+    id : int
+        the category unique id.
+
+    returns:
+    -------
+    dict
+        success, error & data
+
+    """
+
+    response = categories.delete(
+        category_id = category_id,
+        category_type = category_type,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+@router.route("category/update",
+    category_id = router.param('id'),
+    name = router.param(),
+    category_type = "category"
+)
+def update(category_id, name, category_type):
+    """Updates a single category
+
+    params:
+    -------
+    id : int
+        The customer unique id.
+    name : str
+        The new category name
+
+    returns:
+    -------
+    dict
+        success, error & data
+
+    """
+
+    response = categories.update(
+        category_id = category_id,
+        category_type = category_type,
+        name = name,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+@router.route("subcategory/get",
+    amount = router.param(),
+    category_type = "subcategory"
+)
+def get_subcategory(amount, category_type):
+    """Gets all product subcategory
+
+    Fetches all product subcategory
+    and return them.
+
+    params:
+    -------
+    amount : int | None, optional
+        The number of entries to query.
+        (default is None).
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'result':[
+                {
+                    'id':int,
+                    'name':str
+                },
+                ...
+            ]
+        }
+
+    """
+
+    response = categories.get(
+        category_type = category_type,
+        amount = amount,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+@router.route("subcategory/add",
+    to_add = router.param(),
+    category_type = "subcategory"
+)
+def add_subcategory(to_add, category_type):
+    """Adds subcategory to the db
+
+    The add function either adds only one
+    or multiple subcategory.
+
+    params:
+    -------
+    to_add : list
+        A list containing every single new
+        category.
+            Format: [
+                {"name":'name'},
+                {"name":'name'},
+                ...
+            ]
+
+    returns:
+    --------
+    dict
+        success, error & data {}
+
+    """
+
+    response = categories.add(
+        categories = to_add,
+        category_type = category_type,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+@router.route("subcategory/delete",
+    category_id = router.param('id'),
+    category_type = "subcategory"
+)
+def delete_subcategory(category_id, category_type):
+    """Deletes a subcategory
+
+    params:
+    -------
+    id : int
+        the category unique id.
+
+    returns:
+    -------
+    dict
+        success, error & data
+
+    """
+
+    response = categories.delete(
+        category_id = category_id,
+        category_type = category_type,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+@router.route("subcategory/update",
+    category_id = router.param('id'),
+    name = router.param(),
+    category_type = "subcategory"
+)
+def update_subcategory(category_id, name, category_type):
+    """Updates a single subcategory
+
+    params:
+    -------
+    id : int
+        The customer unique id.
+    name : str
+        The new category name
+
+    returns:
+    -------
+    dict
+        success, error & data
+
+    """
+
+    response = categories.update(
+        category_id = category_id,
+        category_type = category_type,
+        name = name,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+#endregion
@@ -0,0 +1,245 @@
+"""
+Contains the api handlers for the 'customers' ressources
+
+"""
+
+# imports
+from miniMoi import app
+from miniMoi.logic.helpers import router
+from miniMoi.logic.functions import customer
+from miniMoi.handlers import parse_page_size
+
+#region 'customers'
+@router.route("customers/get",
+    filter_type = router.param(),
+    what = router.param(),
+    amount = router.param(),
+    page_size = router.param(coerce=parse_page_size, default=None, dtype="int"),
+    cursor = router.param(coerce=router.optional_int, default=None, dtype="int")
+)
+def get(filter_type, what, amount, page_size, cursor):
+    """Returns the requested customers
+
+    params:
+    -------
+    filter_type : str | None
+        Indicates the type of filter to apply.
+            Options: { None, 'customer', 
+                    'town' }
+                    None: Fetches data by id
+                        interval.
+                    'customer': Searches for
+                                a singel customer.
+                    'town': Searches for all
+                            customers in one town.
+    what : str | None:
+        Indicates the query phrase.
+            Example: if None, the string indicates
+                    the interval of ids.
+    amount : int | None, optional
+        The number of entries to query.
+        (default is None).
+    page_size : int | None, optional
+        The max. number of entries per page.
+        (default & max. is app.config['PAGE_SIZE'])
+    cursor : int | None, optional
+        The 'next_cursor' of the previous page.
+        (default is None)
+
+    returns:
+    --------
+    dict
+        success, error, data {
+            'data':[
+                {
+                    'id':list[int],
+                    'date':list[datetime],
+                    'name':list[str],
+                    'surname':list[str],
+                    'street':list[str],
+                    'nr':list[int],
+                    'postal':list[str],
+                    'town':list[str],
+                    'phone':list[str],
+                    'mobile':list[str],
+                    'birthdate':list[str]("%Y.%m.%d),
+                    'approach':list[int],
+                    'notes':list[str],
+                },
+                ...
+            ],
+            'order':[],
+            'mapping':[]
+        }
+
+    """
+
+    response = customer.get(
+        filter_type = filter_type,
+        what = what,
+        amount = amount,
+        page_size = page_size,
+        cursor = cursor,
+        language = app.config['DEFAULT_LANGUAGE'],
+        tz = app.config['TZ_INFO']
+    )
+
+    return response
+
+@router.route("customers/delete",
+    customer_id = router.param('id')
+)
+def delete(customer_id):
+    """Deletes a customer
+
+    params:
+    -------
+    id : int
+        the customer unique id.
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'msg':str
+        }
+    
+    """
+
+    response = customer.delete(
+        customer_id = customer_id,
+        language = app.config['DEFAULT_LANGUAGE'],
+    )
+
+    return response
+
+@router.route("customers/add",
+    to_add = router.param()
+)
+def add(to_add):
+    """Adds customers to the db
+
+    The add function either adds only one
+    customer or a complete list of customers.
+
+    params:
+    -------
+    to_add : list
+        A list containing every single new
+        customer.
+            Format: [
+                {
+                    'name':str,
+                    'surname':str,
+                    'street':str,
+                    'nr':int,
+                    'postal':str,
+                    'town':str,
+                    'phone':str,
+                    'mobile':str,
+                    'birthdate':str("%Y-%m-%d),
+                    'approach':int,
+                    'notes':str
+                },
+                ...
+            ]
+
+    returns:
+    --------
+    dict
+        success, error & data {
+            'msg':str
+        }
+    
+    """
+
+    response = customer.add(
+        customers = to_add,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+@router.route("customers/update",
+    customer_id = router.param('id'),
+    data = router.param(source="request")
+)
+def update(customer_id, data):
+    """Updates a single customer
+
+    params:
+    -------
+    id : int
+        The customer unique id.
+    data : dict
+        A dict containing the data
+        to update.
+            Format: {
+                'name':str,
+                'surname':str,
+                'street':str,
+                'nr':int,
+                'postal':str,
+                'town':str,
+                'phone':str,
+                'mobile':str,
+                'birthdate':str("%Y.%m.%d)
+                'notes':str
+            }
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'msg':str
+        }
+
+    """
+
+    response = customer.update(
+        customer_id = customer_id,
+        data = data,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+@router.route("customers/updateMany",
+    to_update = router.param(coerce=router.json_value)
+)
+def update_many(to_update):
+    """Updates multiple customers at once
+
+    params:
+    -------
+    to_update : list
+        The customers to update (JSON or list).
+            Format: [
+                {
+                    'id':int,
+                    'name':str,
+                    ...
+                    'birthdate':str("%Y.%m.%d)
+                },
+                ...
+            ]
+            (see 'customer.update_many()')
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'msg':str,
+            'updated':int
+        }
+
+    """
+
+    response = customer.update_many(
+        customers = to_update,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+#endregion
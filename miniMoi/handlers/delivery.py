@@ -0,0 +1,306 @@
+"""
+Contains the api handlers for the 'delivery' ressources
+
+"""
+
+# imports
+from flask import send_file
+
+from miniMoi import app
+from miniMoi.logic.helpers import router, jobs
+from miniMoi.logic.functions import delivery
+from miniMoi.handlers import job_response
+
+#region 'delivery'
+@router.route("delivery/create",
+    compact = router.param('format', coerce=lambda val: val == "columnar", default=None)
+)
+def create(compact):
+    """Creates next days delivery overview
+
+    This function creates the overview for the
+    next days delivery.
+
+    params:
+    -------
+    format : str, optional
+        If "columnar", the 'town_based' data
+        is returned as compact columnar payload
+        (see 'delivery._to_columnar()').
+
+    returns:
+    --------
+    dict
+        success, error & data {
+                    'data':{
+                        'category_name':[],
+                        'quantity':[],
+                        'cost':[]
+                    },
+                    'order':[],
+                    'mapping':[]
+                    },
+                'overview_product':{
+                    'category_name':{
+                        'data':{
+                            'product_name':[],
+                            'subcat_1:[],
+                            'subcat_2:[],
+                            'subcat_X:[],
+                            ...},
+                        'order':[],
+                        'mapping':[]
+                    },
+                    'category_name2':{
+                    { ...}
+                    },
+                    ...
+                    
+                    },
+                'total_earnigns':int,
+                'total_spendings':int,
+                'town_based':{
+                    'townName':{
+                        'data':{
+                            'customer_approach':list[int], 
+                            'customer_street':list[str], 
+                            'customer_nr':list[int],
+                            'customer_town':list[str],
+                            'customer_name':list[str],
+                            'customer_surname':list[str],
+                            'customer_id':list[int],
+                            'customer_phone':list[str],
+                            'customer_mobile':list[str],
+                            'quantity':list[int], 
+                            'product_name':list[str],
+                            'product_id':list[int],
+                            'category_name':list[str],
+                            'subcategory_name':list[str],
+                            'product_selling_price':list[float],
+                            'cost':list[float],
+                            'total_cost':list[float],
+                            'notes':list[str]
+                            'id':list[int] # -> the abo_id}
+                            },
+                        'order':[],
+                        'mapping':[]
+                    'townName':{
+                        ...
+                        },
+                    ...
+                }
+            }
+        } 
+    
+    """
+
+    response = delivery.create(
+        language = app.config['DEFAULT_LANGUAGE'],
+        tz = app.config['TZ_INFO'],
+        compact = compact
+    )
+
+    return response
+
+@router.route("delivery/book",
+    data = router.param(coerce=router.json_value),
+    payload = router.param('data')
+)
+def book(data, payload):
+    """Books the manipulated data
+
+    Function takes the orders data,
+    adds it to the Orders table and
+    saves a excel file to disk.
+
+    params:
+    -------
+    data : dict
+        The town based data for each abo.
+            Format: {
+                    'customer_approach':list[int], 
+                    'customer_street':list[str], 
+                    'customer_nr':list[int],
+                    'customer_town':list[str],
+                    'customer_name':list[str],
+                    'customer_surname':list[str],
+                    'customer_id':list[int],
+                    'customer_phone':list[str],
+                    'customer_mobile':list[str],
+                    'quantity':list[int], 
+                    'product_name':list[str], 
+                    'product_id':list[int],
+                    'category_name':list[str],
+                    'subcategory_name':list[str],
+                    'product_selling_price':list[float],
+                    'cost':list[float],
+                    'total_cost':list[float],
+                    'notes':list[str]
+                    'id':list[int] # -> the abo_id
+                    }
+            }
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'job_id':str,
+            'status':str,
+            'duplicate':bool,
+            'msg':str
+        }
+        The result of the booking ('msg') is
+        available via 'jobs/<job_id>'.
+    
+    """
+
+    # book & write the files off the request thread
+    response = jobs.submit(
+        ressource = "delivery/book",
+        func = delivery.book,
+        kwargs = {
+            'data':data,
+            'language':app.config['DEFAULT_LANGUAGE']
+        },
+        payload = payload,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return job_response(response)
+
+@router.route("delivery/saveData",
+    data = router.param(coerce=router.json_value),
+    payload = router.param('data')
+)
+def save_data(data, payload):
+    """Creates the cover & overview and saves it.
+
+    params:
+    -------
+    data : dict
+        The town based data for each abo.
+            Format: {
+                    'customer_approach':list[int], 
+                    'customer_street':list[str], 
+                    'customer_nr':list[int],
+                    'customer_town':list[str],
+                    'customer_name':list[str],
+                    'customer_surname':list[str],
+                    'customer_id':list[int],
+                    'customer_phone':list[str],
+                    'customer_mobile':list[str],
+                    'quantity':list[int], 
+                    'product_name':list[str], 
+                    'product_id':list[int],
+                    'category_name':list[str],
+                    'subcategory_name':list[str],
+                    'product_selling_price':list[float],
+                    'cost':list[float],
+                    'total_cost':list[float],
+                    'notes':list[str]
+                    'id':list[int] # -> the abo_id
+                    }
+            }
+    save_cover : bool, optional
+        If true, the excel cover is printed.
+        (default is True)
+    save_overview : bool, optional
+        If true, the excel overview is printed.
+        (default is True)
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'job_id':str,
+            'status':str,
+            'duplicate':bool,
+            'msg':str
+        }
+        The result ('msg') is available via
+        'jobs/<job_id>'.
+
+    """
+
+    # write the files off the request thread
+    response = jobs.submit(
+        ressource = "delivery/saveData",
+        func = delivery.save_data,
+        kwargs = {
+            'data':data,
+            'save_cover':True,
+            'save_overview':True,
+            'language':app.config['DEFAULT_LANGUAGE']
+        },
+        payload = payload,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return job_response(response)
+
+@router.route("delivery/orderDetails",
+    data = router.param(source="request")
+)
+def order_details(data):
+    """Create order details overview
+
+    Creates the excel overview and returns it.
+
+    params:
+    -------
+    data : dict
+        The town based data for each abo.
+            Format: {
+                    'customer_approach':list[int], 
+                    'customer_street':list[str], 
+                    'customer_nr':list[int],
+                    'customer_town':list[str],
+                    'customer_name':list[str],
+                    'customer_surname':list[str],
+                    'customer_id':list[int],
+                    'customer_phone':list[str],
+                    'customer_mobile':list[str],
+                    'quantity':list[int], 
+                    'product_name':list[str], 
+                    'product_id':list[int],
+                    'category_name':list[str],
+                    'subcategory_name':list[str],
+                    'product_selling_price':list[float],
+                    'cost':list[float],
+                    'total_cost':list[float],
+                    'notes':list[str]
+                    'id':list[int] # -> the abo_id
+                    }
+            }
+
+    returns:
+    -------
+    send_file | dict
+        Format:
+            File: send_file()
+            Dict: {
+                success, 
+                error,
+                data:{
+                    'file':io.BytesIO,
+                    'date':str
+                }
+
+    """
+
+    response = delivery.print_order_details(
+        data = data,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    if not response['success']: return response
+    else: 
+
+        return send_file(
+            response['data']['file'], 
+            attachment_filename="miniMoi_order_details_" + response['data']['date'] + ".xlsx",
+            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            as_attachment=True
+        )
+
+#endregion
@@ -0,0 +1,19 @@
+"""
+Contains the api handlers for the 'demo' ressources
+
+"""
+
+# imports
+from miniMoi.logic.helpers import router
+from miniMoi.logic.functions import demo
+
+#region 'demo'
+@router.route("demo")
+def run():
+    """ runs the demo process """
+
+    response = demo.run()
+
+    return response
+
+#endregion
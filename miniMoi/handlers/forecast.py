@@ -0,0 +1,95 @@
+"""
+Contains the api handlers for the 'forecast' ressources
+
+"""
+
+# imports
+from miniMoi import app
+from miniMoi.logic.helpers import router, jobs
+from miniMoi.logic.functions import forecast
+from miniMoi.handlers import job_response
+
+#region 'forecast'
+@router.route("forecast/get",
+    days = router.param(default=None)
+)
+def get(days):
+    """Returns the delivery forecast
+
+    params:
+    -------
+    days : int | None, optional
+        The number of days to forecast
+        (starting tomorrow).
+        (default is app.config['FORECAST_DAYS'])
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'start':str,
+            'days':int,
+            'forecast_product':{
+                'data':{},
+                'order':[],
+                'mapping':[]
+            },
+            'forecast_subcategory':{
+                'data':{},
+                'order':[],
+                'mapping':[]
+            }
+        }
+
+    """
+
+    response = forecast.create(
+        days = days,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+@router.route("forecast/export",
+    days = router.param(default=None),
+    payload = router.param('data', source="request")
+)
+def export(days, payload):
+    """Saves the delivery forecast as excel
+
+    params:
+    -------
+    days : int | None, optional
+        The number of days to forecast
+        (starting tomorrow).
+        (default is app.config['FORECAST_DAYS'])
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'job_id':str,
+            'status':str,
+            'duplicate':bool,
+            'msg':str
+        }
+        The result ('msg') is available via
+        'jobs/<job_id>'.
+
+    """
+
+    # write the file off the request thread
+    response = jobs.submit(
+        ressource = "forecast/export",
+        func = forecast.export,
+        kwargs = {
+            'days':days,
+            'language':app.config['DEFAULT_LANGUAGE']
+        },
+        payload = payload,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return job_response(response)
+
+#endregion
@@ -0,0 +1,40 @@
+"""
+Contains the api handlers for the 'jobs' ressources
+
+"""
+
+# imports
+from miniMoi import app
+from miniMoi.logic.helpers import router, jobs
+
+#region 'jobs'
+@router.route("jobs/<job_id>")
+def status(job_id):
+    """Returns the status of a background job
+
+    params:
+    -------
+    None (the job id is part of the ressource,
+    'jobs/<job_id>')
+
+    returns:
+    --------
+    dict
+        success, error & data {
+            'job_id':str,
+            'ressource':str,
+            'status':str, # -> 'queued', 'running', 'done' or 'failed'
+            'created':str,
+            'result':dict | None # -> response of the job
+        }
+
+    """
+
+    response = jobs.status(
+        job_id = job_id,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+#endregion
@@ -0,0 +1,226 @@
+"""
+Contains the api handlers for the 'products' ressources
+
+"""
+
+# imports
+from miniMoi import app
+from miniMoi.logic.helpers import router
+from miniMoi.logic.functions import products
+from miniMoi.handlers import parse_page_size
+
+#region 'products'
+@router.route("products/get",
+    filter_type = router.param(),
+    what = router.param(),
+    amount = router.param(),
+    page_size = router.param(coerce=parse_page_size, default=None, dtype="int"),
+    cursor = router.param(coerce=router.optional_int, default=None, dtype="int")
+)
+def get(filter_type, what, amount, page_size, cursor):
+    """Returns the requested products
+
+    params:
+    -------
+    filter_type : str | None
+        Indicates the type of filter to apply.
+            Options: { None, 'product', 
+                    'category' }
+                    None: Fetches data by id
+                        interval.
+                    'product': Searches for
+                                a singel product.
+                    'category': Searches for all
+                                products in one
+                                category.
+    what : str | None:
+        Indicates the query phrase.
+            Example: if None, the string indicates
+                    the interval of ids.
+    amount : int | None, optional
+        The number of entries to query.
+        (default is None).
+    page_size : int | None, optional
+        The max. number of entries per page.
+        (default & max. is app.config['PAGE_SIZE'])
+    cursor : int | None, optional
+        The 'next_cursor' of the previous page.
+        (default is None)
+
+    returns:
+    --------
+    dict
+        success, error, data {
+            'result':[
+                {
+                    'id':int,
+                    'name':str,
+                    'category':int,
+                    'purchase_price':float,
+                    'selling_price':float,
+                    'store':str,
+                    'phone':str
+                },
+                ...
+            ]
+        }
+
+    """
+
+    response = products.get(
+        filter_type = filter_type,
+        what = what,
+        amount = amount,
+        page_size = page_size,
+        cursor = cursor,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+@router.route("products/add",
+    to_add = router.param()
+)
+def add(to_add):
+    """Adds products to the db
+
+    The add function either adds only one
+    or multiple products.
+
+    params:
+    -------
+    to_add : list
+        A list containing every single new
+        product.
+            Format: [
+                {
+                    'name':str,
+                    'category':int,
+                    'purchase_price':float,
+                    'selling_price':float,
+                    'store':str,
+                    'phone':str
+                },
+                ...
+            ]
+
+
+    returns:
+    --------
+    dict
+        success, error & data {}
+
+    """
+
+    response = products.add(
+        products = to_add,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+@router.route("products/delete",
+    product_id = router.param('id')
+)
+def delete(product_id):
+    """Deletes a product
+
+    params:
+    -------
+    id : int
+        the customer unique id.
+
+    returns:
+    -------
+    dict
+        success, error & data
+
+    """
+
+    response = products.delete(
+        product_id = product_id,
+        language = app.config['DEFAULT_LANGUAGE'],
+    )
+
+    return response
+
+@router.route("products/update",
+    product_id = router.param('id'),
+    data = router.param(source="request")
+)
+def update(product_id, data):
+    """Updates a single product
+
+    params:
+    -------
+    id : int
+        The customer unique id.
+    data : dict
+        A dict containing the data
+        to update.
+            Format: {
+                'name':str,
+                'category':int,
+                'purchase_price':float,
+                'selling_price':float,
+                'store':str,
+                'phone':str
+            }
+
+    returns:
+    -------
+    dict
+        success, error & data
+
+    """
+
+    response = products.update(
+        product_id = product_id,
+        data = data,
+        language = app.config['DEFAULT_LANGUAGE'],
+    )
+
+    return response
+
+@router.route("products/reprice",
+    rule = router.param(coerce=router.json_value),
+    preview = router.param(coerce=router.flag, default=False)
+)
+def reprice(rule, preview):
+    """Changes the prices of multiple products
+
+    params:
+    -------
+    rule : dict
+        The price rule (JSON or dict).
+            Format: {
+                'percentage':float,
+                'price':str,
+                'category':int | None,
+                'store':str | None
+            }
+            (see 'products.reprice()')
+    preview : bool, optional
+        If True, only the changes are returned.
+        (default is False)
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'msg':str,
+            'preview':bool,
+            'changes':list
+        }
+
+    """
+
+    response = products.reprice(
+        rule = rule,
+        preview = preview,
+        language = app.config['DEFAULT_LANGUAGE']
+    )
+
+    return response
+
+#endregion
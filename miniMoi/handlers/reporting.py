@@ -0,0 +1,19 @@
+"""
+Contains the api handlers for the 'reporting' ressources
+
+"""
+
+# imports
+from miniMoi.logic.helpers import router
+from miniMoi.logic.functions import reporting
+
+#region 'report'
+@router.route("reporting/get")
+def get():
+    """Creates the report """
+
+    response = reporting.get_report()
+
+    return response
+
+#endregion
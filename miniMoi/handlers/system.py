@@ -0,0 +1,68 @@
+"""
+Contains the api handlers for the 'system' ressources
+
+"""
+
+# imports
+from miniMoi.logic.helpers import router
+from miniMoi.logic.functions import system
+
+#region 'system'
+@router.route("system/dbBackup")
+def db_backup():
+    """Copies the mini-moi db to the documents folder """
+
+    response = system.make_db_copy()
+
+    return response
+
+@router.route("system/dbRollback",
+    filename = router.param()
+)
+def db_rollback(filename):
+    """Rollback the db with old backup
+    
+    params:
+    ------
+    filename : str
+        The name of the file to import
+
+    returns:
+    --------
+    dict    
+        success, error & data {msg}
+
+    """
+
+    response = system.rollback_db_save(
+        filename = filename
+    )
+
+    return response
+
+@router.route("system/routeStats")
+def route_stats():
+    """Returns the call stats per ressource
+
+    params:
+    -------
+    None
+
+    returns:
+    --------
+    dict
+        success, error & data {
+            'stats':{ressource:{
+                'calls':int,
+                'failures':int,
+                'total':float, # -> seconds
+                'mean':float, # -> seconds
+                'max':float # -> seconds
+            }}
+        }
+
+    """
+
+    return {'success':True, 'error':"", 'data':{'stats':router.stats()}}
+
+#endregion
@@ -1,8 +1,18 @@
 """
 Contains all the language files.
 
+Use 'get_translation()' to resolve a language
+(with fallback) and 'get_derived()' for the
+precomputed reverse mappings & error messages.
+Both are memoized per language.
+
 """
 
+# imports
+import functools
+import types
+import typing
+
 from . import en_EN
 from . import fr_FR
 from . import de_DE
@@ -10,4 +20,133 @@ from . import de_DE
 language_files = {
     'EN':en_EN.mapping,
     'DE':de_DE.mapping
-}
\ No newline at end of file
+}
+
+#region 'registry'
+def _freeze(mapping:dict) -> types.MappingProxyType:
+    """Returns a read only view of the (nested) dict """
+
+    return types.MappingProxyType({
+        key:_freeze(value) if isinstance(value, dict) else value for key, value in mapping.items()
+    })
+
+@functools.lru_cache(maxsize=None)
+def _resolve(language:str, fallback:str) -> str:
+    """Returns the available language iso code """
+
+    if language in language_files: return language
+    if fallback in language_files: return fallback
+
+    return "EN"
+
+def resolve(language:typing.Any, fallback:str = "EN") -> str:
+    """Resolves the language iso code
+
+    params:
+    -------
+    language : str
+        The requested language iso code.
+    fallback : str, optional
+        The language to use if the requested
+        one is not available.
+        (default is "EN")
+
+    returns:
+    --------
+    str
+        The iso code of an available language.
+        Falls back to 'fallback' and last to "EN".
+
+    """
+
+    # unhashable (e.g. a list) -> cannot be a language
+    try: return _resolve(language, fallback)
+    except TypeError: return _resolve(fallback, "EN")
+
+def get_translation(language:typing.Any, fallback:str = "EN") -> dict:
+    """Returns the language file
+
+    Replaces the 'try: language_files[language]
+    except: language_files[fallback]' pattern.
+
+    params:
+    -------
+    language : str
+        The requested language iso code.
+    fallback : str, optional
+        The language to use if the requested
+        one is not available.
+        (default is "EN")
+
+    returns:
+    --------
+    dict
+        The language file mapping.
+
+    """
+
+    return language_files[resolve(language, fallback)]
+
+@functools.lru_cache(maxsize=None)
+def _derive(language:str) -> types.MappingProxyType:
+    """Builds the derived structures for an available language """
+
+    translation = language_files[language]
+    errors = translation['error_codes']
+
+    return _freeze({
+        'reverse_column_mapping':{
+            table:{value:key for key, value in mapping.items()} for table, mapping in translation['column_mapping'].items()
+        },
+        'reverse_weekday_mapping':{value:key for key, value in translation['weekday_mapping'].items()},
+        'reverse_cycle_type_mapping':{value:key for key, value in translation['cycle_type_mapping'].items()},
+        'formatted_errors':{
+            'cycleMismatch':errors['cycleMismatch'].format(
+                interval = translation['column_mapping']['abo']['interval'],
+                cycle_type = translation['column_mapping']['abo']['cycle_type'],
+                day = translation['cycle_type_mapping']['day'],
+                interval_value = translation['cycle_type_mapping']['interval']
+            ),
+            'cycleTypeNotAllowed':errors['notAllowed'].format(
+                var="cycle_type",
+                available = str(set([None, 'day', 'interval']))
+            ),
+            'weekdayNotAllowed':errors['notAllowed'].format(
+                var="interval for day",
+                available = "{ " + errors['weekdays'] + " }"
+            )
+        }
+    })
+
+def get_derived(language:typing.Any, fallback:str = "EN") -> types.MappingProxyType:
+    """Returns the derived (read only) structures
+
+    The structures are computed once per language.
+
+    params:
+    -------
+    language : str
+        The requested language iso code.
+    fallback : str, optional
+        The language to use if the requested
+        one is not available.
+        (default is "EN")
+
+    returns:
+    --------
+    types.MappingProxyType
+        {
+            'reverse_column_mapping':{table:{translated:official}},
+            'reverse_weekday_mapping':{translated:idx},
+            'reverse_cycle_type_mapping':{translated:official},
+            'formatted_errors':{
+                'cycleMismatch', 'cycleTypeNotAllowed',
+                'weekdayNotAllowed'
+            }
+        }
+
+    """
+
+    return _derive(resolve(language, fallback))
+
+#endregion
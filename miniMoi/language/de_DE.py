@@ -47,14 +47,27 @@ mapping = {
         'notUnique':"Ihre Einträge für {table} waren nicht einzigartig: {nonUnique}.",
         'blueprintUnkonwn':"Die ausgewählte Blaupause ist nicht bekannt ('{blueprint}'.",
         'noBlueprintFound':"Es gab keine Blaupausen zum importieren. Bitte erzeugen Sie zuerst eines.",
+        'bulkChanged':"Der bereits importierte Teil der Datei wurde seit dem letzten Import verändert. Machen Sie die Änderungen rückgängig oder löschen Sie '{progress}', um die ganze Datei erneut zu importieren.",
         'wrongFileType':"Nur Dateien mit Endung '.{format}' sind erlaubt.",
         'pageRefresh':"Bitte aktualisieren Sie die Seite.",
+        'jobNotFound':"Der Auftrag wurde nicht gefunden (id = '{id}').",
+        'jobQueueFull':"Es laufen zu viele Aufträge. Bitte versuchen Sie es gleich nochmal.",
+        'wrongPriceRule':"Die Preisregel ist ungültig: '{key}'.",
+        'forecastDays':"Die Prognose muss 1 bis {max} Tage umfassen.",
+        'batchTooLarge':"Der Batch enthält zu viele Einträge (max. {max}).",
+        'batchNotAllowed':"'{ressource}' kann nicht in einem Batch verwendet werden.",
+        'batchRolledBack':"Eintrag {index} ('{ressource}') ist fehlgeschlagen. Es wurde nichts gespeichert.",
+        'backendNotSupported':"Die Operation ist nur für die sqlite Datenbankdatei verfügbar (aktuelles Backend '{backend}').",
+        'dbBusy':"Die Datenbank wird noch verwendet (offene Verbindungen oder nicht gespeicherte Änderungen). Bitte versuchen Sie es erneut.",
         '500':"Es trat ein Fehler auf: {c}: {m}",
         '404':"Seite '{ressource}' nicht gefunden.",
     },
     'xlsx':{
         'title_overview':"Bestellungen für {date} - {day}",
         'title_details':"Bestelldetails für {date} - {day}",
+        'title_forecast':"Prognose ab {start} ({days} Tage)",
+        'forecast_products':"Produkte",
+        'forecast_subcategories':"Unterkategorien",
         'notes':"Notiz:",
         'km':"Kilometer",
         'time':"Zeit",
@@ -150,6 +163,14 @@ mapping = {
                 "Ordner auswählen! <br>"
                 "( zu finden unter <b>~/mini-moi/backups/</b> ) </small></span>"
             ),
+            'settings_split_towns':"Lieferlisten",
+            'settings_split_towns_description':(
+                "Speichert eine Lieferliste pro Ort statt "
+                "einer Liste für alle Orte. <br>"
+                "Die Listen werden parallel erstellt."
+            ),
+            'settings_split_towns_on':"Eine Liste pro Ort",
+            'settings_split_towns_off':"Eine Liste",
             'settings_apply_button':"Einstellungen anwenden"
         },
         '/':{
@@ -252,6 +273,8 @@ mapping = {
             'management_tbl_col_special':"Spezial",
             'management_auto_text':"Auto.",
             'management_no_data':"Keine Daten verfügbar!",
+            'management_first_page':"Erste Seite",
+            'management_next_page':"Nächste Seite",
         },
         '/bulk':{
             'bulk_title':"Massen Upload",
@@ -325,6 +348,10 @@ mapping = {
         'blueprint_created':"Die Blaupause für '{blueprint}' wurde erfolgreich unter '{path}' erstellt.",
         'bulkFinished':"Erfolgreich: {success}, Fehler: {failures}",
         'is_empty':"ist leer",
+        'bulkChunks':"{name} ({success}/{chunks} Teile, {rows} Zeilen)",
+        'job_running':"Ihre Dateien werden erstellt. Bitte warten ...",
+        'reprice_preview':"{rows} Produkt(e) würden neu bepreist. Es wurde noch nichts gespeichert.",
+        'repriced':"{rows} Produkt(e) erfolgreich neu bepreist!",
     },
     'column_mapping':{
         'customers':{
@@ -356,6 +383,9 @@ mapping = {
             'store':"Laden",
             'phone':"Tel.",
             },
+        'forecast':{
+            'date':"Datum"
+        },
         'abo':{
             'id':"id",
             'customer_id':"Konsumenten id",
@@ -28,13 +28,27 @@ mapping = {
         'notUnique':"Your {table} entry was not unique: {nonUnique}.",
         'blueprintUnkonwn':"The selected blueprint is not known ('{blueprint}'",
         'noBlueprintFound':"There was no blueprint to import. Please create first one.",
+        'bulkChanged':"The already imported part of the file was changed since the last import. Undo the changes or delete '{progress}' to import the whole file again.",
         'wrongFileType':"Only files in format '.{format}' are allowed.",
+        'pageRefresh':"Please refresh the page.",
+        'jobNotFound':"The job was not found (id = '{id}').",
+        'jobQueueFull':"There are too many running jobs. Please try again in a moment.",
+        'wrongPriceRule':"The price rule is not valid: '{key}'.",
+        'forecastDays':"The forecast needs to cover 1 to {max} days.",
+        'batchTooLarge':"The batch contains too many items (max. {max}).",
+        'batchNotAllowed':"'{ressource}' can not be used within a batch.",
+        'batchRolledBack':"Item {index} ('{ressource}') failed. No changes were saved.",
+        'backendNotSupported':"The operation is only available for the sqlite database file (current backend '{backend}').",
+        'dbBusy':"The database is still in use (open connections or unsaved changes). Please try again.",
         '500':"An error occured: {c}: {m}",
         '404':"Endpoint '{ressource}' not found.",
     },
     'xlsx':{
         'title_overview':"Orders for {date} - {day}",
         'title_details':"Order details for {date} - {day}",
+        'title_forecast':"Forecast from {start} ({days} days)",
+        'forecast_products':"products",
+        'forecast_subcategories':"subcategories",
         'notes':"Notes:",
         'km':"Kilometers",
         'time':"Time",
@@ -127,6 +141,14 @@ mapping = {
                 "a database file (.db) in the 'mini-moi' folder!  <br>"
                 "( located at <b>~/mini-moi/backups/</b> ) </small></span>"
             ),
+            'settings_split_towns':"Delivery Lists",
+            'settings_split_towns_description':(
+                "Saves one delivery list per town instead of "
+                "one list for all towns. <br>"
+                "The lists are created in parallel."
+            ),
+            'settings_split_towns_on':"One list per town",
+            'settings_split_towns_off':"One list",
             'settings_apply_button':"Apply settings"
         },
         '/':{
@@ -228,6 +250,8 @@ mapping = {
             'management_tbl_col_special':"Special",
             'management_auto_text':"Auto.",
             'management_no_data':"No data available!",
+            'management_first_page':"First page",
+            'management_next_page':"Next page",
         },
         '/bulk':{
             'bulk_title':"Bulk Upload",
@@ -299,6 +323,10 @@ mapping = {
         'blueprint_created':"The blueprint for '{blueprint}' was successfully created as '{path}'",
         'bulkFinished':"Successfull: {success}, Failures: {failures}",
         'is_empty':"is empty",
+        'bulkChunks':"{name} ({success}/{chunks} chunks, {rows} rows)",
+        'job_running':"Your files are being created. Please wait ...",
+        'reprice_preview':"{rows} product(s) would be repriced. Nothing was saved yet.",
+        'repriced':"{rows} product(s) were successfully repriced!",
     },
     'column_mapping':{
         'customers':{
@@ -330,6 +358,9 @@ mapping = {
             'store':"Store",
             'phone':"Phone",
             },
+        'forecast':{
+            'date':"Date"
+        },
         'abo':{
             'id':"id",
             'customer_id':"Customer id",
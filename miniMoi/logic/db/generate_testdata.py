@@ -11,6 +11,7 @@ import random
 
 from miniMoi import Session
 from miniMoi.models.Models import Category, Subcategory, Products, Customers, Abo, Orders
+from miniMoi.logic.helpers import aggregates
 
 
 #region 'run'
@@ -349,6 +350,10 @@ def generate():
     session.add_all(toAdd)
     session.commit()
 
+    # rebuild the sales aggregates for the reporting
+    aggregates.rebuild_sales(session)
+    session.commit()
+
     #endregion
 
     #endregion
@@ -4,10 +4,15 @@ Initiate the database (if not already active)
 """
 
 # imports
-from sqlalchemy_utils import database_exists, create_database
+from sqlalchemy import inspect, text
 
 # import models, else create all will fail!
-from miniMoi.models.Models import Customers, Orders, Abo, Category, Subcategory, Products, Log
+from miniMoi.models.Models import Customers, Orders, Abo, Category, Subcategory, Products, Log, SalesDaily
+from miniMoi.logic.helpers import lazy
+
+# only needed for the db creation & migration (startup time)
+sqlalchemy_utils = lazy.module("sqlalchemy_utils")
+aggregates = lazy.module("miniMoi.logic.helpers.aggregates")
 
 
 def run_creation(engine, base) -> None:
@@ -31,13 +36,92 @@ def run_creation(engine, base) -> None:
     """
 
     # check if the database exists already
-    if not database_exists(engine.url): create_database(engine.url)
+    if not sqlalchemy_utils.database_exists(engine.url): sqlalchemy_utils.create_database(engine.url)
 
     # try to create the tables
     # already created tables are not recreated again
     with engine.connect() as conn:
         base.metadata.create_all(engine)
 
+def create_indexes(engine, base) -> list:
+    """Creates missing indexes on existing tables
+
+    'create_all()' only creates the indexes together
+    with new tables. Databases created by older app
+    versions therefore miss indexes which were added
+    to the models later on.
+    This function adds them (already existing indexes
+    are skipped).
+
+    params:
+    -------
+    engine : sql alchemy engine
+        The sql alchemy engine
+    base : sqlalchemy base
+        The sql alchemy base
+
+    returns:
+    --------
+    list
+        Names of the checked indexes.
+
+    """
+
+    checked = []
+
+    for table in base.metadata.sorted_tables:
+        for index in table.indexes:
+
+            # checkfirst -> no error if the index is already there
+            index.create(bind=engine, checkfirst=True)
+            checked.append(index.name)
+
+    return checked
+
+def create_aggregates(engine, Session) -> int:
+    """Creates & backfills the sales aggregates
+
+    Databases created by older app versions have
+    no 'SalesDaily' table. This function creates
+    it and fills it once from the 'Orders' table.
+    Afterwards the booking keeps it up to date.
+
+    params:
+    -------
+    engine : sql alchemy engine
+        The sql alchemy engine
+    Session : sqlalchemy session maker
+        The session maker to create a session
+
+    returns:
+    --------
+    int
+        The number of backfilled rows. Zero
+        if the table already existed.
+
+    """
+
+    # already migrated
+    if inspect(engine).has_table(SalesDaily.__tablename__): return 0
+
+    SalesDaily.__table__.create(bind=engine, checkfirst=True)
+
+    session = Session()
+
+    try:
+
+        rows = aggregates.rebuild_sales(session)
+        session.commit()
+
+    except Exception:
+
+        session.rollback()
+        raise
+
+    finally: session.close()
+
+    return rows
+
 
 def create_defaults(Session) -> bool:
     """Creates default db entries
@@ -67,21 +151,61 @@ def create_defaults(Session) -> bool:
         # create empty adding list
         toAdd = []
 
-        # create the default for subcategory
-        toAdd.append(Subcategory(
-            id = 0,
-            name = "None"
-        ))
+        # create the default for subcategory (server dbs can exist already)
+        if session.query(Subcategory.id).filter(Subcategory.id == 0).first() is None:
+            toAdd.append(Subcategory(
+                id = 0,
+                name = "None"
+            ))
 
         # add and commit
         session.add_all(toAdd)
         session.commit()
 
+        # the explicit id does not move the id sequences (e.g. postgresql)
+        sync_sequences(session.get_bind())
+
     except Exception as e:
 
         # terminate the db session!
-        session.remove()
+        session.rollback()
+        session.close()
 
         return False
 
-    return True
\ No newline at end of file
+    return True
+
+def sync_sequences(engine) -> list:
+    """Moves the id sequences behind the highest id
+
+    Backends with id sequences (postgresql) do not
+    advance them if rows are inserted with explicit
+    ids (defaults, restored or imported rows). This
+    function sets each sequence to the current max
+    id. Other backends are skipped.
+
+    params:
+    -------
+    engine : sql alchemy engine
+        The sql alchemy engine
+
+    returns:
+    --------
+    list
+        Names of the synced tables.
+
+    """
+
+    if engine.dialect.name != "postgresql": return []
+
+    synced = []
+    with engine.begin() as connection:
+        for table in [Customers, Orders, Abo, Category, Subcategory, Products, Log, SalesDaily]:
+
+            name = table.__tablename__
+            connection.execute(text(
+                "SELECT setval(pg_get_serial_sequence(:table, 'id'), COALESCE((SELECT MAX(id) FROM " + name + "), 0) + 1, false)"
+            ), {'table':name})
+            synced.append(name)
+
+    return synced
\ No newline at end of file
@@ -0,0 +1,336 @@
+"""
+Contains the sqlite performance profile
+
+The pragmas of a profile are set on every new
+connection (sqlalchemy 'connect' event). The
+default profile ("performance") uses:
+    - WAL journal -> readers are not blocked by a
+      running write (e.g. 'delivery.book')
+    - NORMAL synchronous -> no fsync per commit
+      (still safe with WAL)
+    - memory mapped I/O & a larger page cache
+    - a busy timeout -> writers wait instead of
+      failing with 'database is locked'
+
+The profile is selected in the settings.json
+('sqlite_profile'). Single pragmas can be
+overwritten with 'sqlite_pragmas' (dict).
+
+"""
+
+# imports
+import os
+import typing
+import sqlite3
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool, QueuePool
+
+# the profiles (pragma:value)
+PROFILES = {
+    'performance':{
+        'journal_mode':"WAL",
+        'synchronous':"NORMAL",
+        'cache_size':-64000, # -> KiB (64MB)
+        'mmap_size':268435456, # -> bytes (256MB)
+        'temp_store':"MEMORY",
+        'busy_timeout':5000 # -> ms
+    },
+    'off':{} # -> sqlite defaults (legacy)
+}
+
+#region 'private functions'
+def _is_memory(url:str) -> bool:
+    """True if the url is an in memory sqlite db """
+
+    return make_url(url).database in [None, "", ":memory:"]
+
+def _set_pragmas(dbapi_connection, pragmas:dict, memory:bool) -> None:
+    """Sets the pragmas on the raw connection """
+
+    cursor = dbapi_connection.cursor()
+
+    for pragma, value in pragmas.items():
+
+        # in memory dbs have no (wal) journal file
+        if pragma == "journal_mode" and memory: continue
+
+        cursor.execute("PRAGMA {p} = {v}".format(p=pragma, v=value))
+
+    cursor.close()
+
+#endregion
+
+#region 'functions'
+def get_pragmas(profile:str = "performance", overwrite:typing.Union[dict, None] = None) -> dict:
+    """Returns the pragmas of the profile
+
+    params:
+    -------
+    profile : str, optional
+        The profile name (see PROFILES). Unknown
+        profiles fall back to "performance".
+        (default is "performance")
+    overwrite : dict | None, optional
+        Single pragmas to overwrite.
+        (default is None)
+
+    returns:
+    --------
+    dict
+        {pragma:value}
+
+    """
+
+    return {**PROFILES.get(profile, PROFILES['performance']), **(overwrite or {})}
+
+def engine_options(url:str, pool_size:int = 5) -> dict:
+    """Returns the 'create_engine()' options
+
+    In memory dbs share one connection across all
+    threads. File dbs keep a pool of connections
+    (the pragmas, page cache & memory map stay alive
+    between the requests).
+
+    params:
+    -------
+    url : str
+        The database url.
+    pool_size : int, optional
+        The number of pooled connections (file dbs).
+        (default is 5)
+
+    returns:
+    --------
+    dict
+        The keyword arguments for 'create_engine()'.
+
+    """
+
+    if make_url(url).get_backend_name() != "sqlite": return {}
+
+    if _is_memory(url): return {'poolclass':StaticPool, 'connect_args':{'check_same_thread':False}}
+
+    return {
+        'poolclass':QueuePool,
+        'pool_size':pool_size,
+        'max_overflow':pool_size * 2,
+        'connect_args':{'check_same_thread':False}
+    }
+
+def apply(engine, pragmas:dict) -> None:
+    """Sets the pragmas on every new connection
+
+    params:
+    -------
+    engine : sqlalchemy engine
+        The engine. Non sqlite engines are ignored.
+    pragmas : dict
+        {pragma:value} (see 'get_pragmas()').
+
+    returns:
+    --------
+    None
+
+    """
+
+    if engine.dialect.name != "sqlite" or not pragmas: return
+
+    memory = _is_memory(str(engine.url))
+
+    event.listen(engine, "connect", lambda dbapi_connection, record: _set_pragmas(dbapi_connection, pragmas, memory))
+
+def uses_file(engine) -> bool:
+    """True if the engine is a sqlite db file
+
+    Backups, rollbacks & the file deletion are only
+    possible for db files (not for in memory dbs or
+    server backends like postgresql).
+
+    params:
+    -------
+    engine : sqlalchemy engine
+        The engine.
+
+    returns:
+    --------
+    bool
+
+    """
+
+    return engine.dialect.name == "sqlite" and not _is_memory(str(engine.url))
+
+def shares_connection(engine) -> bool:
+    """True if all threads share one connection
+
+    In memory dbs use a 'StaticPool' (see
+    'engine_options()'). A commit of any thread
+    commits the open transaction of the others.
+
+    params:
+    -------
+    engine : sqlalchemy engine
+        The engine.
+
+    returns:
+    --------
+    bool
+
+    """
+
+    return isinstance(engine.pool, StaticPool)
+
+def begin(connection) -> None:
+    """Starts the transaction explicitly
+
+    pysqlite defers the BEGIN until the first
+    write. Without it, the first SAVEPOINT opens
+    the transaction & its RELEASE commits it.
+    The write lock is taken right away (IMMEDIATE),
+    so the transaction waits for other writers
+    (busy timeout) instead of failing on its first
+    write. Non sqlite connections are ignored.
+
+    params:
+    -------
+    connection : sqlalchemy connection
+        The connection (e.g. 'session.connection()').
+
+    returns:
+    --------
+    None
+
+    """
+
+    if connection.dialect.name != "sqlite": return
+
+    if not connection.connection.in_transaction: connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+def release(engine, session = None) -> bool:
+    """Writes the WAL into the db file & closes all connections
+
+    Call this before the db file is replaced or
+    deleted. The db file is only complete, if the
+    checkpoint was not blocked (e.g. by an open
+    read transaction) and no '-wal' & '-shm' files
+    are left (-> no other open connections).
+
+    params:
+    -------
+    engine : sqlalchemy engine
+        The (sqlite) engine.
+    session : sqlalchemy scoped_session, optional
+        The session to close first.
+        (default is None)
+
+    returns:
+    --------
+    bool
+        True if the db file is complete.
+
+    """
+
+    if session is not None: session.remove()
+
+    if engine.dialect.name != "sqlite": return True
+
+    if _is_memory(str(engine.url)):
+        engine.dispose()
+
+        return True
+
+    # busy, wal frames, checkpointed frames
+    with engine.connect() as connection:
+        busy = connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0]
+
+    engine.dispose()
+
+    path = make_url(str(engine.url)).database
+
+    return busy == 0 and not any([os.path.exists(path + suffix) for suffix in ["-wal", "-shm"]])
+
+def backup(engine, target:str) -> None:
+    """Copies the db into the target file
+
+    Uses the sqlite backup api: the copy is
+    consistent (incl. the WAL) while the app
+    keeps running.
+
+    params:
+    -------
+    engine : sqlalchemy engine
+        The (sqlite) engine.
+    target : str
+        The path of the copy. An existing file is
+        overwritten.
+
+    returns:
+    --------
+    None
+
+    """
+
+    source = engine.raw_connection()
+
+    try:
+        destination = sqlite3.connect(target)
+
+        try: source.connection.backup(destination)
+        finally: destination.close()
+
+    finally: source.close()
+
+def restore(source:str, target:str) -> None:
+    """Overwrites the target db file with the source db file
+
+    Uses the sqlite backup api (the source is
+    opened read only, a missing source raises
+    'sqlite3.OperationalError'). Call 'release()'
+    first.
+
+    params:
+    -------
+    source : str
+        The path of the db file to load.
+    target : str
+        The path of the db file to overwrite.
+
+    returns:
+    --------
+    None
+
+    """
+
+    sourceConnection = sqlite3.connect(Path(source).resolve().as_uri() + "?mode=ro", uri=True)
+
+    try:
+        destination = sqlite3.connect(target)
+
+        try: sourceConnection.backup(destination)
+        finally: destination.close()
+
+    finally: sourceConnection.close()
+
+def read_pragmas(engine, names:list) -> dict:
+    """Reads the current pragma values
+
+    params:
+    -------
+    engine : sqlalchemy engine
+        The (sqlite) engine.
+    names : list
+        The pragma names.
+
+    returns:
+    --------
+    dict
+        {pragma:value}
+
+    """
+
+    with engine.connect() as connection:
+        return {name:connection.exec_driver_sql("PRAGMA {n}".format(n=name)).scalar() for name in names}
+
+#endregion
@@ -9,10 +9,11 @@ from datetime import tzinfo
 import typing
 
 import pandas as pd
+from sqlalchemy import bindparam
 
 from miniMoi import Session, app
 from miniMoi.models.Models import Abo, Customers, Products, Subcategory
-from miniMoi.language import language_files
+from miniMoi.language import get_translation
 from miniMoi.logic.helpers import tools
 import miniMoi.logic.helpers.time_module as time
 
@@ -21,8 +22,10 @@ def get(
         filter_type:typing.Union[str, None], 
         what:typing.Union[str, None],
         amount:typing.Union[int, None] = None,
-        language:str = app.config['DEFAULT_LANGUAGE'],
-        tz:str = app.config['TZ_INFO']
+        page_size:typing.Union[int, None] = None,
+        cursor:typing.Union[int, None] = None,
+        language:typing.Union[str, None] = None,
+        tz:typing.Union[str, None] = None
     ) -> dict:
     """Returns the requested abos
 
@@ -46,13 +49,21 @@ def get(
     amount : int | None, optional
         The number of entries to query.
         (default is None).
-    language : str, optional
+    page_size : int | None, optional
+        The max. number of entries per page.
+        If None, all entries are returned.
+        (default is None)
+    cursor : int | None, optional
+        The 'next_cursor' of the previous page
+        (the last id on it).
+        (default is None)
+    language : str | None, optional
         the language iso code. Needed for the
         error msg.
-        (default is app.config['DEFAULT_LANGUAGE'])
-    tz : str, optional
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
+    tz : str | None, optional
         Timezone info as string.
-        (default is app.config['TZ_INFO])
+        (default is None -> app.config['TZ_INFO'])
 
     returns:
     --------
@@ -70,14 +81,22 @@ def get(
                     'product_name':str
                 },
                 ...
-            ]
+            ],
+            'pagination':{
+                'page_size':int | None,
+                'cursor':int | None,
+                'next_cursor':int | None,
+                'total':int
+            }
         }
 
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+    if tz is None: tz = app.config['TZ_INFO']
+
     # get language
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -121,31 +140,28 @@ def get(
 
     #endregion
 
-    # limit the amount?
-    if amount is not None: result = result.limit(amount)
-
     #region 'create dropdown options'
     # products
-    products = session.query(Products)
-    if products.first() is None: return {
+    products = session.query(Products).all()
+    if len(products) == 0: return {
         'success':False, 
         'error':errors['noElementInDB'].format(
             element = translation['table_mapping']['product']
         ),
         'data':{}
         }
-    dropdown_products = {el.id:el.name for el in products.all()}
+    dropdown_products = {el.id:el.name for el in products}
 
     # subcategory
-    subcategories = session.query(Subcategory)
-    if subcategories.first() is None: return {
+    subcategories = session.query(Subcategory).all()
+    if len(subcategories) == 0: return {
         'success':False, 
         'error':errors['noElementInDB'].format(
             element = translation['table_mapping']['subcategory']
         ),
         'data':{}
         }
-    dropdown_subcateogry = {el.id:el.name for el in subcategories.all()}
+    dropdown_subcateogry = {el.id:el.name for el in subcategories}
 
     #endregion
 
@@ -171,12 +187,26 @@ def get(
 
     #endregion
 
-    # is result none?
-    if result.first() is None: return{'success':True, 'error':"", 'data':emptyResult}
+    # fetch the page
+    rows, pagination = tools._paginate(result, Abo.id, page_size, cursor, amount)
+    emptyResult.update({'pagination':pagination})
+
+    # result is None?
+    if len(rows) == 0: return{'success':True, 'error':"", 'data':emptyResult}
+
+    # convert the timestamps in one go
+    updateDates = time.series_to_string(
+        time.series_utc_to_local(pd.Series([row.update_date for row in rows], dtype=object)), 
+        "%Y.%m.%d %H:%M"
+        ).tolist()
+    nextDeliveries = time.series_to_string(
+        time.series_utc_to_local(pd.Series([row.next_delivery for row in rows], dtype=object)), 
+        "%Y.%m.%d"
+        ).tolist()
 
     # turn result into list of dicts
     fetched = []
-    for row in result.all():
+    for row, update_date, next_delivery in zip(rows, updateDates, nextDeliveries):
 
         # parse cycle type and interval
         cycle_type = "None"
@@ -188,10 +218,10 @@ def get(
             {
               'id':row.id,
               'customer_id':row.customer_id,
-              'update_date':time.to_string(time.utc_to_local(row.update_date), "%Y.%m.%d %H:%M"),
+              'update_date':update_date,
               'cycle_type':cycle_type,
               'interval':interval,
-              'next_delivery':time.to_string(time.utc_to_local(row.next_delivery), "%Y.%m.%d"),
+              'next_delivery':next_delivery,
               'product':row.product,
               'subcategory':row.subcategory,
               'quantity':row.quantity  
@@ -210,7 +240,7 @@ def get(
         'data':emptyResult
     }
 
-def update(abo_id:int, data:dict, language:str = app.config['DEFAULT_LANGUAGE'], tz = app.config['TZ_INFO']) -> dict:
+def update(abo_id:int, data:dict, language:typing.Union[str, None] = None, tz:typing.Union[str, None] = None) -> dict:
     """Updates a single abo for a customer
 
     params:
@@ -228,13 +258,13 @@ def update(abo_id:int, data:dict, language:str = app.config['DEFAULT_LANGUAGE'],
                 'subcategory':int,
                 'next_delivery':str(%Y.%m.%d) | None
             }
-    language : str, optional
+    language : str | None, optional
         the language iso code. Needed for the
         error msg.
-        (default is app.config['DEFAULT_LANGUAGE])
-    tz : str, optional
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
+    tz : str | None, optional
         The timezone info.
-        (default is app.config['TZ_INFO'])
+        (default is None -> app.config['TZ_INFO'])
 
     returns:
     -------
@@ -243,9 +273,11 @@ def update(abo_id:int, data:dict, language:str = app.config['DEFAULT_LANGUAGE'],
     
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+    if tz is None: tz = app.config['TZ_INFO']
+
     # get language
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -281,27 +313,6 @@ def update(abo_id:int, data:dict, language:str = app.config['DEFAULT_LANGUAGE'],
             'data':{}
             }
 
-    #region 'fetch additional info'
-    # fetch all available products
-    products = pd.read_sql_query(
-        session.query(Products).statement,
-        session.bind
-    )
-
-    # get unique ids
-    availableProducts = products['id'].unique().tolist()
-
-    # fetch all available subcategories
-    subcategories = pd.read_sql_query(
-        session.query(Subcategory).statement,
-        session.bind
-    )
-
-    # get unique ids
-    availableSubcategory = subcategories['id'].unique().tolist()
-
-    #endregion
-
     #region 'parse input'
     # check ints
     int_values = {}
@@ -382,6 +393,10 @@ def update(abo_id:int, data:dict, language:str = app.config['DEFAULT_LANGUAGE'],
 
     #endregion
 
+    # only look up the referenced product & subcategory
+    availableProducts = tools._existing_ids(session, Products.id, [int_values['product']])
+    availableSubcategory = tools._existing_ids(session, Subcategory.id, [int_values['subcategory']])
+
     # selected product available?
     if not int_values['product'] in availableProducts: 
         
@@ -446,7 +461,7 @@ def update(abo_id:int, data:dict, language:str = app.config['DEFAULT_LANGUAGE'],
         }
 
     # add logs
-    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.abo.update', str(locals()))
+    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.abo.update', tools._arguments(update, locals()))
 
     # did all work?
     return {
@@ -459,7 +474,273 @@ def update(abo_id:int, data:dict, language:str = app.config['DEFAULT_LANGUAGE'],
         }
     }
 
-def add(abos:list, language:str = app.config['DEFAULT_LANGUAGE'], tz = app.config['TZ_INFO']) -> dict:
+def update_many(abos:list, language:typing.Union[str, None] = None, tz:typing.Union[str, None] = None) -> dict:
+    """Updates multiple abos at once
+
+    Set based version of 'update()'. The rows are
+    validated together, the referenced ids are
+    looked up with one query per table & all
+    rows are written with one UPDATE statement.
+    Nothing is written if one row is not valid.
+
+    params:
+    -------
+    abos : list
+        The abos to update.
+            Format: [
+                {
+                    'id':int,
+                    'cycle_type':str,
+                    'interval':int,
+                    'product':int,
+                    'quantity':int,
+                    'subcategory':int,
+                    'next_delivery':str(%Y.%m.%d) | None
+                },
+                ...
+            ]
+            Note: If an id is listed more than
+                  once, the last entry is used.
+    language : str | None, optional
+        the language iso code. Needed for the
+        error msg.
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
+    tz : str | None, optional
+        The timezone info.
+        (default is None -> app.config['TZ_INFO'])
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'msg':str,
+            'updated':int
+        }
+    
+    """
+
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+    if tz is None: tz = app.config['TZ_INFO']
+
+    # get language
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
+
+    # get language errorcodes
+    errors = translation['error_codes']
+
+    # check if the list is not empty
+    if not bool(abos): return {'success':False, 'error':errors['noEntry'], 'data':{}}
+
+    # get 'auto.' in different languages
+    auto = translation['html_text']['/management']['management_auto_text']
+
+    #region 'parse input'
+    frame = pd.DataFrame(abos)
+
+    # check columns
+    for col in ['id', 'cycle_type', 'interval', 'product', 'quantity', 'subcategory', 'next_delivery']:
+        if col not in frame.columns: return {
+            'success':False, 
+            'error':errors['missingData'].format(
+                column=translation['column_mapping']['abo'][col]
+            ), 
+            'data':{}
+        }
+
+    # check abo ids (unsaved rows of the page)
+    if (frame['id'].astype(str) == auto).any(): return {
+        'success':False,
+        'error':errors['pageRefresh'],
+        'data':{}
+    }
+
+    # check ints
+    intColumns = ['id', 'product', 'subcategory', 'quantity']
+    invalid = tools._invalid_int(frame, intColumns)
+    if invalid is not None: return {
+        'success':False, 
+        'error':errors['wrongType'].format(
+            var = translation['column_mapping']['abo'][invalid],
+            dtype= translation['type_mapping']['int']
+        ), 
+        'data':{}
+    }
+
+    for col in intColumns: frame[col] = pd.to_numeric(frame[col].astype(str).str.strip()).astype(int)
+
+    # last entry per abo wins
+    frame = frame.drop_duplicates('id', keep='last').reset_index(drop=True)
+
+    # parse cycle type
+    cycleTypes = frame['cycle_type'].astype(object)
+    cycleTypes = cycleTypes.where(~(cycleTypes.isna() | cycleTypes.isin(["None"])), None)
+    hasCycle = cycleTypes.notna()
+
+    # parse interval
+    if tools._invalid_int(frame[hasCycle], ['interval']) is not None: return {
+        'success':False, 
+        'error':errors['wrongType'].format(
+            var = translation['column_mapping']['abo']['interval'],
+            dtype= translation['type_mapping']['int']
+        ), 
+        'data':{}
+    }
+
+    intervals = pd.Series(None, index=frame.index, dtype=object)
+    intervals[hasCycle] = [int(val) for val in pd.to_numeric(frame.loc[hasCycle, 'interval'].astype(str).str.strip())]
+
+    # parse next_delivery
+    nextDeliveries = {}
+    custom = ~(frame['next_delivery'].isna() | frame['next_delivery'].isin(['', 'None', auto]))
+
+    if custom.any():
+
+        # parse from string into datetime
+        parsed = time.series_parse_UI_date(frame.loc[custom, 'next_delivery'], language, tz)
+        if not parsed['success']: return {
+            'success':False,
+            'error':parsed['error'].format(
+                var=translation['column_mapping']['abo']['next_delivery'],
+                format=translation['formats']['birthdate']
+            ),
+            'data':{}
+        }
+
+        nextDeliveries.update(zip(frame.index[custom], parsed['data']['dates'].tolist()))
+
+    # calculate the other next deliveries based on today
+    if (~custom & ~hasCycle).any(): return {
+        'success':False,
+        'error':errors['nextDeliveryMismatch'].format(
+            next_delivery = translation['column_mapping']['abo']['next_delivery'],
+            cycle_type = translation['column_mapping']['abo']['cycle_type'],
+            none = translation['cycle_type_mapping']['None']
+        ),
+        'data':{}
+    }
+
+    if (~custom).any():
+
+        try:
+            calculated = time.calculate_next_deliveries(
+                dates = [time.today()] * int((~custom).sum()),
+                cycle_types = cycleTypes[~custom],
+                intervals = intervals[~custom],
+                language = language
+            )
+        except AssertionError as e: return {'success':False, 'error':str(e), 'data':{}}
+
+        nextDeliveries.update(zip(frame.index[~custom], calculated.dt.to_pydatetime()))
+
+    #endregion
+
+    # create a session
+    session = Session()
+
+    # check the references (one query per table)
+    missingAbos = set(frame['id'].tolist()) - tools._existing_ids(session, Abo.id, frame['id'].tolist())
+    if missingAbos:
+
+        # close session
+        session.close()
+
+        return {
+            'success':False, 
+            'error':errors['notFoundWithId'].format(
+                element=translation['table_mapping']['abo'],
+                id=min(missingAbos)
+            ),
+            'data':{}
+        }
+
+    if not set(frame['product'].tolist()) <= tools._existing_ids(session, Products.id, frame['product'].tolist()):
+
+        # close session
+        session.close()
+
+        return {
+            'success':False,
+            'error':errors['wrongProduct'],
+            'data':{}
+        }
+
+    if not set(frame['subcategory'].tolist()) <= tools._existing_ids(session, Subcategory.id, frame['subcategory'].tolist()):
+
+        # close session
+        session.close()
+
+        return {
+            'success':False,
+            'error':errors['wrongSubcategory'],
+            'data':{}
+        }
+
+    # update (one statement, all rows)
+    updateDate = time.utcnow()
+    rows = [
+        {
+            'abo_id':aboId,
+            'update_date':updateDate,
+            'cycle_type':cycleType,
+            'interval':interval,
+            'next_delivery':nextDelivery,
+            'product':product,
+            'quantity':quantity,
+            'subcategory':subcategory
+        } for aboId, cycleType, interval, nextDelivery, product, quantity, subcategory in zip(
+            frame['id'].tolist(), cycleTypes.tolist(), intervals.tolist(), [nextDeliveries[idx] for idx in frame.index],
+            frame['product'].tolist(), frame['quantity'].tolist(), frame['subcategory'].tolist()
+        )
+    ]
+
+    try:
+        session.execute(Abo.__table__.update().where(Abo.__table__.c.id == bindparam('abo_id')), rows)
+
+        # commit
+        session.commit()
+
+    except Exception as e:
+        code, msg = tools._convert_exception(e)
+
+        # check if sqlite3.IntegrityError -> sql msg
+        if code == "IntegrityError": errorMsg = errors['notUnique'].format(
+                table = translation['table_mapping']['abo'],
+                nonUnique = msg.split("parameters")[-1].split("]")[0].lstrip()
+            )
+
+        # send normal msg
+        else: errorMsg = errors['unableOperation'].format(
+                operation = "update",
+                element = translation['table_mapping']['abo'],
+                c=translation['column_mapping']['abo']['id'] + " : " + ", ".join(str(row['abo_id']) for row in rows),
+                e=str(code),
+                m=str(msg)
+            )
+
+        # close the session
+        session.close()
+
+        return {
+            'success':False,
+            'error':errorMsg,
+            'data':{}
+        }
+
+    # add logs
+    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.abo.update_many', tools._arguments(update_many, locals()))
+
+    return {
+        'success':True,
+        'error':"",
+        'data':{
+            'msg':translation['notification']['update_to_db'].format(
+                element=translation['table_mapping']['abo']
+            ),
+            'updated':len(rows)
+        }
+    }
+
+def add(abos:list, language:typing.Union[str, None] = None, tz:typing.Union[str, None] = None) -> dict:
     """Adds abos to a customer
 
     This function adds one or
@@ -483,13 +764,13 @@ def add(abos:list, language:str = app.config['DEFAULT_LANGUAGE'], tz = app.confi
                 },
                 ...
             ]
-    language : str, optional
+    language : str | None, optional
         The language iso. Needed for the error
         msg.
-        (default is app.config['DEFAULT_LANGUAGE])
-    tz : str, optional
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
+    tz : str | None, optional
         The timezone info.
-        (default is app.config['TZ_INFO'])
+        (default is None -> app.config['TZ_INFO'])
 
     returns:
     --------
@@ -498,9 +779,11 @@ def add(abos:list, language:str = app.config['DEFAULT_LANGUAGE'], tz = app.confi
 
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+    if tz is None: tz = app.config['TZ_INFO']
+
     # get language
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -516,52 +799,50 @@ def add(abos:list, language:str = app.config['DEFAULT_LANGUAGE'], tz = app.confi
     # create session
     session = Session()
 
-    #region 'fetch additional info'
-    # fetch all available products
-    products = pd.read_sql_query(
-        session.query(Products).statement,
-        session.bind
-    )
-
-    # get unique ids
-    availableProducts = products['id'].unique().tolist()
+    #region 'batched validation'
+    # parse the int values of all abos (stops at the first invalid one)
+    intCols = ['customer_id', 'product', 'subcategory', 'quantity']
+    parsed = []
+    for abo in abos:
 
-    # fetch all available subcategories
-    subcategories = pd.read_sql_query(
-        session.query(Subcategory).statement,
-        session.bind
-    )
+        try: parsed.append({val:int(abo[val]) for val in intCols})
+        except ValueError as e: break
 
-    # get unique ids
-    availableSubcategory = subcategories['id'].unique().tolist()
+    # resolve all referenced ids with one query per table
+    availableCustomers = tools._existing_ids(session, Customers.id, [values['customer_id'] for values in parsed])
+    availableProducts = tools._existing_ids(session, Products.id, [values['product'] for values in parsed])
+    availableSubcategory = tools._existing_ids(session, Subcategory.id, [values['subcategory'] for values in parsed])
 
     #endregion
 
+    # get today
+    today = time.today()
+
     # create empty list to store new entries
     toAdd = []
 
     # create the new products
-    for abo in abos:
+    for idx, abo in enumerate(abos):
 
         # parse the int values
-        int_values = {}
-        for val in ['customer_id', 'product', 'subcategory', 'quantity']:
+        if idx < len(parsed): int_values = parsed[idx]
+        else:
+            for val in intCols:
 
-            try: int_values.update({val:int(abo[val])})
-            except ValueError as e: return {
-                'success':False, 
-                'error':errors['wrongType'].format(
-                    var = translation['column_mapping']['abo'][val],
-                    dtype= translation['type_mapping']['int']
-                ), 
-                'data':{}
-            }            
+                try: int(abo[val])
+                except ValueError as e: return {
+                    'success':False, 
+                    'error':errors['wrongType'].format(
+                        var = translation['column_mapping']['abo'][val],
+                        dtype= translation['type_mapping']['int']
+                    ), 
+                    'data':{}
+                }            
 
         try:
 
             # check if customer is available
-            customer = session.query(Customers).filter_by(id = int_values['customer_id']).first()
-            if customer is None: return {
+            if not int_values['customer_id'] in availableCustomers: return {
                 'success':False, 
                 'error':errors['notFoundWithId'].format(
                     element= translation['table_mapping']['customer'],
@@ -596,9 +877,6 @@ def add(abos:list, language:str = app.config['DEFAULT_LANGUAGE'], tz = app.confi
                     'data':{}
                     }
 
-            # get today
-            today = time.today()
-
             # parse cycle type
             cycle_type = abo['cycle_type']
             if cycle_type == "None": cycle_type = None
@@ -729,7 +1007,7 @@ def add(abos:list, language:str = app.config['DEFAULT_LANGUAGE'], tz = app.confi
         }
 
     # add logs
-    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.abo.add', str(locals()))
+    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.abo.add', tools._arguments(add, locals()))
 
     # did all work?
     return {
@@ -742,17 +1020,17 @@ def add(abos:list, language:str = app.config['DEFAULT_LANGUAGE'], tz = app.confi
         }
     }
 
-def delete(abo_id:int, language:str = app.config['DEFAULT_LANGUAGE']) -> dict:
+def delete(abo_id:int, language:typing.Union[str, None] = None) -> dict:
     """Deletes one specific abo
 
     params:
     -------
     abo_id : int
         the abo unique id.
-    language : str, optional
+    language : str | None, optional
         The language iso. Needed for the error
         msg.
-        (default is app.config['DEFAULT_LANGUAGE])
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
     
     returns:
     -------
@@ -761,9 +1039,10 @@ def delete(abo_id:int, language:str = app.config['DEFAULT_LANGUAGE']) -> dict:
     
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
     # get language
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -812,7 +1091,7 @@ def delete(abo_id:int, language:str = app.config['DEFAULT_LANGUAGE']) -> dict:
             }
 
     # add logs
-    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.abo.delete', str(locals()))
+    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.abo.delete', tools._arguments(delete, locals()))
 
     # did all work?
     return {
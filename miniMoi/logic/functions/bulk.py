@@ -5,11 +5,14 @@ Collection of functions to handle bulk imports
 
 # import
 from time import sleep
+import json
+import typing
+import hashlib
 
 import pandas as pd
 
 from miniMoi import app, Session
-from miniMoi.language import language_files
+from miniMoi.language import get_translation, get_derived
 from miniMoi.logic.functions.products import add as products_add
 from miniMoi.logic.functions.categories import add as categories_add
 from miniMoi.logic.functions.customer import add as customer_add
@@ -85,8 +88,8 @@ def _to_excel(df:pd.DataFrame, path:str) -> dict:
         'data':{}
     }
 
-def _load(home:PosixPath , errors:dict, relevant_blueprints:list, file_type:str = "csv") -> dict:
-    """Loads all blueprints from disk
+def _collect(home:PosixPath , errors:dict, relevant_blueprints:list, file_type:str = "csv") -> dict:
+    """Collects the paths of all blueprints on disk
 
     params:
     -------
@@ -105,7 +108,7 @@ def _load(home:PosixPath , errors:dict, relevant_blueprints:list, file_type:str
     -------
     dict
         success, error & data {
-            'loaded':dict
+            'loaded':dict{name:{'path':PosixPath}}
         }
     
     """
@@ -124,14 +127,9 @@ def _load(home:PosixPath , errors:dict, relevant_blueprints:list, file_type:str
         # check if one of the blueprint names is in the filename
         for name in relevant_blueprints:
 
-            #print(name+"_blueprint")
-            #print(str(path).split("/"))
-
             if name + "_blueprint." + file_type == path.name: 
                 
-                # load the dataframe
-                if file_type == "xlsx": loaded.update({name: {'file':pd.read_excel(str(path)), 'path':path}})
-                else: loaded.update({name: {'file':pd.read_csv(str(path), sep=";"), 'path':path}})
+                loaded.update({name: {'path':path}})
                 break
 
     # check if there is at least one file
@@ -150,6 +148,375 @@ def _load(home:PosixPath , errors:dict, relevant_blueprints:list, file_type:str
         }
     }
 
+def _load(home:PosixPath , errors:dict, relevant_blueprints:list, file_type:str = "csv") -> dict:
+    """Loads all blueprints from disk
+
+    params:
+    -------
+    home : PosixPath
+        The posixpath to load from.
+    errors : dict
+        The language file error dict.
+    relevant_blueprints : list
+        List containing the names of the tables
+        in the app language.
+    file_type : str, optional
+        The file type to search for.
+        (default is 'csv')
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'loaded':dict
+        }
+    
+    """
+
+    collected = _collect(home, errors, relevant_blueprints, file_type)
+    if not collected['success']: return collected
+
+    loaded = {}
+    for name, blueprint in collected['data']['loaded'].items():
+
+        # load the dataframe
+        path = blueprint['path']
+        if file_type == "xlsx": loaded.update({name: {'file':pd.read_excel(str(path)), 'path':path}})
+        else: loaded.update({name: {'file':pd.read_csv(str(path), sep=";"), 'path':path}})
+
+    # did all work?
+    return {
+        'success':True,
+        'error':"",
+        'data':{
+            'loaded':loaded
+        }
+    }
+
+def _read_chunks(path:PosixPath, file_type:str, chunk_size:int) -> typing.Iterator[pd.DataFrame]:
+    """Reads the blueprint chunk by chunk
+
+    Only one chunk is held in memory at
+    a time.
+
+    params:
+    -------
+    path : PosixPath
+        The blueprint to read.
+    file_type : str
+        The file type.
+            Options: {'xlsx', 'csv'}
+    chunk_size : int
+        The number of rows per chunk.
+
+    returns:
+    --------
+    Iterator[pd.DataFrame]
+
+    """
+
+    if file_type == "csv":
+
+        for chunk in pd.read_csv(str(path), sep=";", chunksize=chunk_size): yield chunk
+
+        return
+
+    # xlsx -> stream the rows with openpyxl
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(str(path), read_only=True, data_only=True)
+    try:
+
+        rows = workbook.active.iter_rows(values_only=True)
+
+        # first row holds the column names
+        columns = next(rows, None)
+        if columns is None: return
+
+        chunk = []
+        for row in rows:
+
+            # skip completely empty rows (like pd.read_excel)
+            if all(val is None for val in row): continue
+
+            chunk.append(row)
+
+            if len(chunk) == chunk_size:
+
+                yield pd.DataFrame(chunk, columns=columns)
+                chunk = []
+
+        if chunk: yield pd.DataFrame(chunk, columns=columns)
+
+    finally: workbook.close()
+
+def _progress_path(path:PosixPath) -> PosixPath:
+    """Returns the path of the import progress file """
+
+    return path.with_name(path.name + ".progress.json")
+
+def _chunk_hash(chunk:pd.DataFrame) -> str:
+    """Returns the content hash of a chunk (columns & values) """
+
+    digest = hashlib.sha256(json.dumps([str(col) for col in chunk.columns]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(chunk, index=False).to_numpy().tobytes())
+
+    return digest.hexdigest()
+
+def _read_progress(path:PosixPath, chunk_size:int) -> dict:
+    """Reads the import progress of a blueprint
+
+    params:
+    -------
+    path : PosixPath
+        The blueprint path.
+    chunk_size : int
+        The chunk size to use if there is
+        no progress yet.
+
+    returns:
+    --------
+    dict
+        {
+            'chunk_size':int,
+            'done':dict{int:str} # -> chunk idx:content hash
+        }
+        CAUTION: A previous run dictates the
+        chunk size, otherwise the chunk indices
+        would not match.
+
+    """
+
+    try:
+        with open(str(_progress_path(path)), "r") as file: progress = json.loads(file.read())
+
+        # progress files without hashes can not be verified
+        done = progress['done']
+        if not isinstance(done, dict): done = {idx:None for idx in done}
+
+        return {'chunk_size':int(progress['chunk_size']), 'done':{int(idx):digest for idx, digest in done.items()}}
+
+    except: return {'chunk_size':chunk_size, 'done':{}}
+
+def _write_progress(path:PosixPath, progress:dict) -> None:
+    """Saves the import progress of a blueprint """
+
+    with open(str(_progress_path(path)), "w") as file: json.dump(progress, file)
+
+def _prepare(file:str, tmp:pd.DataFrame, session, derived:dict, errors:dict, cache:dict) -> dict:
+    """Converts the blueprint rows into the add format
+
+    Renames the columns to the official names and
+    replaces the names of the related elements with
+    their ids.
+
+    params:
+    -------
+    file : str
+        The official table name.
+            Options: { 'customers', 'category'
+                       'subcategory', 'products',
+                       'abo' }
+    tmp : pd.DataFrame
+        The blueprint rows. Gets modified inplace.
+    session : sqlAlchemy session object
+        Session to query the related elements.
+    derived : dict
+        The derived language structures.
+    errors : dict
+        The language file error dict.
+    cache : dict
+        Keeps the queried name -> id mappings
+        (e.g. between chunks of the same file).
+
+    returns:
+    --------
+    dict
+        success, error & data {
+            'df':pd.DataFrame
+        }
+
+    """
+
+    # rename the columns to the official names
+    if file == "category" or file == "subcategory": official = derived['reverse_column_mapping']['categories']
+    else: official = derived['reverse_column_mapping'][file]
+    tmp.rename(columns = official, inplace=True)
+
+    if file == "products": 
+
+        # query the Categories from the table
+        if 'category' not in cache:
+            categoryMapping = pd.read_sql_query(session.query(models.Category).statement, session.connection())
+            cache['category'] = {row['name']:row['id'] for i, row in categoryMapping.iterrows()}
+
+        # turn tmp category into strings & replace it with the mapping
+        try: tmp.loc[:, 'category'] = tmp.loc[:, 'category'].astype(str).replace(cache['category']).astype(int)
+        except Exception as e:
+            code, msg = tools._convert_exception(e)
+
+            return {
+                'success':False,
+                'error':file + ": " + errors['wrongProduct'] + ": {msg}".format(msg=msg),
+                'data':{}
+            }
+
+    elif file == "abo": 
+
+        #region 'clean tmp'
+        # query for products and subcategories
+        if 'products' not in cache:
+            productsMapping = pd.read_sql_query(session.query(models.Products).statement, session.connection())
+            cache['products'] = {row['name']:row['id'] for i, row in productsMapping.iterrows()}
+
+        if 'subcategory' not in cache:
+            subcatMapping = pd.read_sql_query(session.query(models.Subcategory).statement, session.connection())
+            cache['subcategory'] = {row['name']:row['id'] for i, row in subcatMapping.iterrows()}
+
+        # parse weekday-mapping & cycle type mapping
+        weekdayMapping = derived['reverse_weekday_mapping']
+        cycleMapping = derived['reverse_cycle_type_mapping']
+
+        # replace the names with the ids
+        tmp.loc[:, 'product'] = tmp.loc[:, 'product'].astype(str).replace(cache['products']).astype(int)
+        tmp.loc[:, 'subcategory'] = tmp.loc[:, 'subcategory'].astype(str).replace(cache['subcategory']).astype(int)
+        tmp.loc[:, 'cycle_type'] = tmp.loc[:, 'cycle_type'].fillna("None").astype(str).replace(cycleMapping)
+
+        # replace integers at positions of 'cycle_type == day' with the int
+        tmp.loc[tmp['cycle_type'] == "day", 'interval'] = tmp.loc[tmp['cycle_type'] == "day", 'interval'].astype(str).replace(weekdayMapping)
+
+        # fill missing values in 'next_delivery' to "None"
+        tmp.loc[:, 'next_delivery'] = tmp.loc[:, 'next_delivery'].fillna("None")
+        
+        #endregion
+
+    return {'success':True, 'error':"", 'data':{'df':tmp}}
+
+def _add(file:str, records:list) -> dict:
+    """Adds the records with the matching add function """
+
+    if file == "customers": return customer_add(records)
+    elif file == "category": return categories_add(records, "category")
+    elif file == "subcategory": return categories_add(records, "subcategory")
+    elif file == "products": return products_add(records)
+    
+    return abo_add(records)
+
+def _stream(
+        file:str, 
+        path:PosixPath, 
+        file_type:str, 
+        chunk_size:int, 
+        session, 
+        derived:dict, 
+        errors:dict
+    ) -> dict:
+    """Imports one blueprint chunk by chunk
+
+    Every chunk gets validated and committed
+    on its own (by the add function). The
+    committed chunks (index & content hash) are
+    saved to a progress file next to the
+    blueprint, so a rerun only imports the
+    missing chunks. If a committed chunk was
+    changed since, the rerun is refused.
+
+    params:
+    -------
+    file : str
+        The official table name.
+    path : PosixPath
+        The blueprint path.
+    file_type : str
+        The file type.
+            Options: {'xlsx', 'csv'}
+    chunk_size : int
+        The number of rows per chunk.
+    session : sqlAlchemy session object
+        Session to query the related elements.
+    derived : dict
+        The derived language structures.
+    errors : dict
+        The language file error dict.
+
+    returns:
+    --------
+    dict
+        {
+            'chunks':[{
+                'chunk':int,
+                'rows':int,
+                'success':bool,
+                'skipped':bool,
+                'error':str
+            }, ...],
+            'success_chunks':int,
+            'failure_chunks':int,
+            'success_rows':int,
+            'failure_rows':int,
+            'error':str # -> the refused resume
+        }
+
+    """
+
+    # resume?
+    progress = _read_progress(path, chunk_size)
+    done = progress['done']
+
+    # the committed chunks must be unchanged, otherwise the
+    # chunk indices point to other rows (-> duplicates)
+    if len(done) > 0:
+
+        hashes = {
+            idx:_chunk_hash(tmp) for idx, tmp in enumerate(_read_chunks(path, file_type, progress['chunk_size'])) if idx in done
+        }
+
+        if hashes != done: return {
+            'chunks':[],
+            'success_chunks':0,
+            'failure_chunks':0,
+            'success_rows':0,
+            'failure_rows':0,
+            'error':errors['bulkChanged'].format(progress=_progress_path(path).name)
+        }
+
+    cache = {}
+    chunks = []
+    for idx, tmp in enumerate(_read_chunks(path, file_type, progress['chunk_size'])):
+
+        # hash of the raw chunk (before it gets prepared)
+        digest = _chunk_hash(tmp)
+
+        # already committed in a previous run
+        if idx in done:
+            chunks.append({'chunk':idx, 'rows':len(tmp), 'success':True, 'skipped':True, 'error':""})
+            continue
+
+        result = _prepare(file, tmp, session, derived, errors, cache)
+        if result['success']: result = _add(file, result['data']['df'].to_dict('records'))
+
+        chunks.append({
+            'chunk':idx, 
+            'rows':len(tmp), 
+            'success':bool(result['success']), 
+            'skipped':False, 
+            'error':"" if result['success'] else str(result['error'])
+        })
+
+        # save progress after each commit
+        if result['success']:
+            done[idx] = digest
+            _write_progress(path, {'chunk_size':progress['chunk_size'], 'done':{str(key):done[key] for key in sorted(done)}})
+
+    return {
+        'chunks':chunks,
+        'success_chunks':sum(1 for chunk in chunks if chunk['success']),
+        'failure_chunks':sum(1 for chunk in chunks if not chunk['success']),
+        'success_rows':sum(chunk['rows'] for chunk in chunks if chunk['success']),
+        'failure_rows':sum(chunk['rows'] for chunk in chunks if not chunk['success']),
+        'error':""
+    }
+
 #endregion
 
 #region 'public functions'
@@ -181,8 +548,7 @@ def create_blueprint(blueprint:str, file_type:str="csv") -> dict:
     """
 
     # get language files
-    try: translation = language_files[app.config['DEFAULT_LANGUAGE']]
-    except: translation = language_files['EN']
+    translation = get_translation(app.config['DEFAULT_LANGUAGE'])
 
     # get errors
     errors = translation['error_codes']
@@ -221,7 +587,7 @@ def create_blueprint(blueprint:str, file_type:str="csv") -> dict:
         'data':{}
         }
 
-    df = pd.read_sql_query(statement.statement, session.bind)
+    df = pd.read_sql_query(statement.statement, session.connection())
 
     #endregion
 
@@ -260,12 +626,19 @@ def create_blueprint(blueprint:str, file_type:str="csv") -> dict:
         }
     }
 
-def update(file_type:str="csv") ->dict:
+def update(file_type:str="csv", chunk_size:typing.Union[int, None] = None) ->dict:
     """Reads all blueprints and updates the tables
     
     This function reads all tables in the
     directory '~/mini-moi/blueprints'
-    and updates the tables
+    and updates the tables.
+
+    If 'chunk_size' is passed, the blueprints
+    are streamed: each chunk is validated and
+    committed on its own and the progress is
+    saved next to the blueprint. A blueprint
+    gets only deleted if all its chunks are
+    imported, a rerun imports the missing ones.
     
     params:
     -------
@@ -273,19 +646,30 @@ def update(file_type:str="csv") ->dict:
         The file type to save to.
         (default is 'csv')
             Options: {'xlsx', 'csv'}
+    chunk_size : int | None, optional
+        The rows per chunk. If None, every
+        blueprint is imported at once.
+        (default is None)
 
     returns:
     -------
     dict
         success, error & data {
-            'msg':str
+            'msg':str,
+            'report':{name:{ -> only if chunk_size
+                'chunks':list[dict],
+                'success_chunks':int,
+                'failure_chunks':int,
+                'success_rows':int,
+                'failure_rows':int
+            }}
         }
 
     """
 
     # get language files
-    try: translation = language_files[app.config['DEFAULT_LANGUAGE'] ]
-    except: translation = language_files["EN"]
+    translation = get_translation(app.config['DEFAULT_LANGUAGE'])
+    derived = get_derived(app.config['DEFAULT_LANGUAGE'])
 
     # get errors
     errors = translation['error_codes']
@@ -297,8 +681,9 @@ def update(file_type:str="csv") ->dict:
     originalNames = ["customers", "category", "subcategory", "products", "abo"]
     tablenames = [translation['table_mapping'][name] for name in originalNames]
 
-    # load files & convert it to dfs
-    loaded = _load(home, errors, tablenames, file_type)
+    # load files & convert it to dfs (or only collect them for streaming)
+    if chunk_size is None: loaded = _load(home, errors, tablenames, file_type)
+    else: loaded = _collect(home, errors, tablenames, file_type)
     if not loaded['success']: return loaded
     loaded = loaded['data']['loaded']
 
@@ -313,6 +698,7 @@ def update(file_type:str="csv") ->dict:
         'success':[],
         'failure':[]
     }
+    report = {}
 
     for file in originalNames:
 
@@ -335,94 +721,71 @@ def update(file_type:str="csv") ->dict:
 
         # try to grab the file. if not available skip to the next
         # Caution: has to be the translated name!
-        try: tmp = loaded[translatedFileName]['file']
+        try: blueprint = loaded[translatedFileName]
         except: continue
 
         print("File found")
 
-        # is the file empty?
-        if tmp.empty:
-            
-            # add to failure
-            update_progress['failure'].append(translatedFileName + " " + translation['notification']['is_empty'])
-
-            # jump to the next
-            continue
-
-        #region 'parse data'
-        # run process depending on name
-        if file == "customers": 
-        
-            # rename the columns to the official names
-            official = {value:key for key, value in translation['column_mapping']['customers'].items()}
-            tmp.rename(columns = official, inplace=True)
-
-            result = customer_add(tmp.to_dict('records'))
-
-        elif file == "category" or file == "subcategory": 
+        #region 'streaming'
+        if chunk_size is not None:
 
-            # rename the columns to the official names
-            official = {value:key for key, value in translation['column_mapping']['categories'].items()}
-            tmp.rename(columns = official, inplace=True)
+            result = _stream(file, blueprint['path'], file_type, chunk_size, session, derived, errors)
+            report[translatedFileName] = result
 
-            if file == "category": result = categories_add(tmp.to_dict('records'), "category")
-            else: result = categories_add(tmp.to_dict('records'), "subcategory")
-        
-        elif file == "products": 
+            # resume refused (blueprint & progress are kept)
+            if result['error']:
+                update_progress['failure'].append(translatedFileName + ":" + result['error'])
+                continue
 
-            # rename the columns to the official names
-            official = {value:key for key, value in translation['column_mapping']['products'].items()}
-            tmp.rename(columns = official, inplace=True)
+            summary = translation['notification']['bulkChunks'].format(
+                name = translatedFileName,
+                success = result['success_chunks'],
+                chunks = len(result['chunks']),
+                rows = result['success_rows']
+            )
 
-            # create session & query the Categories from the table
-            categoryMapping = pd.read_sql_query(session.query(models.Category).statement, session.bind)
-            categoryMapping = {row['name']:row['id'] for i, row in categoryMapping.iterrows()}
+            # is the file empty?
+            if len(result['chunks']) == 0: 
+                update_progress['failure'].append(translatedFileName + " " + translation['notification']['is_empty'])
 
-            # turn tmp category into strings & replace it with the mapping
-            try: tmp.loc[:, 'category'] = tmp.loc[:, 'category'].astype(str).replace(categoryMapping).astype(int)
-            except Exception as e:
-                code, msg = tools._convert_exception(e)
+            # all chunks imported?
+            elif result['failure_chunks'] == 0:
 
-                update_progress['failure'].append(
-                    file + ": " + errors['wrongProduct'] + ": {msg}".format(msg=msg)
-                )
+                update_progress['success'].append(summary)
 
-                continue
+                # unlink
+                _unlink(blueprint['path'])
+                if _progress_path(blueprint['path']).is_file(): _unlink(_progress_path(blueprint['path']))
+            
+            else: update_progress['failure'].append(summary + ":" + next(
+                chunk['error'] for chunk in result['chunks'] if not chunk['success']
+            ))
 
-            result = products_add(loaded[translatedFileName]['file'].to_dict('records'))
+            continue
 
-        elif file == "abo": 
+        #endregion
 
-            # rename the columns to the official names
-            official = {value:key for key, value in translation['column_mapping']['abo'].items()}
-            tmp.rename(columns = official, inplace=True)
+        tmp = blueprint['file']
 
-            #region 'clean tmp'
-            # query for products and subcategories
-            productsMapping = pd.read_sql_query(session.query(models.Products).statement, session.bind)
-            productsMapping = {row['name']:row['id'] for i, row in productsMapping.iterrows()}
+        # is the file empty?
+        if tmp.empty:
+            
+            # add to failure
+            update_progress['failure'].append(translatedFileName + " " + translation['notification']['is_empty'])
 
-            subcatMapping = pd.read_sql_query(session.query(models.Subcategory).statement, session.bind)
-            subcatMapping = {row['name']:row['id'] for i, row in subcatMapping.iterrows()}
+            # jump to the next
+            continue
 
-            # parse weekday-mapping & cycle type mapping
-            weekdayMapping = {value:key for key, value in translation['weekday_mapping'].items()}
-            cycleMapping = {value:key for key, value in translation['cycle_type_mapping'].items()}
+        #region 'parse data'
+        # run process depending on name
+        result = _prepare(file, tmp, session, derived, errors, {})
+        if not result['success']:
 
-            # replace the names with the ids
-            tmp.loc[:, 'product'] = tmp.loc[:, 'product'].astype(str).replace(productsMapping).astype(int)
-            tmp.loc[:, 'subcategory'] = tmp.loc[:, 'subcategory'].astype(str).replace(subcatMapping).astype(int)
-            tmp.loc[:, 'cycle_type'] = tmp.loc[:, 'cycle_type'].fillna("None").astype(str).replace(cycleMapping)
+            update_progress['failure'].append(result['error'])
 
-            # replace integers at positions of 'cycle_type == day' with the int
-            tmp.loc[tmp['cycle_type'] == "day", 'interval'] = tmp.loc[tmp['cycle_type'] == "day", 'interval'].astype(str).replace(weekdayMapping)
+            continue
 
-            # fill missing values in 'next_delivery' to "None"
-            tmp.loc[:, 'next_delivery'] = tmp.loc[:, 'next_delivery'].fillna("None")
-            
-            #endregion
-            
-            result = abo_add(loaded[translatedFileName]['file'].to_dict('records'))
+        result = _add(file, result['data']['df'].to_dict('records'))
 
         print("WORKED THROUGH IT, success?", result['success'])
 
@@ -435,7 +798,7 @@ def update(file_type:str="csv") ->dict:
             update_progress['success'].append(translatedFileName)
 
             # unlink
-            _unlink(loaded[translatedFileName]['path'])
+            _unlink(blueprint['path'])
 
         else: 
             print(result['error'])
@@ -445,7 +808,7 @@ def update(file_type:str="csv") ->dict:
 
 
     # send overview
-    return {
+    response = {
         'success':True,
         'error':"",
         'data':{
@@ -456,6 +819,10 @@ def update(file_type:str="csv") ->dict:
         }
     }
 
+    if chunk_size is not None: response['data']['report'] = report
+
+    return response
+
 
 
 #endregion
@@ -12,8 +12,8 @@ more general approach for both of them.
 import typing
 
 from miniMoi import Session, app
-from miniMoi.models.Models import Category, Subcategory
-from miniMoi.language import language_files
+from miniMoi.models.Models import Category, Subcategory, Abo
+from miniMoi.language import get_translation
 from miniMoi.logic.helpers import tools
 
 # mapper
@@ -26,7 +26,7 @@ mapper = {
 def get(
         category_type:str = "category", 
         amount:typing.Union[int, None] = None, 
-        language:str = app.config['DEFAULT_LANGUAGE']
+        language:typing.Union[str, None] = None
     ) -> dict:
     """Gets all product categories/subcategories
 
@@ -46,10 +46,10 @@ def get(
     amount : int | None, optional
         The number of entries to query.
         (default is None).
-    language : str, optional
+    language : str | None, optional
         the language iso code. Needed for the
         error msg.
-        (default is app.config['DEFAULT_LANGUAGE])
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
 
     returns:
     -------
@@ -67,9 +67,10 @@ def get(
 
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
     # get language files
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -126,7 +127,7 @@ def update(
         category_id:int,
         name:str,
         category_type:str = "category", 
-        language:str = app.config['DEFAULT_LANGUAGE']
+        language:typing.Union[str, None] = None
     ) -> dict:
     """Updates a single (sub-) category
 
@@ -144,10 +145,10 @@ def update(
                             table.
                 'subcategory': Queries the Sub-
                                category table.
-    language : str, optional
+    language : str | None, optional
         the language iso code. Needed for the
         error msg.
-        (default is app.config['DEFAULT_LANGUAGE])
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
 
     returns:
     -------
@@ -156,9 +157,10 @@ def update(
     
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
     # get language
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -228,7 +230,7 @@ def update(
         }
 
     # add logs
-    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.categories.update', str(locals()))
+    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.categories.update', tools._arguments(update, locals()))
 
     # did all work?
     return {
@@ -237,7 +239,7 @@ def update(
         'data':{}
     }
 
-def add(categories:list, category_type:str = "category", language:str = app.config['DEFAULT_LANGUAGE']) -> dict:
+def add(categories:list, category_type:str = "category", language:typing.Union[str, None] = None) -> dict:
     """Adds categories to the db
 
     The add function either adds only one
@@ -261,10 +263,10 @@ def add(categories:list, category_type:str = "category", language:str = app.conf
                             table.
                 'subcategory': Queries the Sub-
                                category table.
-    language : str, optional
+    language : str | None, optional
         The language iso. Needed for the error
         msg.
-        (default is app.config['DEFAULT_LANGUAGE])
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
 
     returns:
     --------
@@ -273,9 +275,10 @@ def add(categories:list, category_type:str = "category", language:str = app.conf
 
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
     # get language
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -351,7 +354,7 @@ def add(categories:list, category_type:str = "category", language:str = app.conf
         }
 
     # add logs
-    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.categories.add', str(locals()))
+    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.categories.add', tools._arguments(add, locals()))
 
     # did all work?
     return {
@@ -364,7 +367,7 @@ def add(categories:list, category_type:str = "category", language:str = app.conf
         }
     }
 
-def delete(category_id:int, category_type:str = "category", language:str = app.config['DEFAULT_LANGUAGE']) -> dict:
+def delete(category_id:int, category_type:str = "category", language:typing.Union[str, None] = None) -> dict:
     """Deletes a category
 
     params:
@@ -379,10 +382,10 @@ def delete(category_id:int, category_type:str = "category", language:str = app.c
                             table.
                 'subcategory': Queries the Sub-
                                category table.
-    language : str, optional
+    language : str | None, optional
         The language iso. Needed for the error
         msg.
-        (default is app.config['DEFAULT_LANGUAGE])
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
     
     returns:
     -------
@@ -391,9 +394,10 @@ def delete(category_id:int, category_type:str = "category", language:str = app.c
 
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
     # get language
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -430,6 +434,11 @@ def delete(category_id:int, category_type:str = "category", language:str = app.c
         }
     
     try:
+        # abos fall back to the default subcategory
+        # (same as 'ondelete=SET DEFAULT', also if the backend does not enforce it)
+        if category_type == "subcategory":
+            session.query(Abo).filter(Abo.subcategory == categoryId).update({'subcategory':0}, synchronize_session=False)
+
         # delete it
         session.delete(category)
 
@@ -452,7 +461,7 @@ def delete(category_id:int, category_type:str = "category", language:str = app.c
             }
 
     # add logs
-    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.categories.delete', str(locals()))
+    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.categories.delete', tools._arguments(delete, locals()))
 
     # did all work?
     return {
@@ -7,11 +7,13 @@ related to the customer.
 # imports
 import datetime
 import typing
-import copy
+
+import pandas as pd
+from sqlalchemy import bindparam
 
 from miniMoi import Session, app
 from miniMoi.models.Models import Customers
-from miniMoi.language import language_files
+from miniMoi.language import get_translation
 from miniMoi.logic.helpers import tools
 import miniMoi.logic.helpers.time_module as time
 
@@ -21,8 +23,10 @@ def get(
         filter_type:typing.Union[str, None], 
         what:typing.Union[str, None],
         amount:typing.Union[int, None] = None,
-        language:str = app.config['DEFAULT_LANGUAGE'],
-        tz:str = app.config['TZ_INFO']
+        page_size:typing.Union[int, None] = None,
+        cursor:typing.Union[int, None] = None,
+        language:typing.Union[str, None] = None,
+        tz:typing.Union[str, None] = None
     ) -> dict:
     """Returns the requested customers
 
@@ -45,13 +49,21 @@ def get(
     amount : int | None, optional
         The number of entries to query.
         (default is None).
-    language : str, optional
+    page_size : int | None, optional
+        The max. number of entries per page.
+        If None, all entries are returned.
+        (default is None)
+    cursor : int | None, optional
+        The 'next_cursor' of the previous page
+        (the last id on it).
+        (default is None)
+    language : str | None, optional
         the language iso code. Needed for the
         error msg.
-        (default is app.config['DEFAULT_LANGUAGE])
-    tz : str, optional
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
+    tz : str | None, optional
         The timezone info.
-        (default is app.config['TZ_INFO'])
+        (default is None -> app.config['TZ_INFO'])
 
     returns:
     --------
@@ -76,14 +88,22 @@ def get(
                 ...
             ],
             'order':[],
-            'mapping':[]
+            'mapping':[],
+            'pagination':{
+                'page_size':int | None,
+                'cursor':int | None,
+                'next_cursor':int | None,
+                'total':int
+            }
         }
 
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+    if tz is None: tz = app.config['TZ_INFO']
+
     # get language files
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -120,21 +140,18 @@ def get(
     # filter by customer surname?
     elif filter_type == "customer" and what is not None: 
         
-        result = session.query(Customers).filter_by(surname = what)
+        result = session.query(Customers).filter_by(surname = str(what)) # -> strict types (e.g. postgresql)
 
     # filter by town
     elif filter_type == "town":
 
-        result = session.query(Customers).filter_by(town = what)
+        result = session.query(Customers).filter_by(town = str(what))
 
     # else return error
     else: return {'success':False, 'error':errors['unknownFilter'], 'data':{}}
 
     #endregion
 
-    # limit the amount?
-    if amount is not None: result = result.limit(amount)
-
     #region 'create empty result return'
     intendedOrder = [
             'id', 'date', 'name', 'surname', 'street',
@@ -152,31 +169,35 @@ def get(
 
     #endregion
 
+    # fetch the page
+    rows, pagination = tools._paginate(result, Customers.id, page_size, cursor, amount)
+    emptyResult.update({'pagination':pagination})
+
     # result is None?
-    if result.first() is None: return{'success':True, 'error':"", 'data':emptyResult}
+    if len(rows) == 0: return{'success':True, 'error':"", 'data':emptyResult}
+
+    # convert the timestamps in one go
+    converted = {
+        col:time.series_to_string(
+            time.series_utc_to_local(pd.Series([getattr(row, col) for row in rows], dtype=object), tz),
+            strFormat
+            ).tolist() for col, strFormat in [("date", "%Y.%m.%d %H:%M"), ("birthdate", "%Y.%m.%d")]
+    }
 
     # turn into list
     fetched = []
-    for row in result.all():
+    for i, row in enumerate(rows):
 
         tmp = {}
 
         for col in row.__table__.columns:
 
-            # convert timestamp
-            if col.name == "date": tmp[col.name] = time.to_string(
-                time.utc_to_local(getattr(row, col.name), tz),
-                "%Y.%m.%d %H:%M"
-                )
-            
-            elif col.name == "birthdate": tmp[col.name] = time.to_string(
-                time.utc_to_local(getattr(row, col.name), tz),
-                "%Y.%m.%d"
-                )
+            # converted timestamp?
+            if col.name in converted: tmp[col.name] = converted[col.name][i]
             
             else: tmp[col.name] = getattr(row, col.name)
 
-        fetched.append(copy.deepcopy(tmp))
+        fetched.append(tmp)
 
     if len(fetched) == 0: return{'success':True, 'error':"", 'data':emptyResult}
 
@@ -190,7 +211,7 @@ def get(
         'data':emptyResult
     }
 
-def update(customer_id:int, data:dict, language:str = app.config['DEFAULT_LANGUAGE'], tz = app.config['TZ_INFO']) -> dict:
+def update(customer_id:int, data:dict, language:typing.Union[str, None] = None, tz:typing.Union[str, None] = None) -> dict:
     """Updates a single customer
 
     params:
@@ -212,13 +233,13 @@ def update(customer_id:int, data:dict, language:str = app.config['DEFAULT_LANGUA
                 'birthdate':str("%Y.%m.%d)
                 'notes':str
             }
-    language : str, optional
+    language : str | None, optional
         the language iso code. Needed for the
         error msg.
-        (default is app.config['DEFAULT_LANGUAGE])
-    tz : str, optional
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
+    tz : str | None, optional
         The timezone info
-        (default is app.config['TZ_INFO'])
+        (default is None -> app.config['TZ_INFO'])
 
     returns:
     -------
@@ -229,9 +250,11 @@ def update(customer_id:int, data:dict, language:str = app.config['DEFAULT_LANGUA
     
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+    if tz is None: tz = app.config['TZ_INFO']
+
     # get language
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -336,7 +359,7 @@ def update(customer_id:int, data:dict, language:str = app.config['DEFAULT_LANGUA
         }
 
     # add logs
-    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.customer.update', str(locals()))
+    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.customer.update', tools._arguments(update, locals()))
 
     # did all work?
     return {
@@ -349,7 +372,199 @@ def update(customer_id:int, data:dict, language:str = app.config['DEFAULT_LANGUA
         }
     }
 
-def add(customers:list, language:str = app.config['DEFAULT_LANGUAGE'], tz = app.config['TZ_INFO']) -> dict:
+def update_many(customers:list, language:typing.Union[str, None] = None, tz:typing.Union[str, None] = None) -> dict:
+    """Updates multiple customers at once
+
+    Set based version of 'update()'. The rows are
+    validated together, the ids are looked up with
+    one query & all rows are written with one
+    UPDATE statement. Nothing is written if one
+    row is not valid.
+
+    params:
+    -------
+    customers : list
+        The customers to update.
+            Format: [
+                {
+                    'id':int,
+                    'name':str,
+                    'surname':str,
+                    'street':str,
+                    'nr':int,
+                    'postal':str,
+                    'town':str,
+                    'phone':str,
+                    'mobile':str,
+                    'approach':int,
+                    'birthdate':str("%Y.%m.%d)
+                },
+                ...
+            ]
+            Note: If an id is listed more than
+                  once, the last entry is used.
+    language : str | None, optional
+        the language iso code. Needed for the
+        error msg.
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
+    tz : str | None, optional
+        The timezone info
+        (default is None -> app.config['TZ_INFO'])
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'msg':str,
+            'updated':int
+        }
+    
+    """
+
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+    if tz is None: tz = app.config['TZ_INFO']
+
+    # get language
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
+
+    # get language errorcodes
+    errors = translation['error_codes']
+
+    # check if the list is not empty
+    if not bool(customers): return {'success':False, 'error':errors['noEntry'], 'data':{}}
+
+    #region 'parse input'
+    frame = pd.DataFrame(customers)
+
+    # check columns
+    strColumns = ['name', 'surname', 'street', 'postal', 'town', 'phone', 'mobile']
+    for col in ['id', 'nr', 'approach', 'birthdate', *strColumns]:
+        if col not in frame.columns: return {
+            'success':False, 
+            'error':errors['missingData'].format(
+                column=translation['column_mapping']['customers'][col]
+            ), 
+            'data':{}
+        }
+
+    # check ids (unsaved rows of the page)
+    if (frame['id'].astype(str) == translation['html_text']['/management']['management_auto_text']).any(): return {
+        'success':False,
+        'error':errors['pageRefresh'],
+        'data':{}
+    }
+
+    # check ints
+    invalid = tools._invalid_int(frame, ['id', 'nr', 'approach'])
+    if invalid is not None: return {'success':False, 'error':errors['wrongType'].format(
+        var = translation['column_mapping']['customers'][invalid],
+        dtype= translation['type_mapping']['int']
+    ), 'data':{}}
+
+    for col in ['id', 'nr', 'approach']: frame[col] = pd.to_numeric(frame[col].astype(str).str.strip()).astype(int)
+    for col in strColumns: frame[col] = frame[col].astype(str)
+
+    # last entry per customer wins
+    frame = frame.drop_duplicates('id', keep='last').reset_index(drop=True)
+
+    # parse birthdate
+    birthdates = {}
+    given = frame['birthdate'] != ""
+
+    if given.any():
+
+        parsed = time.series_parse_UI_date(frame.loc[given, 'birthdate'], language, tz)
+        if not parsed['success']: return {
+            'success':False,
+            'error':parsed['error'].format(
+                var=translation['column_mapping']['customers']['birthdate'],
+                format=translation['formats']['birthdate']
+            ),
+            'data':{}
+        }
+
+        birthdates = dict(zip(frame.index[given], parsed['data']['dates'].tolist()))
+
+    #endregion
+
+    # create a session
+    session = Session()
+
+    # check the ids (one query)
+    missing = set(frame['id'].tolist()) - tools._existing_ids(session, Customers.id, frame['id'].tolist())
+    if missing:
+
+        # close session & return error
+        session.close()
+
+        return {
+            'success':False, 
+            'error':errors['notFoundWithId'].format(
+                element=translation['table_mapping']['customer'],
+                id=min(missing)
+            ), 
+            'data':{}
+        }
+
+    # update (one statement, all rows)
+    rows = frame[['id', 'nr', 'approach', *strColumns]].rename(columns={'id':"customer_id"}).to_dict('records')
+    for row, birthdate in zip(rows, [birthdates.get(idx) for idx in frame.index]):
+        row.update({
+            'customer_id':int(row['customer_id']),
+            'nr':int(row['nr']),
+            'approach':int(row['approach']),
+            'birthdate':birthdate
+        })
+
+    try:
+        session.execute(Customers.__table__.update().where(Customers.__table__.c.id == bindparam('customer_id')), rows)
+
+        # commit
+        session.commit()
+
+    except Exception as e:
+
+        code, msg = tools._convert_exception(e)
+
+        # check if sqlite3.IntegrityError -> sql msg
+        if code == "IntegrityError": errorMsg = errors['notUnique'].format(
+                table = translation['table_mapping']['customer'],
+                nonUnique = msg.split("parameters")[-1].split("]")[0].lstrip()
+            )
+
+        # send normal msg
+        else: errorMsg = errors['unableOperation'].format(
+                operation = "update",
+                element = translation['table_mapping']['customer'],
+                c=translation['column_mapping']['customers']['id'] + " : " + ", ".join(str(row['customer_id']) for row in rows),
+                e=str(code),
+                m=str(msg)
+            )
+
+        # close the session
+        session.close()
+
+        return {
+            'success':False,
+            'error':errorMsg,
+            'data':{}
+        }
+
+    # add logs
+    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.customer.update_many', tools._arguments(update_many, locals()))
+
+    return {
+        'success':True,
+        'error':"",
+        'data':{
+            'msg':translation['notification']['update_to_db'].format(
+                element=translation['table_mapping']['customer']
+            ),
+            'updated':len(rows)
+        }
+    }
+
+def add(customers:list, language:typing.Union[str, None] = None, tz:typing.Union[str, None] = None) -> dict:
     """Adds customers to the db
 
     The add function either adds only one
@@ -376,13 +591,13 @@ def add(customers:list, language:str = app.config['DEFAULT_LANGUAGE'], tz = app.
                 },
                 ...
             ]
-    language : str, optional
+    language : str | None, optional
         The language iso. Needed for the error
         msg.
-        (default is app.config['DEFAULT_LANGUAGE])
-    tz : str, optional
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
+    tz : str | None, optional
         The timezone info
-        (default is app.config['TZ_INFO'])
+        (default is None -> app.config['TZ_INFO'])
 
     returns:
     --------
@@ -393,9 +608,11 @@ def add(customers:list, language:str = app.config['DEFAULT_LANGUAGE'], tz = app.
 
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+    if tz is None: tz = app.config['TZ_INFO']
+
     # get language
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -499,7 +716,7 @@ def add(customers:list, language:str = app.config['DEFAULT_LANGUAGE'], tz = app.
         }
 
     # add logs
-    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.customer.add', str(locals()))
+    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.customer.add', tools._arguments(add, locals()))
 
     # did all work?
     return {
@@ -512,17 +729,17 @@ def add(customers:list, language:str = app.config['DEFAULT_LANGUAGE'], tz = app.
         }
     }
 
-def delete(customer_id:int, language:str = app.config['DEFAULT_LANGUAGE']) -> dict:
+def delete(customer_id:int, language:typing.Union[str, None] = None) -> dict:
     """Deletes a customer
 
     params:
     -------
     customer_id : int
         the customer unique id.
-    language : str, optional
+    language : str | None, optional
         The language iso. Needed for the error
         msg.
-        (default is app.config['DEFAULT_LANGUAGE])
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
     
     returns:
     -------
@@ -531,9 +748,10 @@ def delete(customer_id:int, language:str = app.config['DEFAULT_LANGUAGE']) -> di
 
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
     # get language
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -585,7 +803,7 @@ def delete(customer_id:int, language:str = app.config['DEFAULT_LANGUAGE']) -> di
             }
 
     # add logs
-    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.customer.delete', str(locals()))
+    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.customer.delete', tools._arguments(delete, locals()))
 
     # did all work?
     return {
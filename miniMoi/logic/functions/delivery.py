@@ -4,20 +4,32 @@ Collection of function which handle the delivery
 """
 
 # import
+import os
+import re
 import typing
+import atexit
 import datetime
+import threading
+import multiprocessing
+from time import perf_counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 import numpy as np
 import pandas as pd
 import xlsxwriter as xlsx
+from sqlalchemy import bindparam, type_coerce, String
 
 from miniMoi import Session, app
 from miniMoi.models.Models import Abo, Customers, Products, Category, Subcategory, Orders
-from miniMoi.logic.helpers import tools
-from miniMoi.language import language_files
+from miniMoi.logic.helpers import tools, aggregates, serialize
+from miniMoi.language import get_translation
 import miniMoi.logic.helpers.time_module as time
 import miniMoi.logic.helpers.excel as xlsx
 
+# excel worker processes (created on first use, guarded by the lock)
+_executorLock = threading.Lock()
+_executor = None
 
 #region 'helpers (private) functions' ----------------------------
 def _create_mapping(data:dict, translation:dict) -> tuple:
@@ -53,6 +65,161 @@ def _create_mapping(data:dict, translation:dict) -> tuple:
 
     return (cols, mapper)
 
+def _to_columnar(df:pd.DataFrame, group:str, encode:list, translation:dict) -> dict:
+    """Encodes the (grouped) rows as compact columnar payload
+
+    All groups share one column schema ('order'
+    & 'mapping' are created once). The columns
+    in 'encode' are dictionary encoded: the values
+    are replaced by their index within the
+    'dictionaries' list (-1 = missing).
+    The rows of each group are a contiguous slice
+    ('start' to 'stop') of the columns.
+
+    params:
+    -------
+    df : pd.DataFrame
+        The rows, sorted by the group column.
+    group : str
+        The column to group by.
+    encode : list
+        The columns to dictionary encode.
+    translation : dict
+        The excel translation dict.
+
+    returns:
+    --------
+    dict
+        {
+            'format':"columnar",
+            'order':list,
+            'mapping':list,
+            'dictionaries':{col:list},
+            'data':{col:list},
+            'groups':{
+                'name':list,
+                'start':list,
+                'stop':list
+            }
+        }
+
+    """
+
+    order, mapping = _create_mapping({col:None for col in df.columns}, translation)
+
+    data = serialize.frame_to_columns(df[[col for col in df.columns if col not in encode]])
+    dictionaries = {}
+    for col in encode:
+
+        codes, uniques = pd.factorize(df[col], sort=False)
+        data[col] = codes.tolist()
+        dictionaries[col] = serialize.to_native(uniques)
+
+    names, starts, stops = _group_bounds(df[group])
+
+    return {
+        'format':"columnar",
+        'order':order,
+        'mapping':mapping,
+        'dictionaries':dictionaries,
+        'data':{col:data[col] for col in df.columns},
+        'groups':{
+            'name':names,
+            'start':starts,
+            'stop':stops
+        }
+    }
+
+def _group_bounds(values:pd.Series) -> tuple:
+    """Returns the contiguous groups of the (sorted) values 
+
+    returns:
+    --------
+    tuple
+        (names, starts, stops) # -> lists, rows 'start' to 'stop' belong to 'name'
+
+    """
+
+    if len(values) == 0: return ([], [], [])
+
+    codes = pd.factorize(values, sort=False)[0]
+    boundaries = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.concatenate([[0], boundaries]).astype(int)
+    stops = np.concatenate([boundaries, [len(values)]]).astype(int)
+
+    return (serialize.to_native(values.iloc[starts]), starts.tolist(), stops.tolist())
+
+def _delivery_query(session, start:datetime.datetime, end:datetime.datetime):
+    """Builds the joined delivery query
+
+    Fetches all abos with a next delivery within
+    the given interval together with the customer,
+    product, category & subcategory information
+    the overview needs. Everything is resolved with
+    one single sql statement.
+
+    params:
+    -------
+    session : sqlAlchemy session object
+        The session to build the query with.
+    start : datetime.datetime
+        Lower bound of 'next_delivery' (utc).
+    end : datetime.datetime
+        Upper bound of 'next_delivery' (utc).
+
+    returns:
+    --------
+    sqlalchemy.orm.Query
+        Columns: { 'id', 'customer_id', 'product',
+                   'subcategory', 'quantity', 'next_delivery',
+                   'customer_approach', 'customer_street',
+                   'customer_nr', 'customer_town', 'customer_name',
+                   'customer_surname', 'customer_phone',
+                   'customer_mobile', 'customer_notes',
+                   'product_id', 'product_name',
+                   'product_selling_price', 'product_purchase_price',
+                   'category_name', 'subcategory_name' }
+
+    """
+
+    query = session.query(
+        Abo.id,
+        Abo.customer_id,
+        Abo.product,
+        Abo.subcategory,
+        Abo.quantity,
+        Abo.next_delivery,
+        Customers.approach.label('customer_approach'),
+        Customers.street.label('customer_street'),
+        Customers.nr.label('customer_nr'),
+        Customers.town.label('customer_town'),
+        Customers.name.label('customer_name'),
+        Customers.surname.label('customer_surname'),
+        Customers.phone.label('customer_phone'),
+        Customers.mobile.label('customer_mobile'),
+        Customers.notes.label('customer_notes'),
+        Products.id.label('product_id'),
+        Products.name.label('product_name'),
+        Products.selling_price.label('product_selling_price'),
+        Products.purchase_price.label('product_purchase_price'),
+        Category.name.label('category_name'),
+        Subcategory.name.label('subcategory_name')
+    ).outerjoin(
+        Customers, Abo.customer_id == Customers.id
+    ).outerjoin(
+        Products, Abo.product == Products.id
+    ).outerjoin(
+        Category, Products.category == Category.id
+    ).outerjoin(
+        Subcategory, Abo.subcategory == Subcategory.id
+    ).filter(
+        Abo.next_delivery <= end
+    ).filter(
+        Abo.next_delivery >= start
+    )
+
+    return query
+
 def _product_overview(granular:pd.DataFrame, to_dict:bool=False) -> typing.Union[pd.DataFrame, dict]:
     """Produces the product overview
 
@@ -72,12 +239,16 @@ def _product_overview(granular:pd.DataFrame, to_dict:bool=False) -> typing.Union
     """
 
     # create product overview
-    overview_product = granular.groupby('category_name').apply(lambda x: pd.crosstab(
-        index = x['product_name'],
-        columns = x['subcategory_name'],
-        values = x['quantity'],
-        aggfunc="sum"
-    ))
+    overview_product = granular.pivot_table(
+        index = ['category_name', 'product_name'],
+        columns = 'subcategory_name',
+        values = 'quantity',
+        aggfunc = "sum"
+    )
+
+    # keep the subcategories in order of appearance per category
+    subcategories = granular.sort_values(['category_name', 'subcategory_name'])['subcategory_name'].unique().tolist()
+    overview_product = overview_product.reindex(columns=pd.Index(subcategories, name='subcategory_name'))
 
     # add total to overview
     overview_product['total'] = overview_product.sum(axis=1)
@@ -113,8 +284,7 @@ def _category_overview(granular:pd.DataFrame, to_dict:bool=False) -> typing.Unio
     """
 
     # create category overview
-    overview_category = granular.groupby('category_name').apply(
-        lambda x: x[['quantity', 'cost']].sum()
+    overview_category = granular.groupby('category_name')[['quantity', 'cost']].sum(
         ).reset_index().fillna(0).sort_values('category_name')
 
     if to_dict: return overview_category.to_dict("list")
@@ -147,17 +317,107 @@ def _prepare_granular(df:pd.DataFrame, reset_index:bool = True) -> pd.DataFrame:
 
     granular =  df.groupby(
         ['product_name', 'category_name', 'subcategory_name']
-        ).apply(lambda x: x[['quantity','cost']].sum())
+        )[['quantity','cost']].sum()
 
     if reset_index: return granular.reset_index()
 
     return granular
 
+def _town_filename(idx:int, town:typing.Any) -> str:
+    """Returns a file system safe file name for the town workbook """
+
+    return "{idx:03d}_{town}.xlsx".format(idx=idx, town=re.sub(r"[^\w\- ]", "_", str(town)).strip())
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Returns the (lazily created) excel process pool 
+    
+    The pool is shared by all requests, so the
+    worker processes are started only once. Its
+    size is app.config['EXCEL_WORKERS'] (None ->
+    number of cpus).
+    The workers are spawned, not forked: the pool
+    is started from a job thread while other
+    threads (jobs, audit flusher) may hold locks.
+
+    """
+
+    global _executor
+
+    with _executorLock:
+        if _executor is None: _executor = ProcessPoolExecutor(
+            max_workers = app.config['EXCEL_WORKERS'],
+            mp_context = multiprocessing.get_context("spawn")
+        )
+
+        return _executor
+
+def _shutdown_executor() -> None:
+    """Stops the excel worker processes (if started) """
+
+    global _executor
+
+    with _executorLock: executor, _executor = _executor, None
+
+    if executor is not None: executor.shutdown(wait=True)
+
+def _render(tasks:list, workers:typing.Union[int, None] = None) -> int:
+    """Renders the excel files
+
+    The tasks are rendered by the shared process
+    pool (if there is more than one task & worker).
+
+    params:
+    -------
+    tasks : list
+        The tasks to render.
+            Format: [(function, kwargs), ...]
+            The function must be importable
+            (module level), the kwargs picklable.
+    workers : int | None, optional
+        The max. number of processes. If 1, the
+        tasks are rendered in this process.
+        (default is None -> number of cpus)
+
+    returns:
+    --------
+    int
+        The number of rendered files.
+
+    """
+
+    global _executor
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+
+    if workers <= 1:
+
+        for func, kwargs in tasks: func(**kwargs)
+
+        return len(tasks)
+
+    executor = _get_executor()
+
+    try:
+        # raises the first exception of the workers
+        futures = [executor.submit(func, **kwargs) for func, kwargs in tasks]
+        for future in futures: future.result()
+
+    except BrokenProcessPool:
+
+        # a worker died -> the next request starts a new pool
+        with _executorLock:
+            if _executor is executor: _executor = None
+
+        raise
+
+    return len(tasks)
+
 def _process_excel(
         df:pd.DataFrame, 
         save_cover:bool=True, 
         save_overview:bool=True, 
-        language:str = app.config['DEFAULT_LANGUAGE']
+        language:typing.Union[str, None] = None,
+        split_towns:typing.Union[bool, None] = None
     ) -> dict:
     """Process the df and saves the files to 'downloads'
 
@@ -170,17 +430,34 @@ def _process_excel(
         (default is True)
     save_overview : bool, optional
         If True, the overview excel will be saved.
+    language : str | None, optional
+        The language to use.
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
+    split_towns : bool | None, optional
+        If True, one overview workbook per town is
+        saved to 'overview_<date>/'. The town workbooks
+        and the cover are rendered in parallel processes.
+        (default is None -> app.config['SPLIT_TOWNS'])
 
     returns:
     --------
     dict
-        success, error & data {'path':str}
+        success, error & data {
+            'path':str,
+            'files':int,
+            'duration':float # -> wall clock seconds
+        }
     
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
+    started = perf_counter()
+
     # try to grab the language files
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
+
+    if split_towns is None: split_towns = app.config['SPLIT_TOWNS']
 
     # gate date of tomorrow
     date = time.to_string(
@@ -198,46 +475,66 @@ def _process_excel(
     # create 'mini-moi' folder if available
     fullPath.mkdir(exist_ok=True)
 
-    # create product overviews
-    # group on granularest level
-    granular = _prepare_granular(df)
+    # collect the files to render: [(function, kwargs)]
+    tasks = []
 
     if save_cover:
-        # create category overview
-        overview_category = _category_overview(granular, to_dict=True)
-
-        # create product overview
-        overview_product = _product_overview(granular, to_dict = True)
-
-        # create excel -> save to download folder
-        cover = xlsx.print_cover(
-            category_overview = overview_category,
-            product_overview = overview_product,
-            path = str(fullPath / "cover_{date}.xlsx".format(date=date)),
-            tomorrow = True,
-            language = language
-    )
+
+        # create product overviews
+        # group on granularest level
+        granular = _prepare_granular(df)
+
+        tasks.append((xlsx.print_cover, {
+            'category_overview':_category_overview(granular, to_dict=True),
+            'product_overview':_product_overview(granular, to_dict = True),
+            'path':str(fullPath / "cover_{date}.xlsx".format(date=date)),
+            'tomorrow':True,
+            'language':language
+        }))
 
     if save_overview:
         
-        # build townbased
+        # build townbased (one split, keeps the order of appearance)
         townbased = {
-                t:df[df['customer_town'] == t].to_dict("list") for t in df['customer_town'].unique().tolist()
-            } 
+                t:group.to_dict("list") for t, group in df.groupby('customer_town', sort=False, dropna=False)
+            }
 
-        orderDetails = xlsx.print_order_list(
-            townbased,
-            path = str(fullPath / "overview_{date}.xlsx".format(date=date)),
-            tomorrow = True,
-            language = language
-        )
+        if split_towns:
+
+            townPath = fullPath / "overview_{date}".format(date=date)
+            townPath.mkdir(exist_ok=True)
+
+            tasks += [
+                (xlsx.print_order_list, {
+                    'data':{t:townData},
+                    'path':str(townPath / _town_filename(idx, t)),
+                    'tomorrow':True,
+                    'language':language
+                }) for idx, (t, townData) in enumerate(townbased.items())
+            ]
+
+        else:
+
+            tasks.append((xlsx.print_order_list, {
+                'data':townbased,
+                'path':str(fullPath / "overview_{date}.xlsx".format(date=date)),
+                'tomorrow':True,
+                'language':language
+            }))
+
+    # the single workbooks are rendered in this process
+    files = _render(tasks, app.config['EXCEL_WORKERS'] if split_towns else 1)
+
+    duration = perf_counter() - started
 
     # did all work?
     return {
         'success':True,
         'error':"",
         'data':{
-            'path':translation['notification']['save_path'].format(path=str(fullPath))
+            'path':translation['notification']['save_path'].format(path=str(fullPath)),
+            'files':files,
+            'duration':duration
         }
     }
 
@@ -322,28 +619,23 @@ def _process_received(data:dict, errors:dict) -> dict:
             }
 
     # turn into correct formats
-    # fill na with -999
-    df.fillna(-999, inplace=True)
-    df.replace('', -999, inplace=True)
-    
-    # sort
-    df = df.astype(str).sort_values(['customer_town', 'customer_approach', 'product_name'])
+    # -> missing values ('' & None) are filled with -999 per column type
+    missing = lambda col: col.fillna(-999).replace('', -999)
+
+    # sort (by the string representation)
+    df = df.sort_values(['customer_town', 'customer_approach', 'product_name'], key=lambda col: missing(col).astype(str))
 
     int_values = ['id', 'customer_approach', 'customer_nr', 'customer_id', 'quantity', 'product_id']
     float_values = ['product_selling_price', 'cost', 'total_cost']
     is_numeric = int_values + float_values
     str_values = [col for col in df.columns if col not in is_numeric]
 
-    numeric_df = df.loc[:, is_numeric].astype(float).round(2)
-    #int_df = df.loc[:, int_values].astype(int)
-    str_df = df.loc[:, str_values].astype(str)
+    numeric_df = df.loc[:, is_numeric].apply(missing).astype(float).round(2)
+    numeric_df = pd.concat([numeric_df[float_values], numeric_df[int_values].astype(int)], axis=1)
+    str_df = df.loc[:, str_values].fillna("").astype(str)
 
-    df = pd.concat([numeric_df[float_values], numeric_df[int_values].astype(int), str_df], axis=1)
-    
     # turn -999 back to nan
-    df.replace(-999, np.nan, inplace=True)
-    df.replace(-999.0, np.nan, inplace=True)
-    df.replace('-999', "", inplace=True)
+    df = pd.concat([numeric_df.replace(-999, np.nan), str_df.replace('-999', "")], axis=1)
 
     # sort order
     df = df.loc[:, relCols]
@@ -360,7 +652,11 @@ def _process_received(data:dict, errors:dict) -> dict:
 
 
 #region '(public) functions' -------------------------------------
-def create(language = app.config['DEFAULT_LANGUAGE'], tz = app.config['TZ_INFO']) -> dict:
+def create(
+        language:typing.Union[str, None] = None, 
+        tz:typing.Union[str, None] = None,
+        compact:bool = False
+    ) -> dict:
     """Creates next days delivery overview
 
     This function creates the overview for the
@@ -368,12 +664,19 @@ def create(language = app.config['DEFAULT_LANGUAGE'], tz = app.config['TZ_INFO']
 
     params:
     -------
-    language : str, optional
+    language : str | None, optional
         language ISO code for the errors.
-        (default is app.config['DEFAULT_LANGUAGE])
-    tz : str, optional
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
+    tz : str | None, optional
         Timzone information.
-        (default is app.config['TZ_INFO'])
+        (default is None -> app.config['TZ_INFO'])
+    compact : bool, optional
+        If True, 'town_based' is returned as compact
+        columnar payload (shared column schema and
+        dictionary encoded town, street, product,
+        category & subcategory names).
+        See '_to_columnar()' for the format.
+        (default is False)
 
     returns:
     --------
@@ -441,9 +744,11 @@ def create(language = app.config['DEFAULT_LANGUAGE'], tz = app.config['TZ_INFO']
     
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+    if tz is None: tz = app.config['TZ_INFO']
+
     # get language files
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -458,11 +763,10 @@ def create(language = app.config['DEFAULT_LANGUAGE'], tz = app.config['TZ_INFO']
     tomorrow = today + datetime.timedelta(days=1)
     yesterday = today + datetime.timedelta(days=-1)
 
-    # query abos
-    abosQuery = session.query(Abo).filter(Abo.next_delivery <= tomorrow).filter(Abo.next_delivery >= yesterday)
+    # query abos (incl. customer, product, category & subcategory info)
     abos = pd.read_sql_query(
-        abosQuery.statement,
-        session.bind
+        _delivery_query(session, yesterday, tomorrow).statement,
+        session.connection()
     )
 
     #region 'prepare df'
@@ -473,65 +777,19 @@ def create(language = app.config['DEFAULT_LANGUAGE'], tz = app.config['TZ_INFO']
     abos.loc[:, 'next_delivery_utc'] = abos.loc[:, 'next_delivery']
 
     # convert utcnow to local time
-    abos.loc[:, 'next_delivery'] = abos.loc[:, 'next_delivery'].map(lambda x: time.to_string(time.utc_to_local(x, tz)))
+    abos['next_delivery'] = time.series_to_string(time.series_utc_to_local(abos['next_delivery'], tz))
 
     # convert today & tomorrow to local time
     todayLocal = time.utc_to_local(today, tz)
     tomorrowLocal = time.utc_to_local(tomorrow, tz)
 
     # filter abos to be only for tomorrow
-    abos = abos[abos['next_delivery'] == time.to_string(tomorrowLocal)]
+    df = abos[abos['next_delivery'] == time.to_string(tomorrowLocal)].copy()
 
-    if abos.empty: return {'success':False, 'error':errors['noDelivery'], 'data':{}}
-
-    #endregion
+    if df.empty: return {'success':False, 'error':errors['noDelivery'], 'data':{}}
 
     #endregion
 
-    #region 'query additional info' ----------------------------
-    # query customers
-    customersQuery = session.query(Customers).filter(Customers.id.in_(
-        abos['customer_id'].unique().tolist()
-    ))
-    customers = pd.read_sql_query(customersQuery.statement, session.bind)
-    customers.columns = ["customer_" + col for col in customers.columns]
-
-    # query products
-    productsQuery = session.query(Products).filter(Products.id.in_(
-        abos['product'].unique().tolist()
-    ))
-    products = pd.read_sql_query(productsQuery.statement, session.bind)
-    products.columns = ["product_" + col for col in products.columns]
-
-    # query categories
-    categoriesQuery = session.query(Category).filter(Category.id.in_(
-        products['product_category'].unique().tolist()
-    ))
-    categories = pd.read_sql_query(categoriesQuery.statement, session.bind)
-    categories.columns = ["category_" + col for col in categories.columns]
-
-    # query subcategories
-    subcategoryQuery = session.query(Subcategory).filter(Subcategory.id.in_(
-        abos['subcategory'].unique().tolist()
-    ))
-    subcategories = pd.read_sql_query(subcategoryQuery.statement, session.bind)
-    subcategories.columns = ["subcategory_" +  col for col in subcategories.columns]
-
-    #endregion
-
-    #region 'merge together' -----------------------------------
-    # abos + costumers
-    df = pd.merge(abos, customers, how="left", left_on="customer_id", right_on="customer_id")
-
-    # df + products
-    df = pd.merge(df, products, how="left", left_on="product", right_on="product_id")
-
-    # df + categories
-    df = pd.merge(df, categories, how="left", left_on="product_category", right_on="category_id")
-
-    # df + subcategories
-    df = pd.merge(df, subcategories, how="left", left_on="subcategory", right_on="subcategory_id")
-    
     #endregion
 
     #region 'create overview' ----------------------------------
@@ -553,11 +811,7 @@ def create(language = app.config['DEFAULT_LANGUAGE'], tz = app.config['TZ_INFO']
     totalSpendings = df['spendings'].sum()
 
     # sort for town based userlist
-    cost_per_customer = df.groupby('customer_id').apply(lambda x: x['cost'].sum()).reset_index()
-    cost_per_customer.rename(columns={0:'total_cost'}, inplace=True)
-
-    # merge together
-    df = pd.merge(df, cost_per_customer, how="left", left_on="customer_id", right_on="customer_id")
+    df['total_cost'] = df.groupby('customer_id')['cost'].transform("sum")
 
     # select only relevant information
     relevantCols = [
@@ -583,16 +837,32 @@ def create(language = app.config['DEFAULT_LANGUAGE'], tz = app.config['TZ_INFO']
         ]
     df = df.loc[:, relevantCols].sort_values(['customer_town', 'customer_approach', 'product_name'])
 
-    # turn into townbased dict
-    townbased = {
-            t:df[df['customer_town'] == t].to_dict("list") for t in df['customer_town'].unique().tolist()
-        } 
-
-    #endregion
-
     # get xlsx table name mapping
     xlsxNames = translation['xlsx']
 
+    # turn into townbased dict (the rows are sorted by town)
+    if compact:
+        
+        townbased = {}
+        townBasedOverview = _to_columnar(
+            df, 
+            group = "customer_town",
+            encode = ['customer_town', 'customer_street', 'product_name', 'subcategory_name', 'category_name'],
+            translation = xlsxNames
+        )
+
+    else:
+
+        # convert once (vectorized), then slice the towns
+        columns = serialize.frame_to_columns(df)
+        townbased = {
+                t:{col:values[start:stop] for col, values in columns.items()} 
+                for t, start, stop in zip(*_group_bounds(df['customer_town'])) if not pd.isnull(t)
+            }
+        townBasedOverview = {}
+
+    #endregion
+
     #region 'create orders & mapping'
     # category
     categoryOrder, categoryMapping = _create_mapping(overview_category, xlsxNames)
@@ -613,7 +883,6 @@ def create(language = app.config['DEFAULT_LANGUAGE'], tz = app.config['TZ_INFO']
         })
 
     # townbased
-    townBasedOverview = {}
     for t in townbased.keys():
 
         # get mapper
@@ -646,11 +915,12 @@ def create(language = app.config['DEFAULT_LANGUAGE'], tz = app.config['TZ_INFO']
         }
     }
 
-def book(data:dict, language = app.config['DEFAULT_LANGUAGE']) -> dict:
+def book(data:dict, language:typing.Union[str, None] = None) -> dict:
     """Books the manipulated data
 
     This function takes the data and adds 
-    the provided info to the 'Orders' table.
+    the provided info to the 'Orders' table
+    (and the daily sales aggregates).
     It also calculates the next delivery
     date.
     In the end it returns the printed excel.
@@ -681,9 +951,9 @@ def book(data:dict, language = app.config['DEFAULT_LANGUAGE']) -> dict:
                     'id':list[int] # -> the abo_id
                     }
             }
-    language : str, optional
+    language : str | None, optional
         language ISO code for the errors.
-        (default is app.config['DEFAULT_LANGUAGE])
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
  
     returns:
     -------
@@ -695,9 +965,10 @@ def book(data:dict, language = app.config['DEFAULT_LANGUAGE']) -> dict:
 
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
     # get language errorcodes
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
     errors = translation['error_codes']
 
     processed = _process_received(data, errors)
@@ -711,37 +982,76 @@ def book(data:dict, language = app.config['DEFAULT_LANGUAGE']) -> dict:
     session = Session()
 
     # fetch all abos to update
-    toQuery = [int(val) for val in  df['id'].unique().tolist() if not np.isnan(val)]
-    abos = session.query(Abo).filter(Abo.id.in_(toQuery)).all()
-    
-    # add order & update next_delivery
-    toAdd = []
+    # -> the dates are parsed by pandas (not per row by sqlAlchemy)
+    # -> the id range is queried & filtered by pandas (no IN list with
+    #    one bind parameter per id)
+    toQuery = df['id'].dropna().unique().astype(int).tolist()
+    abos = pd.read_sql_query(
+        session.query(
+            Abo.id,
+            type_coerce(Abo.next_delivery, String).label('next_delivery'),
+            Abo.cycle_type,
+            Abo.interval
+        ).filter(Abo.id.between(min(toQuery, default=0), max(toQuery, default=-1))).statement,
+        session.connection()
+    )
+    abos = abos[abos['id'].isin(toQuery)].reset_index(drop=True)
+    abos['next_delivery'] = pd.to_datetime(abos['next_delivery'])
     
     try:
-        for abo in abos:
-
-            # grab df row
-            tmp = df[df['id'] == abo.id]
-
-            # add order
-            toAdd.append(Orders(
-                customer_id = int(tmp['customer_id'].tolist()[0]),
-                product = int(tmp['product_id'].tolist()[0]),
-                product_name = str(tmp['product_name'].tolist()[0]),
-                category = str(tmp['category_name'].tolist()[0]),
-                subcategory = str(tmp['subcategory_name'].tolist()[0]),
-                quantity = int(tmp['quantity'].tolist()[0]),
-                price = float(tmp['product_selling_price'].tolist()[0]),
-                total = float(tmp['cost'].tolist()[0])
-            ))
-
-            # update abo next_delivery
-            abo.next_delivery = time.calculate_next_delivery(
-                date = abo.next_delivery,
-                cycle_type = abo.cycle_type,
-                interval = abo.interval,
-                language = language
-            )
+
+        # one row per abo (the first one wins), ordered by the abo id
+        booked = pd.merge(
+            abos, 
+            df.drop_duplicates('id'), 
+            how="left", 
+            on="id"
+        ).sort_values('id')
+
+        # build all orders at once
+        bookingDate = time.utcnow()
+        orders = pd.DataFrame({
+            'customer_id':booked['customer_id'].astype(int),
+            'product':booked['product_id'].astype(int),
+            'product_name':booked['product_name'].astype(str),
+            'category':booked['category_name'].astype(str),
+            'subcategory':booked['subcategory_name'].astype(str),
+            'quantity':booked['quantity'].astype(int),
+            'price':booked['product_selling_price'].astype(float),
+            'total':booked['cost'].astype(float)
+        })
+
+        # calculate all next deliveries at once
+        nextDelivery = time.calculate_next_deliveries(
+            dates = booked['next_delivery'],
+            cycle_types = booked['cycle_type'],
+            intervals = booked['interval'],
+            language = language
+        )
+
+        # add orders (executemany) & update next_delivery
+        if len(booked) > 0:
+
+            # rows from the column lists (native types without boxing per value)
+            columns = {col:orders[col].tolist() for col in orders.columns}
+            session.execute(Orders.__table__.insert(), [
+                dict(zip(columns.keys(), row), date=bookingDate) for row in zip(*columns.values())
+            ])
+
+            # few distinct next deliveries -> one update per date & batch of ids
+            nextDeliveries = pd.DataFrame({'id':booked['id'].astype(int).to_numpy(), 'next_delivery':nextDelivery.to_numpy()})
+            for date, ids in nextDeliveries.groupby('next_delivery', dropna=False, sort=True)['id']:
+
+                ids = ids.tolist()
+                date = None if pd.isnull(date) else pd.Timestamp(date).to_pydatetime()
+
+                for start in range(0, len(ids), 900): # -> below the sqlite variable limit
+                    session.execute(
+                        Abo.__table__.update().where(Abo.__table__.c.id.in_(ids[start:start + 900])).values(next_delivery=date)
+                    )
+
+            # keep the sales aggregates in sync (same transaction)
+            aggregates.upsert_sales(session, aggregates.aggregate_orders(orders.assign(date=bookingDate)))
 
     except Exception as e:
 
@@ -762,9 +1072,6 @@ def book(data:dict, language = app.config['DEFAULT_LANGUAGE']) -> dict:
             'data':{}
             }
 
-    # add to add to the session
-    session.add_all(toAdd)
-
     # generate excel files
     excel = _process_excel(df, True, True, language)
     if not excel['success']: return excel
@@ -801,7 +1108,7 @@ def save_data(
         data:dict,
         save_cover:bool = True,
         save_overview:bool = True,
-        language:str = app.config['DEFAULT_LANGUAGE']
+        language:typing.Union[str, None] = None
     ) -> dict:
     """Create order details overview
 
@@ -839,9 +1146,9 @@ def save_data(
     save_overview : bool, optional
         If true, the excel overview is printed.
         (default is True)
-    language : str, optional
+    language : str | None, optional
         language ISO code for the errors.
-        (default is app.config['DEFAULT_LANGUAGE])
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
  
     returns:
     -------
@@ -852,9 +1159,10 @@ def save_data(
 
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
     # get language errorcodes
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
     
     errors = translation['error_codes']
 
@@ -879,3 +1187,5 @@ def save_data(
 
 #endregion
 
+# stop the excel worker processes before the interpreter exits
+atexit.register(_shutdown_executor)
@@ -4,7 +4,7 @@ Handles the demo db generation process
 """
 
 # import
-from miniMoi import app, engine, base, Session
+from miniMoi import app, base, Session
 from miniMoi.logic.db import generate_testdata, init_database
 from miniMoi.logic.functions import system
 
@@ -16,7 +16,7 @@ def run():
     system.delete_db()
 
     # create new db
-    init_database.run_creation(engine, base)
+    init_database.run_creation(Session.get_bind(), base)
 
     # create defaults
     init_database.create_defaults(Session)
@@ -0,0 +1,416 @@
+"""
+Contains the functions for the delivery forecast
+
+The forecast expands the cycles of all abos into
+their future delivery days and sums the quantities
+per day & product (and product & subcategory).
+
+"""
+
+# import
+import typing
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from miniMoi import Session, app
+from miniMoi.models.Models import Abo, Products, Subcategory
+from miniMoi.language import get_translation
+from miniMoi.logic.helpers import tools
+import miniMoi.logic.helpers.time_module as time
+import miniMoi.logic.helpers.excel as xlsx
+
+#region 'private functions' ---------------
+def _expand(
+        next_deliveries:np.ndarray,
+        cycle_types:np.ndarray,
+        intervals:np.ndarray,
+        start:np.datetime64,
+        days:int
+    ) -> tuple:
+    """Expands the abo cycles into the delivery days of the window
+
+    Follows the rules of 'calculate_next_delivery()':
+    the 'next_delivery' itself, then (with a cycle)
+    every 'interval' days or every week at the weekday
+    'interval'. Every abo gets the days of its cycle
+    within [start, start + days) without a loop per
+    abo: the count per abo is calculated first, then
+    all days are generated with one 'np.repeat()'.
+
+    params:
+    -------
+    next_deliveries : np.ndarray
+        The next delivery dates (datetime64).
+    cycle_types : np.ndarray
+        The cycle types.
+            Options: { None, 'day', 'interval' }
+    intervals : np.ndarray
+        The days to let pass or the weekday as idx
+        (NaN without cycle).
+    start : np.datetime64
+        The first day of the window.
+    days : int
+        The number of days of the window.
+
+    returns:
+    --------
+    tuple
+        (rows, days) -> np.ndarray
+        The abo row (position) & the day within
+        the window (0 = start) of each delivery.
+
+    """
+
+    # days since epoch
+    first = next_deliveries.astype("datetime64[D]")
+    valid = ~np.isnat(first)
+    first = np.where(valid, first.astype(np.int64), 0)
+
+    startDay = np.datetime64(start, "D").astype(np.int64)
+    endDay = startDay + days
+
+    isDay = cycle_types == "day"
+    isInterval = cycle_types == "interval"
+    intervals = np.nan_to_num(np.asarray(intervals, dtype=float), nan=-1).astype(np.int64)
+
+    # the next delivery itself
+    inWindow = valid & (first >= startDay) & (first < endDay)
+    firstRows = np.flatnonzero(inWindow)
+    firstDays = first[inWindow] - startDay
+
+    # the following deliveries: base + k * step (k >= 0)
+    weekday = (first + 3) % 7 # -> 1970-01-01 was a thursday
+    cyclic = valid & ((isDay & (intervals >= 0) & (intervals <= 6)) | (isInterval & (intervals > 0)))
+
+    step = np.where(isDay, 7, np.maximum(intervals, 1))
+    base = first + np.where(isDay, 7 + intervals - weekday, step)
+
+    kMin = np.maximum(-((base - startDay) // step), 0)
+    kMax = (endDay - 1 - base) // step
+    counts = np.where(cyclic, np.maximum(kMax - kMin + 1, 0), 0)
+
+    rows = np.repeat(np.arange(len(first)), counts)
+    k = kMin[rows] + np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    return (
+        np.concatenate([firstRows, rows]),
+        np.concatenate([firstDays, base[rows] + k * step[rows] - startDay])
+    )
+
+def _to_table(matrix:pd.DataFrame, dates:list, translation:dict) -> dict:
+    """Converts a forecast matrix into the table format
+
+    params:
+    -------
+    matrix : pd.DataFrame
+        The forecast matrix (see 'project()'). The
+        column index levels are (id, name) pairs.
+    dates : list
+        The formatted dates of the rows.
+    translation : dict
+        The language file.
+
+    returns:
+    --------
+    dict
+        {
+            'data':{'date':list, 'key':list, ...},
+            'order':list,
+            'mapping':list
+        }
+
+    """
+
+    # key: ids joined by '_', mapping: names (first one outside the brackets)
+    keys, names = ["date"], [translation['column_mapping']['forecast']['date']]
+    for col in matrix.columns:
+
+        keys.append("_".join(str(val) for val in col[::2]))
+        names.append(col[1] if len(col) == 2 else "{p} ({s})".format(p=col[1], s=col[3]))
+
+    data = {'date':dates}
+    data.update({key:values.tolist() for key, values in zip(keys[1:], matrix.to_numpy().T)})
+
+    return {'data':data, 'order':keys, 'mapping':names}
+
+#endregion
+
+#region 'public functions' ----------------
+def project(
+        abos:pd.DataFrame,
+        start:datetime.datetime,
+        days:int,
+        by:list = ['product']
+    ) -> pd.DataFrame:
+    """Projects the abos & sums the quantities per day
+
+    params:
+    -------
+    abos : pd.DataFrame
+        The abos.
+            Columns: { 'next_delivery', 'cycle_type',
+                       'interval', 'quantity', *by }
+    start : datetime.datetime
+        The first day of the forecast.
+    days : int
+        The number of days to forecast.
+    by : list, optional
+        The columns to sum the quantities by.
+        (default is ['product'])
+
+    returns:
+    --------
+    pd.DataFrame
+        The date x key matrix.
+            Index: the days (start - start + days - 1)
+            Columns: the keys of 'by' (sorted)
+            Values: the quantities (int)
+
+    """
+
+    start = pd.Timestamp(start).normalize()
+    dates = pd.date_range(start, periods=days, freq="D")
+
+    # group keys (one code per key)
+    groups = abos.groupby(by, sort=True, dropna=False)
+    codes = groups.ngroup().to_numpy()
+    keys = groups.size().index
+
+    rows, dayIdx = _expand(
+        next_deliveries = pd.to_datetime(abos['next_delivery'], cache=False).to_numpy(dtype="datetime64[ns]"),
+        cycle_types = abos['cycle_type'].to_numpy(dtype=object),
+        intervals = pd.to_numeric(abos['interval'], errors="coerce").to_numpy(dtype=float),
+        start = start.to_datetime64(),
+        days = days
+    )
+
+    # sum the quantities per day & key
+    counts = np.bincount(
+        dayIdx * len(keys) + codes[rows],
+        weights = abos['quantity'].fillna(0).to_numpy(dtype=float)[rows],
+        minlength = days * len(keys)
+    )
+
+    return pd.DataFrame(counts.reshape(days, len(keys)).round().astype(np.int64), index=dates, columns=keys)
+
+def create(
+        days:typing.Union[int, None] = None,
+        language:typing.Union[str, None] = None,
+        tz:typing.Union[str, None] = None
+    ) -> dict:
+    """Creates the delivery forecast
+
+    Projects all abos for the next days (starting
+    tomorrow). Abos with a next delivery before
+    yesterday are not delivered anymore (see
+    'delivery.create()') & are left out.
+
+    params:
+    -------
+    days : int | None, optional
+        The number of days to forecast.
+        (default is None -> app.config['FORECAST_DAYS'])
+    language : str | None, optional
+        language ISO code for the errors.
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
+    tz : str | None, optional
+        Timzone information.
+        (default is None -> app.config['TZ_INFO'])
+
+    returns:
+    --------
+    dict
+        success, error & data {
+            'start':str,
+            'days':int,
+            'forecast_product':{
+                'data':{
+                    'date':list[str],
+                    'product_id':list[int],
+                    ...
+                },
+                'order':[],
+                'mapping':[]
+            },
+            'forecast_subcategory':{
+                'data':{
+                    'date':list[str],
+                    'productId_subcategoryId':list[int],
+                    ...
+                },
+                'order':[],
+                'mapping':[]
+            }
+        }
+
+    """
+
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+    if tz is None: tz = app.config['TZ_INFO']
+
+    # get language files
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
+
+    # get language errorcodes
+    errors = translation['error_codes']
+
+    # parse days
+    if days in [None, "", "null"]: days = app.config['FORECAST_DAYS']
+
+    try: days = int(days)
+    except ValueError as e: return {
+        'success':False,
+        'error':errors['wrongType'].format(
+            var = "days",
+            dtype = translation['type_mapping']['int']
+        ),
+        'data':{}
+    }
+
+    if days < 1 or days > app.config['FORECAST_MAX_DAYS']: return {
+        'success':False,
+        'error':errors['forecastDays'].format(max=app.config['FORECAST_MAX_DAYS']),
+        'data':{}
+    }
+
+    # local days (the next deliveries are saved in utc)
+    today = time.utc_to_local(time.utcnow(), tz).replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    tomorrow = today + datetime.timedelta(days=1)
+    yesterday = today + datetime.timedelta(days=-1)
+
+    # create session
+    session = Session()
+
+    # query the abos (only their columns)
+    # NOTE:
+    # Read via the dbapi cursor (no row objects, no date parsing per
+    # row). Nearly all abos are active, so the whole table is scanned
+    # & the old ones are filtered below (an index search per row is
+    # slower).
+    columns = ['next_delivery', 'cycle_type', 'interval', 'quantity', 'product', 'subcategory']
+    connection = session.connection()
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(str(
+            session.query(*[getattr(Abo, col) for col in columns]).statement.compile(dialect=connection.dialect)
+        ))
+        abos = pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+    finally: cursor.close()
+
+    # names of the (few) products & subcategories
+    productNames = dict(session.query(Products.id, Products.name).all())
+    subcategoryNames = dict(session.query(Subcategory.id, Subcategory.name).all())
+
+    # close session
+    session.close()
+
+    # active abos & utc -> local days
+    nextDelivery = pd.to_datetime(abos['next_delivery'])
+    abos = abos.assign(
+        next_delivery = nextDelivery.dt.tz_localize("UTC").dt.tz_convert(tz).dt.tz_localize(None)
+    )[nextDelivery >= time.local_to_utc(yesterday, tz).replace(tzinfo=None)]
+
+    dates = time.series_to_string(pd.Series(pd.date_range(tomorrow, periods=days, freq="D"))).tolist()
+
+    # project once, the product matrix is the sum over the subcategories
+    subcategories = project(abos, tomorrow, days, by=['product', 'subcategory'])
+    products = subcategories.T.groupby(level=0, sort=True).sum().T
+
+    # add the names to the ids (missing -> "")
+    products.columns = pd.MultiIndex.from_tuples(
+        [(idx, productNames.get(idx, "")) for idx in products.columns],
+        names=['product', 'product_name']
+    )
+    subcategories.columns = pd.MultiIndex.from_tuples(
+        [(pIdx, productNames.get(pIdx, ""), sIdx, subcategoryNames.get(sIdx, "")) for pIdx, sIdx in subcategories.columns],
+        names=['product', 'product_name', 'subcategory', 'subcategory_name']
+    )
+
+    return {
+        'success':True,
+        'error':"",
+        'data':{
+            'start':dates[0],
+            'days':days,
+            'forecast_product':_to_table(products, dates, translation),
+            'forecast_subcategory':_to_table(subcategories, dates, translation)
+        }
+    }
+
+def export(
+        days:typing.Union[int, None] = None,
+        language:typing.Union[str, None] = None,
+        tz:typing.Union[str, None] = None
+    ) -> dict:
+    """Saves the delivery forecast as excel
+
+    The file is saved to '~/mini-moi/forecast'.
+
+    params:
+    -------
+    days : int | None, optional
+        The number of days to forecast.
+        (default is None -> app.config['FORECAST_DAYS'])
+    language : str | None, optional
+        language ISO code for the errors.
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
+    tz : str | None, optional
+        Timzone information.
+        (default is None -> app.config['TZ_INFO'])
+
+    returns:
+    --------
+    dict
+        success, error & data {
+            'msg':str
+        }
+
+    """
+
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+    if tz is None: tz = app.config['TZ_INFO']
+
+    # get language files
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
+
+    forecast = create(days, language, tz)
+    if not forecast['success']: return forecast
+
+    # create 'forecast' folder if not available
+    fullPath = app.config['MINI_MOI_HOME'] / "forecast"
+    fullPath.mkdir(exist_ok=True)
+
+    path = fullPath / "forecast_{start}_{days}.xlsx".format(
+        start = forecast['data']['start'].replace(".", "-"),
+        days = forecast['data']['days']
+    )
+
+    try:
+        xlsx.print_forecast(
+            forecast = forecast['data'],
+            path = str(path),
+            language = language
+        )
+
+    except Exception as e:
+
+        code, msg = tools._convert_exception(e)
+
+        return {
+            'success':False,
+            'error':translation['error_codes']['500'].format(c=str(code), m=str(msg)),
+            'data':{}
+        }
+
+    return {
+        'success':True,
+        'error':"",
+        'data':{
+            'msg':translation['notification']['save_path'].format(path=str(path))
+        }
+    }
+
+#endregion
@@ -5,14 +5,16 @@ products
 """
 
 # imports
+import math
 import typing
 from numpy import var
 
 import pandas as pd
+from sqlalchemy import bindparam
 
 from miniMoi import Session, app
 from miniMoi.models.Models import Products, Category
-from miniMoi.language import language_files
+from miniMoi.language import get_translation
 from miniMoi.logic.helpers import tools
 
 
@@ -30,17 +32,19 @@ def _margin(revenue:float, cost:float, decimals:int = 2) -> float:
 
     params:
     ------
-    revenue : float
+    revenue : float | pd.Series
         The selling price of the item.
-    cost : float
+    cost : float | pd.Series
         The purchase price of the item.
+        Note: Pass series to calculate the
+              margins of several items at once.
     decimals : int, optional
         The number of decimals.
         (default is 2)
 
     returns:
     --------
-    float
+    float | pd.Series
         margin
 
     """
@@ -54,7 +58,9 @@ def get(
         filter_type:typing.Union[str, None], 
         what:typing.Union[str, None],
         amount:typing.Union[int, None] = None,
-        language:str = app.config['DEFAULT_LANGUAGE']
+        page_size:typing.Union[int, None] = None,
+        cursor:typing.Union[int, None] = None,
+        language:typing.Union[str, None] = None
     ) -> dict:
     """Returns the requested products
 
@@ -78,10 +84,18 @@ def get(
     amount : int | None, optional
         The number of entries to query.
         (default is None).
-    language : str, optional
+    page_size : int | None, optional
+        The max. number of entries per page.
+        If None, all entries are returned.
+        (default is None)
+    cursor : int | None, optional
+        The 'next_cursor' of the previous page
+        (the last id on it).
+        (default is None)
+    language : str | None, optional
         the language iso code. Needed for the
         error msg.
-        (default is app.config['DEFAULT_LANGUAGE])
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
 
     returns:
     --------
@@ -98,14 +112,21 @@ def get(
                     'phone':str
                 },
                 ...
-            ]
+            ],
+            'pagination':{
+                'page_size':int | None,
+                'cursor':int | None,
+                'next_cursor':int | None,
+                'total':int
+            }
         }
 
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
     # get language files
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -137,7 +158,7 @@ def get(
     # filter by product name?
     elif filter_type == "product" and what is not None: 
         
-        result = session.query(Products).filter_by(name = what)
+        result = session.query(Products).filter_by(name = str(what))
 
     # filter by town
     elif filter_type == "category":
@@ -165,12 +186,9 @@ def get(
 
     #endregion
 
-    # limit the amount?
-    if amount is not None: result = result.limit(amount)
-
     #region 'create dropdown options'
-    categories = session.query(Category)
-    if categories.first() is None: return {
+    categories = session.query(Category).all()
+    if len(categories) == 0: return {
         'success':False, 
         'error':errors['noElementInDB'].format(
             element = translation['table_mapping']['category']
@@ -179,7 +197,7 @@ def get(
         }
 
     # parse all elements to dict
-    dropdown_category = {cat.id:cat.name for cat in categories.all()}
+    dropdown_category = {cat.id:cat.name for cat in categories}
 
     #endregion
 
@@ -201,12 +219,16 @@ def get(
 
     #endregion
 
+    # fetch the page
+    rows, pagination = tools._paginate(result, Products.id, page_size, cursor, amount)
+    emptyResult.update({'pagination':pagination})
+
     # result is None?
-    if result.first() is None: return{'success':True, 'error':"", 'data':emptyResult}
+    if len(rows) == 0: return{'success':True, 'error':"", 'data':emptyResult}
 
     # turn into list
     fetched = []
-    for row in result.all():
+    for row in rows:
 
         fetched.append({col.name:getattr(row, col.name) for col in row.__table__.columns})
 
@@ -222,7 +244,7 @@ def get(
         'data':emptyResult
     }
     
-def update(product_id:int, data:dict, language:str = app.config['DEFAULT_LANGUAGE']) -> dict:
+def update(product_id:int, data:dict, language:typing.Union[str, None] = None) -> dict:
     """Updates a single product
 
     params:
@@ -240,10 +262,10 @@ def update(product_id:int, data:dict, language:str = app.config['DEFAULT_LANGUAG
                 'store':str,
                 'phone':str
             }
-    language : str, optional
+    language : str | None, optional
         the language iso code. Needed for the
         error msg.
-        (default is app.config['DEFAULT_LANGUAGE])
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
 
     returns:
     -------
@@ -252,9 +274,10 @@ def update(product_id:int, data:dict, language:str = app.config['DEFAULT_LANGUAG
     
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
     # get language
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -325,7 +348,7 @@ def update(product_id:int, data:dict, language:str = app.config['DEFAULT_LANGUAG
     # fetch all possible categories
     categories = pd.read_sql_query(
         session.query(Category).statement,
-        session.bind
+        session.connection()
     )
 
     # get unique ids
@@ -387,7 +410,7 @@ def update(product_id:int, data:dict, language:str = app.config['DEFAULT_LANGUAG
         }
 
     # add logs
-    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.products.update', str(locals()))
+    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.products.update', tools._arguments(update, locals()))
 
     # did all work?
     return {
@@ -400,7 +423,207 @@ def update(product_id:int, data:dict, language:str = app.config['DEFAULT_LANGUAG
         }
     }
 
-def add(products:list, language:str = app.config['DEFAULT_LANGUAGE']) -> dict:
+def reprice(rule:dict, preview:bool = False, language:typing.Union[str, None] = None) -> dict:
+    """Changes the prices of multiple products
+
+    Applies a percentage rule to all products
+    of the filter (category and/or store). The
+    new prices & margins are calculated for all
+    products at once and written with one UPDATE
+    statement.
+
+    params:
+    -------
+    rule : dict
+        The price rule.
+            Format: {
+                'percentage':float, # -> 5 = +5 %
+                'price':str, # -> optional
+                'category':int | None, # -> optional
+                'store':str | None # -> optional
+            }
+            'price' options: { 'purchase_price',
+                'selling_price', 'both' }
+                (default is 'purchase_price')
+            Note: Without 'category' & 'store'
+                  the rule applies to all products.
+    preview : bool, optional
+        If True, only the changes are returned
+        (the db is not touched).
+        (default is False)
+    language : str | None, optional
+        the language iso code. Needed for the
+        error msg.
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
+
+    returns:
+    -------
+    dict
+        success, error & data {
+            'msg':str,
+            'preview':bool,
+            'changes':[
+                {
+                    'id':int,
+                    'name':str,
+                    'purchase_price':float,
+                    'new_purchase_price':float,
+                    'selling_price':float,
+                    'new_selling_price':float,
+                    'margin':float,
+                    'new_margin':float
+                },
+                ...
+            ]
+        }
+    
+    """
+
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
+    # get language
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
+
+    # get language errorcodes
+    errors = translation['error_codes']
+
+    # check if the rule is not empty
+    if not bool(rule): return {'success':False, 'error':errors['noEntry'], 'data':{}}
+
+    #region 'parse input'
+    # percentage
+    try: percentage = rule['percentage'] if isinstance(rule['percentage'], float) else float(".".join(str(rule['percentage']).split(",")))
+    except (KeyError, ValueError) as e: return {
+        'success':False,
+        'error':errors['wrongType'].format(
+            var = "percentage",
+            dtype = translation['type_mapping']['float'],
+        ),
+        'data':{}
+    }
+
+    # prices must stay positive & finite ('nan', 'inf' parse as floats)
+    if not math.isfinite(percentage) or percentage <= -100: return {'success':False, 'error':errors['wrongPriceRule'].format(key="percentage"), 'data':{}}
+
+    # price to change
+    priceType = rule.get('price') or "purchase_price"
+    if priceType not in ['purchase_price', 'selling_price', 'both']: return {
+        'success':False, 
+        'error':errors['wrongPriceRule'].format(key="price"), 
+        'data':{}
+    }
+
+    # filter
+    category_id = rule.get('category')
+    if category_id not in [None, "", "None"]:
+        try: category_id = int(category_id)
+        except ValueError as e: return {
+            'success':False,
+            'error':errors['wrongType'].format(
+                var = translation['column_mapping']['products']['category'],
+                dtype = translation['type_mapping']['int'],
+            ),
+            'data':{}
+        }
+
+    else: category_id = None
+
+    store = rule.get('store')
+    if store in ["", "None"]: store = None
+
+    #endregion
+
+    # create a session
+    session = Session()
+
+    # fetch the products of the filter
+    query = session.query(Products.id, Products.name, Products.purchase_price, Products.selling_price, Products.margin)
+    if category_id is not None: query = query.filter(Products.category == category_id)
+    if store is not None: query = query.filter(Products.store == str(store))
+
+    products = pd.read_sql_query(query.order_by(Products.id).statement, session.connection())
+
+    # calculate the new prices (vectorized)
+    factor = 1 + percentage / 100
+    columns = ['purchase_price', 'selling_price'] if priceType == "both" else [priceType]
+
+    for col in ['purchase_price', 'selling_price']:
+        products['new_' + col] = (products[col] * factor).round(2) if col in columns else products[col]
+
+    # products without selling price keep a margin of 0
+    products['new_margin'] = _margin(
+        products['new_selling_price'].where(products['new_selling_price'] != 0), 
+        products['new_purchase_price']
+    ).fillna(0.)
+
+    changes = products[[
+        'id', 'name', 'purchase_price', 'new_purchase_price', 
+        'selling_price', 'new_selling_price', 'margin', 'new_margin'
+    ]].to_dict('records')
+
+    # only return the changes?
+    if preview:
+
+        # close session
+        session.close()
+
+        return {
+            'success':True,
+            'error':"",
+            'data':{
+                'msg':translation['notification']['reprice_preview'].format(rows=len(changes)),
+                'preview':True,
+                'changes':changes
+            }
+        }
+
+    # update (one statement, all rows)
+    rows = [
+        {'product_id':productId, 'purchase_price':purchasePrice, 'selling_price':sellingPrice, 'margin':margin}
+        for productId, purchasePrice, sellingPrice, margin in zip(
+            products['id'].tolist(), products['new_purchase_price'].tolist(), 
+            products['new_selling_price'].tolist(), products['new_margin'].tolist()
+        )
+    ]
+
+    try:
+        if bool(rows): session.execute(Products.__table__.update().where(Products.__table__.c.id == bindparam('product_id')), rows)
+
+        session.commit()
+
+    except Exception as e:
+
+        code, msg = tools._convert_exception(e)
+
+        # close the session
+        session.close()
+
+        return {
+            'success':False,
+            'error':errors['unableOperation'].format(
+                operation = "update",
+                element = translation['table_mapping']['product'],
+                c=translation['column_mapping']['products']['id'] + " : " + ", ".join(str(row['product_id']) for row in rows),
+                e=str(code),
+                m=str(msg)
+            ),
+            'data':{}
+        }
+
+    # add logs
+    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.products.reprice', tools._arguments(reprice, locals()))
+
+    return {
+        'success':True,
+        'error':"",
+        'data':{
+            'msg':translation['notification']['repriced'].format(rows=len(changes)),
+            'preview':False,
+            'changes':changes
+        }
+    }
+
+def add(products:list, language:typing.Union[str, None] = None) -> dict:
     """Adds products to the db
 
     The add function either adds only one
@@ -422,10 +645,10 @@ def add(products:list, language:str = app.config['DEFAULT_LANGUAGE']) -> dict:
                 },
                 ...
             ]
-    language : str, optional
+    language : str | None, optional
         The language iso. Needed for the error
         msg.
-        (default is app.config['DEFAULT_LANGUAGE])
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
 
 
     returns:
@@ -435,10 +658,11 @@ def add(products:list, language:str = app.config['DEFAULT_LANGUAGE']) -> dict:
 
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
 
     # get language
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -454,7 +678,7 @@ def add(products:list, language:str = app.config['DEFAULT_LANGUAGE']) -> dict:
     # fetch all possible category numbers (with_entities for only one column)
     categories = pd.read_sql_query(
         session.query(Category).statement,
-        session.bind
+        session.connection()
     )
 
     # get unique ids
@@ -586,7 +810,7 @@ def add(products:list, language:str = app.config['DEFAULT_LANGUAGE']) -> dict:
         }
 
     # add logs
-    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.products.add', str(locals()))
+    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.products.add', tools._arguments(add, locals()))
 
     # did all work?
     return {
@@ -599,17 +823,17 @@ def add(products:list, language:str = app.config['DEFAULT_LANGUAGE']) -> dict:
         }
     }
 
-def delete(product_id:int, language:str = app.config['DEFAULT_LANGUAGE']) -> dict:
+def delete(product_id:int, language:typing.Union[str, None] = None) -> dict:
     """Deletes a product
 
     params:
     -------
     product_id : int
         the customer unique id.
-    language : str, optional
+    language : str | None, optional
         The language iso. Needed for the error
         msg.
-        (default is app.config['DEFAULT_LANGUAGE])
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
     
     returns:
     -------
@@ -618,9 +842,10 @@ def delete(product_id:int, language:str = app.config['DEFAULT_LANGUAGE']) -> dic
 
     """
 
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
     # get language
-    try: translation = language_files[language]
-    except: translation = language_files[app.config['DEFAULT_LANGUAGE']]
+    translation = get_translation(language, app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
@@ -671,7 +896,7 @@ def delete(product_id:int, language:str = app.config['DEFAULT_LANGUAGE']) -> dic
             }
 
     # add logs
-    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.products.delete', str(locals()))
+    if app.config['ACTION_LOGGING']: tools._update_logs(session, 'miniMoi.logic.functions.products.delete', tools._arguments(delete, locals()))
 
     # did all work?
     return {
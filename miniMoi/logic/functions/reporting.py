@@ -7,10 +7,11 @@ Contains functions in regards to the reporting
 import datetime
 
 import pandas as pd
+from sqlalchemy import func
 
 from miniMoi import app, Session
 import miniMoi.models.Models as models
-from miniMoi.language import language_files
+from miniMoi.language import get_translation
 import miniMoi.logic.helpers.time_module as time
 
 #region 'private functions' ---------------
@@ -20,14 +21,13 @@ import miniMoi.logic.helpers.time_module as time
 
 #region 'public functions' ----------------
 def get_report():
-    """Fetches the Orders & builds reports
-
-    The information from the table 'Orders'
-    gets fetched (time interval : this year).
-    Additionally the info for product and 
-    category are queried.
-    With those three informations, we create
-    the reporting values.
+    """Fetches the sales aggregates & builds reports
+
+    The daily sales aggregates ('SalesDaily')
+    of this year are fetched, already summed
+    per day, product & category.
+    With those aggregates, we create the
+    reporting values.
     
     params:
     -------
@@ -42,49 +42,58 @@ def get_report():
     """
 
     # get language
-    try: translation = language_files[app.config['DEFAULT_LANGUAGE']]
-    except: translation = language_files["EN"]
+    translation = get_translation(app.config['DEFAULT_LANGUAGE'])
 
     # get language errorcodes
     errors = translation['error_codes']
 
     #region 'get dates'
-    # what was the date of the first of this year?
     """
     CAUTION:
-    The orders are always saved at the previous day. So the first day of the
-    current year is the 31.12. of last year
+    The orders are always saved at the previous day. The aggregates
+    are already keyed by the delivery day (order date + 1 day).
     
     """
 
     today = time.today()
-    currentYear = time.today().year
-    startOfYear = time.parse_date_string(str(currentYear-1) + "-12-31")
-    endOfYear = time.parse_date_string(str(currentYear) + "-12-30")
+    currentYear = today.year
+    startOfYear = time.parse_date_string(str(currentYear) + "-01-01")
+    endOfYear = time.parse_date_string(str(currentYear) + "-12-31")
 
     #endregion
 
     # create session
     session = Session()
 
-    # get data for the current year
-    year = session.query(models.Orders).filter(models.Orders.date >= startOfYear).filter(models.Orders.date <= endOfYear)
-    year = pd.read_sql_query(year.statement, session.bind)
+    # get the aggregates for the current year (without the customer dimension)
+    year = session.query(
+        models.SalesDaily.date,
+        models.SalesDaily.product_name,
+        models.SalesDaily.category,
+        func.sum(models.SalesDaily.quantity).label("quantity"),
+        func.sum(models.SalesDaily.total).label("total")
+    ).filter(
+        models.SalesDaily.date >= startOfYear
+    ).filter(
+        models.SalesDaily.date <= endOfYear
+    ).group_by(
+        models.SalesDaily.date, models.SalesDaily.product_name, models.SalesDaily.category
+    )
+    year = pd.read_sql_query(year.statement, session.connection())
 
     #region 'prepare date'
-    # add one day to date (cause it gets booked in the previous day)
-    year.loc[:, 'date'] = year.loc[:, 'date'] + datetime.timedelta(days=1)
+    year['date'] = pd.to_datetime(year['date'])
 
     # get month, day & weekday
-    year['month'] = year['date'].map(lambda x: x.month)
-    year['day'] = year['date'].map(lambda x: x.day)
-    year['weekday'] = year['date'].map(lambda x: x.weekday())
+    year['month'] = year['date'].dt.month
+    year['day'] = year['date'].dt.day
+    year['weekday'] = year['date'].dt.weekday
 
     # replace weekday int with the name
-    year['weekday_name'] = year['weekday'].replace(translation['weekday_mapping'])
+    year['weekday_name'] = year['weekday'].map(translation['weekday_mapping'])
 
     # replace the month with its name
-    year['month_name'] = year['month'].replace(translation['month_mapping'])
+    year['month_name'] = year['month'].map(translation['month_mapping'])
 
     #endregion
 
@@ -4,20 +4,44 @@ Contains a collection of system operations
 """
 
 # import
-import shutil
 from pathlib import Path
 
-from miniMoi import app
-from miniMoi.language import language_files
+from miniMoi import app, engine, Session, base
+from miniMoi.language import get_translation
+from miniMoi.logic.db import sqlite
+from miniMoi.logic.helpers import audit
 import miniMoi.logic.helpers.time_module as time
 
+#region 'private functions' ------------------------
+def _not_supported(translation:dict) -> dict:
+    """Returns the error for non file dbs """
+
+    return {
+        'success':False,
+        'error':translation['error_codes']['backendNotSupported'].format(backend=engine.dialect.name),
+        'data':{}
+    }
+
+def _busy(translation:dict) -> dict:
+    """Returns the error for a db in use """
+
+    return {
+        'success':False,
+        'error':translation['error_codes']['dbBusy'],
+        'data':{}
+    }
+
+#endregion
+
 #region 'public functions' -------------------------
 def make_db_copy():
     """Copies the db to the mini-moi download folder """
 
     # get language files
-    try: translation = language_files[app.config['DEFAULT_LANGUAGE']]
-    except: translation = language_files['EN']
+    translation = get_translation(app.config['DEFAULT_LANGUAGE'])
+
+    # only db files can be copied
+    if not sqlite.uses_file(engine): return _not_supported(translation)
 
     # create home path
     fullPath = app.config['MINI_MOI_HOME'] / "backups"
@@ -31,8 +55,9 @@ def make_db_copy():
         str_format = "%Y-%m-%d"
         )
 
-    # copy the mini-moi app to the database
-    shutil.copyfile(str(app.config['DB_FILE_PATH']), (fullPath/("app_backup_" + today + ".db")))
+    # copy the mini-moi app to the database (incl. the WAL)
+    audit.flush()
+    sqlite.backup(engine, str(fullPath/("app_backup_" + today + ".db")))
 
     return {
         'success':True,
@@ -64,14 +89,19 @@ def rollback_db_save(filename:str) -> dict:
     """
 
     # get language files
-    try: translation = language_files[app.config['DEFAULT_LANGUAGE']]
-    except: translation = language_files['EN']
+    translation = get_translation(app.config['DEFAULT_LANGUAGE'])
+
+    # only db files can be exchanged
+    if not sqlite.uses_file(engine): return _not_supported(translation)
 
     # create source path
     sourcePath = app.config['MINI_MOI_HOME'] / "backups" / filename
 
-    # copy it to the cwd db
-    shutil.copyfile(str(sourcePath), str(app.config['DB_FILE_PATH']))
+    # copy it to the cwd db (no open connections)
+    audit.flush()
+    if not sqlite.release(engine, Session): return _busy(translation)
+
+    sqlite.restore(str(sourcePath), str(app.config['DB_FILE_PATH']))
 
     return {
         'success':True,
@@ -82,9 +112,22 @@ def rollback_db_save(filename:str) -> dict:
     }
 
 def delete_db() -> dict:
-    """Deletes the database. Handle with care! """
+    """Deletes the database. Handle with care! 
+    
+    Server backends (e.g. postgresql) keep the
+    database, only the tables are dropped.
+
+    """
+
+    audit.flush()
+
+    if not sqlite.uses_file(engine):
+        Session.remove()
+        base.metadata.drop_all(engine)
+
+    elif not sqlite.release(engine, Session): return _busy(get_translation(app.config['DEFAULT_LANGUAGE']))
 
-    app.config['DB_FILE_PATH'].unlink()
+    else: app.config['DB_FILE_PATH'].unlink()
     
     return {
         'success':True,
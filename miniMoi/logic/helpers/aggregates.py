@@ -0,0 +1,179 @@
+"""
+Contains the materialized sales aggregates
+
+The table 'SalesDaily' keeps the daily sums of
+the 'Orders' (per product, category & customer).
+The rows are updated incrementally during the
+booking and the reporting only reads these
+pre-aggregated rows.
+
+"""
+
+# imports
+import pandas as pd
+from sqlalchemy import bindparam
+
+from miniMoi.models.Models import Orders, SalesDaily
+
+# the aggregation key & the summed values
+KEYS = ['date', 'product', 'product_name', 'category', 'customer_id']
+VALUES = ['quantity', 'total', 'orders']
+
+#region 'functions'
+def aggregate_orders(orders:pd.DataFrame) -> pd.DataFrame:
+    """Aggregates order rows to daily sales rows
+
+    CAUTION:
+    The orders are always booked the day before
+    the delivery. The aggregates are keyed by the
+    delivery day (order date + 1 day, midnight).
+
+    params:
+    -------
+    orders : pd.DataFrame
+        The order rows.
+            Columns: { 'date', 'product', 'product_name',
+                       'category', 'customer_id', 'quantity',
+                       'total' }
+
+    returns:
+    --------
+    pd.DataFrame
+        One row per key.
+            Columns: KEYS + VALUES
+
+    """
+
+    if orders.empty: return pd.DataFrame(columns=KEYS + VALUES)
+
+    df = orders[KEYS + ['quantity', 'total']].copy()
+    # (the cache check of 'to_datetime()' turns datetime columns into objects)
+    if not pd.api.types.is_datetime64_any_dtype(df['date']): df['date'] = pd.to_datetime(df['date'])
+    df['date'] = df['date'].dt.floor("D") + pd.Timedelta(days=1)
+    df['orders'] = 1
+
+    return df.groupby(KEYS, dropna=False, sort=True)[VALUES].sum().reset_index()
+
+def _records(df:pd.DataFrame) -> list:
+    """Converts the frame into db ready dicts (native types, None for nan) """
+
+    columns = {
+        col:df[col].astype(object).where(df[col].notnull(), None).tolist() for col in KEYS + VALUES if col != "date"
+    }
+    columns['date'] = df['date'].dt.to_pydatetime().tolist()
+
+    return [dict(zip(columns.keys(), row)) for row in zip(*columns.values())]
+
+def upsert_sales(session, sales:pd.DataFrame) -> dict:
+    """Adds the sales to the aggregates
+
+    Existing keys are incremented, new keys are
+    inserted. Both with one executemany statement.
+    The session is not committed.
+
+    params:
+    -------
+    session : sqlAlchemy session object
+        The session to write with.
+    sales : pd.DataFrame
+        The output of 'aggregate_orders()'.
+
+    returns:
+    --------
+    dict
+        {'inserted':int, 'updated':int}
+
+    """
+
+    if sales.empty: return {'inserted':0, 'updated':0}
+
+    table = SalesDaily.__table__
+
+    # fetch the existing keys of the affected days
+    rows = session.execute(
+        session.query(SalesDaily.id, *[getattr(SalesDaily, key) for key in KEYS]).filter(
+            SalesDaily.date >= sales['date'].min().to_pydatetime()
+        ).filter(
+            SalesDaily.date <= sales['date'].max().to_pydatetime()
+        ).statement
+    ).fetchall()
+
+    sales = sales.assign(row_id=None)
+    if len(rows) > 0:
+
+        existing = pd.DataFrame([tuple(row) for row in rows], columns=['row_id'] + KEYS)
+        existing['date'] = pd.to_datetime(existing['date'])
+
+        sales = pd.merge(sales.drop(columns="row_id"), existing, how="left", on=KEYS)
+
+    toUpdate = sales[sales['row_id'].notnull()]
+    toInsert = sales[sales['row_id'].isnull()].drop(columns="row_id")
+
+    if not toUpdate.empty:
+
+        session.execute(
+            table.update().where(table.c.id == bindparam('row_id')).values(
+                quantity = table.c.quantity + bindparam('add_quantity'),
+                total = table.c.total + bindparam('add_total'),
+                orders = table.c.orders + bindparam('add_orders')
+            ),
+            [
+                {'row_id':rowId, 'add_quantity':quantity, 'add_total':total, 'add_orders':orders}
+                for rowId, quantity, total, orders in zip(
+                    toUpdate['row_id'].astype(int).tolist(),
+                    toUpdate['quantity'].astype(int).tolist(),
+                    toUpdate['total'].astype(float).tolist(),
+                    toUpdate['orders'].astype(int).tolist()
+                )
+            ]
+        )
+
+    if not toInsert.empty: session.execute(table.insert(), _records(toInsert))
+
+    return {'inserted':len(toInsert), 'updated':len(toUpdate)}
+
+def rebuild_sales(session, chunk_size:int = 50_000) -> int:
+    """Rebuilds the aggregates from the 'Orders' table
+
+    Used to backfill databases which were created
+    before the aggregates existed. The orders are
+    read in chunks, so the memory stays bounded by
+    the number of keys.
+    The session is not committed.
+
+    params:
+    -------
+    session : sqlAlchemy session object
+        The session to write with.
+    chunk_size : int, optional
+        The number of orders per chunk.
+        (default is 50_000)
+
+    returns:
+    --------
+    int
+        The number of aggregate rows.
+
+    """
+
+    session.query(SalesDaily).delete(synchronize_session=False)
+
+    query = session.query(
+        Orders.date, Orders.product, Orders.product_name, Orders.category,
+        Orders.customer_id, Orders.quantity, Orders.total
+    )
+
+    parts = [
+        aggregate_orders(chunk) for chunk in pd.read_sql_query(query.statement, session.connection(), chunksize=chunk_size)
+    ]
+    parts = [part for part in parts if not part.empty]
+    if len(parts) == 0: return 0
+
+    # keys can be split over chunks
+    sales = pd.concat(parts).groupby(KEYS, dropna=False, sort=True)[VALUES].sum().reset_index()
+
+    session.execute(SalesDaily.__table__.insert(), _records(sales))
+
+    return len(sales)
+
+#endregion
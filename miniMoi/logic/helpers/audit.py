@@ -0,0 +1,280 @@
+"""
+Contains the buffered audit log writer
+
+User actions (ACTION_LOGGING) are not committed
+within the request anymore. They are put into a
+bounded queue and a background flusher inserts
+them in batches (one transaction per batch and
+database). The queue is flushed on shutdown.
+
+Engines which share one connection across all
+threads (in memory dbs) are written synchronously
+by the caller: a commit of the flusher would
+commit the open transaction of the request.
+
+The action payload is a size capped json string
+(long lists, e.g. of a bulk import, are reduced
+to their length & first items).
+
+"""
+
+# imports
+import sys
+import json
+import queue
+import atexit
+import typing
+import datetime
+import threading
+
+from miniMoi import app
+from miniMoi.models.Models import Log
+from miniMoi.logic.db import sqlite
+
+# defaults (overwritten by the app config)
+QUEUE_SIZE = 10000
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 1.0 # -> seconds
+MAX_PAYLOAD = 500 # -> characters (size of 'Log.action')
+MAX_ITEMS = 10 # -> list items & dict keys kept in the payload
+MAX_STRING = 100 # -> characters per string in the payload
+MAX_DEPTH = 3 # -> nesting levels kept in the payload
+
+# stops the flusher
+_STOP = object()
+
+# writer state (guarded by the lock)
+_lock = threading.Lock()
+_queue = None
+_flusher = None
+
+#region 'private functions'
+def _config(key:str, default:typing.Any) -> typing.Any:
+    """Returns the app config value (or the default) """
+
+    try: return app.config.get(key, default)
+    except RuntimeError: return default
+
+def _compact(value:typing.Any, depth:int = 0) -> typing.Any:
+    """Reduces the value to a small json compatible structure """
+
+    if value is None or isinstance(value, (bool, int, float)): return value
+
+    if isinstance(value, str): return value if len(value) <= MAX_STRING else value[:MAX_STRING] + "..."
+
+    if isinstance(value, (datetime.datetime, datetime.date)): return value.isoformat()
+
+    if depth >= MAX_DEPTH: return "<" + type(value).__name__ + ">"
+
+    if isinstance(value, dict):
+        compact = {str(key):_compact(val, depth + 1) for key, val in list(value.items())[:MAX_ITEMS]}
+        if len(value) > MAX_ITEMS: compact['...'] = len(value)
+
+        return compact
+
+    if isinstance(value, (list, tuple, set)):
+        items = list(value)
+        if len(items) <= MAX_ITEMS: return [_compact(val, depth + 1) for val in items]
+
+        return {'len':len(items), 'head':[_compact(val, depth + 1) for val in items[:MAX_ITEMS]]}
+
+    return "<" + type(value).__name__ + ">"
+
+def _write(batch:list) -> None:
+    """Inserts the batch (one transaction per engine) """
+
+    engines = {}
+    for engine, row in batch: engines.setdefault(engine, []).append(row)
+
+    for engine, rows in engines.items():
+
+        try:
+            with engine.begin() as connection: connection.execute(Log.__table__.insert(), rows)
+
+        except Exception as e:
+
+            print("NOT ABLE TO LOG: ", str(len(rows)), " actions (", type(e).__name__, ": ", str(e), ")")
+            sys.stdout.flush()
+
+def _write_now(engine, row:dict, session = None) -> None:
+    """Inserts the row in the calling thread
+
+    With a session the row is part of its open
+    transaction (committed or rolled back with
+    it). Without an open transaction the row is
+    committed right away.
+
+    """
+
+    if session is None: return _write([(engine, row)])
+
+    try:
+
+        inTransaction = session.in_transaction()
+        session.execute(Log.__table__.insert(), [row])
+        if not inTransaction: session.commit()
+
+    except Exception as e:
+
+        print("NOT ABLE TO LOG: ", row['ressource'], " (", type(e).__name__, ": ", str(e), ")")
+        sys.stdout.flush()
+
+def _run(log_queue:queue.Queue, batch_size:int, interval:float) -> None:
+    """The flusher loop (background thread) """
+
+    stop = False
+    while not stop:
+
+        # wait for the first entry
+        try: entry = log_queue.get(timeout=interval)
+        except queue.Empty: continue
+
+        batch, done = [], 1
+        if entry is _STOP: stop = True
+        else: batch.append(entry)
+
+        # drain up to the batch size
+        while not stop and len(batch) < batch_size:
+
+            try: entry = log_queue.get_nowait()
+            except queue.Empty: break
+
+            done += 1
+            if entry is _STOP: stop = True
+            else: batch.append(entry)
+
+        if batch: _write(batch)
+
+        for _ in range(done): log_queue.task_done()
+
+def _get_queue() -> queue.Queue:
+    """Returns the queue (starts the flusher on first use) """
+
+    global _queue, _flusher
+
+    with _lock:
+
+        if _flusher is None or not _flusher.is_alive():
+
+            _queue = queue.Queue(maxsize=_config('AUDIT_QUEUE_SIZE', QUEUE_SIZE))
+            _flusher = threading.Thread(
+                target=_run,
+                args=(_queue, _config('AUDIT_BATCH_SIZE', BATCH_SIZE), _config('AUDIT_FLUSH_INTERVAL', FLUSH_INTERVAL)),
+                name="miniMoi-audit",
+                daemon=True
+            )
+            _flusher.start()
+
+        return _queue
+
+#endregion
+
+#region 'functions'
+def payload(action:typing.Any, max_size:typing.Union[int, None] = None) -> str:
+    """Returns the size capped json payload
+
+    params:
+    -------
+    action : any
+        The action (e.g. the function arguments).
+    max_size : int | None, optional
+        Max. characters.
+        (default is None -> app.config['AUDIT_MAX_PAYLOAD'])
+
+    returns:
+    --------
+    str
+        The json payload (cut with '...' if too long).
+
+    """
+
+    maxSize = max_size or _config('AUDIT_MAX_PAYLOAD', MAX_PAYLOAD)
+
+    text = action if isinstance(action, str) else json.dumps(_compact(action), separators=(",", ":"), default=str)
+
+    return text if len(text) <= maxSize else text[:maxSize - 3] + "..."
+
+def log(engine, ressource:str, action:typing.Any, session = None) -> bool:
+    """Queues the user action
+
+    Engines with one shared connection (see
+    'sqlite.shares_connection()') are written
+    synchronously instead.
+
+    params:
+    -------
+    engine : sqlalchemy engine
+        The engine of the db to write to.
+    ressource : str
+        The function name/endpoint which was called.
+    action : any
+        The action (see 'payload()').
+    session : sqlAlchemy session object, optional
+        The session of the caller. Used for the
+        synchronous writes.
+        (default is None)
+
+    returns:
+    --------
+    bool
+        False if the queue was full (the action
+        is dropped after waiting 1 second).
+
+    """
+
+    row = {
+        'date':datetime.datetime.utcnow(),
+        'ressource':payload(str(ressource)),
+        'action':payload(action)
+    }
+
+    # one connection -> write on the caller's transaction
+    if sqlite.shares_connection(engine):
+        _write_now(engine, row, session)
+        return True
+
+    try: _get_queue().put((engine, row), timeout=1.0)
+    except queue.Full:
+
+        print("NOT ABLE TO LOG (queue full): ", row['ressource'], row['action'])
+        sys.stdout.flush()
+
+        return False
+
+    return True
+
+def flush() -> None:
+    """Waits until all queued actions are written
+
+    returns:
+    --------
+    None
+
+    """
+
+    with _lock: logQueue = _queue if _flusher is not None and _flusher.is_alive() else None
+
+    if logQueue is not None: logQueue.join()
+
+def shutdown() -> None:
+    """Writes the queued actions & stops the flusher
+
+    returns:
+    --------
+    None
+
+    """
+
+    global _queue, _flusher
+
+    with _lock: logQueue, flusher, _queue, _flusher = _queue, _flusher, None, None
+
+    if flusher is None or not flusher.is_alive(): return
+
+    logQueue.put(_STOP)
+    flusher.join()
+
+#endregion
+
+# write the buffered actions before the interpreter exits
+atexit.register(shutdown)
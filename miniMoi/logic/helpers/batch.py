@@ -0,0 +1,185 @@
+"""
+Contains the transaction handling of batch requests
+
+A batch runs several api ressources in one session
+and one transaction. The logic functions keep their
+own 'session.commit()', 'session.rollback()' &
+'session.close()' calls. Within a batch these only
+act on the savepoint of the current item:
+    - commit -> flush (the savepoint is released
+      after the item)
+    - rollback -> rolls back the savepoint of the
+      item (the other items are kept)
+    - close -> no-op
+
+The transaction is committed (or rolled back)
+once at the end of the batch. The audit log
+entries of the items are held back until then:
+they are queued after the final commit and
+dropped with a rolled back item or batch.
+
+"""
+
+# imports
+import typing
+import contextlib
+
+from sqlalchemy.orm import Session as OrmSession, sessionmaker
+
+from miniMoi.logic.db import sqlite
+from miniMoi.logic.helpers import audit
+
+#region 'session'
+class BatchSession(OrmSession):
+    """Session of a batch request
+
+    Use 'item()' to run one batch item within
+    a savepoint.
+
+    """
+
+    _item = None
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Creates the session & the held audit logs """
+
+        super().__init__(*args, **kwargs)
+
+        # (ressource, payload) of the batch & of the current item
+        self._logs = []
+        self._itemLogs = []
+
+    def commit(self) -> None:
+        """Flushes within an item, else commits & queues the logs """
+
+        if self._item is not None: return self.flush()
+
+        super().commit()
+
+        logs, self._logs = self._logs, []
+        for ressource, action in logs: audit.log(self.get_bind(), ressource, action, self)
+
+    def rollback(self) -> None:
+        """Rolls back the item savepoint, else the transaction """
+
+        if self._item is None:
+            self._logs = []
+            return super().rollback()
+
+        if self._open():
+            self._itemLogs = []
+            self._item.rollback()
+
+    def log(self, ressource:str, action) -> None:
+        """Holds the audit log until the batch is committed
+
+        params:
+        -------
+        ressource : str
+            The function name/endpoint which was called.
+        action : any
+            The action (see 'audit.payload()').
+
+        returns:
+        --------
+        None
+
+        """
+
+        entry = (ressource, audit.payload(action))
+
+        if self._item is None: self._logs.append(entry)
+        else: self._itemLogs.append(entry)
+
+    def _open(self) -> bool:
+        """True if the item savepoint is not rolled back yet """
+
+        return self._item is not None and self._item is self.get_nested_transaction()
+
+    def close(self) -> None:
+        """Ignored within an item """
+
+        if self._item is None:
+            self._logs = []
+            return super().close()
+
+    @contextlib.contextmanager
+    def item(self) -> typing.Iterator[dict]:
+        """Runs the block within a savepoint
+
+        Set 'success' of the yielded dict to False
+        to roll the item back. Exceptions roll the
+        item back & are passed on.
+
+        yields:
+        -------
+        dict
+            {'success':bool}
+
+        """
+
+        state = {'success':True}
+        self._item = self.begin_nested()
+        self._itemLogs = []
+
+        try: yield state
+        except Exception:
+            state['success'] = False
+            raise
+
+        finally:
+
+            # rolled back by the logic function?
+            if not self._open(): state['success'] = False
+
+            # (a failed flush deactivates the savepoint)
+            elif state['success'] and self._item.is_active:
+                self._item.commit()
+                self._logs.extend(self._itemLogs)
+
+            else:
+                state['success'] = False
+                self._item.rollback()
+
+            self._item = None
+            self._itemLogs = []
+
+#endregion
+
+#region 'functions'
+@contextlib.contextmanager
+def session(scoped) -> typing.Iterator[BatchSession]:
+    """Installs a batch session in the scoped session
+
+    The logic functions get the batch session from
+    'Session()' (same thread). After the block the
+    batch session is removed again.
+
+    params:
+    -------
+    scoped : sqlalchemy scoped_session
+        The scoped session (e.g. 'miniMoi.Session').
+
+    yields:
+    -------
+    BatchSession
+        Commit or roll back the transaction at the
+        end of the block.
+
+    """
+
+    scoped.remove()
+
+    batchSession = sessionmaker(class_=BatchSession, **scoped.session_factory.kw)()
+    scoped.registry.set(batchSession)
+
+    try:
+
+        # savepoints need an explicit BEGIN (pysqlite)
+        sqlite.begin(batchSession.connection())
+
+        yield batchSession
+
+    finally: scoped.remove()
+
+#endregion
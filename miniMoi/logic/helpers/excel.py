@@ -12,9 +12,168 @@ import xlsxwriter as xlsx
 from pathlib import Path
 
 import miniMoi.logic.helpers.time_module as time
-from miniMoi.language import language_files
+from miniMoi.language import get_translation
 
 # region 'private functions' ------------------------
+def _workbook(output:typing.Union[io.BytesIO, str]) -> xlsx.Workbook:
+    """Creates a streaming workbook
+
+    'constant_memory' flushes each row to a
+    temp file as soon as the next row is
+    written. The rows must therefore be
+    written in ascending order.
+
+    """
+
+    return xlsx.Workbook(output, {'nan_inf_to_errors': True, 'constant_memory':True})
+
+def _formats(workbook:xlsx.Workbook) -> dict:
+    """Creates the cell formats once per workbook
+
+    All worksheets of the workbook share
+    these formats.
+
+    params:
+    -------
+    workbook : xlsxwriter.Workbook
+        The workbook to add the formats to.
+
+    returns:
+    --------
+    dict
+        {name:xlsxwriter.format.Format}
+
+    """
+
+    highlight = "b2b2b2"
+    offwhite = "eeeeee"
+
+    return {
+        'title':workbook.add_format({
+            'bold':1,
+            'font_size':12,
+            'font_name':"Grotesk",
+            'align':"left",
+            'valign':"vcenter",
+            'text_wrap':True
+            }),
+        'notes':workbook.add_format({
+            'bold':1,
+            'font_name':"Grotesk",
+            'align':"left",
+            'valign':"vcenter",
+            'text_wrap':True,
+            'bg_color':offwhite
+        }),
+        'notes_bg':workbook.add_format({
+            'bg_color':offwhite,
+            'font_name':"Grotesk",
+            'text_wrap':True,
+            'align':"left",
+            'valign':"vcenter",
+        }),
+        'subtitle':workbook.add_format({
+            'bold':1,
+            'font_size':10,
+            'font_name':"Grotesk",
+            'align':"left",
+            'valign':"vcenter",
+            'text_wrap':True,
+            'bottom':2
+        }),
+        'table_head':workbook.add_format({
+            'align':"left",
+            'font_size':9,
+            'font_name':"Grotesk",
+            'valign':"vcenter",
+            'text_wrap':True,
+            'bg_color':highlight,
+            'bottom':1
+        }),
+        'table':workbook.add_format({
+            'align':"left",
+            'font_size':8,
+            'font_name':"Grotesk",
+            'valign':"vcenter",
+            'text_wrap':True,
+            'bottom':4
+        }),
+        'table_no_border':workbook.add_format({
+            'align':"left",
+            'font_size':8,
+            'font_name':"Grotesk",
+            'valign':"vcenter",
+            'text_wrap':True
+        }),
+        'table_separator':workbook.add_format({
+            'align':"left",
+            'font_size':8,
+            'font_name':"Grotesk",
+            'valign':"vcenter",
+            'text_wrap':True,
+            'bottom':1
+        })
+        }
+
+class _RowBuffer():
+    """Collects cells & writes them in row order
+
+    The cover layout writes blocks side by side
+    (column wise). In 'constant_memory' mode
+    this is not possible, so the cells are
+    buffered and written row by row on 'flush()'.
+    Only use it for small blocks.
+
+    attributes:
+    ----------
+    worksheet : xlsxwriter.Worksheet
+        The worksheet to write to.
+
+    methods:
+    --------
+    write
+        Buffers one cell.
+    merge_range
+        Buffers a merged range.
+    flush
+        Writes all buffered cells.
+
+    """
+
+    def __init__(self, worksheet):
+        """Init the buffer """
+
+        self.worksheet = worksheet
+        self.cells = {}
+        self.merges = {}
+
+    def write(self, row:int, col:int, value:typing.Any, cell_format = None) -> None:
+        """Buffers one cell """
+
+        self.cells.setdefault(row, {})[col] = (value, cell_format)
+
+    def merge_range(self, first_row:int, first_col:int, last_row:int, last_col:int, value:typing.Any, cell_format = None) -> None:
+        """Buffers a merged range (value in the first cell, formatted blanks else) """
+
+        self.merges.setdefault(first_row, []).append((first_row, first_col, last_row, last_col))
+
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                self.write(row, col, value if (row, col) == (first_row, first_col) else "", cell_format)
+
+    def flush(self) -> None:
+        """Writes the buffered cells in row order """
+
+        for row in sorted(set(self.cells) | set(self.merges)):
+
+            # only registers the range: unformatted blanks are not written
+            for merge in self.merges.get(row, []): self.worksheet.merge_range(*merge, "", None)
+
+            for col, (value, cellFormat) in sorted(self.cells.get(row, {}).items()):
+                self.worksheet.write(row, col, value, cellFormat)
+
+        self.cells = {}
+        self.merges = {}
 
 #endregion
 
@@ -72,8 +231,7 @@ def print_cover(
     """
 
     # get language files
-    try: xlsx_language = language_files[language]['xlsx']
-    except: xlsx_language = language_files["EN"]['xlsx']
+    xlsx_language = get_translation(language)['xlsx']
 
     # grab current date
     useDate = time.today()
@@ -89,7 +247,7 @@ def print_cover(
     else: output = str(path)
     
     # create workbook & worksheet
-    workbook = xlsx.Workbook(output, {'nan_inf_to_errors': True})
+    workbook = _workbook(output)
     worksheet = workbook.add_worksheet("overview")
 
     # create meta data
@@ -110,68 +268,16 @@ def print_cover(
     worked = worksheet.set_header('&L&G', {'image-left': Path().cwd()/"miniMoi/static/img/miniMoi_logo.png"})
 
     print(worked)
-    #region 'format cells'
-    highlight = "b2b2b2"
-    offwhite = "eeeeee"
+    # shared formats
+    formats = _formats(workbook)
 
-    formats = {
-        'title':workbook.add_format({
-            'bold':1,
-            'font_size':12,
-            'font_name':"Grotesk",
-            'align':"left",
-            'valign':"vcenter",
-            'text_wrap':True
-            }),
-        'notes':workbook.add_format({
-            'bold':1,
-            'font_name':"Grotesk",
-            'align':"left",
-            'valign':"vcenter",
-            'text_wrap':True,
-            'bg_color':offwhite
-        }),
-        'notes_bg':workbook.add_format({
-            'bg_color':offwhite,
-            'font_name':"Grotesk",
-            'text_wrap':True,
-            'align':"left",
-            'valign':"vcenter",
-        }),
-        'subtitle':workbook.add_format({
-            'bold':1,
-            'font_size':10,
-            'font_name':"Grotesk",
-            'align':"left",
-            'valign':"vcenter",
-            'text_wrap':True,
-            'bottom':2
-        }),
-        'table_head':workbook.add_format({
-            'align':"left",
-            'font_size':9,
-            'font_name':"Grotesk",
-            'valign':"vcenter",
-            'text_wrap':True,
-            'bg_color':highlight,
-            'bottom':1
-        }),
-        'table':workbook.add_format({
-            'align':"left",
-            'font_size':8,
-            'font_name':"Grotesk",
-            'valign':"vcenter",
-            'text_wrap':True,
-            'bottom':4
-        })
-        }
-
-    #endregion
+    # the blocks are written side by side -> buffer & write row wise
+    buffer = _RowBuffer(worksheet)
 
     #region 'write'
     #region 'write info'
     # write title
-    worksheet.merge_range(
+    buffer.merge_range(
         1,0, 
         2,5, 
         xlsx_language['title_overview'].format(
@@ -182,13 +288,13 @@ def print_cover(
         )
 
     # write notes
-    worksheet.merge_range(
+    buffer.merge_range(
         4,0,
         4,5,
         xlsx_language['notes'],
         formats['notes']
         )
-    worksheet.merge_range(
+    buffer.merge_range(
         5,0,
         9,5,
         "",
@@ -196,28 +302,28 @@ def print_cover(
         )
 
     # add kilometers
-    worksheet.merge_range(
+    buffer.merge_range(
         1,7,
         1,8,
         xlsx_language['km'],
         formats['subtitle']
         )
-    worksheet.write(2,7, xlsx_language['start'], formats['table'])
-    worksheet.write(2,8, "", formats['table'])
-    worksheet.write(3,7, xlsx_language['end'], formats['table'])
-    worksheet.write(3,8, "", formats['table'])
+    buffer.write(2,7, xlsx_language['start'], formats['table'])
+    buffer.write(2,8, "", formats['table'])
+    buffer.write(3,7, xlsx_language['end'], formats['table'])
+    buffer.write(3,8, "", formats['table'])
 
     # add time
-    worksheet.merge_range(
+    buffer.merge_range(
         6,7,
         6,8,
         xlsx_language['time'],
         formats['subtitle']
         )
-    worksheet.write(7,7, xlsx_language['start'], formats['table'])
-    worksheet.write(7,8, "", formats['table'])
-    worksheet.write(8,7, xlsx_language['end'], formats['table'])
-    worksheet.write(8,8, "", formats['table'])
+    buffer.write(7,7, xlsx_language['start'], formats['table'])
+    buffer.write(7,8, "", formats['table'])
+    buffer.write(8,7, xlsx_language['end'], formats['table'])
+    buffer.write(8,8, "", formats['table'])
 
     #endregion
 
@@ -253,7 +359,7 @@ def print_cover(
         n_cols = len(tmp.keys())
 
         # write category name
-        worksheet.merge_range(
+        buffer.merge_range(
             cursor_row, cursor_col,
             cursor_row, cursor_col + n_cols -1,
             str(category),
@@ -269,8 +375,8 @@ def print_cover(
         for col in tmp:
 
             # write the column name
-            try: worksheet.write(cursor_row, cursor_col, xlsx_language[col], formats['table_head'])
-            except: worksheet.write(cursor_row, cursor_col, col, formats['table_head'])
+            try: buffer.write(cursor_row, cursor_col, xlsx_language[col], formats['table_head'])
+            except: buffer.write(cursor_row, cursor_col, col, formats['table_head'])
 
             # add to cursor
             cursor_row +=1
@@ -280,7 +386,7 @@ def print_cover(
             for row in tmp[col]:
                 
                 # write value
-                worksheet.write(cursor_row, cursor_col, row, formats['table'])
+                buffer.write(cursor_row, cursor_col, row, formats['table'])
 
                 # add to cursor
                 cursor_row +=1
@@ -312,7 +418,7 @@ def print_cover(
     cursor_col = 7
 
     # write name
-    worksheet.merge_range(
+    buffer.merge_range(
         cursor_row_start, cursor_col,
         cursor_row_start, cursor_col + 1,
         xlsx_language['total'],
@@ -323,15 +429,15 @@ def print_cover(
     cursor_row_start +=1
 
     # write heads
-    worksheet.write(cursor_row_start, cursor_col, xlsx_language['quantity'], formats['table_head'])
-    worksheet.write(cursor_row_start, cursor_col+1, xlsx_language['category_name'], formats['table_head'])
+    buffer.write(cursor_row_start, cursor_col, xlsx_language['quantity'], formats['table_head'])
+    buffer.write(cursor_row_start, cursor_col+1, xlsx_language['category_name'], formats['table_head'])
 
     # add to cursor
     cursor_row_start +=1
 
     # write data
-    for i, row in enumerate(category_overview['quantity']): worksheet.write(cursor_row_start + i, cursor_col, row, formats['table'])
-    for i, row in enumerate(category_overview['category_name']): worksheet.write(cursor_row_start + i, cursor_col+1, row, formats['table'])
+    for i, row in enumerate(category_overview['quantity']): buffer.write(cursor_row_start + i, cursor_col, row, formats['table'])
+    for i, row in enumerate(category_overview['category_name']): buffer.write(cursor_row_start + i, cursor_col+1, row, formats['table'])
 
     #endregion
 
@@ -339,6 +445,9 @@ def print_cover(
 
     #endregion
 
+    # write rows in order
+    buffer.flush()
+
     # close & save
     workbook.close()
 
@@ -409,8 +518,7 @@ def print_order_list(
     """
 
     # get language files
-    try: xlsx_language = language_files[language]['xlsx']
-    except: xlsx_language = language_files["EN"]['xlsx']
+    xlsx_language = get_translation(language)['xlsx']
 
     # grab current date
     useDate = time.today()
@@ -426,7 +534,7 @@ def print_order_list(
     else: output = str(path)
     
     # create workbook & worksheet
-    workbook = xlsx.Workbook(output, {'nan_inf_to_errors': True})
+    workbook = _workbook(output)
     worksheet = workbook.add_worksheet("order details")
     worksheet.set_landscape()
 
@@ -464,75 +572,8 @@ def print_order_list(
 
     #endregion
 
-    highlight = "b2b2b2"
-    offwhite = "eeeeee"
-
-    formats = {
-        'title':workbook.add_format({
-            'bold':1,
-            'font_size':12,
-            'font_name':"Grotesk",
-            'align':"left",
-            'valign':"vcenter",
-            'text_wrap':True
-            }),
-        'notes':workbook.add_format({
-            'bold':1,
-            'font_name':"Grotesk",
-            'align':"left",
-            'valign':"vcenter",
-            'text_wrap':True,
-            'bg_color':offwhite
-        }),
-        'notes_bg':workbook.add_format({
-            'bg_color':offwhite,
-            'font_name':"Grotesk",
-            'text_wrap':True,
-            'align':"left",
-            'valign':"vcenter",
-        }),
-        'subtitle':workbook.add_format({
-            'bold':1,
-            'font_size':10,
-            'font_name':"Grotesk",
-            'align':"left",
-            'valign':"vcenter",
-            'text_wrap':True,
-            'bottom':2
-        }),
-        'table_head':workbook.add_format({
-            'align':"left",
-            'font_size':9,
-            'font_name':"Grotesk",
-            'valign':"vcenter",
-            'text_wrap':True,
-            'bg_color':highlight,
-            'bottom':1
-        }),
-        'table':workbook.add_format({
-            'align':"left",
-            'font_size':8,
-            'font_name':"Grotesk",
-            'valign':"vcenter",
-            'text_wrap':True,
-            'bottom':4
-        }),
-        'table_no_border':workbook.add_format({
-            'align':"left",
-            'font_size':8,
-            'font_name':"Grotesk",
-            'valign':"vcenter",
-            'text_wrap':True
-        }),
-        'table_separator':workbook.add_format({
-            'align':"left",
-            'font_size':8,
-            'font_name':"Grotesk",
-            'valign':"vcenter",
-            'text_wrap':True,
-            'bottom':1
-        })
-        }
+    # shared formats
+    formats = _formats(workbook)
 
     #endregion
 
@@ -571,100 +612,165 @@ def print_order_list(
     n_cols = len(neededCols) + 1
 
     # set cursor
-    cursor_row_start = 4
     cursor_row = 4
-    cursor_col = 0
+
+    """
+    CAUTION:
+    The workbook streams the rows ('constant_memory').
+    Each town block is therefore written row by row:
+        title, column heads, one row per entry.
+    Repeated values (same as the row above) are left blank
+    and the last row of each group (first column) gets
+    the separator border.
+    
+    """
 
     # for each town
     for town in data:
 
-        # get town
-        tmp = data[town]
-
-        # kill not needed columns
-        tmp = {col:tmp[col] for col in neededCols}
+        # get town & kill not needed columns
+        tmp = [data[town][col] for col in neededCols]
+        first = tmp[0]
+        n_rows = len(first)
 
         # write town name
         worksheet.merge_range(
-            cursor_row, cursor_col,
-            cursor_row, cursor_col + n_cols -1,
+            cursor_row, 0,
+            cursor_row, n_cols -1,
             town,
             formats['subtitle']
         )
 
-        # add to cursor
-        cursor_row_start +=1
-        cursor_row = cursor_row_start
+        # write the column heads & the checkbox
+        cursor_row += 1
+        for c, col in enumerate(neededCols): worksheet.write(cursor_row, c, xlsx_language[col], formats['table_head'])
+        worksheet.write(cursor_row, n_cols - 1, xlsx_language['checkbox'], formats['table_head'])
+
+        # write the entries
+        cursor_row += 1
+        for i in range(n_rows):
+
+            # separator after the last row of a group
+            if i == n_rows - 1 or first[i] != first[i+1]: use_format = formats['table_separator']
+            else: use_format = formats['table']
 
-        # for each column in the data
-        for c, col in enumerate(tmp.keys()):
+            for c, values in enumerate(tmp):
 
-            # write down the column
-            worksheet.write(cursor_row, cursor_col, xlsx_language[col], formats['table_head'])
+                # only write the value if it differs from the last one
+                if i == 0 or values[i] != values[i-1]: insert_value = values[i]
+                else: insert_value = ""
+
+                worksheet.write(cursor_row, c, insert_value, use_format)
+
+            # checkbox
+            worksheet.write(cursor_row, n_cols - 1, "", use_format)
 
-            # add cursor row
             cursor_row += 1
 
-            # get length of rows
-            n_rows = len(tmp[col])
+        # leave two blank rows
+        cursor_row += 2
 
-            # only for the first col: check the separator idx
-            if c == 0:
-                separator_idx = []
-                for i, row in enumerate(tmp[col]):
-                    try: 
-                        if row != tmp[col][i+1]: separator_idx.append(i)
-                    except: separator_idx.append(i)
+    #endregion
 
-            # for each entry
-            for i, row in enumerate(tmp[col]):
-                
-                # blank text
-                insert_value = ""
+    # close & save
+    workbook.close()
 
-                # determin if we should write the text or not
-                if i == 0: insert_value = row
-                else :
+    # get to the first byte
+    if path is None: output.seek(0)
 
-                    # was the last value a different one?
-                    if row != tmp[col][i-1]: insert_value = row
+    return output
 
-                if i in separator_idx: use_format = formats['table_separator']
-                else: use_format = formats['table']
+    #endregion
 
-                # write the value
-                worksheet.write(cursor_row, cursor_col, insert_value, use_format)
+def print_forecast(
+        forecast:dict,
+        path:typing.Union[str, None] = None,
+        language:str = "EN"
+    ) -> typing.Union[io.BytesIO, str]:
+    """Creates the forecast excel
 
-                # add to cursor
-                cursor_row += 1
+    One worksheet per forecast table (products &
+    products per subcategory). One row per day,
+    one column per product.
 
-            # end of row? -> reset
-            cursor_row = cursor_row_start
-            cursor_col += 1
+    params:
+    -------
+    forecast : dict
+        The forecast (see 'forecast.create()').
+            Format: {
+                'start':str,
+                'days':int,
+                'forecast_product':{
+                    'data':{'date':list, ...},
+                    'order':list,
+                    'mapping':list
+                },
+                'forecast_subcategory':{...}
+            }
+    path : str | None
+        If none, the file gets returned
+        as bytes io.
+        Else it gets saved to disk.
+        (default is None)
+    language : bool, optional
+        The language to use.
+        (default is "EN")
 
-        # end of all columns? -> add checkbox
-        worksheet.write(cursor_row, cursor_col, xlsx_language['checkbox'], formats['table_head'])
+    returns:
+    --------
+    io.BytesIO | str
+        Returns the bytes io
 
-        # add to cursor
-        cursor_row += 1
+    """
 
-        # for length of n_rows write nothing
-        for i in range(n_rows): 
-            
-            if i in separator_idx: worksheet.write(cursor_row, cursor_col, "", formats['table_separator'])
-            else: worksheet.write(cursor_row, cursor_col, "", formats['table'])
+    # get language files
+    xlsx_language = get_translation(language)['xlsx']
 
-            # add to cursor row
-            cursor_row += 1
+    if path is None: output = io.BytesIO()
+    else: output = str(path)
 
-        # set cursor_row_end to cursor_row and add 2
-        cursor_row_start = cursor_row + 2
-        cursor_row = cursor_row_start
-        cursor_col = 0
+    # create workbook
+    workbook = _workbook(output)
+
+    # create meta data
+    workbook.set_properties({
+        'author':"Daniel Kiermeier",
+        'category':"CRM light, delivery forecast",
+        'keywords':"Mini Moi, delivery forecast",
+        'comments':(
+            "This file was created by using Mini Moi - "
+            "an CRM light app created by Daniel Kiermeier. "
+            "You can checkout the project on "
+            "https://github.com/No9005/mini-moi "
+            )
+    })
 
-        # loop again!
+    # shared formats
+    formats = _formats(workbook)
 
-    #endregion
+    for table, name in [('forecast_product', 'forecast_products'), ('forecast_subcategory', 'forecast_subcategories')]:
+
+        worksheet = workbook.add_worksheet(xlsx_language[name])
+        order, mapping = forecast[table]['order'], forecast[table]['mapping']
+        columns = [forecast[table]['data'][col] for col in order]
+
+        worksheet.set_column(0, 0, 12) # date
+        worksheet.set_column(1, max(len(order) - 1, 1), 14) # products
+
+        # title
+        worksheet.merge_range(
+            1, 0,
+            2, 5,
+            xlsx_language['title_forecast'].format(start=forecast['start'], days=forecast['days']),
+            formats['title']
+        )
+
+        # column heads
+        for c, head in enumerate(mapping): worksheet.write(4, c, head, formats['table_head'])
+
+        # one row per day
+        for r, values in enumerate(zip(*columns)):
+            for c, value in enumerate(values): worksheet.write(5 + r, c, value, formats['table'])
 
     # close & save
     workbook.close()
@@ -674,8 +780,6 @@ def print_order_list(
 
     return output
 
-    #endregion
-
 #endregion
 
 
@@ -0,0 +1,253 @@
+"""
+Contains the background job system
+
+Long running requests (booking, excel creation)
+are submitted as jobs. They are executed by a
+bounded thread pool, so the request returns
+immediately with a job id. The frontend polls
+the job status via the 'jobs/<id>' ressource.
+
+Identical requests which are still queued or
+running are not submitted twice. The already
+existing job is returned instead.
+
+"""
+
+# imports
+import uuid
+import typing
+import hashlib
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from miniMoi import app, Session
+from miniMoi.language import get_translation
+from miniMoi.logic.helpers import tools, lazy
+
+# imported on first use (pandas)
+time = lazy.module("miniMoi.logic.helpers.time_module")
+
+# job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# registry (guarded by the lock)
+_lock = threading.Lock()
+_executor = None
+_jobs = {}
+_inflight = {}
+
+#region 'private functions'
+def _get_executor() -> ThreadPoolExecutor:
+    """Returns the (lazily created) worker pool """
+
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=app.config['JOB_WORKERS'], thread_name_prefix="miniMoi-job")
+
+    return _executor
+
+def _key(ressource:str, payload:typing.Any) -> str:
+    """Builds the de-duplication key of a request """
+
+    return ressource + ":" + hashlib.sha1(str(payload).encode("utf-8")).hexdigest()
+
+def _evict() -> None:
+    """Drops the oldest finished jobs (lock must be held) """
+
+    finished = [jobId for jobId, job in _jobs.items() if job['status'] in [DONE, FAILED]]
+
+    for jobId in finished[:max(0, len(finished) - app.config['JOB_HISTORY'])]: del _jobs[jobId]
+
+def _run(job_id:str, func:typing.Callable, kwargs:dict, flask_app) -> None:
+    """Executes the job (in a worker thread) """
+
+    with flask_app.app_context(): _execute(job_id, func, kwargs)
+
+def _execute(job_id:str, func:typing.Callable, kwargs:dict) -> None:
+    """Executes the job within the app context of the submitting app """
+
+    with _lock: _jobs[job_id].update({'status':RUNNING, 'started':time.utcnow()})
+
+    try:
+
+        result = func(**kwargs)
+        status = DONE if result.get('success', False) else FAILED
+
+    except Exception as e:
+
+        code, msg = tools._convert_exception(e)
+        traceback.print_exc()
+
+        result = {
+            'success':False,
+            'error':get_translation(app.config['DEFAULT_LANGUAGE'])['error_codes']['500'].format(c=code, m=msg),
+            'data':{}
+        }
+        status = FAILED
+
+    finally:
+
+        # the scoped session is bound to this worker thread
+        Session.remove()
+
+    with _lock:
+
+        _jobs[job_id].update({'status':status, 'finished':time.utcnow(), 'result':result})
+        _inflight.pop(_jobs[job_id]['key'], None)
+        _evict()
+
+def _to_dict(job:dict) -> dict:
+    """Returns the public job information """
+
+    return {
+        'job_id':job['id'],
+        'ressource':job['ressource'],
+        'status':job['status'],
+        'created':time.to_string(job['created'], "%Y-%m-%d %H:%M:%S"),
+        'result':job['result']
+    }
+
+#endregion
+
+#region 'functions'
+def submit(
+        ressource:str,
+        func:typing.Callable,
+        kwargs:typing.Union[dict, None] = None,
+        payload:typing.Any = None,
+        language:typing.Union[str, None] = None
+    ) -> dict:
+    """Submits a background job
+
+    params:
+    -------
+    ressource : str
+        The ressource name of the job.
+    func : callable
+        The function to execute. Must return
+        a success, error & data dict.
+    kwargs : dict | None, optional
+        The keyword arguments for 'func'.
+        (default is None -> no arguments)
+    payload : any, optional
+        The raw request payload. Used to detect
+        identical requests (with the ressource).
+        (default is None -> no de-duplication)
+    language : str | None, optional
+        language ISO code for the errors.
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
+
+    returns:
+    --------
+    dict
+        success, error & data {
+            'job_id':str,
+            'ressource':str,
+            'status':str,
+            'created':str,
+            'result':None,
+            'duplicate':bool
+        }
+
+    """
+
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
+    errors = get_translation(language, app.config['DEFAULT_LANGUAGE'])['error_codes']
+
+    key = _key(ressource, payload) if payload is not None else uuid.uuid4().hex
+
+    with _lock:
+
+        # identical request still in flight?
+        if key in _inflight:
+            return {'success':True, 'error':"", 'data':{**_to_dict(_jobs[_inflight[key]]), 'duplicate':True}}
+
+        # bounded queue
+        pending = len([job for job in _jobs.values() if job['status'] in [QUEUED, RUNNING]])
+        if pending >= app.config['JOB_QUEUE_SIZE']:
+            return {'success':False, 'error':errors['jobQueueFull'], 'data':{}}
+
+        jobId = uuid.uuid4().hex
+        _jobs[jobId] = {
+            'id':jobId,
+            'key':key,
+            'ressource':ressource,
+            'status':QUEUED,
+            'created':time.utcnow(),
+            'started':None,
+            'finished':None,
+            'result':None
+        }
+        _inflight[key] = jobId
+
+        job = _to_dict(_jobs[jobId])
+
+    _get_executor().submit(_run, jobId, func, kwargs or {}, app._get_current_object())
+
+    return {'success':True, 'error':"", 'data':{**job, 'duplicate':False}}
+
+def status(job_id:str, language:typing.Union[str, None] = None) -> dict:
+    """Returns the job status
+
+    params:
+    -------
+    job_id : str
+        The job id.
+    language : str | None, optional
+        language ISO code for the errors.
+        (default is None -> app.config['DEFAULT_LANGUAGE'])
+
+    returns:
+    --------
+    dict
+        success, error & data {
+            'job_id':str,
+            'ressource':str,
+            'status':str, # -> 'queued', 'running', 'done' or 'failed'
+            'created':str,
+            'result':dict | None # -> the response of the job function
+        }
+
+    """
+
+    if language is None: language = app.config['DEFAULT_LANGUAGE']
+
+    errors = get_translation(language, app.config['DEFAULT_LANGUAGE'])['error_codes']
+
+    with _lock:
+
+        if job_id not in _jobs:
+            return {'success':False, 'error':errors['jobNotFound'].format(id=str(job_id)), 'data':{}}
+
+        job = _to_dict(_jobs[job_id])
+
+    return {'success':True, 'error':"", 'data':job}
+
+def shutdown(wait:bool = True) -> None:
+    """Stops the worker pool
+
+    params:
+    -------
+    wait : bool, optional
+        If True, waits for the running jobs.
+        (default is True)
+
+    returns:
+    --------
+    None
+
+    """
+
+    global _executor
+
+    with _lock: executor, _executor = _executor, None
+
+    if executor is not None: executor.shutdown(wait=wait)
+
+#endregion
@@ -0,0 +1,75 @@
+"""
+Contains the lazy module loading
+
+The logic modules pull in pandas, numpy, xlsxwriter,
+openpyxl & pytz. To keep the app startup (and the
+first page) fast, these modules are only imported
+on first use (e.g. the first request to one of
+their api ressources).
+
+"""
+
+# imports
+import typing
+import threading
+import importlib
+
+#region 'classes'
+class LazyModule:
+    """Proxy of a module which is imported on first use
+
+    Every attribute access is forwarded to the
+    real module. The first access imports it.
+
+    attributes:
+    ----------
+    None
+
+    methods:
+    --------
+    None
+
+    """
+
+    def __init__(self, name:str):
+        """Stores the module name (nothing is imported) """
+
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, attr:str) -> typing.Any:
+        """Imports the module (once) & returns the attribute """
+
+        if self._module is None:
+            with self._lock:
+                if self._module is None: self._module = importlib.import_module(self._name)
+
+        return getattr(self._module, attr)
+
+    def __repr__(self) -> str:
+        """Shows the proxy state """
+
+        return "<lazy module '{n}' ({s})>".format(n=self._name, s="loaded" if self._module is not None else "not loaded")
+
+#endregion
+
+#region 'functions'
+def module(name:str) -> LazyModule:
+    """Returns a lazy proxy of the module
+
+    params:
+    -------
+    name : str
+        The absolute module name
+        (e.g. "miniMoi.logic.functions.delivery").
+
+    returns:
+    --------
+    LazyModule
+
+    """
+
+    return LazyModule(name)
+
+#endregion
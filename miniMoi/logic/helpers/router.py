@@ -0,0 +1,319 @@
+"""
+Contains the routing registry of the api
+
+Each api ressource (e.g. 'customers/get') is
+mapped to a handler function. The handler declares
+its parameters, which are read from the request
+data and coerced before the call:
+
+    @router.route("customers/delete", customer_id=router.param("id"))
+    def delete(customer_id):
+        ...
+
+Ressources ending with '<name>' (e.g. 'jobs/<job_id>')
+pass the rest of the path as parameter 'name'.
+
+The handler modules register themselves on import.
+With 'register_lazy()' a module is only imported
+when the first ressource of its group (the first
+path segment) is requested.
+
+Every dispatch is counted & timed per ressource
+(see 'stats()').
+
+"""
+
+# imports
+import json
+import time
+import typing
+import importlib
+import threading
+
+# marks required parameters
+REQUIRED = object()
+
+class NotFound(LookupError):
+    """Raised for unknown ressources """
+
+class WrongType(ValueError):
+    """Raised if a parameter can not be coerced
+
+    attributes:
+    -----------
+    key : str
+        The key in the request data.
+    dtype : str
+        The expected type (see 'param()').
+
+    """
+
+    def __init__(self, key:str, dtype:str):
+
+        super().__init__(key)
+
+        self.key = key
+        self.dtype = dtype
+
+# registry (guarded by the lock)
+_lock = threading.Lock()
+_routes = {}
+_prefixed = {}
+_lazy = {}
+_stats = {}
+
+#region 'coercion'
+def _is_empty(value:typing.Any) -> bool:
+    """True if the value is an empty form value """
+
+    return value is None or (isinstance(value, str) and value in ["", "null", "None"])
+
+def optional_int(value:typing.Any) -> typing.Union[int, None]:
+    """Converts to int (empty values -> None) """
+
+    return None if _is_empty(value) else int(value)
+
+def json_value(value:typing.Any) -> typing.Any:
+    """Parses jsonified form values """
+
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+def flag(value:typing.Any) -> bool:
+    """Converts form flags ("true", "1", ...) to bool """
+
+    if isinstance(value, str): return value.lower() in ["true", "1", "yes", "on"]
+
+    return bool(value)
+
+#endregion
+
+#region 'private functions'
+def _resolve(ressource:str) -> typing.Union[tuple, None]:
+    """Returns (key, route, path params) of the ressource (lock must be held) """
+
+    if ressource in _routes: return ressource, _routes[ressource], {}
+
+    prefix, _, rest = ressource.partition("/")
+    if prefix in _prefixed and rest:
+        key, name = _prefixed[prefix]
+        return key, _routes[key], {name:rest}
+
+    return None
+
+def _load(ressource:str) -> None:
+    """Imports the lazily registered module of the ressource group """
+
+    group = ressource.partition("/")[0]
+
+    with _lock: moduleName = _lazy.get(group)
+
+    if moduleName is None: return
+
+    # the module registers its routes on import
+    importlib.import_module(moduleName)
+
+    with _lock: _lazy.pop(group, None)
+
+def _record(key:str, duration:float, failed:bool) -> None:
+    """Adds the call to the ressource stats """
+
+    with _lock:
+
+        stat = _stats.setdefault(key, {'calls':0, 'failures':0, 'total':0.0, 'max':0.0})
+        stat['calls'] += 1
+        stat['failures'] += int(failed)
+        stat['total'] += duration
+        stat['max'] = max(stat['max'], duration)
+
+#endregion
+
+#region 'functions'
+def param(
+        key:typing.Union[str, None] = None,
+        coerce:typing.Union[typing.Callable, None] = None,
+        default:typing.Any = REQUIRED,
+        source:str = "data",
+        dtype:typing.Union[str, None] = None
+    ) -> dict:
+    """Declares a handler parameter
+
+    params:
+    -------
+    key : str | None, optional
+        The key in the request data.
+        (default is None -> the parameter name)
+    coerce : callable | None, optional
+        Converts the raw value.
+        (default is None -> passed unchanged)
+    default : any, optional
+        Used if the key is missing.
+        (default is REQUIRED -> KeyError if missing)
+    source : str, optional
+        "data" (the request data) or "request"
+        (the whole request, e.g. the 'data' dict).
+        (default is "data")
+    dtype : str | None, optional
+        The expected type (a key of the language
+        'type_mapping', e.g. "int"). If set, a failing
+        coercion raises 'WrongType'.
+        (default is None -> the error is passed on)
+
+    returns:
+    --------
+    dict
+        The parameter declaration.
+
+    """
+
+    return {'key':key, 'coerce':coerce, 'default':default, 'source':source, 'dtype':dtype}
+
+def route(ressource:str, **params) -> typing.Callable:
+    """Registers the decorated handler for the ressource
+
+    params:
+    -------
+    ressource : str
+        The ressource (e.g. "customers/get" or
+        "jobs/<job_id>").
+    **params : dict
+        {handler argument:param()}. Plain values
+        are passed as constants.
+
+    returns:
+    --------
+    callable
+        The decorator.
+
+    """
+
+    def decorator(func:typing.Callable) -> typing.Callable:
+
+        with _lock:
+
+            _routes[ressource] = {'func':func, 'params':params}
+
+            if ressource.endswith(">"):
+                prefix, _, name = ressource.partition("/")
+                _prefixed[prefix] = (ressource, name.strip("<>"))
+
+        return func
+
+    return decorator
+
+def register_lazy(group:str, module_name:str) -> None:
+    """Registers a handler module for a ressource group
+
+    The module is imported (and registers its
+    routes) on the first request of the group.
+
+    params:
+    -------
+    group : str
+        The first path segment (e.g. "customers").
+    module_name : str
+        The module with the handlers.
+
+    returns:
+    --------
+    None
+
+    """
+
+    with _lock: _lazy[group] = module_name
+
+def dispatch(ressource:str, request:dict) -> typing.Any:
+    """Calls the handler of the ressource
+
+    Raises 'NotFound' if the ressource is not
+    known & 'WrongType' if a typed parameter can
+    not be coerced. Exceptions of the handler are
+    passed on (after they were counted).
+
+    params:
+    -------
+    ressource : str
+        The requested ressource.
+    request : dict
+        {'ressource':str, 'data':dict}
+
+    returns:
+    --------
+    any
+        The handler response.
+
+    """
+
+    with _lock: resolved = _resolve(ressource)
+
+    if resolved is None:
+
+        _load(ressource)
+
+        with _lock: resolved = _resolve(ressource)
+
+        if resolved is None: raise NotFound(ressource)
+
+    key, handler, pathParams = resolved
+
+    start = time.perf_counter()
+    failed = True
+    try:
+
+        kwargs = dict(pathParams)
+        for name, spec in handler['params'].items():
+
+            # constants
+            if not isinstance(spec, dict):
+                kwargs[name] = spec
+                continue
+
+            source = request if spec['source'] == "request" else request['data']
+            dataKey = spec['key'] or name
+
+            if dataKey in source: value = source[dataKey]
+            elif spec['default'] is REQUIRED: raise KeyError(dataKey)
+            else: value = spec['default']
+
+            try: kwargs[name] = spec['coerce'](value) if spec['coerce'] is not None else value
+            except (ValueError, TypeError) as e:
+
+                if spec['dtype'] is None: raise
+                raise WrongType(dataKey, spec['dtype']) from e
+
+        response = handler['func'](**kwargs)
+        failed = isinstance(response, dict) and not response.get('success', True)
+
+        return response
+
+    finally: _record(key, time.perf_counter() - start, failed)
+
+def ressources() -> list:
+    """Returns the registered ressources (incl. lazy groups) """
+
+    with _lock: return sorted(list(_routes.keys()) + [group + "/*" for group in _lazy.keys()])
+
+def stats() -> dict:
+    """Returns the call stats per ressource
+
+    returns:
+    --------
+    dict
+        {ressource:{
+            'calls':int,
+            'failures':int, # -> exceptions & 'success':False
+            'total':float, # -> seconds
+            'mean':float, # -> seconds
+            'max':float # -> seconds
+        }}
+
+    """
+
+    with _lock:
+        return {key:{**stat, 'mean':stat['total'] / stat['calls']} for key, stat in _stats.items()}
+
+def reset_stats() -> None:
+    """Clears the call stats """
+
+    with _lock: _stats.clear()
+
+#endregion
@@ -0,0 +1,161 @@
+"""
+Contains the json serialization of the api responses
+
+'tools.jEncoder' converts every non native value
+(numpy scalars, timestamps, ...) with one python
+call per value. This module converts pandas frames,
+series & numpy arrays column wise (vectorized) into
+json native lists instead. The remaining response
+is walked once, so the json encoder only sees
+native python objects.
+
+Dates are encoded like flask's json encoder does
+(see 'werkzeug.http.http_date()', naive dates are
+utc), e.g. "Sun, 01 May 2022 12:00:00 GMT".
+
+"""
+
+# imports
+import json
+import typing
+import datetime
+
+import numpy as np
+import pandas as pd
+from werkzeug.http import http_date
+
+from miniMoi import app
+from miniMoi.logic.helpers import tools
+
+# values the json encoder handles natively
+_NATIVE = {str, int, float, bool, type(None)}
+
+#region 'private functions'
+def _is_native(values:list) -> bool:
+    """True if all values are native python scalars """
+
+    return set(map(type, values)) <= _NATIVE
+
+def _date(value:typing.Union[datetime.date, np.datetime64]) -> str:
+    """Formats one date like flask's json encoder """
+
+    if isinstance(value, pd.Timestamp): value = value.to_pydatetime()
+    elif isinstance(value, np.datetime64): value = pd.Timestamp(value).to_pydatetime()
+
+    return http_date(value)
+
+def _column(values:typing.Union[pd.Series, pd.Index, np.ndarray]) -> list:
+    """Converts one column into a json native list
+
+    Same semantics as 'pd.DataFrame.to_dict("list")',
+    except for dates (http date strings, None for
+    missing dates).
+
+    """
+
+    if isinstance(values, np.ndarray) and values.ndim > 1: return values.tolist()
+
+    series = values if isinstance(values, pd.Series) else pd.Series(values, copy=False)
+
+    # numerical & boolean columns -> one c call
+    if series.dtype.kind in "biuf": return series.tolist()
+
+    # dates -> only the distinct dates are formatted
+    if series.dtype.kind == "M" or isinstance(series.dtype, pd.DatetimeTZDtype):
+
+        codes, uniques = pd.factorize(series, sort=False)
+        formatted = np.array([_date(val) for val in uniques] + [None], dtype=object)
+
+        return formatted[codes].tolist() # -> code -1 (missing) is the appended None
+
+    converted = series.tolist()
+
+    if _is_native(converted): return converted
+
+    return [val if type(val) in _NATIVE else to_native(val) for val in converted]
+
+#endregion
+
+#region 'functions'
+def frame_to_columns(df:pd.DataFrame) -> dict:
+    """Converts a frame into json native columns
+
+    params:
+    -------
+    df : pd.DataFrame
+        The frame to convert.
+
+    returns:
+    --------
+    dict
+        {column:list}
+
+    """
+
+    return {col:_column(df[col]) for col in df.columns}
+
+def to_native(obj:typing.Any) -> typing.Any:
+    """Converts the object into json native objects
+
+    Frames become column dicts (see 'frame_to_columns()'),
+    series & arrays become lists, numpy scalars become
+    python scalars and dates become strings.
+
+    params:
+    -------
+    obj : any
+        The object to convert.
+
+    returns:
+    --------
+    any
+        The json native object.
+
+    """
+
+    objType = type(obj)
+
+    if objType in _NATIVE: return obj
+    elif objType is dict: return {key:to_native(val) for key, val in obj.items()}
+    elif objType in [list, tuple]:
+        if _is_native(obj): return list(obj)
+        return [to_native(val) for val in obj]
+    elif isinstance(obj, pd.DataFrame): return frame_to_columns(obj)
+    elif isinstance(obj, (pd.Series, pd.Index, np.ndarray)): return _column(obj)
+    elif isinstance(obj, np.generic):
+        if isinstance(obj, np.datetime64): return None if np.isnat(obj) else _date(obj)
+        return obj.item()
+    elif obj is pd.NaT: return None
+    elif isinstance(obj, (datetime.datetime, datetime.date)): return _date(obj)
+    elif isinstance(obj, dict): return {key:to_native(val) for key, val in obj.items()}
+
+    return obj
+
+def dumps(obj:typing.Any) -> bytes:
+    """Serializes the (api) response
+
+    Uses the flask json settings (sorted keys,
+    ascii). Anything 'to_native()' does not know
+    is passed to 'tools.jEncoder'.
+
+    params:
+    -------
+    obj : any
+        The object to serialize.
+
+    returns:
+    --------
+    bytes
+        The utf-8 encoded json.
+
+    """
+
+    return json.dumps(
+        to_native(obj),
+        cls = tools.jEncoder,
+        separators = (",", ":"),
+        sort_keys = app.config['JSON_SORT_KEYS'],
+        ensure_ascii = app.config['JSON_AS_ASCII']
+    ).encode("utf-8")
+
+#endregion
@@ -6,9 +6,13 @@ functions relevant to calculate times
 # import
 import typing
 import datetime
+import functools
 import pytz
 
-from miniMoi.language import language_files
+import numpy as np
+import pandas as pd
+
+from miniMoi.language import get_translation, get_derived
 
 #region 'functions' -----------------
 def today():
@@ -121,11 +125,6 @@ def calculate_next_delivery(date:datetime.datetime, cycle_type:str, interval:int
 
     """
 
-    # get language files
-    try: translation = language_files[language]
-    except: translation = language_files['EN']
-    errors = translation['error_codes']
-
     # cycle time none (or the alternatives)?
     if cycle_type is None: return None
 
@@ -137,20 +136,10 @@ def calculate_next_delivery(date:datetime.datetime, cycle_type:str, interval:int
     elif cycle_type == "day":
         
         # interval none?
-        if interval is None: raise AssertionError(errors['cycleMismatch'].format(
-            interval = translation['column_mapping']['abo']['interval'],
-            cycle_type = translation['column_mapping']['abo']['cycle_type'],
-            day = translation['cycle_type_mapping']['day'], 
-            interval_value = translation['cycle_type_mapping']['interval']
-        ))
+        if interval is None: raise AssertionError(get_derived(language)['formatted_errors']['cycleMismatch'])
 
         # interval outside of 0-6?
-        elif interval < 0 or interval > 6: raise AssertionError(
-            errors['notAllowed'].format(
-                    var="interval for day",
-                    available = "{ " + errors['weekdays'] + " }"
-                )
-        )
+        elif interval < 0 or interval > 6: raise AssertionError(get_derived(language)['formatted_errors']['weekdayNotAllowed'])
             
         # generate the date by weekday
         next_delivery = date_by_weekday(
@@ -162,12 +151,7 @@ def calculate_next_delivery(date:datetime.datetime, cycle_type:str, interval:int
     elif cycle_type == "interval":
         
         # interval none?
-        if interval is None: raise AssertionError(errors['cycleMismatch'].format(
-            interval = translation['column_mapping']['abo']['interval'],
-            cycle_type = translation['column_mapping']['abo']['cycle_type'],
-            day = translation['cycle_type_mapping']['day'], 
-            interval_value = translation['cycle_type_mapping']['interval']
-        ))
+        if interval is None: raise AssertionError(get_derived(language)['formatted_errors']['cycleMismatch'])
 
         # generate the next delivery date
         next_delivery = date_by_interval(
@@ -176,16 +160,90 @@ def calculate_next_delivery(date:datetime.datetime, cycle_type:str, interval:int
         )
 
     # non valid type
-    else: raise AssertionError(
-        errors['notAllowed'].format(
-                var="cycle_type",
-                available = str(set([None, 'day', 'interval']))
-            )
-        )
+    else: raise AssertionError(get_derived(language)['formatted_errors']['cycleTypeNotAllowed'])
 
     # did all work?
     return next_delivery
 
+def calculate_next_deliveries(
+        dates:typing.Union[pd.Series, list], 
+        cycle_types:typing.Union[pd.Series, list], 
+        intervals:typing.Union[pd.Series, list], 
+        language:str="EN"
+    ) -> pd.Series:
+    """Calculates the next delivery dates (vectorized)
+
+    Same rules as 'calculate_next_delivery()', but applied
+    to all passed abos at once with vectorized date
+    arithmetic.
+
+    EXCEPTIONS:
+        [1] AssertionError
+            If at least one abo has non valid
+            parameters.
+
+    params:
+    -------
+    dates : pd.Series | list
+        The start dates for the calculations.
+    cycle_types : pd.Series | list
+        The type of cycle to apply.
+            Options: { None, 'day', 'interval' }
+                None: The next delivery is NaT
+    intervals : pd.Series | list
+        The days to let pass or the weekday as idx.
+            Note: The weekdays are 0-6 starting
+                  at Monday = 0
+    language : str
+        The language iso code. Indicates the language
+        to use for errors.
+        (default is "EN")
+
+    returns:
+    --------
+    pd.Series
+        The next delivery dates (NaT if the
+        cycle type is None)
+
+    """
+
+    # align inputs
+    dates = pd.to_datetime(pd.Series(dates)).reset_index(drop=True)
+    cycle_types = pd.Series(cycle_types, dtype=object).reset_index(drop=True)
+    intervals = pd.to_numeric(pd.Series(intervals, dtype=object), errors="coerce").reset_index(drop=True)
+
+    # masks for the cycle types
+    is_none = cycle_types.isna() | cycle_types.isin(["None", ""])
+    is_day = cycle_types == "day"
+    is_interval = cycle_types == "interval"
+
+    # only resolve the language files if something is wrong
+    if not (is_none | is_day | is_interval).all() or intervals[is_day | is_interval].isna().any() or \
+        ((intervals[is_day] < 0) | (intervals[is_day] > 6)).any():
+
+        # precomputed error messages
+        errors = get_derived(language)['formatted_errors']
+
+        # non valid type
+        if not (is_none | is_day | is_interval).all(): raise AssertionError(errors['cycleTypeNotAllowed'])
+
+        # interval none?
+        if intervals[is_day | is_interval].isna().any(): raise AssertionError(errors['cycleMismatch'])
+
+        # interval outside of 0-6
+        raise AssertionError(errors['weekdayNotAllowed'])
+
+    # days to add: 'interval' -> interval, 'day' -> one week + weekday difference
+    offset = np.where(is_interval, intervals, 0)
+    offset = np.where(is_day, 7 + intervals - dates.dt.weekday, offset)
+
+    next_delivery = dates + pd.to_timedelta(offset, unit="D")
+
+    # no cycle -> no next delivery
+    next_delivery[is_none] = pd.NaT
+
+    return next_delivery
+
 def parse_date_string(string:str) -> datetime.datetime:
     """Parses a string into a datetime object
     
@@ -229,6 +287,28 @@ def to_string(date:datetime.datetime, str_format:str = "%Y.%m.%d") -> str:
     # else return the formatted time
     return date.strftime(str_format)
 
+@functools.lru_cache(maxsize=64)
+def get_timezone(tz:str) -> datetime.tzinfo:
+    """Returns the (cached) timezone object
+
+    The pytz lookup is comparably slow and
+    the same few timezones are requested over
+    and over again, so the objects get cached.
+
+    params:
+    -------
+    tz : str
+        Timezone as string.
+
+    returns:
+    --------
+    datetime.tzinfo
+        The pytz timezone.
+
+    """
+
+    return pytz.timezone(tz)
+
 def utc_to_local(date:datetime.datetime, tz:str = "Europe/Paris") -> datetime.datetime:
     """Convert utcnow to local time
 
@@ -251,7 +331,7 @@ def utc_to_local(date:datetime.datetime, tz:str = "Europe/Paris") -> datetime.da
     if date is None: return date
 
     # get timezone info
-    tzInfo = pytz.timezone(tz)
+    tzInfo = get_timezone(tz)
 
     return pytz.utc.localize(date).astimezone(tzInfo)
 
@@ -281,7 +361,7 @@ def local_to_utc(date:datetime.datetime, tz:str = "Europe/Paris") -> datetime.da
     if date is None: return date
     
     # create local timezone
-    local = pytz.timezone(tz)
+    local = get_timezone(tz)
     
     # localize
     localized = local.localize(date, is_dst=None)
@@ -317,8 +397,7 @@ def parse_UI_date(ui_string:str, language:str= "EN", tz:str = "Europe/Paris") ->
     """
 
     # get language files
-    try: translation = language_files[language]
-    except: translation = language_files["EN"]
+    translation = get_translation(language)
 
     # errors
     errors = translation['error_codes']
@@ -371,3 +450,141 @@ def parse_UI_date(ui_string:str, language:str= "EN", tz:str = "Europe/Paris") ->
     }
 
 #endregion
+
+#region 'series' --------------------
+def series_utc_to_local(dates:pd.Series, tz:str = "Europe/Paris") -> pd.Series:
+    """Converts a series of utc times to local time
+
+    Vectorized version of 'utc_to_local()'.
+
+    params:
+    -------
+    dates : pd.Series
+        The naive datetimes in utc. None
+        values become NaT.
+    tz : str
+        Timezone as string.
+        (default is "Europe/Paris")
+
+    returns:
+    --------
+    pd.Series
+        Timezone aware datetimes in local time.
+
+    """
+
+    return pd.to_datetime(dates).dt.tz_localize(pytz.utc).dt.tz_convert(get_timezone(tz))
+
+def series_local_to_utc(dates:pd.Series, tz:str = "Europe/Paris") -> pd.Series:
+    """Converts a series of local times to utc
+
+    Vectorized version of 'local_to_utc()'.
+    Like the scalar version, ambiguous or
+    non existent local times raise an error.
+
+    params:
+    -------
+    dates : pd.Series
+        The naive datetimes in local time.
+        None values become NaT.
+    tz : str, optional
+        The timezone of the datetimes.
+        (default is "Europe/Paris")
+
+    returns:
+    --------
+    pd.Series
+        Timezone aware datetimes in utc.
+
+    """
+
+    return pd.to_datetime(dates).dt.tz_localize(
+        get_timezone(tz), ambiguous="raise", nonexistent="raise"
+        ).dt.tz_convert(pytz.utc)
+
+def series_to_string(dates:pd.Series, str_format:str = "%Y.%m.%d") -> pd.Series:
+    """Converts a series of datetimes to strings
+
+    Vectorized version of 'to_string()'.
+    strftime is expensive, hence every distinct
+    value gets formatted only once. The datetimes
+    are floored to the resolution of the format
+    first, so e.g. a column of delivery dates only
+    needs a handful of strftime calls.
+
+    params:
+    -------
+    dates : pd.Series
+        Datetimes (naive or timezone aware).
+    str_format : str
+        The string format to use.
+        (default is "%Y.%m.%d)
+
+    returns:
+    --------
+    pd.Series
+        The formatted strings. NaT becomes None.
+
+    """
+
+    dates = pd.to_datetime(dates)
+
+    # work on the wall time, unless the format needs the timezone
+    if dates.dt.tz is not None and not any(code in str_format for code in ["%z", "%Z"]): dates = dates.dt.tz_localize(None)
+
+    # floor to the resolution of the format
+    if dates.dt.tz is None and not any(code in str_format for code in ["%S", "%f", "%X", "%c", "%T"]):
+        if any(code in str_format for code in ["%H", "%I", "%M", "%p", "%R"]): dates = dates.dt.floor("min")
+        else: dates = dates.dt.floor("D")
+
+    # format each distinct value only once
+    codes, uniques = pd.factorize(dates)
+    formatted = np.append(np.asarray(uniques.strftime(str_format), dtype=object), None)
+
+    return pd.Series(formatted[codes], index=dates.index, dtype=object)
+
+def series_parse_UI_date(ui_strings:pd.Series, language:str = "EN", tz:str = "Europe/Paris") -> dict:
+    """Parses a series of UI date inputs into datetimes
+
+    Vectorized version of 'parse_UI_date()'. Every
+    distinct input is parsed only once.
+
+    params:
+    -------
+    ui_strings : pd.Series
+        The strings to parse.
+    language : str, optional
+        The language iso code.
+        (default is "EN")
+    tz : str, optional
+        Timezone information
+        (default is "Europe/Paris")
+
+    returns:
+    --------
+    dict
+        success, error & data {
+            'dates':pd.Series # -> utc datetimes (dtype object)
+        }
+        The error is the one of the first non
+        valid input.
+
+    """
+
+    parsed = {}
+    for value in pd.unique(ui_strings):
+
+        result = parse_UI_date(value, language, tz)
+        if not result['success']: return result
+
+        parsed[value] = result['data']['date']
+
+    return {
+        'success':True,
+        'error':"",
+        'data':{
+            'dates':pd.Series([parsed[value] for value in ui_strings], index=ui_strings.index, dtype=object)
+        }
+    }
+
+#endregion
@@ -8,10 +8,12 @@ import typing
 import datetime
 import json
 import sys
+import inspect
 
-import numpy as np
+from miniMoi.logic.helpers import audit, batch, lazy
 
-from miniMoi.models.Models import Log
+# imported on first use
+pd = lazy.module("pandas")
 
 #region 'functions'
 def _convert_exception(e) -> tuple:
@@ -28,20 +30,28 @@ def _to_dict(orm_object, to_fetch:list) -> dict:
     
     return payload
 
-def _update_logs(session, ressource:str, action:str) -> None:
+def _update_logs(session, ressource:str, action:typing.Any) -> None:
     """Adds the user action to the logs 
     
+    The action is queued & written in batches by
+    the background flusher (see 'audit.py'). The
+    request does not wait for the log commit.
+    Within a batch the action is held until the
+    batch is committed (see 'batch.py').
+
     NOTE:
-    prints warnings if the commit was no success
+    prints warnings if the queue was full
 
     params:
     -------
     session : sqlAlchemy session object
-        The sql session object to add elements to.
+        The sql session of the request (the log is
+        written to its database).
     ressource : str
         The function name/endpoint which was called.
-    action : str
-        Stringified parameters.
+    action : any
+        The parameters (see '_arguments()') or a
+        message.
 
     returns:
     -------
@@ -49,25 +59,140 @@ def _update_logs(session, ressource:str, action:str) -> None:
 
     """
 
-    # create a new log
-    newLog = Log(
-        ressource = str(ressource),
-        action = str(action)
-    )
+    if isinstance(session, batch.BatchSession): session.log(ressource, action)
+    else: audit.log(session.get_bind(), ressource, action, session)
 
-    # add to session
-    session.add(newLog)
+    return
 
-    #try to commit
-    try: session.commit()
-    except:
+def _arguments(func:typing.Callable, namespace:dict) -> dict:
+    """Returns the arguments of func from its locals() """
 
-        session.rollback()
-        
-        print("NOT ABLE TO LOG: ", str(ressource), str(action))
-        sys.stdout.flush()
+    return {name:namespace[name] for name in inspect.signature(func).parameters if name in namespace}
 
-    return
+def _existing_ids(session, id_column, ids:list, batch_size:int = 900) -> set:
+    """Returns the ids which exist in the table
+
+    Set based replacement for one lookup per
+    element. The ids are queried in batches to
+    stay below the sqlite variable limit.
+
+    params:
+    -------
+    session : sqlAlchemy session object
+        The session to query with.
+    id_column : sqlAlchemy column
+        The id column of the table.
+    ids : list
+        The ids to check.
+    batch_size : int, optional
+        Max. number of ids per query.
+        (default is 900)
+
+    returns:
+    --------
+    set
+        The existing ids.
+
+    """
+
+    unique = list(set(ids))
+
+    existing = set()
+    for start in range(0, len(unique), batch_size):
+        existing.update(
+            row[0] for row in session.query(id_column).filter(id_column.in_(unique[start:start + batch_size])).all()
+        )
+
+    return existing
+
+def _invalid_int(frame, columns:list) -> typing.Union[str, None]:
+    """Returns the first column with a non int value (or None)
+
+    Vectorized version of 'int(value)' for all rows
+    of the columns (pandas DataFrame).
+
+    """
+
+    for col in columns:
+
+        values = pd.to_numeric(frame[col].astype(str).str.strip(), errors="coerce")
+        if values.isna().any() or (values % 1 != 0).any(): return col
+
+    return None
+
+def _paginate(
+        query,
+        id_column,
+        page_size:typing.Union[int, None] = None,
+        cursor:typing.Union[int, None] = None,
+        amount:typing.Union[int, None] = None
+    ) -> tuple:
+    """Fetches one page of the query
+
+    Uses a keyset cursor on the id column,
+    so every page is an index range scan
+    and the query runs only once (plus one
+    count for the total).
+
+    params:
+    -------
+    query : sqlAlchemy query object
+        The (filtered) query. Must not be
+        limited yet.
+    id_column : sqlAlchemy column
+        The unique, sortable id column.
+    page_size : int | None, optional
+        The max. number of rows per page.
+        If None, all rows are returned.
+        (default is None)
+    cursor : int | None, optional
+        The last id of the previous page.
+        (default is None)
+    amount : int | None, optional
+        Legacy limit. Applied if smaller than
+        the page size.
+        (default is None)
+
+    returns:
+    --------
+    tuple
+        (rows:list, pagination:dict{
+            'page_size':int | None,
+            'cursor':int | None,
+            'next_cursor':int | None,
+            'total':int
+        })
+
+    """
+
+    # total of the filtered query
+    total = query.order_by(None).count()
+
+    # limit of this page
+    limit = min([val for val in [page_size, amount] if val is not None], default=None)
+
+    # keyset
+    query = query.order_by(id_column)
+    if cursor is not None: query = query.filter(id_column > cursor)
+
+    # fetch one more row to see if there is a next page
+    if limit is not None: query = query.limit(limit + 1)
+    rows = query.all()
+
+    nextCursor = None
+    if limit is not None and len(rows) > limit:
+
+        rows = rows[:limit]
+
+        # 'amount' caps the whole result, not only the page
+        if page_size is not None and limit == page_size: nextCursor = getattr(rows[-1], id_column.key)
+
+    return rows, {
+        'page_size':page_size,
+        'cursor':cursor,
+        'next_cursor':nextCursor,
+        'total':total
+    }
 
 #endregion
 
@@ -99,9 +224,12 @@ class jEncoder(json.JSONEncoder):
     def default(self, obj:typing.Any) -> typing.Any:
         """Converts dtypes to default python objects """
 
-        if isinstance(obj, np.integer): return int(obj)
-        elif isinstance(obj, np.floating): return float(obj)
-        elif isinstance(obj, np.ndarray): return obj.tolist()
+        # numpy objects only exist if numpy is loaded (lazy imports)
+        np = sys.modules.get("numpy")
+
+        if np is not None and isinstance(obj, np.integer): return int(obj)
+        elif np is not None and isinstance(obj, np.floating): return float(obj)
+        elif np is not None and isinstance(obj, np.ndarray): return obj.tolist()
         elif isinstance(obj, datetime.datetime): return obj.strftime("%Y.%m.%d")
         elif isinstance(obj, datetime.date): return obj.strftime("%Y.%m.%d")
 
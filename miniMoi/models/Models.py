@@ -4,10 +4,10 @@ Contains the table schemes for the database
 """
 
 # imports
-from miniMoi import base, engine
+from miniMoi import base
 
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Float
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Float, Index, UniqueConstraint, text
 
 from datetime import datetime
 
@@ -127,6 +127,67 @@ class Orders(base):
     price = Column(Float, nullable = False)
     total = Column(Float, nullable = False)
 
+class SalesDaily(base):
+    """Daily sales aggregates of the orders
+
+    Materialized sums of the 'Orders' table.
+    One row per delivery day, product, category
+    and customer. The rows are updated
+    incrementally each time orders are booked
+    (see 'miniMoi.logic.helpers.aggregates').
+
+    attributes:
+    -----------
+    id : int
+        The row id.
+    date : datetime
+        The delivery day (midnight, utc).
+            Caution: The orders are booked the
+                     day before the delivery. This
+                     is the order date + 1 day.
+    product : int
+        product id.
+    product_name : str
+        The product name at the time of
+        order.
+    category : str
+        The category name at the time of
+        order.
+    customer_id : int
+        Customer id.
+    quantity : int
+        The summed quantity.
+    total : float
+        The summed revenue.
+    orders : int
+        The number of aggregated orders.
+
+    indices:
+    --------
+    uq_sales_daily_key
+        Unique (date, product, product_name,
+        category, customer_id). Also used by
+        the date range lookup of the report.
+
+    """
+
+    __tablename__ = "sales_daily"
+    __table_args__ = (
+        UniqueConstraint("date", "product", "product_name", "category", "customer_id", name="uq_sales_daily_key"),
+    )
+
+    id = Column(Integer, primary_key = True)
+    date = Column(DateTime, nullable = False)
+
+    product = Column(Integer)
+    product_name = Column(String(100), nullable = False)
+    category = Column(String(100), default = "unknown")
+    customer_id = Column(Integer)
+
+    quantity = Column(Integer, nullable = False, default = 0)
+    total = Column(Float, nullable = False, default = 0)
+    orders = Column(Integer, nullable = False, default = 0)
+
 class Abo(base):
     """Timeframe & next orders
     
@@ -178,23 +239,38 @@ class Abo(base):
     subcategory: int
         subcategory id.
             ForeignKey: Subcategory -> id
+            Caution: Deleted subcategories are replaced
+                     by the default subcategory (id 0).
     quantity : int
         The quantity of the product in the abo.
+
+    indices:
+    --------
+    ix_abo_next_delivery_customer_id
+        Composite (next_delivery, customer_id).
+        Used by the delivery date window lookup.
+    ix_abo_customer_id
+        Used by the customer filter.
+    ix_abo_product
+        Used by product lookups & deletes.
     
     """
 
     __tablename__ = "abo"
+    __table_args__ = (
+        Index("ix_abo_next_delivery_customer_id", "next_delivery", "customer_id"),
+    )
 
     id = Column(Integer, primary_key = True)
-    customer_id = Column(Integer, ForeignKey("customers.id"), nullable = False)
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable = False, index = True)
     update_date = Column(DateTime, default = datetime.utcnow)
 
     cycle_type = Column(String(10))
     interval = Column(Integer)
     next_delivery = Column(DateTime)
 
-    product = Column(Integer, ForeignKey("products.id"), nullable=False)
-    subcategory = Column(Integer, ForeignKey("subcategory.id", ondelete='SET DEFAULT'), default=0, nullable=False)
+    product = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    subcategory = Column(Integer, ForeignKey("subcategory.id", ondelete='SET DEFAULT'), default=0, server_default=text("0"), nullable=False)
     quantity = Column(Integer, nullable=False)
 
 class Category(base):
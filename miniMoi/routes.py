@@ -4,16 +4,20 @@ Contains the app routing
 """
 
 # imports
+import gzip
 import json
 
 from flask import render_template, request, url_for, send_from_directory
 
 from miniMoi import app, Session
 from miniMoi import handlers
+from miniMoi.logic.helpers import lazy
 from miniMoi.language import language_files
 
+# imported on first api request (pandas & numpy)
+serialize = lazy.module("miniMoi.logic.helpers.serialize")
+
 #region 'cleanup, shutdown & context'
-@app.teardown_appcontext
 def shutdown_session(exception=None):
     """Shuts down the db session connections """
 
@@ -22,7 +26,6 @@ def shutdown_session(exception=None):
     # and .remove() closes the connection to db
     Session.remove()
 
-@app.route("/kill", methods = ["POST"])
 def kill():
     """Shutdown the app 
     
@@ -51,13 +54,11 @@ def kill():
         'data':{}
     }
 
-@app.route("/shutdown",  methods=["GET", "POST"])
 def shutdown():
     """Shutsdown the app """
 
     return render_template("html/shutdown.html", mute_home=True, mute_nav=True)
 
-@app.context_processor
 def inject_to_all_templates():
     """Creates the basic app context """
     
@@ -85,13 +86,11 @@ def inject_to_all_templates():
 #endregion
 
 #region 'views'
-@app.route("/", methods=["GET"])
 def index():
     """Index page """
 
     return render_template("html/index.html")
 
-@app.route("/settings", methods=["GET", "POST"])
 def settings():
     """Settings page """
 
@@ -102,11 +101,15 @@ def settings():
             # get payload
             payload = request.form
 
-            # parse values
-            newSettings = {
+            # parse values (keeps the settings without form field)
+            with open(str(app.config['SETTINGS_FILE_PATH']), "r") as infile:
+                newSettings = json.loads(infile.read())
+
+            newSettings.update({
                 'default_language':payload['language'],
-                'action_logging':payload['logging']
-            }
+                'action_logging':payload['logging'],
+                'split_towns':payload.get('split_towns', str(app.config['SPLIT_TOWNS']))
+            })
         except:
             return {
                 'success':False,
@@ -127,48 +130,42 @@ def settings():
     context = {
         'selected_language':app.config['DEFAULT_LANGUAGE'],
         'available_languages':app.config['AVAILABLE_LANGUAGES'],
-        'action_logging':str(app.config['ACTION_LOGGING'])
+        'action_logging':str(app.config['ACTION_LOGGING']),
+        'split_towns':str(app.config['SPLIT_TOWNS'])
     }
 
     return render_template("html/settings.html", **context)
 
-@app.route("/please_restart", methods = ["GET"])
 def restart_instruction():
     """This shows the instruction to restart the app. """
 
     return render_template("html/restart.html", mute_home=True, mute_nav=True)
 
-@app.route("/delivery", methods=["GET"])
 def delivery():
     """Displays the delivery page """
 
     return render_template("html/delivery.html")
 
-@app.route("/management", methods=["GET"])
 def management():
     """Displays the management page """
 
     return render_template("html/management.html")
 
-@app.route("/bulk", methods=["GET"])
 def bulk():
     """Displays the bulk upload system """
 
     return render_template("html/bulk.html", mute_home=True, mute_nav=True)
 
-@app.route("/demo", methods=["GET"])
 def demo():
     """Displays the demo popup """
 
     return render_template("html/demo.html", mute_home=True, mute_nav=True)
     
-@app.route("/reporting", methods=["GET", "POST"])
 def reporting():
     """Displays the reporting page """
 
     return render_template("html/reporting.html")
 
-@app.route("/favicon.ico", methods=["GET"])
 def favicon():
     """Sends the favicon if requested """
 
@@ -177,7 +174,40 @@ def favicon():
 #endregion
 
 #region 'api routes'
-@app.route("/api/<path:ressource>", methods=["POST"])
+def _to_response(response:dict):
+    """Serializes the api response
+
+    The response is serialized with 'serialize.dumps()'
+    (vectorized frame & numpy conversion). Large bodies 
+    are gzipped, if the client accepts gzip and the
+    body is larger than app.config['API_GZIP_MIN_SIZE']
+    (None disables the compression).
+    
+    params:
+    -------
+    response : dict
+        The handler response.
+
+    returns:
+    --------
+    flask.Response
+        
+    """
+
+    if not isinstance(response, dict): return response
+
+    body = serialize.dumps(response)
+    minSize = app.config['API_GZIP_MIN_SIZE']
+
+    if minSize is None or len(body) < minSize or "gzip" not in request.headers.get("Accept-Encoding", ""):
+        return app.response_class(body, mimetype="application/json")
+
+    compressed = app.response_class(gzip.compress(body, compresslevel=5), mimetype="application/json")
+    compressed.headers['Content-Encoding'] = "gzip"
+    compressed.headers['Vary'] = "Accept-Encoding"
+
+    return compressed
+
 def to_api(ressource) -> dict:
     """Sends request to the api
     
@@ -204,12 +234,52 @@ def to_api(ressource) -> dict:
         else: payload = request.form
     except: payload = request.form
 
+    # pagination ('page_size', 'cursor') may also be passed as query string
+    if request.args: payload = {**payload, **request.args.to_dict()}
+
     # pass it to the handler
     response = handlers.api({
         'ressource':ressource,
         'data':payload
     })
 
-    return response
+    return _to_response(response)
+
+#endregion
+
+#region 'registration'
+def register(app) -> None:
+    """Registers the routes at the app
+
+    params:
+    -------
+    app : Flask
+        The app (see 'miniMoi.create_app()').
+
+    returns:
+    --------
+    None
+
+    """
+
+    # cleanup, shutdown & context
+    app.teardown_appcontext(shutdown_session)
+    app.context_processor(inject_to_all_templates)
+    app.add_url_rule("/kill", view_func=kill, methods=["POST"])
+    app.add_url_rule("/shutdown", view_func=shutdown, methods=["GET", "POST"])
+
+    # views
+    app.add_url_rule("/", view_func=index, methods=["GET"])
+    app.add_url_rule("/settings", view_func=settings, methods=["GET", "POST"])
+    app.add_url_rule("/please_restart", view_func=restart_instruction, methods=["GET"])
+    app.add_url_rule("/delivery", view_func=delivery, methods=["GET"])
+    app.add_url_rule("/management", view_func=management, methods=["GET"])
+    app.add_url_rule("/bulk", view_func=bulk, methods=["GET"])
+    app.add_url_rule("/demo", view_func=demo, methods=["GET"])
+    app.add_url_rule("/reporting", view_func=reporting, methods=["GET", "POST"])
+    app.add_url_rule("/favicon.ico", view_func=favicon, methods=["GET"])
+
+    # api
+    app.add_url_rule("/api/<path:ressource>", view_func=to_api, methods=["POST"])
 
 #endregion
\ No newline at end of file
@@ -12,12 +12,16 @@ app storage in the users home directory.
 # import
 from pathlib import Path
 import json
+import typing
 
 
 #region 'settings blueprint'
 settingsBlueprint = {
     'default_language':"EN",
-    'action_logging':"True"
+    'action_logging':"True",
+    'split_towns':"False",
+    'sqlite_profile':"performance",
+    'database_url':"" # -> empty = sqlite file of the app storage
 }
 
 
@@ -32,11 +36,19 @@ def _get_home():
 #endregion
 
 #region 'public functions'
-def set_done():
-    """Creates the 'done.txt' for future starups """
+def set_done(home_path:typing.Union[Path, None] = None):
+    """Creates the 'done.txt' for future starups 
+    
+    params:
+    -------
+    home_path : Path | None, optional
+        The mini-moi home path.
+        (default is None -> '~/mini-moi')
+
+    """
 
     # get home
-    homePath = _get_home()
+    homePath = home_path or _get_home()
 
     #region 'write setup done file'
     with open(str(homePath / "system/done.txt"), 'w') as file:
@@ -46,12 +58,20 @@ def set_done():
 
     return True
 
-def run():
-    """Runs the setup on first app start """
+def run(home_path:typing.Union[Path, None] = None):
+    """Runs the setup on first app start 
+    
+    params:
+    -------
+    home_path : Path | None, optional
+        The mini-moi home path.
+        (default is None -> '~/mini-moi')
+
+    """
 
     #region 'home creation'
     # home directory
-    homePath = _get_home()
+    homePath = home_path or _get_home()
 
     # create the mini-moi app
     (homePath).mkdir(parents=True, exist_ok=True)
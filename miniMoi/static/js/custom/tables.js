@@ -275,4 +275,78 @@ function get_table_values(table) {
     });
 
     return data
-};
\ No newline at end of file
+};
+function decode_columnar(payload) {
+    /* decodes a compact columnar payload
+
+    Turns the compact payload (shared column
+    schema & dictionary encoded columns) into
+    the grouped table format 'create_table()'
+    expects.
+
+    params:
+    -------
+    payload : json-object
+        The compact payload.
+            Format: {
+                'format':"columnar",
+                'order':[],
+                'mapping':[],
+                'dictionaries':{col:[values]},
+                'data':{col:[values | codes]},
+                'groups':{
+                    'name':[],
+                    'start':[],
+                    'stop':[]
+                }
+            }
+
+    returns:
+    --------
+    json-object
+        {
+            group_name:{
+                'data':{col:[values]},
+                'order':[],
+                'mapping':[]
+            },
+            ...
+        }
+
+    */
+
+    // not compact -> nothing to decode
+    if (payload == null || payload.format != "columnar") { return payload };
+
+    // decode the dictionary encoded columns once (-1 = missing)
+    var columns = {};
+    payload.order.forEach(function(col) {
+
+        var values = payload.data[col];
+        var dictionary = payload.dictionaries[col];
+
+        if (dictionary === undefined) { columns[col] = values }
+        else { columns[col] = values.map(function(code) { return code < 0 ? null : dictionary[code] }) };
+
+    });
+
+    // slice the groups
+    var decoded = {};
+    payload.groups.name.forEach(function(name, g) {
+
+        var start = payload.groups.start[g];
+        var stop = payload.groups.stop[g];
+
+        var data = {};
+        payload.order.forEach(function(col) { data[col] = columns[col].slice(start, stop) });
+
+        decoded[name] = {
+            'data':data,
+            'order':payload.order,
+            'mapping':payload.mapping
+        };
+
+    });
+
+    return decoded
+};
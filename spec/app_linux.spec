@@ -8,7 +8,16 @@ a = Analysis(['app.py'],
              pathex=[],
              binaries=[],
              datas=[('miniMoi/templates', 'miniMoi/templates'), ('miniMoi/static', 'miniMoi/static')],
-             hiddenimports=[],
+             hiddenimports=[ # -> lazy imported (see 'miniMoi/logic/helpers/lazy.py')
+                'miniMoi.logic.functions.customer', 'miniMoi.logic.functions.products', 'miniMoi.logic.functions.categories',
+                'miniMoi.logic.functions.abo', 'miniMoi.logic.functions.delivery', 'miniMoi.logic.functions.system',
+                'miniMoi.logic.functions.bulk', 'miniMoi.logic.functions.reporting', 'miniMoi.logic.functions.demo',
+                'miniMoi.logic.helpers.serialize', 'miniMoi.logic.helpers.aggregates', 'miniMoi.logic.helpers.time_module',
+                'miniMoi.handlers.delivery', 'miniMoi.handlers.customers', 'miniMoi.handlers.products', 'miniMoi.handlers.categories',
+                'miniMoi.handlers.abo', 'miniMoi.handlers.system', 'miniMoi.handlers.bulk', 'miniMoi.handlers.reporting',
+                'miniMoi.handlers.jobs', 'miniMoi.handlers.demo', 'miniMoi.handlers.batch', 'miniMoi.handlers.forecast',
+                'sqlalchemy_utils'
+             ],
              hookspath=[],
              hooksconfig={},
              runtime_hooks=[],
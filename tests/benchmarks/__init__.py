@@ -0,0 +1,147 @@
+"""
+Contains the benchmarks.
+
+The benchmarks are not part of the unittests. To run
+one of them, activate your .venv (if you have one) and use:
+    $ python3 -m tests.benchmarks.<benchmark to run>
+
+"""
+
+# imports
+import time
+import random
+import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from miniMoi import base
+from miniMoi.models.Models import Abo, Customers, Products, Category, Subcategory
+from miniMoi.logic.db import init_database, sqlite
+
+#region 'functions'
+def create_session(url:str = "sqlite://") -> tuple:
+    """Creates a fresh engine & scoped session
+
+    params:
+    -------
+    url : str, optional
+        The database url.
+        (default is "sqlite://" -> in memory)
+
+    returns:
+    --------
+    tuple
+        (engine, scoped_session)
+
+    """
+
+    # same pool as the app (in memory -> one connection for all threads)
+    engine = create_engine(url, echo=False, future=False, **sqlite.engine_options(url))
+    base.metadata.create_all(engine)
+
+    return engine, scoped_session(sessionmaker(bind=engine))
+
+def populate(engine, n_abos:int, seed:int = 42) -> None:
+    """Fills the database with random delivery data
+
+    Roughly four abos per customer. Most abos are
+    due tomorrow, the rest is scattered around
+    the next days.
+
+    params:
+    -------
+    engine : sqlalchemy engine
+        The engine to write to.
+    n_abos : int
+        The number of abos to create.
+    seed : int, optional
+        The random seed.
+        (default is 42)
+
+    returns:
+    --------
+    None
+
+    """
+
+    rnd = random.Random(seed)
+
+    n_customers = max(1, n_abos // 4)
+    n_products = 200
+    n_categories = 10
+    towns = ["Town_" + str(i) for i in range(max(1, n_customers // 100))]
+    tomorrow = datetime.datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)
+
+    with engine.begin() as conn:
+
+        conn.execute(Subcategory.__table__.insert(), [
+            {'id':i, 'name':name} for i, name in enumerate(["None", "Ganz", "Geschnitten"])
+        ])
+
+        conn.execute(Category.__table__.insert(), [
+            {'id':i + 1, 'name':"Category_" + str(i)} for i in range(n_categories)
+        ])
+
+        conn.execute(Products.__table__.insert(), [
+            {
+                'id':i + 1,
+                'name':"Product_" + str(i),
+                'category':rnd.randint(1, n_categories),
+                'purchase_price':1.0,
+                'selling_price':2.5,
+                'margin':.6,
+                'store':"Store",
+                'phone':"+00 phone"
+            } for i in range(n_products)
+        ])
+
+        conn.execute(Customers.__table__.insert(), [
+            {
+                'id':i + 1,
+                'name':"Name_" + str(i),
+                'surname':"Surname_" + str(i),
+                'street':"Street",
+                'nr':rnd.randint(1, 200),
+                'postal':"0000",
+                'town':rnd.choice(towns),
+                'phone':"+00 phone",
+                'mobile':"+00 mobile",
+                'approach':rnd.randint(1, 50),
+                'notes':""
+            } for i in range(n_customers)
+        ])
+
+        conn.execute(Abo.__table__.insert(), [
+            {
+                'id':i + 1,
+                'customer_id':rnd.randint(1, n_customers),
+                'cycle_type':"interval",
+                'interval':rnd.randint(1, 7),
+                'next_delivery':tomorrow + datetime.timedelta(days=rnd.choice([0, 0, 0, 0, 1, 2])),
+                'product':rnd.randint(1, n_products),
+                'subcategory':rnd.randint(1, 2),
+                'quantity':rnd.randint(1, 10)
+            } for i in range(n_abos)
+        ])
+
+    # explicit ids -> move the id sequences (e.g. postgresql)
+    init_database.sync_sequences(engine)
+
+    return
+
+def timeit(func, repeat:int = 3) -> float:
+    """Returns the best wall clock time of 'func' in seconds """
+
+    best = None
+    for _ in range(repeat):
+
+        start = time.perf_counter()
+        func()
+        duration = time.perf_counter() - start
+
+        if best is None or duration < best: best = duration
+
+    return best
+
+#endregion
@@ -0,0 +1,102 @@
+"""
+Benchmarks the batched abo validation.
+
+Times 'abo.add()' for growing numbers of abos &
+counts the SELECTs it sends. The number of
+SELECTs must not grow with the number of abos
+(besides the id batches of 900).
+
+To run the benchmark use:
+    $ python3 -m tests.benchmarks.bench_abo
+
+"""
+
+# imports
+import time
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import event
+
+from miniMoi.models.Models import Customers, Products, Subcategory
+from miniMoi.logic.functions import abo
+from miniMoi.logic.helpers import audit
+
+from tests.benchmarks import create_session
+
+#region 'benchmark'
+def run(sizes:list = [100, 1_000, 10_000]) -> dict:
+    """Runs the benchmark for all sizes
+
+    params:
+    -------
+    sizes : list, optional
+        The number of abos to add.
+        (default is [100, 1_000, 10_000])
+
+    returns:
+    --------
+    dict
+        {n_abos:{'seconds':float, 'selects':int}}
+
+    """
+
+    results = {}
+    for n in sizes:
+
+        # sqlite file -> the audit log is written by another thread
+        tmp = tempfile.TemporaryDirectory()
+        engine, Session = create_session("sqlite:///" + str(Path(tmp.name) / "bench.db"))
+
+        # customers -> ids 1 ... n/4 + 1
+        with engine.begin() as connection:
+            connection.execute(Customers.__table__.insert(), [{
+                'name':"Name", 'surname':"Surname", 'street':"Street",
+                'nr':i, 'postal':"0000", 'town':"Town"
+            } for i in range(n // 4 + 1)])
+            connection.execute(Products.__table__.insert(), [
+                {'name':name, 'category':1, 'purchase_price':1., 'selling_price':2., 'margin':.5, 'store':"", 'phone':""}
+                for name in ["Brot", "Baguette"]
+            ])
+            connection.execute(Subcategory.__table__.insert(), [{'name':name} for name in ["Sub1", "Sub2"]])
+
+        abos = [{
+            'customer_id':str(1 + i % (n // 4 + 1)),
+            'cycle_type':"interval",
+            'interval':7,
+            'product':1 + i % 2,
+            'next_delivery':None,
+            'subcategory':1 + i % 2,
+            'quantity':5
+        } for i in range(n)]
+
+        # count the SELECTs
+        selects = []
+        def count(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"): selects.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count)
+        with patch('miniMoi.logic.functions.abo.Session', Session):
+
+            start = time.perf_counter()
+            assert abo.add(abos=abos, language="EN", tz="Europe/Berlin")['success']
+            duration = time.perf_counter() - start
+
+        event.remove(engine, "before_cursor_execute", count)
+
+        results[n] = {'seconds':duration, 'selects':len(selects)}
+
+        audit.flush()
+        Session.remove()
+        engine.dispose()
+        tmp.cleanup()
+
+        print("{n:>8} abos | abo.add() {seconds:8.3f}s | {selects} SELECTs".format(n=n, **results[n]))
+
+    return results
+
+#endregion
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,93 @@
+"""
+Benchmarks the action logging.
+
+Compares the request latency of the legacy logging
+(one Log row & commit per action, 'str(locals())'
+payload) against the buffered audit writer (queued,
+batched inserts by the background flusher). Both
+write to a sqlite file with the "performance" profile.
+
+To run the benchmark use:
+    $ python3 -m tests.benchmarks.bench_audit
+
+"""
+
+# imports
+import os
+import time
+import tempfile
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from miniMoi import base
+from miniMoi.models.Models import Log
+from miniMoi.logic.db import sqlite
+from miniMoi.logic.helpers import audit
+
+#region 'helpers'
+def _legacy(engine, ressource:str, action:dict) -> None:
+    """The legacy logging (commit per action) """
+
+    with Session(engine) as session:
+        session.add(Log(ressource=ressource, action=str(action)[:500]))
+        session.commit()
+
+#endregion
+
+#region 'benchmark'
+def run(n_actions:int = 2000, rows_per_action:int = 100) -> dict:
+    """Runs the benchmark
+
+    params:
+    -------
+    n_actions : int, optional
+        The number of logged actions.
+        (default is 2000)
+    rows_per_action : int, optional
+        Size of the input list of each action
+        (like a bulk import).
+        (default is 100)
+
+    returns:
+    --------
+    dict
+        {mode:{'per_action':float, 'total':float}} # -> seconds
+
+    """
+
+    action = {'customers':[{'name':"Fritz", 'surname':"Meier", 'town':"Entenhausen"}] * rows_per_action, 'language':"EN"}
+
+    results = {}
+    for mode in ['legacy', 'buffered']:
+
+        with tempfile.TemporaryDirectory() as tmp:
+
+            url = "sqlite:///" + os.path.join(tmp, "app.db")
+            engine = create_engine(url, echo=False, future=False, **sqlite.engine_options(url))
+            sqlite.apply(engine, sqlite.get_pragmas())
+            base.metadata.create_all(engine)
+
+            start = time.perf_counter()
+            for _ in range(n_actions):
+                if mode == "legacy": _legacy(engine, "miniMoi.logic.functions.customer.add", action)
+                else: audit.log(engine, "miniMoi.logic.functions.customer.add", action)
+            latency = time.perf_counter() - start
+
+            audit.shutdown()
+            total = time.perf_counter() - start
+
+            with Session(engine) as session: assert session.query(Log).count() == n_actions
+
+            engine.dispose()
+
+        results[mode] = {'per_action':latency / n_actions, 'total':total}
+
+        print("{mode:>9} | {per_action:10.6f}s per action (request latency) | {total:8.3f}s incl. flush".format(mode=mode, **results[mode]))
+
+    return results
+
+#endregion
+
+if __name__ == "__main__":
+    run()
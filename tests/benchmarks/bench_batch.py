@@ -0,0 +1,72 @@
+"""
+Benchmarks the batch requests.
+
+Compares editing n categories with one '/api/category/update'
+request per row (one commit each) against one '/api/batch'
+request (one commit). The app uses a sqlite file with
+the "performance" profile.
+
+To run the benchmark use:
+    $ python3 -m tests.benchmarks.bench_batch
+
+"""
+
+# imports
+import time
+import tempfile
+from pathlib import Path
+
+import miniMoi
+from miniMoi import create_app
+from miniMoi.models.Models import Category
+
+#region 'benchmark'
+def run(n_rows:int = 200) -> dict:
+    """Runs the benchmark
+
+    params:
+    -------
+    n_rows : int, optional
+        The number of edited rows.
+        (default is 200)
+
+    returns:
+    --------
+    dict
+        {mode:float} # -> seconds
+
+    """
+
+    results = {}
+    for mode in ['single', 'batch']:
+
+        with tempfile.TemporaryDirectory() as tmp:
+
+            app = create_app({'HOME':tmp, 'DATABASE_URL':"sqlite:///" + str(Path(tmp) / "app.db")})
+
+            with app.app_context():
+                session = miniMoi.Session()
+                session.add_all([Category(name="category " + str(idx)) for idx in range(n_rows)])
+                session.commit()
+                miniMoi.Session.remove()
+
+            items = [{'ressource':"category/update", 'data':{'id':idx + 1, 'name':"edited " + str(idx)}} for idx in range(n_rows)]
+            client = app.test_client()
+
+            start = time.perf_counter()
+            if mode == "single":
+                for item in items: assert client.post("/api/" + item['ressource'], json=item['data']).get_json()['success']
+            else:
+                assert client.post("/api/batch", json={'items':items}).get_json()['data']['committed']
+            results[mode] = time.perf_counter() - start
+
+            app.extensions['miniMoi']['engine'].dispose()
+
+        print("{mode:>7} | {rows} rows {duration:8.3f}s".format(mode=mode, rows=n_rows, duration=results[mode]))
+
+    return results
+
+#endregion
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,275 @@
+"""
+Benchmarks the delivery overview creation.
+
+Compares the legacy data fetching (five separate queries
+stitched together with four merges) against the joined
+single statement query used by 'delivery.create'.
+Additionally the booking ('delivery.book') is compared
+against the legacy per abo booking loop and the
+size of the legacy 'town_based' payload is compared
+against the compact columnar payload (plain & gzipped).
+
+To run the benchmark use:
+    $ python3 -m tests.benchmarks.bench_delivery
+
+"""
+
+# imports
+import gzip
+import json
+import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from miniMoi.models.Models import Abo, Customers, Products, Category, Subcategory, Orders
+from miniMoi.logic.functions import delivery
+from miniMoi.logic.helpers import audit
+import miniMoi.logic.helpers.time_module as time
+
+from tests.benchmarks import create_session, populate, timeit
+
+#region 'legacy reference'
+def _legacy_fetch(session, yesterday:datetime.datetime, tomorrow:datetime.datetime) -> pd.DataFrame:
+    """The data fetching prior to the joined query """
+
+    abos = pd.read_sql_query(
+        session.query(Abo).filter(Abo.next_delivery <= tomorrow).filter(Abo.next_delivery >= yesterday).statement,
+        session.bind
+    )
+
+    customers = pd.read_sql_query(session.query(Customers).filter(Customers.id.in_(
+        abos['customer_id'].unique().tolist()
+    )).statement, session.bind)
+    customers.columns = ["customer_" + col for col in customers.columns]
+
+    products = pd.read_sql_query(session.query(Products).filter(Products.id.in_(
+        abos['product'].unique().tolist()
+    )).statement, session.bind)
+    products.columns = ["product_" + col for col in products.columns]
+
+    categories = pd.read_sql_query(session.query(Category).filter(Category.id.in_(
+        products['product_category'].unique().tolist()
+    )).statement, session.bind)
+    categories.columns = ["category_" + col for col in categories.columns]
+
+    subcategories = pd.read_sql_query(session.query(Subcategory).filter(Subcategory.id.in_(
+        abos['subcategory'].unique().tolist()
+    )).statement, session.bind)
+    subcategories.columns = ["subcategory_" + col for col in subcategories.columns]
+
+    df = pd.merge(abos, customers, how="left", left_on="customer_id", right_on="customer_id")
+    df = pd.merge(df, products, how="left", left_on="product", right_on="product_id")
+    df = pd.merge(df, categories, how="left", left_on="product_category", right_on="category_id")
+    df = pd.merge(df, subcategories, how="left", left_on="subcategory", right_on="subcategory_id")
+
+    return df
+
+def _joined_fetch(session, yesterday:datetime.datetime, tomorrow:datetime.datetime) -> pd.DataFrame:
+    """The data fetching with the joined query """
+
+    return pd.read_sql_query(
+        delivery._delivery_query(session, yesterday, tomorrow).statement,
+        session.bind
+    )
+
+def _legacy_book(session, df:pd.DataFrame) -> None:
+    """The booking loop prior to the bulk booking """
+
+    toQuery = [int(val) for val in  df['id'].unique().tolist() if not np.isnan(val)]
+    abos = session.query(Abo).filter(Abo.id.in_(toQuery)).all()
+
+    toAdd = []
+    for abo in abos:
+
+        tmp = df[df['id'] == abo.id]
+
+        toAdd.append(Orders(
+            customer_id = int(tmp['customer_id'].tolist()[0]),
+            product = int(tmp['product_id'].tolist()[0]),
+            product_name = str(tmp['product_name'].tolist()[0]),
+            category = str(tmp['category_name'].tolist()[0]),
+            subcategory = str(tmp['subcategory_name'].tolist()[0]),
+            quantity = int(tmp['quantity'].tolist()[0]),
+            price = float(tmp['product_selling_price'].tolist()[0]),
+            total = float(tmp['cost'].tolist()[0])
+        ))
+
+        abo.next_delivery = time.calculate_next_delivery(
+            date = abo.next_delivery,
+            cycle_type = abo.cycle_type,
+            interval = abo.interval,
+            language = "EN"
+        )
+
+    session.add_all(toAdd)
+    session.commit()
+
+def _booking_data(session, n:int) -> dict:
+    """Creates the frontend payload for the first n abos """
+
+    today = time.today()
+
+    df = _joined_fetch(session, today, today + datetime.timedelta(days=3)).head(n)
+    df['cost'] = df['product_selling_price'] * df['quantity']
+    df['total_cost'] = df.groupby('customer_id')['cost'].transform("sum")
+
+    return df.drop(columns=['product', 'subcategory', 'next_delivery', 'product_purchase_price']).to_dict("list")
+
+#endregion
+
+#region 'benchmark'
+def run(sizes:list = [1_000, 10_000, 100_000]) -> dict:
+    """Runs the benchmark for all sizes
+
+    params:
+    -------
+    sizes : list, optional
+        The number of abos to benchmark.
+        (default is [1_000, 10_000, 100_000])
+
+    returns:
+    --------
+    dict
+        {n_abos:{'legacy':float, 'joined':float, 'create':float}}
+
+    """
+
+    today = time.today()
+    tomorrow = today + datetime.timedelta(days=1)
+    yesterday = today + datetime.timedelta(days=-1)
+
+    results = {}
+    for n in sizes:
+
+        engine, Session = create_session()
+        populate(engine, n)
+        session = Session()
+
+        with patch('miniMoi.logic.functions.delivery.Session', Session):
+
+            results[n] = {
+                'legacy':timeit(lambda: _legacy_fetch(session, yesterday, tomorrow)),
+                'joined':timeit(lambda: _joined_fetch(session, yesterday, tomorrow)),
+                'create':timeit(lambda: delivery.create(language="EN", tz="UTC"))
+            }
+
+        Session.remove()
+        engine.dispose()
+
+        print("{n:>8} abos | legacy fetch {legacy:8.3f}s | joined fetch {joined:8.3f}s | create() {create:8.3f}s".format(
+            n=n, **results[n]
+        ))
+
+    return results
+
+def run_book(sizes:list = [2_000, 20_000], legacy_max:int = 2_000) -> dict:
+    """Runs the booking benchmark
+
+    params:
+    -------
+    sizes : list, optional
+        The number of booked deliveries.
+        (default is [2_000, 20_000])
+    legacy_max : int, optional
+        The legacy loop is quadratic; it only runs
+        up to this size.
+        (default is 2_000)
+
+    returns:
+    --------
+    dict
+        {n_deliveries:{'legacy':float | None, 'book':float}}
+
+    """
+
+    results = {}
+    for n in sizes:
+
+        results[n] = {'legacy':None, 'book':None}
+
+        for name in ['legacy', 'book']:
+
+            if name == "legacy" and n > legacy_max: continue
+
+            # fresh db for each run -> the booking changes the abos
+            engine, Session = create_session()
+            populate(engine, n)
+            session = Session()
+            data = _booking_data(session, n)
+
+            with patch('miniMoi.logic.functions.delivery.Session', Session), \
+                patch('miniMoi.logic.functions.delivery._process_excel', return_value={'success':True, 'error':"", 'data':{'path':""}}):
+
+                if name == "legacy": 
+                    
+                    processed = delivery._process_received(data, {})['data']['df']
+                    results[n][name] = timeit(lambda: _legacy_book(session, processed), repeat=1)
+
+                else: results[n][name] = timeit(lambda: delivery.book(data, "EN"), repeat=1)
+
+            # the action log is written by the flusher thread
+            audit.flush()
+
+            Session.remove()
+            engine.dispose()
+
+        print("{n:>8} deliveries | legacy book {legacy} | book() {book:8.3f}s".format(
+            n=n,
+            legacy="{:8.3f}s".format(results[n]['legacy']) if results[n]['legacy'] is not None else "  skipped",
+            book=results[n]['book']
+        ))
+
+    return results
+
+def run_payload(sizes:list = [1_000, 10_000, 100_000]) -> dict:
+    """Runs the payload size benchmark
+
+    params:
+    -------
+    sizes : list, optional
+        The number of abos.
+        (default is [1_000, 10_000, 100_000])
+
+    returns:
+    --------
+    dict
+        {n_abos:{'legacy':float, 'compact':float, 'gzip':float}} # -> MB
+
+    """
+
+    size = lambda payload: len(json.dumps(payload).encode("utf-8")) / 1e6
+
+    results = {}
+    for n in sizes:
+
+        engine, Session = create_session()
+        populate(engine, n)
+
+        with patch('miniMoi.logic.functions.delivery.Session', Session):
+
+            legacy = delivery.create(language="EN", tz="UTC")['data']
+            compact = delivery.create(language="EN", tz="UTC", compact=True)['data']
+
+        Session.remove()
+        engine.dispose()
+
+        results[n] = {
+            'legacy':size(legacy),
+            'compact':size(compact),
+            'gzip':len(gzip.compress(json.dumps(compact).encode("utf-8"), compresslevel=5)) / 1e6
+        }
+
+        print("{n:>8} abos | legacy payload {legacy:8.2f}MB | compact payload {compact:8.2f}MB | compact gzipped {gzip:8.2f}MB".format(
+            n=n, **results[n]
+        ))
+
+    return results
+
+#endregion
+
+if __name__ == "__main__":
+    run()
+    run_book()
+    run_payload()
@@ -0,0 +1,151 @@
+"""
+Benchmarks the excel generation memory.
+
+Compares the peak (python) memory of the legacy
+in memory workbooks against the streaming
+('constant_memory') workbooks used by
+'excel.print_order_list'.
+Additionally the wall clock time of the single
+overview workbook is compared against the per
+town workbooks rendered in parallel processes
+('delivery._process_excel(split_towns=True)').
+
+To run the benchmark use:
+    $ python3 -m tests.benchmarks.bench_excel
+
+"""
+
+# imports
+import os
+import tempfile
+import tracemalloc
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import xlsxwriter as xlsx
+
+from miniMoi import app
+import miniMoi.logic.helpers.excel as excel
+from miniMoi.logic.functions import delivery
+
+from tests.benchmarks import timeit
+
+# the printed columns
+COLUMNS = [
+    'customer_street', 'customer_nr', 'customer_name', 'customer_surname',
+    'quantity', 'product_name', 'subcategory_name', 'total_cost',
+    'customer_phone', 'customer_mobile', 'customer_notes'
+]
+
+#region 'helpers'
+def order_list(n:int, towns:int = 300) -> dict:
+    """Creates the 'print_order_list' payload with n rows over the towns """
+
+    perTown = max(n // towns, 1)
+
+    return {
+        "Town {idx}".format(idx=idx):{
+            col:[i % 7 if col == "quantity" else "{col} {i}".format(col=col, i=i // 3) for i in range(perTown)] for col in COLUMNS
+        } for idx in range(towns)
+    }
+
+def peak_memory(data:dict, legacy:bool = False) -> float:
+    """Returns the peak memory (MB) of one 'print_order_list' call """
+
+    legacyWorkbook = lambda output: xlsx.Workbook(output, {'nan_inf_to_errors': True})
+
+    with tempfile.TemporaryDirectory() as tmp, \
+        patch.object(excel, '_workbook', legacyWorkbook if legacy else excel._workbook):
+
+        tracemalloc.start()
+        excel.print_order_list(data, os.path.join(tmp, "orders.xlsx"))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return peak / 1e6
+
+#endregion
+
+#region 'benchmark'
+def run(sizes:list = [3_000, 30_000, 90_000]) -> dict:
+    """Runs the benchmark for all sizes
+
+    params:
+    -------
+    sizes : list, optional
+        The number of order rows (300 towns).
+        (default is [3_000, 30_000, 90_000])
+
+    returns:
+    --------
+    dict
+        {n_rows:{'legacy':float, 'stream':float, 'time':float}}
+
+    """
+
+    results = {}
+    for n in sizes:
+
+        data = order_list(n)
+
+        with tempfile.TemporaryDirectory() as tmp:
+
+            results[n] = {
+                'legacy':peak_memory(data, legacy=True),
+                'stream':peak_memory(data),
+                'time':timeit(lambda: excel.print_order_list(data, os.path.join(tmp, "orders.xlsx")), repeat=1)
+            }
+
+        print("{n:>8} rows | legacy peak {legacy:8.1f}MB | streaming peak {stream:8.1f}MB | print_order_list() {time:8.3f}s".format(
+            n=n, **results[n]
+        ))
+
+    return results
+
+def run_split(sizes:list = [3_000, 30_000], towns:int = 300) -> dict:
+    """Runs the per town workbook benchmark
+
+    params:
+    -------
+    sizes : list, optional
+        The number of order rows.
+        (default is [3_000, 30_000])
+    towns : int, optional
+        The number of towns.
+        (default is 300)
+
+    returns:
+    --------
+    dict
+        {n_rows:{'single':float, 'split':float}}
+
+    """
+
+    results = {}
+    for n in sizes:
+
+        # one frame with all towns (like the received delivery data)
+        df = pd.concat([
+            pd.DataFrame(townData).assign(
+                customer_town=town, customer_id=idx, product_id=1, category_name="Brot", subcategory_name="Ganz", product_selling_price=1.0, cost=1.0
+            ) for idx, (town, townData) in enumerate(order_list(n, towns).items())
+        ], ignore_index=True)
+
+        results[n] = {}
+        for name, split in [('single', False), ('split', True)]:
+
+            with tempfile.TemporaryDirectory() as tmp, patch.dict(app.config, {'MINI_MOI_HOME':Path(tmp)}):
+                results[n][name] = delivery._process_excel(df, True, True, "EN", split_towns=split)['data']['duration']
+
+        print("{n:>8} rows | cover + overview {single:8.3f}s | cover + {towns} town workbooks (processes) {split:8.3f}s".format(
+            n=n, towns=towns, **results[n]
+        ))
+
+    return results
+
+#endregion
+
+if __name__ == "__main__":
+    run()
+    run_split()
@@ -0,0 +1,80 @@
+"""
+Benchmarks the delivery forecast.
+
+Times 'forecast.create()' end to end (query, name
+mapping & projection) for n abos (all cycle types)
+in a sqlite file over the given number of days.
+
+To run the benchmark use:
+    $ python3 -m tests.benchmarks.bench_forecast
+
+"""
+
+# imports
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import case
+
+from miniMoi.models.Models import Abo
+from miniMoi.logic.functions import forecast
+
+from tests.benchmarks import create_session, populate, timeit
+
+#region 'benchmark'
+def run(n_abos:int = 100000, days:int = 60) -> dict:
+    """Runs the benchmark
+
+    params:
+    -------
+    n_abos : int, optional
+        The number of abos.
+        (default is 100000)
+    days : int, optional
+        The number of forecasted days.
+        (default is 60)
+
+    returns:
+    --------
+    dict
+        {'create':float} # -> seconds
+
+    """
+
+    tmp = tempfile.TemporaryDirectory()
+    engine, Session = create_session("sqlite:///" + str(Path(tmp.name) / "bench.db"))
+    populate(engine, n_abos)
+
+    # mix the cycle types (interval -> a third weekly, a third without cycle)
+    with engine.begin() as connection:
+        connection.execute(Abo.__table__.update().values(
+            cycle_type = case((Abo.id % 3 == 1, "day"), (Abo.id % 3 == 2, None), else_=Abo.cycle_type),
+            interval = case((Abo.id % 3 == 1, Abo.id % 7), (Abo.id % 3 == 2, None), else_=Abo.interval)
+        ))
+
+    with patch('miniMoi.logic.functions.forecast.Session', Session):
+
+        result = forecast.create(days=days, language="EN", tz="Europe/Berlin")
+        assert result['success']
+
+        results = {'create':timeit(lambda: forecast.create(days=days, language="EN", tz="Europe/Berlin"))}
+
+    print("forecast.create() | {n} abos x {days} days -> {products} products, {subcategories} subcategories {duration:8.3f}s".format(
+        n=n_abos,
+        days=days,
+        products=len(result['data']['forecast_product']['order']) - 1,
+        subcategories=len(result['data']['forecast_subcategory']['order']) - 1,
+        duration=results['create']
+    ))
+
+    Session.remove()
+    engine.dispose()
+    tmp.cleanup()
+
+    return results
+
+#endregion
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,78 @@
+"""
+Benchmarks the bulk price change.
+
+Compares repricing n products with one
+'/api/products/update' request per product against
+one '/api/products/reprice' request. The app uses a
+sqlite file with the "performance" profile.
+
+To run the benchmark use:
+    $ python3 -m tests.benchmarks.bench_reprice
+
+"""
+
+# imports
+import time
+import tempfile
+from pathlib import Path
+
+import miniMoi
+from miniMoi import create_app
+from miniMoi.models.Models import Products, Category
+
+#region 'benchmark'
+def run(n_rows:int = 500) -> dict:
+    """Runs the benchmark
+
+    params:
+    -------
+    n_rows : int, optional
+        The number of repriced products.
+        (default is 500)
+
+    returns:
+    --------
+    dict
+        {mode:float} # -> seconds
+
+    """
+
+    results = {}
+    for mode in ['single', 'reprice']:
+
+        with tempfile.TemporaryDirectory() as tmp:
+
+            app = create_app({'HOME':tmp, 'DATABASE_URL':"sqlite:///" + str(Path(tmp) / "app.db")})
+
+            with app.app_context():
+                session = miniMoi.Session()
+                session.add(Category(name="Brot"))
+                session.add_all([
+                    Products(name="product " + str(idx), category=1, purchase_price=1. + idx % 10, selling_price=20., margin=0., store="MeinLaden", phone="")
+                    for idx in range(n_rows)
+                ])
+                session.commit()
+                miniMoi.Session.remove()
+
+            client = app.test_client()
+
+            start = time.perf_counter()
+            if mode == "single":
+                for idx in range(n_rows): assert client.post("/api/products/update", json={
+                    'id':idx + 1, 'name':"product " + str(idx), 'category':1, 'purchase_price':round((1. + idx % 10) * 1.05, 2),
+                    'selling_price':20., 'store':"MeinLaden", 'phone':""
+                }).get_json()['success']
+            else:
+                assert len(client.post("/api/products/reprice", json={'rule':{'percentage':5, 'store':"MeinLaden"}}).get_json()['data']['changes']) == n_rows
+            results[mode] = time.perf_counter() - start
+
+            app.extensions['miniMoi']['engine'].dispose()
+
+        print("{mode:>7} | {rows} rows {duration:8.3f}s".format(mode=mode, rows=n_rows, duration=results[mode]))
+
+    return results
+
+#endregion
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,93 @@
+"""
+Benchmarks the json serialization of the api responses.
+
+Compares the legacy serialization (cell wise conversion
+of the numpy values by 'tools.jEncoder') against the
+vectorized column conversion of 'serialize.dumps'
+for a delivery like payload.
+
+To run the benchmark use:
+    $ python3 -m tests.benchmarks.bench_serialize
+
+"""
+
+# imports
+import json
+
+import numpy as np
+import pandas as pd
+
+from miniMoi.logic.helpers import tools, serialize
+
+from tests.benchmarks import timeit
+
+#region 'helpers'
+def delivery_frame(n_cells:int, seed:int = 42) -> pd.DataFrame:
+    """Creates a delivery like frame with roughly n_cells cells """
+
+    rng = np.random.default_rng(seed)
+    n = max(n_cells // 10, 1)
+
+    return pd.DataFrame({
+        'customer_id':rng.integers(1, 5_000, n),
+        'customer_street':rng.choice(["Elmstreet", "Quickhausen", "Castlestreet"], n),
+        'customer_nr':rng.integers(1, 200, n),
+        'customer_town':rng.choice(["Entenhausen", "Dreamland"], n),
+        'product_id':rng.integers(1, 40, n),
+        'product_name':rng.choice(["Sonnenkernbrot", "Doppelweck", "Kaisersemmel"], n),
+        'quantity':rng.integers(1, 10, n),
+        'product_selling_price':rng.integers(1, 40, n) * .25,
+        'cost':rng.integers(1, 400, n) * .25,
+        'next_delivery':pd.Timestamp("2022-05-01") + pd.to_timedelta(rng.integers(0, 30, n), unit="D")
+    })
+
+def legacy_dumps(df:pd.DataFrame) -> bytes:
+    """The cell wise serialization (numpy values per cell) """
+
+    return json.dumps(
+        {'success':True, 'error':"", 'data':{col:list(df[col]) for col in df.columns}},
+        cls = tools.jEncoder,
+        separators = (",", ":"),
+        sort_keys = True
+    ).encode("utf-8")
+
+#endregion
+
+#region 'benchmark'
+def run(sizes:list = [10_000, 100_000, 1_000_000]) -> dict:
+    """Runs the benchmark for all sizes
+
+    params:
+    -------
+    sizes : list, optional
+        The number of cells.
+        (default is [10_000, 100_000, 1_000_000])
+
+    returns:
+    --------
+    dict
+        {n_cells:{'legacy':float, 'serialize':float}}
+
+    """
+
+    results = {}
+    for n in sizes:
+
+        df = delivery_frame(n)
+        response = {'success':True, 'error':"", 'data':df}
+
+        results[n] = {
+            'legacy':timeit(lambda: legacy_dumps(df)),
+            'serialize':timeit(lambda: serialize.dumps(response))
+        }
+
+        print("{n:>9} cells | jEncoder (per cell) {legacy:8.3f}s | serialize.dumps() {serialize:8.3f}s".format(
+            n=n, **results[n]
+        ))
+
+    return results
+
+#endregion
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,164 @@
+"""
+Benchmarks the sqlite profiles under concurrency.
+
+Reader threads run the delivery like joined query
+while one writer thread keeps updating the abos
+(like 'delivery.book' or 'bulk.update'). The reader
+& writer throughput of the legacy sqlite defaults
+('off') is compared against the "performance"
+profile (WAL, NORMAL synchronous, mmap, cache).
+
+To run the benchmark use:
+    $ python3 -m tests.benchmarks.bench_sqlite
+
+"""
+
+# imports
+import os
+import time
+import tempfile
+import threading
+
+from sqlalchemy import create_engine, text
+
+from miniMoi import base
+from miniMoi.logic.db import sqlite
+
+from tests.benchmarks import populate
+
+# the reader query (delivery like join)
+READ = text("""
+    SELECT c.town, SUM(a.quantity), COUNT(*)
+    FROM abo a JOIN customers c ON c.id = a.customer_id
+    GROUP BY c.town
+""")
+
+# the writer statements (booking like: all abos & one order per abo)
+WRITE = [
+    text("UPDATE abo SET quantity = quantity + 1, next_delivery = next_delivery"),
+    text("""
+        INSERT INTO orders (date, customer_id, product, product_name, category, subcategory, quantity, price, total)
+        SELECT CURRENT_TIMESTAMP, customer_id, product, 'product', 'category', 'subcategory', quantity, 1.0, quantity
+        FROM abo
+    """)
+]
+
+#region 'helpers'
+def throughput(engine, readers:int = 4, duration:float = 3.0) -> dict:
+    """Measures the reads & writes per second
+
+    params:
+    -------
+    engine : sqlalchemy engine
+        The populated engine.
+    readers : int, optional
+        Number of reader threads.
+        (default is 4)
+    duration : float, optional
+        Seconds to run.
+        (default is 3.0)
+
+    returns:
+    --------
+    dict
+        {
+            'reads':float, # -> per second
+            'writes':float, # -> per second
+            'errors':int,
+            'max_wait':float # -> slowest read (s)
+        }
+
+    """
+
+    stop = threading.Event()
+    counts = {'reads':0, 'writes':0, 'errors':0, 'max_wait':0.0}
+    lock = threading.Lock()
+
+    def _count(key:str, wait:float = 0.0) -> None:
+        with lock: 
+            counts[key] += 1
+            counts['max_wait'] = max(counts['max_wait'], wait)
+
+    def _reader() -> None:
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                with engine.connect() as connection: connection.execute(READ).fetchall()
+                _count('reads', time.perf_counter() - start)
+            except Exception: _count('errors')
+
+    def _writer() -> None:
+        while not stop.is_set():
+            try:
+                with engine.begin() as connection:
+                    for statement in WRITE: connection.execute(statement)
+                    time.sleep(.1) # -> python work within the transaction
+                _count('writes')
+            except Exception: _count('errors')
+
+    threads = [threading.Thread(target=_reader) for _ in range(readers)] + [threading.Thread(target=_writer)]
+    for thread in threads: thread.start()
+
+    time.sleep(duration)
+    stop.set()
+
+    for thread in threads: thread.join()
+
+    return {
+        'reads':counts['reads'] / duration, 
+        'writes':counts['writes'] / duration, 
+        'errors':counts['errors'],
+        'max_wait':counts['max_wait']
+    }
+
+#endregion
+
+#region 'benchmark'
+def run(n_abos:int = 50_000, readers:int = 4, duration:float = 5.0) -> dict:
+    """Runs the benchmark for both profiles
+
+    params:
+    -------
+    n_abos : int, optional
+        The number of abos.
+        (default is 50_000)
+    readers : int, optional
+        Number of reader threads.
+        (default is 4)
+    duration : float, optional
+        Seconds per profile.
+        (default is 5.0)
+
+    returns:
+    --------
+    dict
+        {profile:{'reads':float, 'writes':float, 'errors':int, 'max_wait':float}}
+
+    """
+
+    results = {}
+    for profile in ['off', 'performance']:
+
+        with tempfile.TemporaryDirectory() as tmp:
+
+            url = "sqlite:///" + os.path.join(tmp, "app.db")
+
+            engine = create_engine(url, echo=False, future=False, **sqlite.engine_options(url))
+            sqlite.apply(engine, sqlite.get_pragmas(profile))
+
+            base.metadata.create_all(engine)
+            populate(engine, n_abos)
+
+            results[profile] = throughput(engine, readers, duration)
+            engine.dispose()
+
+        print("{profile:>12} | {readers} readers {reads:8.1f} reads/s (slowest {max_wait:6.3f}s) | 1 writer {writes:8.1f} writes/s | errors {errors}".format(
+            profile=profile, readers=readers, **results[profile]
+        ))
+
+    return results
+
+#endregion
+
+if __name__ == "__main__":
+    run()
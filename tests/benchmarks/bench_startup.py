@@ -0,0 +1,113 @@
+"""
+Benchmarks the app startup.
+
+Measures the import & 'create_app()' time of 'miniMoi'
+and the time to the first response (index page) in
+a fresh interpreter. The lazy startup is compared against
+the legacy eager startup (all logic modules
+imported up front).
+
+To run the benchmark use:
+    $ python3 -m tests.benchmarks.bench_startup
+
+"""
+
+# imports
+import sys
+import json
+import subprocess
+
+# the heavy modules which should not be loaded before the first api request
+HEAVY_MODULES = ['pandas', 'numpy', 'xlsxwriter', 'openpyxl', 'pytz']
+
+# budget (seconds) for the import & the first response (see 'tests/helpers/test_lazy.py')
+STARTUP_BUDGET = 3.0
+
+# measured in the fresh interpreter
+_SCRIPT = """
+import sys, json, time
+start = time.perf_counter()
+import miniMoi
+app = miniMoi.create_app()
+imported = time.perf_counter()
+if {eager}:
+    import miniMoi.logic.functions.customer, miniMoi.logic.functions.products, miniMoi.logic.functions.categories
+    import miniMoi.logic.functions.abo, miniMoi.logic.functions.delivery, miniMoi.logic.functions.system
+    import miniMoi.logic.functions.bulk, miniMoi.logic.functions.reporting, miniMoi.logic.functions.demo
+status = app.test_client().get("/").status_code
+responded = time.perf_counter()
+print(json.dumps({{
+    'import':imported - start,
+    'first_response':responded - start,
+    'status':status,
+    'loaded':[name for name in {heavy} if name in sys.modules]
+}}))
+"""
+
+#region 'functions'
+def measure(eager:bool = False) -> dict:
+    """Measures the startup in a fresh interpreter
+
+    params:
+    -------
+    eager : bool, optional
+        If True, all logic modules are imported
+        before the first response (legacy).
+        (default is False)
+
+    returns:
+    --------
+    dict
+        {
+            'import':float, # -> seconds
+            'first_response':float, # -> seconds (incl. import)
+            'status':int,
+            'loaded':list # -> loaded heavy modules
+        }
+
+    """
+
+    output = subprocess.run(
+        [sys.executable, "-c", _SCRIPT.format(eager=eager, heavy=HEAVY_MODULES)],
+        capture_output=True, text=True, check=True
+    ).stdout
+
+    return json.loads(output.strip().splitlines()[-1])
+
+#endregion
+
+#region 'benchmark'
+def run(repeat:int = 5) -> dict:
+    """Runs the benchmark
+
+    params:
+    -------
+    repeat : int, optional
+        Number of fresh interpreters per mode
+        (the best run is reported).
+        (default is 5)
+
+    returns:
+    --------
+    dict
+        {mode:{'import':float, 'first_response':float, 'loaded':list}}
+
+    """
+
+    results = {}
+    for mode in ['eager', 'lazy']:
+
+        runs = [measure(eager = mode == "eager") for _ in range(repeat)]
+        best = min(runs, key=lambda val: val['first_response'])
+        results[mode] = best
+
+        print("{mode:>6} | import {import_:8.3f}s | first response {first:8.3f}s | heavy modules loaded: {loaded}".format(
+            mode=mode, import_=best['import'], first=best['first_response'], loaded=", ".join(best['loaded']) or "-"
+        ))
+
+    return results
+
+#endregion
+
+if __name__ == "__main__":
+    run()
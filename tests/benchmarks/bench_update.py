@@ -0,0 +1,84 @@
+"""
+Benchmarks the set based updates.
+
+Compares editing n abos with one '/api/abo/update'
+request per row against one '/api/abo/updateMany'
+request. The app uses a sqlite file with the
+"performance" profile.
+
+To run the benchmark use:
+    $ python3 -m tests.benchmarks.bench_update
+
+"""
+
+# imports
+import time
+import datetime
+import tempfile
+from pathlib import Path
+
+import miniMoi
+from miniMoi import create_app
+from miniMoi.models.Models import Abo, Customers, Products, Subcategory
+
+#region 'benchmark'
+def run(n_rows:int = 500) -> dict:
+    """Runs the benchmark
+
+    params:
+    -------
+    n_rows : int, optional
+        The number of edited rows.
+        (default is 500)
+
+    returns:
+    --------
+    dict
+        {mode:float} # -> seconds
+
+    """
+
+    results = {}
+    for mode in ['single', 'updateMany']:
+
+        with tempfile.TemporaryDirectory() as tmp:
+
+            app = create_app({'HOME':tmp, 'DATABASE_URL':"sqlite:///" + str(Path(tmp) / "app.db")})
+
+            with app.app_context():
+                session = miniMoi.Session()
+                session.add_all([
+                    Customers(name="Fritz", surname="Meier", street="Elmstreet", nr=5, postal="0000", town="Entenhausen", phone="", mobile="", approach=1, notes=""),
+                    Products(name="Brot", category=0, purchase_price=1., selling_price=2., margin=.5, store="", phone=""),
+                    Subcategory(name="Sub1")
+                ])
+                session.add_all([
+                    Abo(customer_id=1, cycle_type="day", interval=0, next_delivery=datetime.datetime(2022, 3, 14), product=1, subcategory=0, quantity=1)
+                    for _ in range(n_rows)
+                ])
+                session.commit()
+                miniMoi.Session.remove()
+
+            rows = [
+                {'id':idx + 1, 'customer_id':1, 'cycle_type':"interval", 'interval':idx % 7 + 1, 'product':1, 'subcategory':1, 'quantity':2, 'next_delivery':None}
+                for idx in range(n_rows)
+            ]
+            client = app.test_client()
+
+            start = time.perf_counter()
+            if mode == "single":
+                for row in rows: assert client.post("/api/abo/update", json=row).get_json()['success']
+            else:
+                assert client.post("/api/abo/updateMany", json={'to_update':rows}).get_json()['data']['updated'] == n_rows
+            results[mode] = time.perf_counter() - start
+
+            app.extensions['miniMoi']['engine'].dispose()
+
+        print("{mode:>10} | {rows} rows {duration:8.3f}s".format(mode=mode, rows=n_rows, duration=results[mode]))
+
+    return results
+
+#endregion
+
+if __name__ == "__main__":
+    run()
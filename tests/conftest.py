@@ -0,0 +1,9 @@
+"""
+Pytest entry point.
+
+Pytest imports the test modules before the 'tests'
+package. Loading this file imports 'tests/__init__.py'
+first, so the test app exists before the logic
+modules are imported.
+
+"""
@@ -0,0 +1,171 @@
+"""
+Tests the app factory
+
+"""
+
+# imports
+import os
+import sys
+import json
+import tempfile
+import subprocess
+import unittest
+from unittest.mock import patch
+from pathlib import Path
+
+from sqlalchemy.engine import make_url
+
+import miniMoi
+from miniMoi import create_app
+from miniMoi.models.Models import Subcategory, Customers
+from miniMoi.logic.helpers import jobs
+
+from tests import testApp
+
+# class
+class TestCreateApp(unittest.TestCase):
+    """Tests the 'create_app()' factory
+
+    methods:
+    --------
+    setUp
+        Tests setup
+    tearDown
+        Clean after test
+    test_import
+        Tests the side effect free import
+    test_isolation
+        Tests isolated app instances
+    test_file_db
+        Tests the setup & db file creation
+    test_database_url
+        Tests the database url order
+
+    """
+
+    def setUp(self):
+        """Prepare test """
+
+        self.homes = [tempfile.TemporaryDirectory() for _ in range(2)]
+
+        # second app with german settings
+        settingsPath = Path(self.homes[1].name) / "mini-moi/system/settings"
+        settingsPath.mkdir(parents=True)
+        with open(settingsPath / "settings.json", "w") as file:
+            json.dump({'default_language':"DE", 'action_logging':"False"}, file)
+
+        return
+
+    def tearDown(self):
+        """Cleanup after test """
+
+        jobs.shutdown()
+
+        for home in self.homes: home.cleanup()
+
+    #region 'tests'
+    def test_import(self):
+        """Tests the side effect free import """
+
+        with tempfile.TemporaryDirectory() as tmp:
+
+            output = subprocess.run(
+                [sys.executable, "-c", "import miniMoi, sys; print('sqlalchemy_utils' in sys.modules)"],
+                capture_output=True, text=True, check=True, env={**os.environ, 'HOME':tmp}
+            ).stdout
+
+            # no setup, no db
+            self.assertEqual(output.strip(), "False")
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_isolation(self):
+        """Tests isolated app instances """
+
+        apps = [create_app({'HOME':home.name, 'DATABASE_URL':"sqlite://", 'PAGE_SIZE':idx + 1}) for idx, home in enumerate(self.homes)]
+
+        # config & settings
+        self.assertEqual([app.config['DEFAULT_LANGUAGE'] for app in apps], ["EN", "DE"])
+        self.assertEqual([app.config['PAGE_SIZE'] for app in apps], [1, 2])
+        self.assertNotEqual(apps[0].extensions['miniMoi']['engine'], apps[1].extensions['miniMoi']['engine'])
+
+        # the first (test) app stays the default app
+        self.assertEqual(miniMoi.app._get_current_object(), testApp)
+
+        # separate dbs (with defaults)
+        with apps[0].app_context():
+
+            session = miniMoi.Session()
+            session.add(Customers(name="Only", surname="First", street="Elmstreet", nr=1, postal="12345", town="Entenhausen", approach=1))
+            session.commit()
+
+        for app, expected in zip(apps, [1, 0]):
+            with app.app_context():
+
+                self.assertEqual(miniMoi.app._get_current_object(), app)
+                self.assertEqual(miniMoi.Session().query(Customers).count(), expected)
+                self.assertGreater(miniMoi.Session().query(Subcategory).count(), 0)
+
+        # routes & background jobs run in their app
+        for app, expected in zip(apps, [1, 0]):
+
+            self.assertEqual(app.test_client().get("/").status_code, 200)
+
+            with app.app_context():
+
+                job = jobs.submit("test", lambda: {'success':True, 'error':"", 'data':miniMoi.Session().query(Customers).count()})
+
+            jobs.shutdown()
+
+            self.assertEqual(jobs.status(job['data']['job_id'])['data']['result']['data'], expected)
+
+    def test_file_db(self):
+        """Tests the setup & db file creation """
+
+        app = create_app({'HOME':self.homes[0].name})
+
+        self.assertTrue((Path(self.homes[0].name) / "mini-moi/system/done.txt").is_file())
+        self.assertTrue(app.config['DB_FILE_PATH'].is_file())
+
+        app.extensions['miniMoi']['engine'].dispose()
+
+        # second start -> migration only
+        app = create_app({'HOME':self.homes[0].name})
+
+        with app.app_context(): self.assertGreater(miniMoi.Session().query(Subcategory).count(), 0)
+
+        app.extensions['miniMoi']['engine'].dispose()
+
+    def test_database_url(self):
+        """Tests the database url order """
+
+        settings = {'database_url':"sqlite:///" + str(Path(self.homes[0].name) / "settings.db")}
+        dbFile = Path(self.homes[0].name) / "db/app.db"
+
+        # default -> the sqlite file of the app storage
+        with patch.dict(os.environ, {'MINI_MOI_DATABASE_URL':""}):
+            self.assertEqual(make_url(miniMoi._database_url({}, {}, dbFile)).database, str(dbFile))
+
+            # settings.json
+            self.assertEqual(miniMoi._database_url({}, settings, dbFile), settings['database_url'])
+
+        # environment variable
+        with patch.dict(os.environ, {'MINI_MOI_DATABASE_URL':"postgresql://user:pw@localhost/minimoi"}):
+            self.assertEqual(miniMoi._database_url({}, settings, dbFile), "postgresql://user:pw@localhost/minimoi")
+
+            # explicit config
+            self.assertEqual(miniMoi._database_url({'DATABASE_URL':"sqlite://"}, settings, dbFile), "sqlite://")
+
+        # the app uses the settings url
+        settingsPath = Path(self.homes[1].name) / "mini-moi/system/settings/settings.json"
+        with open(settingsPath, "w") as file:
+            json.dump({'default_language':"EN", 'action_logging':"False", **settings}, file)
+
+        with patch.dict(os.environ, {'MINI_MOI_DATABASE_URL':""}):
+            app = create_app({'HOME':self.homes[1].name})
+
+        self.assertEqual(app.extensions['miniMoi']['engine'].url.database, make_url(settings['database_url']).database)
+        self.assertTrue(Path(make_url(settings['database_url']).database).is_file())
+
+        app.extensions['miniMoi']['engine'].dispose()
+
+    #endregion
@@ -0,0 +1,201 @@
+"""
+Tests the database initiation & migrations
+
+"""
+
+# imports
+import unittest
+
+import datetime
+
+from sqlalchemy import text, inspect
+from sqlalchemy.orm import Session, sessionmaker
+
+from miniMoi import base
+from miniMoi.models.Models import Abo, Customers, Orders, SalesDaily, Subcategory, Products, Category
+from miniMoi.logic.db import init_database
+from miniMoi.logic.functions import delivery
+
+from tests import testEngine
+
+# class
+class TestInitDatabase(unittest.TestCase):
+    """Tests the init_database functions
+
+    CAUTION:
+    The functions
+        - run_creation()
+        - create_defaults()
+    are only tested indirectly.
+
+    methods:
+    --------
+    setUp
+        Tests setup
+    tearDown
+        Clean after test
+    test_create_indexes
+        Tests the index migration
+    test_query_plan
+        Tests if the abo lookups use the indexes
+    test_create_aggregates
+        Tests the sales aggregates migration
+    test_sync_sequences
+        Tests the id sequence sync
+
+    """
+
+    def setUp(self):
+        """Prepare test """
+
+        # copy engine to self.
+        self.testEngine = testEngine
+
+        # create db
+        base.metadata.create_all(self.testEngine)
+
+        return
+
+    def tearDown(self):
+        """Cleanup after test """
+
+        base.metadata.drop_all(self.testEngine)
+        self.testEngine = None
+
+    #region 'helpers'
+    def _indexes(self) -> list:
+        """Returns the index names of the abo table """
+
+        return sorted([index['name'] for index in inspect(self.testEngine).get_indexes("abo")])
+
+    def _plan(self, statement) -> str:
+        """Returns the sqlite query plan as one string """
+
+        compiled = str(statement.compile(
+            dialect=self.testEngine.dialect,
+            compile_kwargs={'literal_binds':True}
+        ))
+
+        with self.testEngine.connect() as conn:
+            rows = conn.execute(text("EXPLAIN QUERY PLAN " + compiled)).fetchall()
+
+        return " | ".join([str(row[-1]) for row in rows])
+
+    #endregion
+
+    #region 'tests'
+    def test_create_indexes(self):
+        """Tests the index migration on 'old' db files """
+
+        expected = ['ix_abo_customer_id', 'ix_abo_next_delivery_customer_id', 'ix_abo_product']
+
+        # fresh db has all indexes
+        self.assertEqual(self._indexes(), expected)
+
+        # simulate an old db without indexes
+        with self.testEngine.begin() as conn:
+            for name in expected: conn.execute(text("DROP INDEX " + name))
+
+        self.assertEqual(self._indexes(), [])
+
+        # migrate
+        checked = init_database.create_indexes(self.testEngine, base)
+
+        # assert
+        self.assertTrue(all([name in checked for name in expected]))
+        self.assertEqual(self._indexes(), expected)
+
+        # running twice does not fail
+        init_database.create_indexes(self.testEngine, base)
+        self.assertEqual(self._indexes(), expected)
+
+    @unittest.skipUnless(testEngine.dialect.name == "sqlite", "sqlite query plan")
+    def test_query_plan(self):
+        """Tests if the abo lookups use the indexes """
+
+        today = datetime.datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        with Session(self.testEngine) as session:
+
+            # delivery date window
+            plan = self._plan(delivery._delivery_query(
+                session,
+                today + datetime.timedelta(days=-1),
+                today + datetime.timedelta(days=1)
+            ).statement)
+
+            self.assertIn("USING INDEX ix_abo_next_delivery_customer_id", plan)
+            self.assertNotIn("SCAN abo", plan)
+
+            # customer filter
+            plan = self._plan(session.query(Abo).filter_by(customer_id = 1).statement)
+            self.assertIn("USING INDEX ix_abo_customer_id", plan)
+
+            # product filter
+            plan = self._plan(session.query(Abo).filter_by(product = 1).statement)
+            self.assertIn("USING INDEX ix_abo_product", plan)
+
+    def test_create_aggregates(self):
+        """Tests the sales aggregates migration on 'old' db files """
+
+        now = datetime.datetime.utcnow()
+
+        # simulate an old db with orders but without aggregates
+        with Session(self.testEngine) as session:
+
+            session.add_all([
+                Customers(name="Fritz", surname="Meier", street="Elmstreet", nr=5, postal="0000", town="Entenhausen", approach=1),
+                Customers(name="Hans", surname="Peter", street="Elmstreet", nr=7, postal="0000", town="Entenhausen", approach=2),
+                Category(name="Brot"),
+                Products(name="Brot", category=1, purchase_price=1., selling_price=1.5, margin=.3, store="", phone="")
+            ])
+            session.flush()
+
+            session.execute(Orders.__table__.insert(), [
+                {'customer_id':1, 'date':now, 'product':1, 'product_name':"Brot", 'category':"Brot", 'quantity':2, 'price':1.5, 'total':3.0},
+                {'customer_id':1, 'date':now, 'product':1, 'product_name':"Brot", 'category':"Brot", 'quantity':1, 'price':1.5, 'total':1.5},
+                {'customer_id':2, 'date':now, 'product':1, 'product_name':"Brot", 'category':"Brot", 'quantity':1, 'price':1.5, 'total':1.5}
+            ])
+            session.commit()
+
+        SalesDaily.__table__.drop(self.testEngine)
+
+        # migrate
+        rows = init_database.create_aggregates(self.testEngine, sessionmaker(bind=self.testEngine))
+
+        # assert
+        self.assertEqual(rows, 2)
+
+        with Session(self.testEngine) as session:
+
+            sales = session.query(SalesDaily).order_by(SalesDaily.customer_id).all()
+
+            self.assertEqual([(row.customer_id, row.quantity, row.total, row.orders) for row in sales], [(1, 3, 4.5, 2), (2, 1, 1.5, 1)])
+            self.assertEqual(sales[0].date, now.replace(hour=0, minute=0, second=0, microsecond=0) + datetime.timedelta(days=1))
+
+        # running twice does not backfill again
+        self.assertEqual(init_database.create_aggregates(self.testEngine, sessionmaker(bind=self.testEngine)), 0)
+
+    def test_sync_sequences(self):
+        """Tests the id sequence sync """
+
+        with Session(self.testEngine) as session:
+
+            session.add(Subcategory(id=0, name="None"))
+            session.commit()
+
+        synced = init_database.sync_sequences(self.testEngine)
+
+        # only backends with sequences
+        if self.testEngine.dialect.name != "postgresql": self.assertEqual(synced, [])
+        else: self.assertIn(Subcategory.__tablename__, synced)
+
+        # the next row gets a free id
+        with Session(self.testEngine) as session:
+
+            session.add(Subcategory(name="Next"))
+            session.commit()
+
+            self.assertEqual(session.query(Subcategory).filter(Subcategory.name == "Next").one().id, 1)
+
+    #endregion
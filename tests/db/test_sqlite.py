@@ -0,0 +1,203 @@
+"""
+Tests the sqlite performance profile
+
+"""
+
+# imports
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, text
+
+from miniMoi import base
+from miniMoi.models.Models import Customers
+from miniMoi.logic.db import sqlite
+
+# class
+class TestSqlite(unittest.TestCase):
+    """Tests the sqlite.py functions
+
+    methods:
+    --------
+    setUp
+        Tests setup
+    tearDown
+        Clean after test
+    test_pragmas
+        Tests the pragmas of the profiles
+    test_concurrent_read
+        Tests reading during a write
+    test_release
+        Tests the complete db file after 'release()'
+    test_backup
+        Tests the copies with the sqlite backup api
+    test_uses_file
+        Tests the db file detection
+
+    """
+
+    def setUp(self):
+        """Prepare test """
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.url = "sqlite:///" + os.path.join(self.tmp.name, "app.db")
+        self.engines = []
+
+        return
+
+    def tearDown(self):
+        """Cleanup after test """
+
+        for engine in self.engines: engine.dispose()
+        self.tmp.cleanup()
+
+    #region 'helpers'
+    def _engine(self, url:str, pragmas:dict):
+        """Creates an engine with the pragmas """
+
+        engine = create_engine(url, echo=False, future=False, **sqlite.engine_options(url))
+        sqlite.apply(engine, pragmas)
+        self.engines.append(engine)
+
+        return engine
+
+    #endregion
+
+    #region 'tests'
+    def test_pragmas(self):
+        """Tests the pragmas of the profiles """
+
+        names = ['journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store', 'busy_timeout']
+
+        # performance
+        engine = self._engine(self.url, sqlite.get_pragmas("performance", {'busy_timeout':1234}))
+
+        self.assertEqual(sqlite.read_pragmas(engine, names), {
+            'journal_mode':"wal",
+            'synchronous':1, # -> NORMAL
+            'cache_size':-64000,
+            'mmap_size':268435456,
+            'temp_store':2, # -> MEMORY
+            'busy_timeout':1234
+        })
+
+        # every pooled connection
+        with engine.connect() as first, engine.connect() as second:
+            self.assertEqual(
+                [conn.exec_driver_sql("PRAGMA synchronous").scalar() for conn in [first, second]], [1, 1]
+            )
+
+        # legacy defaults
+        engine = self._engine("sqlite:///" + os.path.join(self.tmp.name, "legacy.db"), sqlite.get_pragmas("off"))
+        self.assertEqual(sqlite.read_pragmas(engine, ['journal_mode'])['journal_mode'], "delete")
+
+        # in memory -> no wal
+        engine = self._engine("sqlite://", sqlite.get_pragmas())
+        self.assertEqual(sqlite.read_pragmas(engine, ['journal_mode', 'synchronous']), {'journal_mode':"memory", 'synchronous':1})
+
+        # unknown profile & other backends
+        self.assertEqual(sqlite.get_pragmas("unknown"), sqlite.PROFILES['performance'])
+        self.assertEqual(sqlite.engine_options("postgresql://user@localhost/db"), {})
+
+    def test_concurrent_read(self):
+        """Tests reading during a write """
+
+        engine = self._engine(self.url, sqlite.get_pragmas())
+        base.metadata.create_all(engine)
+
+        with engine.begin() as connection:
+            connection.execute(Customers.__table__.insert(), [{'name':"a", 'surname':"b", 'street':"s", 'nr':1, 'postal':"1", 'town':"t", 'approach':1}])
+
+        writer = engine.raw_connection()
+        writer.execute("BEGIN EXCLUSIVE")
+        writer.execute("DELETE FROM customers")
+
+        # the reader sees the last commit (without waiting)
+        reader = sqlite3.connect(os.path.join(self.tmp.name, "app.db"), timeout=0)
+        self.assertEqual(reader.execute("SELECT COUNT(*) FROM customers").fetchone()[0], 1)
+        reader.close()
+
+        writer.rollback()
+        writer.close()
+
+    def test_release(self):
+        """Tests the complete db file after 'release()' """
+
+        engine = self._engine(self.url, sqlite.get_pragmas("performance", {'busy_timeout':100}))
+        base.metadata.create_all(engine)
+
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE numbers (n INTEGER)"))
+            connection.execute(text("INSERT INTO numbers VALUES (1), (2), (3)"))
+
+        # an open read transaction blocks the checkpoint
+        reader = sqlite3.connect(os.path.join(self.tmp.name, "app.db"))
+        reader.execute("BEGIN")
+        reader.execute("SELECT COUNT(*) FROM numbers").fetchone()
+
+        with engine.begin() as connection: connection.execute(text("INSERT INTO numbers VALUES (4)"))
+
+        self.assertFalse(sqlite.release(engine))
+
+        reader.rollback()
+        self.assertFalse(sqlite.release(engine)) # -> the reader is still connected
+        reader.close()
+
+        self.assertTrue(sqlite.release(engine))
+
+        # the copied file contains everything
+        self.assertFalse(os.path.isfile(os.path.join(self.tmp.name, "app.db-wal")))
+
+        copy = os.path.join(self.tmp.name, "copy.db")
+        shutil.copyfile(os.path.join(self.tmp.name, "app.db"), copy)
+
+        connection = sqlite3.connect(copy)
+        self.assertEqual(connection.execute("SELECT SUM(n) FROM numbers").fetchone()[0], 10)
+        connection.close()
+
+    def test_backup(self):
+        """Tests the copies with the sqlite backup api """
+
+        engine = self._engine(self.url, sqlite.get_pragmas())
+
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE numbers (n INTEGER)"))
+            connection.execute(text("INSERT INTO numbers VALUES (1), (2), (3)"))
+
+        # the commits are still in the WAL, the app keeps its connections
+        copy = os.path.join(self.tmp.name, "copy.db")
+        sqlite.backup(engine, copy)
+
+        self.assertTrue(os.path.isfile(os.path.join(self.tmp.name, "app.db-wal")))
+        self.assertEqual(os.listdir(self.tmp.name).count("copy.db-wal"), 0)
+
+        connection = sqlite3.connect(copy)
+        self.assertEqual(connection.execute("SELECT SUM(n) FROM numbers").fetchone()[0], 6)
+        connection.close()
+
+        # restore the copy
+        with engine.begin() as connection: connection.execute(text("DELETE FROM numbers"))
+
+        self.assertTrue(sqlite.release(engine))
+        sqlite.restore(copy, os.path.join(self.tmp.name, "app.db"))
+
+        with engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT SUM(n) FROM numbers")).scalar(), 6)
+
+        # missing files are not created
+        with self.assertRaises(sqlite3.OperationalError): sqlite.restore(os.path.join(self.tmp.name, "missing.db"), copy)
+        self.assertFalse(os.path.isfile(os.path.join(self.tmp.name, "missing.db")))
+
+    def test_uses_file(self):
+        """Tests the db file detection """
+
+        self.assertTrue(sqlite.uses_file(self._engine(self.url, {})))
+        self.assertFalse(sqlite.uses_file(self._engine("sqlite://", {})))
+
+        # server backends (the driver is not needed to build the engine url)
+        self.assertEqual(sqlite.engine_options("postgresql://user:pw@localhost/minimoi"), {})
+
+    #endregion
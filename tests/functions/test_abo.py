@@ -9,10 +9,11 @@ from unittest.mock import patch
 
 import datetime
 
+from sqlalchemy import event
 from sqlalchemy.orm import scoped_session, sessionmaker, Session
 
 from miniMoi import base
-from miniMoi.models.Models import Abo, Customers, Products, Subcategory
+from miniMoi.models.Models import Abo, Customers, Products, Category, Subcategory
 
 from miniMoi.logic.functions import abo
 from miniMoi.logic.helpers.time_module import local_to_utc
@@ -38,8 +39,12 @@ class TestAbo(unittest.TestCase):
         Tests the getter
     test_update
         Tests the updater
+    test_update_many
+        Tests the set based updater
     test_add
         Tests the add
+    test_add_selects
+        Tests the number of SELECTs of the add
     test_delete
         Tests the delete process
 
@@ -114,8 +119,11 @@ class TestAbo(unittest.TestCase):
                 name="Sub2"
             )
 
+            # create the categories of the products
+            newCategories = [Category(name="Brot"), Category(name="Weißwaren")]
+
             # add to db
-            session.add_all([newUser, newProduct, newProduct2, newAbo, newSub, newSub2])
+            session.add_all([newUser, newProduct, newProduct2, newAbo, newSub, newSub2, *newCategories])
 
             # commit
             session.commit()
@@ -123,6 +131,7 @@ class TestAbo(unittest.TestCase):
     def tearDown(self):
         """Cleans the mess after a test"""
 
+        testSession.remove()
         base.metadata.drop_all(self.testEngine)
         self.testEngine = None
         self.account = None
@@ -220,7 +229,8 @@ class TestAbo(unittest.TestCase):
                     1: 'Sub1', 2: 'Sub2'
                     }
                 },
-            'table_name':"Subscriptions"
+            'table_name':"Subscriptions",
+            'pagination':{'page_size':None, 'cursor':None, 'next_cursor':None, 'total':0}
         })
 
         #endregion
@@ -346,7 +356,8 @@ class TestAbo(unittest.TestCase):
                     1: 'Sub1', 2: 'Sub2'
                     }
                 },
-            'table_name':"Subscriptions"
+            'table_name':"Subscriptions",
+            'pagination':{'page_size':None, 'cursor':None, 'next_cursor':None, 'total':2}
             }})
 
         #endregion
@@ -385,7 +396,8 @@ class TestAbo(unittest.TestCase):
                     1: 'Sub1', 2: 'Sub2'
                     }
                 },
-            'table_name':"Subscriptions"
+            'table_name':"Subscriptions",
+            'pagination':{'page_size':None, 'cursor':None, 'next_cursor':None, 'total':2}
         })
 
         #endregion
@@ -540,6 +552,74 @@ class TestAbo(unittest.TestCase):
 
         #endregion
     
+    def test_update_many(self):
+        """Tests the set based updater """
+
+        # add a second abo
+        with Session(testEngine) as session:
+            session.add(Abo(customer_id=1, cycle_type="day", interval=0, next_delivery=datetime.datetime(2022, 3, 14), product=1, subcategory=1, quantity=1))
+            session.commit()
+
+        def rows(**changes) -> list:
+            """Returns the rows to update (changes apply to the 2nd) """
+
+            return [
+                {'id':1, 'cycle_type':"interval", 'interval':"3", 'product':"1", 'next_delivery':None, 'subcategory':2., 'quantity':2},
+                {'id':2, 'cycle_type':"day", 'interval':2, 'product':2, 'next_delivery':"2021-12-01", 'subcategory':1, 'quantity':"7", **changes}
+            ]
+
+        #region 'nothing is written on errors'
+        for changes, error in [
+            ({'id':99}, "The Subscription was not found (id = '99')."),
+            ({'product':15}, "Selected product not available."),
+            ({'subcategory':10}, "Selected subcategory not available."),
+            ({'quantity':"a"}, "'Qnt.' needs to be a(n) number (whole)."),
+            ({'cycle_type':"None", 'next_delivery':None}, "The 'Next delivery' is not allowed to be empty if the 'Cycle type' is None."),
+            ({'id':"Auto."}, "Please refresh the page."),
+        ]:
+            result = abo.update_many(rows(**changes), language="EN", tz="Europe/Berlin")
+
+            # assert
+            self.assertFalse(result['success'])
+            self.assertEqual(result['error'], error)
+
+        with Session(testEngine) as session:
+            self.assertEqual([row.cycle_type for row in session.query(Abo).order_by(Abo.id)], ["day", "day"])
+
+        #endregion
+
+        #region 'success'
+        result = abo.update_many(rows(), language="EN", tz="Europe/Berlin")
+
+        # assert
+        self.assertTrue(result['success'])
+        self.assertEqual(result['data']['updated'], 2)
+
+        # same result as the single updater
+        current = (datetime.datetime.utcnow() + datetime.timedelta(days=3)).strftime("%Y.%m.%d")
+
+        with Session(testEngine) as session:
+            first, second = session.query(Abo).order_by(Abo.id).all()
+
+            self.assertEqual((first.cycle_type, first.interval, first.subcategory, first.quantity), ("interval", 3, 2, 2))
+            self.assertEqual(first.next_delivery.strftime("%Y.%m.%d"), current)
+
+            self.assertEqual((second.cycle_type, second.interval, second.product, second.quantity), ("day", 2, 2, 7))
+            self.assertEqual(second.next_delivery.strftime("%Y.%m.%d"), "2021.11.30")
+
+        #endregion
+
+        #region 'last entry per id wins'
+        result = abo.update_many([*rows(), {**rows()[0], 'quantity':9}], language="EN", tz="Europe/Berlin")
+
+        # assert
+        self.assertEqual(result['data']['updated'], 2)
+
+        with Session(testEngine) as session:
+            self.assertEqual(session.query(Abo).filter_by(id = 1).first().quantity, 9)
+
+        #endregion
+
     def test_add(self):
         """Adds a element to the db """
 
@@ -649,6 +729,50 @@ class TestAbo(unittest.TestCase):
         
         #endregion
 
+    def test_add_selects(self):
+        """Tests the number of SELECTs of the add 
+        
+        The validation is batched: the number of
+        SELECTs must not grow with the number of
+        abos (see 'tests.benchmarks.bench_abo' for
+        the timings).
+        
+        """
+
+        n = 200
+
+        # add customers -> ids 2 ... n/4 + 1
+        with testEngine.begin() as connection:
+            connection.execute(Customers.__table__.insert(), [{
+                'name':"Name", 'surname':"Surname", 'street':"Street", 
+                'nr':i, 'postal':"0000", 'town':"Town"
+            } for i in range(n // 4)])
+
+        abos = [{
+            'customer_id':str(1 + i % (n // 4 + 1)),
+            'cycle_type':"interval",
+            'interval':7,
+            'product':1 + i % 2,
+            'next_delivery':None,
+            'subcategory':1 + i % 2,
+            'quantity':5
+        } for i in range(n)]
+
+        # count the SELECTs
+        selects = []
+        def count(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"): selects.append(statement)
+
+        event.listen(testEngine, "before_cursor_execute", count)
+        try: result = abo.add(abos = abos, language = "EN", tz = "Europe/Berlin")
+        finally: event.remove(testEngine, "before_cursor_execute", count)
+
+        # assert
+        self.assertTrue(result['success'])
+        self.assertLessEqual(len(selects), 3)
+
+        with Session(testEngine) as session: self.assertEqual(session.query(Abo).count(), n + 1)
+
     def test_delete(self):
         """Tests the abo deletion """
 
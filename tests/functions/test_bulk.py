@@ -6,11 +6,13 @@ Tests the functions in bulk.py
 # imports
 import unittest
 from unittest.mock import patch
+import tempfile
 
 import pandas as pd
 
 from miniMoi import app, base
 from miniMoi.logic.functions import bulk
+from miniMoi.language import language_files
 import miniMoi.models.Models as models
 
 from tests import testEngine
@@ -45,6 +47,8 @@ class TestBulk(unittest.TestCase):
         Tests the blueprint creation
     test_update
         tests the bulk updater
+    test_update_streaming
+        tests the chunked, resumable bulk updater
 
     """
 
@@ -60,6 +64,7 @@ class TestBulk(unittest.TestCase):
     def tearDown(self) -> None:
         """Cleanup after tests """
 
+        testSession.remove()
         base.metadata.drop_all(self.testEngine)
         self.testEngine = None
 
@@ -496,4 +501,94 @@ class TestBulk(unittest.TestCase):
 
         #endregion
 
-    #endregion
\ No newline at end of file
+    @patch('miniMoi.logic.functions.bulk.customer_add')
+    def test_update_streaming(self, mock_customer):
+        """Tests the chunked, resumable bulk updater """
+
+        # the chunk with 'Fail' cannot be committed
+        def add(customers):
+            if any(customer['name'] == "Fail" for customer in customers): return {'success':False, 'error':"broken chunk"}
+            return {'success':True}
+
+        mock_customer.side_effect = add
+
+        # blueprint with 10 rows -> 4 chunks of max. 3 rows
+        blueprint = pd.DataFrame({
+            'Name':["Name" + str(i) for i in range(10)],
+            'surname':["Surname"] * 10,
+            'City':["Town"] * 10
+        })
+        blueprint.loc[4, 'Name'] = "Fail"
+
+        with tempfile.TemporaryDirectory() as folder, app.app_context():
+            app.config['DEFAULT_LANGUAGE'] = "EN"
+            app.config['BLUEPRINT_PATH'] = Path(folder)
+
+            path = Path(folder) / "Customers_blueprint.csv"
+            blueprint.to_csv(path, sep=";", index=False)
+
+            #region 'one chunk fails'
+            result = bulk.update(chunk_size=3)
+
+            # assert
+            self.assertTrue(result['success'])
+            report = result['data']['report']['Customers']
+            self.assertEqual([chunk['rows'] for chunk in report['chunks']], [3, 3, 3, 1])
+            self.assertEqual([chunk['success'] for chunk in report['chunks']], [True, False, True, True])
+            self.assertEqual(report['success_chunks'], 3)
+            self.assertEqual(report['failure_chunks'], 1)
+            self.assertEqual(report['success_rows'], 7)
+            self.assertEqual(report['failure_rows'], 3)
+            self.assertEqual(result['data']['msg'], "Successfull: {}, Failures: {Customers (3/4 chunks, 7 rows):broken chunk}")
+
+            # each chunk is passed on its own (renamed to the official names)
+            self.assertEqual(mock_customer.call_count, 4)
+            self.assertEqual([customer['name'] for customer in mock_customer.call_args_list[0][0][0]], ["Name0", "Name1", "Name2"])
+            self.assertEqual(mock_customer.call_args_list[0][0][0][0]['town'], "Town")
+
+            # blueprint & progress are kept
+            self.assertTrue(path.is_file())
+            progress = bulk._read_progress(path, 3)
+            self.assertEqual((progress['chunk_size'], sorted(progress['done'].keys())), (3, [0, 2, 3]))
+
+            #endregion
+
+            #region 'committed rows changed'
+            # a new first row shifts all chunks -> the resume is refused
+            pd.concat([blueprint.iloc[:1], blueprint]).to_csv(path, sep=";", index=False)
+
+            result = bulk.update(chunk_size=3)
+
+            # assert -> nothing imported, blueprint & progress are kept
+            self.assertEqual(mock_customer.call_count, 4)
+            self.assertEqual(result['data']['msg'], "Successfull: {}, Failures: {Customers:" + language_files['EN']['error_codes']['bulkChanged'].format(
+                progress = "Customers_blueprint.csv.progress.json"
+            ) + "}")
+            self.assertTrue(path.is_file())
+            self.assertEqual(bulk._read_progress(path, 3), progress)
+
+            #endregion
+
+            #region 'resume'
+            # fix the chunk & rerun with another chunk size -> the saved one is used
+            blueprint.loc[4, 'Name'] = "Name4"
+            blueprint.to_csv(path, sep=";", index=False)
+
+            result = bulk.update(chunk_size=100)
+
+            # assert -> only the failed chunk is imported
+            self.assertEqual(mock_customer.call_count, 5)
+            self.assertEqual([customer['name'] for customer in mock_customer.call_args_list[-1][0][0]], ["Name3", "Name4", "Name5"])
+
+            report = result['data']['report']['Customers']
+            self.assertEqual([chunk['skipped'] for chunk in report['chunks']], [True, False, True, True])
+            self.assertEqual(report['failure_chunks'], 0)
+            self.assertEqual(result['data']['msg'], "Successfull: {Customers (4/4 chunks, 10 rows)}, Failures: {}")
+
+            # blueprint & progress are removed
+            self.assertFalse(path.is_file())
+            self.assertFalse(bulk._progress_path(path).is_file())
+
+            #endregion
+
+    #endregion
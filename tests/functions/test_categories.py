@@ -131,6 +131,7 @@ class TestCategories(unittest.TestCase):
     def tearDown(self):
         """Cleans the mess after a test"""
 
+        testSession.remove()
         base.metadata.drop_all(self.testEngine)
         self.testEngine = None
 
@@ -454,7 +455,7 @@ class TestCategories(unittest.TestCase):
         # db check
         with Session(testEngine) as session:
 
-            result = session.query(Category)
+            result = session.query(Category).order_by(Category.id)
 
             self.assertEqual(result.count(), 2)
             self.assertEqual(result.first().id, 0)
@@ -491,4 +492,27 @@ class TestCategories(unittest.TestCase):
 
         #endregion
 
+        #region 'success, abos fall back to the default subcategory'
+        with Session(testEngine) as session:
+
+            session.add(Subcategory(id=0, name="None"))
+            session.commit()
+
+        result = categories.delete(
+            category_id = 2,
+            category_type  = "subcategory",
+            language = "EN"
+        )
+
+        # assert
+        self.assertTrue(result['success'])
+
+        # db check
+        with Session(testEngine) as session:
+
+            self.assertEqual(session.query(Subcategory).count(), 1)
+            self.assertEqual(session.query(Abo).get(1).subcategory, 0)
+
+        #endregion
+
     #endregion
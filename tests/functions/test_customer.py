@@ -12,7 +12,7 @@ import datetime
 from sqlalchemy.orm import scoped_session, sessionmaker, Session
 
 from miniMoi import base, app
-from miniMoi.models.Models import Abo, Customers, Products, Subcategory
+from miniMoi.models.Models import Abo, Customers, Products, Category, Subcategory
 
 from miniMoi.logic.functions import customer
 
@@ -35,8 +35,12 @@ class TestCustomer(unittest.TestCase):
         Clean after test
     test_get
         Tests the getter
+    test_get_pagination
+        Tests the paginated getter
     test_update
         Tests the updater
+    test_update_many
+        Tests the set based updater
     test_add
         Tests the add
     test_delete
@@ -114,8 +118,11 @@ class TestCustomer(unittest.TestCase):
                 name="Sub2"
             )
 
+            # create the categories of the products
+            newCategories = [Category(name="Brot"), Category(name="Weißwaren")]
+
             # add to db
-            session.add_all([newUser, newProduct, newProduct2, newAbo, newSub, newSub2])
+            session.add_all([newUser, newProduct, newProduct2, newAbo, newSub, newSub2, *newCategories])
 
             # commit
             session.commit()
@@ -123,6 +130,7 @@ class TestCustomer(unittest.TestCase):
     def tearDown(self):
         """Cleans the mess after a test"""
 
+        testSession.remove()
         base.metadata.drop_all(self.testEngine)
         self.testEngine = None
 
@@ -169,7 +177,8 @@ class TestCustomer(unittest.TestCase):
                     'Postal', 'City', 'Phone', 'Mobile', 'Birthdate', 
                     'Approach', 'Notes'
                 ],
-                'table_name':"Customer"
+                'table_name':"Customer",
+                'pagination':{'page_size':None, 'cursor':None, 'next_cursor':None, 'total':1}
                 }
         })
 
@@ -195,7 +204,8 @@ class TestCustomer(unittest.TestCase):
                 'Phone', 'Mobile', 'Birthdate', 'Approach',
                 'Notes'
             ],
-            'table_name':"Customer"
+            'table_name':"Customer",
+            'pagination':{'page_size':None, 'cursor':None, 'next_cursor':None, 'total':0}
         })
 
         #endregion
@@ -237,7 +247,8 @@ class TestCustomer(unittest.TestCase):
                 'Postal', 'City', 'Phone', 'Mobile', 'Birthdate', 
                 'Approach', 'Notes'
             ],
-            'table_name':"Customer"
+            'table_name':"Customer",
+            'pagination':{'page_size':None, 'cursor':None, 'next_cursor':None, 'total':1}
             }})
 
         #endregion
@@ -278,7 +289,8 @@ class TestCustomer(unittest.TestCase):
                 'Postal', 'City', 'Phone', 'Mobile', 'Birthdate', 
                 'Approach', 'Notes'
             ],
-            'table_name':"Customer"
+            'table_name':"Customer",
+            'pagination':{'page_size':None, 'cursor':None, 'next_cursor':None, 'total':1}
             }})
 
         #endregion
@@ -304,11 +316,62 @@ class TestCustomer(unittest.TestCase):
                 'Phone', 'Mobile', 'Birthdate', 'Approach',
                 'Notes'
             ],
-            'table_name':"Customer"
+            'table_name':"Customer",
+            'pagination':{'page_size':None, 'cursor':None, 'next_cursor':None, 'total':0}
         })
 
         #endregion
 
+    def test_get_pagination(self):
+        """Tests the paginated getter """
+
+        # add more customers in 'Entenhausen' & one elsewhere
+        with Session(self.testEngine) as session:
+
+            session.add_all([
+                Customers(name = "Name" + str(i), surname = "Surname", street = "Street", nr = i, postal = "0000", town = "Entenhausen") for i in range(6)
+            ] + [Customers(name = "Other", surname = "Surname", street = "Street", nr = 1, postal = "0000", town = "Dreamland")])
+            session.commit()
+
+        # walk through the pages
+        pages = []
+        cursor = None
+        while True:
+
+            result = customer.get(
+                filter_type = "town",
+                what = "Entenhausen",
+                page_size = 3,
+                cursor = cursor,
+                language = "EN",
+                tz = "Europe/Berlin"
+            )
+
+            self.assertTrue(result['success'])
+            self.assertLessEqual(len(result['data']['data']), 3)
+            self.assertEqual(result['data']['pagination']['total'], 7)
+
+            pages.append([row['id'] for row in result['data']['data']])
+
+            cursor = result['data']['pagination']['next_cursor']
+            if cursor is None: break
+
+        # assert
+        self.assertEqual(pages, [[1, 2, 3], [4, 5, 6], [7]])
+
+        # 'amount' caps the result -> no further page
+        result = customer.get(
+            filter_type = "town",
+            what = "Entenhausen",
+            amount = 2,
+            page_size = 3,
+            language = "EN",
+            tz = "Europe/Berlin"
+        )
+
+        self.assertEqual([row['id'] for row in result['data']['data']], [1, 2])
+        self.assertIsNone(result['data']['pagination']['next_cursor'])
+
     def test_update(self):
         """Tests the updater """
             
@@ -415,6 +478,58 @@ class TestCustomer(unittest.TestCase):
 
             #endregion
         
+    def test_update_many(self):
+        """Tests the set based updater """
+
+        # add a second customer
+        with Session(testEngine) as session:
+            session.add(Customers(name="Hans", surname="Huber", street="Weg", nr=1, postal="1111", town="Town", phone="", mobile="", approach=1, notes=""))
+            session.commit()
+
+        def rows(**changes) -> list:
+            """Returns the rows to update (changes apply to the 2nd) """
+
+            row = {'name':"Peter", 'surname':"Fischkopf", 'street':"Weiher", 'nr':3, 'postal':"0101", 'town':"Birdy", 'phone':"", 'mobile':"", 'approach':"15"}
+
+            return [
+                {**row, 'id':1, 'birthdate':"1832-12-10"},
+                {**row, 'id':"2", 'name':"Anna", 'birthdate':"", **changes}
+            ]
+
+        #region 'nothing is written on errors'
+        for changes, error in [
+            ({'id':5}, "The Customer was not found (id = '5')."),
+            ({'nr':"3a"}, "'Nr' needs to be a(n) number (whole)."),
+            ({'birthdate':"10.12"}, "'Birthdate' needs to be in the format 'Year.Month.Day'."),
+        ]:
+            result = customer.update_many(rows(**changes), language="EN")
+
+            # assert
+            self.assertFalse(result['success'])
+            self.assertEqual(result['error'], error)
+
+        with Session(testEngine) as session:
+            self.assertEqual([row.name for row in session.query(Customers).order_by(Customers.id)], ["Fritz", "Hans"])
+
+        #endregion
+
+        #region 'success'
+        result = customer.update_many(rows(), language="EN")
+
+        # assert
+        self.assertTrue(result['success'])
+        self.assertEqual(result['data']['updated'], 2)
+
+        with Session(testEngine) as session:
+            first, second = session.query(Customers).order_by(Customers.id).all()
+
+            self.assertEqual((first.name, first.nr, first.approach, first.notes), ("Peter", 3, 15, ""))
+            self.assertIsNotNone(first.birthdate)
+
+            self.assertEqual((second.name, second.town, second.birthdate), ("Anna", "Birdy", None))
+
+        #endregion
+
     def test_add(self):
         """Adds a element to the db """
 
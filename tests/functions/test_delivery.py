@@ -8,11 +8,14 @@ import unittest
 from unittest.mock import patch
 
 import datetime
+import tempfile
+from pathlib import Path
 
 from sqlalchemy.orm import scoped_session, sessionmaker, Session
 import numpy as np
+import pandas as pd
 
-from miniMoi import base
+from miniMoi import base, app
 from miniMoi.models.Models import Abo, Customers, Products, Category, Subcategory, Orders
 
 from miniMoi.logic.functions import delivery
@@ -23,6 +26,48 @@ from tests import testEngine
 testSessionFactory = sessionmaker(bind=testEngine)
 testSession = scoped_session(testSessionFactory)
 
+#region 'legacy reference'
+def _legacy_overviews(df:pd.DataFrame) -> tuple:
+    """The overview aggregation prior to the native groupby
+
+    Used as golden reference for the overview dicts.
+
+    returns:
+    --------
+    tuple
+        (overview_category, overview_product, total_cost)
+
+    """
+
+    granular = df.groupby(
+        ['product_name', 'category_name', 'subcategory_name']
+        ).apply(lambda x: x[['quantity','cost']].sum()).reset_index()
+
+    overview_category = granular.groupby('category_name').apply(
+        lambda x: x[['quantity', 'cost']].sum()
+        ).reset_index().fillna(0).sort_values('category_name').to_dict("list")
+
+    overview_product = granular.groupby('category_name').apply(lambda x: pd.crosstab(
+        index = x['product_name'],
+        columns = x['subcategory_name'],
+        values = x['quantity'],
+        aggfunc="sum"
+    ))
+    overview_product['total'] = overview_product.sum(axis=1)
+    overview_product = overview_product.fillna(0).astype(int).reset_index()
+    opCols = [col for col in overview_product.columns if col != "category_name"]
+    overview_product = {
+        t:overview_product.loc[overview_product['category_name'] == t, opCols].sort_values('product_name').to_dict("list") for t in overview_product['category_name'].unique().tolist()
+    }
+
+    cost_per_customer = df.groupby('customer_id').apply(lambda x: x['cost'].sum()).reset_index()
+    cost_per_customer.rename(columns={0:'total_cost'}, inplace=True)
+    total_cost = pd.merge(df, cost_per_customer, how="left", left_on="customer_id", right_on="customer_id")['total_cost'].tolist()
+
+    return overview_category, overview_product, total_cost
+
+#endregion
+
 # class
 @patch('miniMoi.logic.functions.delivery.Session', testSession)
 class TestDelivery(unittest.TestCase):
@@ -45,12 +90,16 @@ class TestDelivery(unittest.TestCase):
         Clean after test
     test_create
         Tests the overview creation
+    test_overview_golden
+        Tests the overviews of 'create()' against the legacy aggregation
     test_book
         Tests the booking
     test_print_order_details
         Tests the order details printer
     test_print_cover
         Tests the cover printer
+    test_process_excel_split
+        Tests the per town workbooks
 
     """
 
@@ -337,6 +386,7 @@ class TestDelivery(unittest.TestCase):
     def tearDown(self):
         """Cleanup after test """
 
+        testSession.remove()
         base.metadata.drop_all(self.testEngine)
         self.testEngine = None
 
@@ -461,6 +511,123 @@ class TestDelivery(unittest.TestCase):
             }
         })
 
+    def test_create_compact(self):
+        """Tests the compact columnar payload """
+
+        # run
+        legacy = delivery.create(language = "EN", tz = "Europe/Berlin")
+        result = delivery.create(language = "EN", tz = "Europe/Berlin", compact = True)
+
+        # assert
+        self.assertTrue(result['success'])
+        self.assertEqual(result['data']['overview_product'], legacy['data']['overview_product'])
+
+        compact = result['data']['town_based']
+        self.assertEqual(compact['format'], "columnar")
+        self.assertEqual(compact['groups']['name'], ["Dreamland", "Entenhausen"])
+        self.assertEqual(compact['dictionaries']['customer_town'], ["Dreamland", "Entenhausen"])
+        self.assertEqual(compact['data']['customer_town'], [0, 1, 1, 1, 1, 1])
+
+        # decoded -> the legacy town based dicts
+        decoded = {}
+        for name, start, stop in zip(*compact['groups'].values()):
+
+            decoded[name] = {
+                'data':{
+                    col:[
+                        (compact['dictionaries'][col][val] if val >= 0 else None) if col in compact['dictionaries'] else val 
+                        for val in values[start:stop]
+                    ] for col, values in compact['data'].items()
+                },
+                'order':compact['order'],
+                'mapping':compact['mapping']
+            }
+
+        self.assertEqual(decoded, legacy['data']['town_based'])
+
+    def test_overview_golden(self):
+        """Tests the overviews of 'create()' against the legacy aggregation """
+
+        # fresh db -> only the random abos are delivered tomorrow
+        base.metadata.drop_all(self.testEngine)
+        base.metadata.create_all(self.testEngine)
+
+        # test data -> prices in quarters, so sums are exact
+        rng = np.random.default_rng(42)
+        n = 500
+        categories = ["Brot", "Semmel", "Kuchen", "Gebäck"]
+        subcategories = ["Geschnitten", "Ganz", "Stück", "Blech"]
+        allowed = {"Brot":[1, 2], "Semmel":[2], "Kuchen":[3, 4, 2], "Gebäck":[4]}
+        tomorrow = datetime.datetime.utcnow().date() + datetime.timedelta(days=1)
+
+        products = [
+            {'name':"{c} {i}".format(c=c, i=i), 'category':c, 'category_id':idx + 1, 'price':int(rng.integers(1, 40)) * .25}
+            for idx, c in enumerate(categories) for i in range(6)
+        ]
+        abos = []
+        for _ in range(n):
+
+            productId = int(rng.integers(0, len(products)))
+            abos.append({
+                'customer_id':int(rng.integers(1, 81)),
+                'product':productId + 1,
+                'subcategory':int(rng.choice(allowed[products[productId]['category']])),
+                'quantity':int(rng.integers(1, 10))
+            })
+
+        with Session(self.testEngine) as session:
+
+            session.add_all([Category(name=c) for c in categories] + [Subcategory(name=s) for s in subcategories])
+            session.add_all([
+                Products(name=p['name'], category=p['category_id'], purchase_price=.25, selling_price=p['price'], margin=.01, store="MeinLaden", phone="+50 phone")
+                for p in products
+            ])
+            session.add_all([
+                Customers(name="Name {i}".format(i=i), surname="Surname", street="Street", nr=i, postal="0000", town=str(rng.choice(["Entenhausen", "Dreamland", "Quickhausen"])), phone="", mobile="", approach=i % 7, notes="")
+                for i in range(1, 81)
+            ])
+            session.add_all([
+                Abo(cycle_type=None, interval=None, next_delivery=tomorrow, **abo) for abo in abos
+            ])
+            session.commit()
+
+        # legacy reference of the same abos
+        df = pd.DataFrame({
+            'customer_id':[abo['customer_id'] for abo in abos],
+            'category_name':[products[abo['product'] - 1]['category'] for abo in abos],
+            'product_name':[products[abo['product'] - 1]['name'] for abo in abos],
+            'subcategory_name':[subcategories[abo['subcategory'] - 1] for abo in abos],
+            'quantity':[abo['quantity'] for abo in abos],
+            'product_selling_price':[products[abo['product'] - 1]['price'] for abo in abos]
+        })
+        df['cost'] = df['product_selling_price'] * df['quantity']
+
+        legacyCategory, legacyProduct, legacyTotalCost = _legacy_overviews(df)
+        legacyTotalCost = dict(zip(df['customer_id'].tolist(), legacyTotalCost))
+
+        # run
+        result = delivery.create(language = "EN", tz = "UTC")
+
+        overviewCategory = result['data']['overview_category']['data']
+        overviewProduct = {category:values['data'] for category, values in result['data']['overview_product'].items()}
+        rows = [
+            (customerId, totalCost) for town in result['data']['town_based'].values()
+            for customerId, totalCost in zip(town['data']['customer_id'], town['data']['total_cost'])
+        ]
+
+        # assert
+        self.assertTrue(result['success'])
+        self.assertEqual(overviewCategory, legacyCategory)
+        self.assertEqual(overviewProduct, legacyProduct)
+        self.assertEqual(len(rows), n)
+        self.assertEqual([totalCost for _, totalCost in rows], [legacyTotalCost[customerId] for customerId, _ in rows])
+
+        # column order is used by the frontend mapping
+        self.assertEqual(list(overviewCategory.keys()), list(legacyCategory.keys()))
+        self.assertEqual(list(overviewProduct.keys()), list(legacyProduct.keys()))
+        for category in legacyProduct.keys():
+            self.assertEqual(list(overviewProduct[category].keys()), list(legacyProduct[category].keys()))
+
     @patch('miniMoi.logic.functions.delivery.xlsx.print_cover')
     @patch('miniMoi.logic.functions.delivery.xlsx.print_order_list')
     def test_book(self, mock_order, mock_cover):
@@ -478,6 +645,10 @@ class TestDelivery(unittest.TestCase):
                 7:session.query(Abo).filter_by(id = 7).first().next_delivery,
             }
 
+            # no cycle -> no next delivery after the booking
+            session.query(Abo).filter_by(id = 2).update({'cycle_type':None, 'interval':None})
+            session.commit()
+
         # test data
         test = {
             'customer_approach':[1,1,3,3,3], 
@@ -535,6 +706,11 @@ class TestDelivery(unittest.TestCase):
             for i in [4,7]:
                 self.assertEqual(session.query(Abo).filter_by(id = i).first().next_delivery, oldDates[i])
 
+            self.assertIsNone(session.query(Abo).filter_by(id = 2).first().next_delivery)
+
+            # one booking date for all orders
+            self.assertEqual(len({order.date for order in orders}), 1)
+
         #endregion
 
         #region 'missing data'
@@ -727,4 +903,60 @@ class TestDelivery(unittest.TestCase):
 
         #endregion
 
-    #endregion
\ No newline at end of file
+    def test_process_excel_split(self):
+        """Tests the per town workbooks """
+
+        test = {
+            'customer_approach':[1,1,3,2], 
+            'customer_street':["Quickhausen", "Quickhausen", "Elmstreet", "Castlestreet"], 
+            'customer_nr':[5,5,5,1],
+            'customer_town':["Entenhausen", "Entenhausen", "Entenhausen", "Dream/land"],
+            'customer_name':["Hans", "Hans", "Fritz", "Zorg"],
+            'customer_surname':["Peter", "Peter", "Meier", "King"],
+            'customer_id':[2,2,1,3],
+            'customer_phone':["+83 phone", "+83 phone", "+83 phone", ""],
+            'customer_mobile':["+83 mobile", "+83 mobile", "+83 mobile", ""],
+            'quantity':[10,5,10,1], 
+            'product_name':["Doppelweck", "Sonnenkernbrot", "Fitnessbrot", "Doppelweck"], 
+            'product_id':[5, 1, 2, 5],
+            'product_selling_price':[0.5, 3.5, 5.0, 0.5],
+            'subcategory_name':["Geschnitten", "Ganz", "Geschnitten", "Ganz"],
+            'category_name':["Semmel", "Brot", "Brot", "Semmel"],
+            'cost':[5.00, 17.50, 50.0, 0.5],
+            'total_cost':[22.50, 22.50, 50.0, 0.5],
+            'customer_notes':["First boy", "First boy", "idx 1", ""],
+            'id':[5, 6, 1, 8]
+        }
+        df = delivery._process_received(test, {})['data']['df']
+
+        with tempfile.TemporaryDirectory() as tmp, patch.dict(app.config, {'MINI_MOI_HOME':Path(tmp), 'EXCEL_WORKERS':2}):
+
+            # one workbook per town + cover (rendered in processes)
+            result = delivery._process_excel(df, True, True, "EN", split_towns=True)
+
+            self.assertTrue(result['success'])
+            self.assertEqual(result['data']['files'], 3)
+            self.assertGreater(result['data']['duration'], 0)
+
+            delivered = Path(tmp) / "delivery"
+            townFiles = sorted([path.name for path in delivered.glob("overview_*/*.xlsx")])
+            towns = df['customer_town'].unique().tolist()
+
+            self.assertEqual(townFiles, sorted([delivery._town_filename(idx, town) for idx, town in enumerate(towns)]))
+            self.assertIn("Dream_land", " ".join(townFiles))
+            self.assertEqual(len(list(delivered.glob("cover_*.xlsx"))), 1)
+
+            # the worker processes are reused by the next request
+            executor = delivery._executor
+            self.assertIsNotNone(executor)
+            self.assertEqual(executor._mp_context.get_start_method(), "spawn") # -> no fork of the threaded app
+            self.assertEqual(delivery._process_excel(df, True, True, "EN", split_towns=True)['data']['files'], 3)
+            self.assertIs(delivery._executor, executor)
+
+            # single overview
+            result = delivery._process_excel(df, False, True, "EN", split_towns=False)
+
+            self.assertEqual(result['data']['files'], 1)
+            self.assertEqual(len(list(delivered.glob("overview_*.xlsx"))), 1)
+
+    #endregion
@@ -0,0 +1,183 @@
+"""
+Tests the function for the delivery forecast
+
+"""
+
+# imports
+import unittest
+from unittest.mock import patch
+
+import datetime
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from sqlalchemy.orm import scoped_session, sessionmaker, Session
+
+from miniMoi import base, app
+from miniMoi.models.Models import Abo, Customers, Products, Category, Subcategory
+
+from miniMoi.logic.functions import forecast
+import miniMoi.logic.helpers.time_module as time
+
+from tests import testEngine
+
+# create session macker to mock it
+testSessionFactory = sessionmaker(bind=testEngine)
+testSession = scoped_session(testSessionFactory)
+
+# class
+@patch('miniMoi.logic.functions.forecast.Session', testSession)
+class TestForecast(unittest.TestCase):
+    """Tests the forecast functions
+
+    methods:
+    --------
+    setUp
+        Tests setup
+    tearDown
+        Clean after test
+    test_project
+        Tests the projection against the single steps
+    test_create
+        Tests the forecast tables
+    test_export
+        Tests the excel export
+
+    """
+
+    def setUp(self):
+        """Prepares the test """
+
+        # copy engine to self.
+        self.testEngine = testEngine
+
+        # create db
+        base.metadata.create_all(self.testEngine)
+
+        today = time.today()
+        self.tomorrow = today + datetime.timedelta(days=1)
+
+        with Session(self.testEngine) as session:
+
+            session.add_all([
+                Customers(name="Fritz", surname="Meier", street="Elmstreet", nr=5, postal="0000", town="Entenhausen", phone="", mobile="", approach=1, notes=""),
+                Category(name="Brot"),
+                Products(name="Brot", category=1, purchase_price=1., selling_price=2., margin=.5, store="MeinLaden", phone=""),
+                Products(name="Baguette", category=1, purchase_price=1., selling_price=2., margin=.5, store="MeinLaden", phone=""),
+                Subcategory(name="Sub1"),
+                Subcategory(name="Sub2")
+            ])
+
+            session.add_all([
+                # every 2nd day from tomorrow -> day 0, 2, 4, 6
+                Abo(customer_id=1, cycle_type="interval", interval=2, next_delivery=self.tomorrow, product=1, subcategory=1, quantity=2),
+
+                # weekly (weekday of tomorrow) -> day 0, 7
+                Abo(customer_id=1, cycle_type="day", interval=self.tomorrow.weekday(), next_delivery=self.tomorrow, product=1, subcategory=1, quantity=1),
+
+                # no cycle -> day 3
+                Abo(customer_id=1, cycle_type=None, interval=None, next_delivery=self.tomorrow + datetime.timedelta(days=3), product=2, subcategory=1, quantity=5),
+
+                # not delivered anymore
+                Abo(customer_id=1, cycle_type="interval", interval=1, next_delivery=today - datetime.timedelta(days=5), product=2, subcategory=1, quantity=9),
+
+                # delivered today -> day 2, 5
+                Abo(customer_id=1, cycle_type="interval", interval=3, next_delivery=today, product=2, subcategory=2, quantity=4)
+            ])
+
+            session.commit()
+
+    def tearDown(self):
+        """Cleans the mess after a test"""
+
+        testSession.remove()
+        base.metadata.drop_all(self.testEngine)
+        self.testEngine = None
+
+    #region 'tests'
+    def test_project(self):
+        """Tests the projection against the single steps """
+
+        rng = np.random.default_rng(5)
+        start = datetime.datetime(2024, 5, 10)
+        n, days = 500, 30
+
+        cycleTypes = rng.choice(np.array(["day", "interval", None, "None"], dtype=object), n)
+        abos = pd.DataFrame({
+            'next_delivery':[start + datetime.timedelta(days=int(val)) for val in rng.integers(-3, 40, n)],
+            'cycle_type':cycleTypes,
+            'interval':[int(rng.integers(0, 7)) if val == "day" else (int(rng.integers(1, 20)) if val == "interval" else None) for val in cycleTypes],
+            'quantity':rng.integers(1, 5, n),
+            'product':rng.integers(1, 4, n)
+        })
+
+        # step by step with 'calculate_next_delivery()'
+        expected = np.zeros((days, 3), dtype=int)
+        for row in abos.itertuples():
+
+            date = row.next_delivery
+            while date is not None and (date - start).days < days:
+
+                if date >= start: expected[(date - start).days, row.product - 1] += row.quantity
+                date = time.calculate_next_delivery(date, row.cycle_type, row.interval)
+
+        matrix = forecast.project(abos, start, days)
+
+        # assert
+        self.assertEqual(matrix.columns.tolist(), [1, 2, 3])
+        self.assertEqual(matrix.index[0], pd.Timestamp(start))
+        np.testing.assert_array_equal(matrix.to_numpy(), expected)
+
+    def test_create(self):
+        """Tests the forecast tables """
+
+        #region 'not valid days'
+        self.assertEqual(forecast.create(days="a", language="EN", tz="UTC")['error'], "'days' needs to be a(n) number (whole).")
+        self.assertEqual(forecast.create(days=0, language="EN", tz="UTC")['error'], "The forecast needs to cover 1 to 60 days.")
+
+        #endregion
+
+        #region 'defaults of the app (per call)'
+        with patch.dict(app.config, {'DEFAULT_LANGUAGE':"DE"}):
+            self.assertEqual(forecast.create(days="a", tz="UTC")['error'], "'days' muss vom Typ Zahl (ganz) sein.")
+
+        #endregion
+
+        #region 'success'
+        result = forecast.create(days=8, language="EN", tz="UTC")
+
+        # assert
+        self.assertTrue(result['success'])
+        self.assertEqual(result['data']['start'], self.tomorrow.strftime("%Y.%m.%d"))
+
+        products = result['data']['forecast_product']
+        self.assertEqual(products['order'], ["date", "1", "2"])
+        self.assertEqual(products['mapping'], ["Date", "Brot", "Baguette"])
+        self.assertEqual(len(products['data']['date']), 8)
+        self.assertEqual(products['data']['1'], [3, 0, 2, 0, 2, 0, 2, 1])
+        self.assertEqual(products['data']['2'], [0, 0, 4, 5, 0, 4, 0, 0])
+
+        subcategories = result['data']['forecast_subcategory']
+        self.assertEqual(subcategories['order'], ["date", "1_1", "2_1", "2_2"])
+        self.assertEqual(subcategories['mapping'], ["Date", "Brot (Sub1)", "Baguette (Sub1)", "Baguette (Sub2)"])
+        self.assertEqual(subcategories['data']['2_2'], [0, 0, 4, 0, 0, 4, 0, 0])
+
+        #endregion
+
+    def test_export(self):
+        """Tests the excel export """
+
+        with tempfile.TemporaryDirectory() as tmp, patch.dict(app.config, {'MINI_MOI_HOME':Path(tmp)}):
+
+            result = forecast.export(days=7, language="EN", tz="UTC")
+
+            # assert
+            self.assertTrue(result['success'])
+            self.assertEqual([path.name for path in (Path(tmp) / "forecast").iterdir()], [
+                "forecast_{start}_7.xlsx".format(start=self.tomorrow.strftime("%Y-%m-%d"))
+            ])
+
+    #endregion
@@ -37,6 +37,8 @@ class TestProducts(unittest.TestCase):
         Tests the getter
     test_update
         Tests the updater
+    test_reprice
+        Tests the bulk price change
     test_add
         Tests the add
     test_delete
@@ -131,6 +133,7 @@ class TestProducts(unittest.TestCase):
     def tearDown(self):
         """Cleans the mess after a test"""
 
+        testSession.remove()
         base.metadata.drop_all(self.testEngine)
         self.testEngine = None
 
@@ -179,7 +182,8 @@ class TestProducts(unittest.TestCase):
                     'Margin', 'Store', 'Phone'
                     ],
                 'dropdown': {'category': {1: 'Brot', 2: 'Weißwaren'}},
-                'table_name':"Products"
+                'table_name':"Products",
+                'pagination':{'page_size':None, 'cursor':None, 'next_cursor':None, 'total':2}
                 }
         })
 
@@ -203,7 +207,8 @@ class TestProducts(unittest.TestCase):
                 'Margin', 'Store', 'Phone'
                 ],
             'dropdown': {'category': {1: 'Brot', 2: 'Weißwaren'}},
-            'table_name':"Products"
+            'table_name':"Products",
+            'pagination':{'page_size':None, 'cursor':None, 'next_cursor':None, 'total':0}
         })
 
         #endregion
@@ -237,7 +242,8 @@ class TestProducts(unittest.TestCase):
                 'Margin', 'Store', 'Phone'
                 ],
             'dropdown': {'category': {1: 'Brot', 2: 'Weißwaren'}},
-            'table_name':"Products"
+            'table_name':"Products",
+            'pagination':{'page_size':None, 'cursor':None, 'next_cursor':None, 'total':1}
             }})
 
         #endregion
@@ -296,7 +302,8 @@ class TestProducts(unittest.TestCase):
                 'Margin', 'Store', 'Phone'
                 ],
             'dropdown': {'category': {1: 'Brot', 2: 'Weißwaren'}},
-            'table_name':"Products"
+            'table_name':"Products",
+            'pagination':{'page_size':None, 'cursor':None, 'next_cursor':None, 'total':2}
             }})
 
         #endregion
@@ -321,7 +328,8 @@ class TestProducts(unittest.TestCase):
                 'Margin', 'Store', 'Phone'
                 ],
             'dropdown': {'category': {1: 'Brot', 2: 'Weißwaren'}},
-            'table_name':"Products"
+            'table_name':"Products",
+            'pagination':{'page_size':None, 'cursor':None, 'next_cursor':None, 'total':2}
         })
 
         #endregion
@@ -421,6 +429,74 @@ class TestProducts(unittest.TestCase):
 
         #endregion
     
+    def test_reprice(self):
+        """Tests the bulk price change """
+
+        def prices() -> list:
+            """Returns (purchase, selling, margin) per product """
+
+            with Session(testEngine) as session:
+                return [(row.purchase_price, row.selling_price, row.margin) for row in session.query(Products).order_by(Products.id)]
+
+        #region 'invalid rules'
+        for rule, error in [
+            ({}, "You did not enter/change anything."),
+            ({'percentage':"ten"}, "'percentage' needs to be a(n) decimal."),
+            ({'percentage':-100}, "The price rule is not valid: 'percentage'."),
+            ({'percentage':"nan"}, "The price rule is not valid: 'percentage'."),
+            ({'percentage':"inf"}, "The price rule is not valid: 'percentage'."),
+            ({'percentage':float("-inf")}, "The price rule is not valid: 'percentage'."),
+            ({'percentage':5, 'price':"margin"}, "The price rule is not valid: 'price'."),
+            ({'percentage':5, 'category':"Brot"}, "'Category' needs to be a(n) number (whole)."),
+        ]:
+            self.assertEqual(products.reprice(rule, language="EN")['error'], error)
+
+        #endregion
+
+        #region 'preview'
+        result = products.reprice({'percentage':"10,0", 'category':2}, preview=True, language="EN")
+
+        # assert
+        self.assertTrue(result['data']['preview'])
+        self.assertEqual(result['data']['changes'], [{
+            'id':2, 'name':"Baguette", 
+            'purchase_price':1.5, 'new_purchase_price':1.65, 
+            'selling_price':2., 'new_selling_price':2., 
+            'margin':.01, 'new_margin':.18
+        }])
+
+        # nothing changed
+        self.assertEqual(prices(), [(3.5, 10., .01), (1.5, 2., .01)])
+
+        #endregion
+
+        #region 'success'
+        result = products.reprice({'percentage':10, 'category':2}, language="EN")
+
+        # assert (same as preview)
+        self.assertTrue(result['success'])
+        self.assertEqual(result['data']['msg'], "1 product(s) were successfully repriced!")
+        self.assertEqual(prices(), [(3.5, 10., .01), (1.65, 2., .18)])
+
+        # both prices of the store (the margin stays the same)
+        result = products.reprice({'percentage':-50, 'price':"both", 'store':"MeinLaden"}, language="EN")
+
+        self.assertEqual(prices(), [(1.75, 5., .65), (.82, 1., .18)])
+
+        # same margins as the single updater
+        self.assertEqual([row['new_margin'] for row in result['data']['changes']], [products._margin(5., 1.75), products._margin(1., .82)])
+
+        #endregion
+
+        #region 'no product within the filter'
+        result = products.reprice({'percentage':10, 'store':"Unknown"}, language="EN")
+
+        # assert
+        self.assertTrue(result['success'])
+        self.assertEqual(result['data']['changes'], [])
+
+        #endregion
+
     def test_add(self):
         """Adds a element to the db """
 
@@ -0,0 +1,211 @@
+"""
+Tests the reporting based functions
+
+"""
+
+# imports
+import unittest
+from unittest.mock import patch
+
+import datetime
+import random
+
+from sqlalchemy.orm import scoped_session, sessionmaker, Session
+import pandas as pd
+
+from miniMoi import base
+from miniMoi.models.Models import Orders, SalesDaily, Customers, Products, Category
+from miniMoi.language import language_files
+from miniMoi.logic.helpers import aggregates
+from miniMoi.logic.db import init_database
+from miniMoi.logic.functions import reporting
+import miniMoi.logic.helpers.time_module as time
+
+from tests import testEngine
+
+# create session macker to mock it
+testSessionFactory = sessionmaker(bind=testEngine)
+testSession = scoped_session(testSessionFactory)
+
+#region 'legacy reference'
+def _legacy_report(year:pd.DataFrame, translation:dict) -> dict:
+    """The report calculation on the raw orders
+
+    Used as golden reference for the aggregates.
+
+    """
+
+    today = time.today()
+    currentYear = today.year
+    startOfYear = time.parse_date_string(str(currentYear-1) + "-12-31")
+    endOfYear = time.parse_date_string(str(currentYear) + "-12-30")
+
+    year = year[(year['date'] >= startOfYear) & (year['date'] <= endOfYear)].copy()
+
+    year.loc[:, 'date'] = year.loc[:, 'date'] + datetime.timedelta(days=1)
+    year['month'] = year['date'].map(lambda x: x.month)
+    year['day'] = year['date'].map(lambda x: x.day)
+    year['weekday'] = year['date'].map(lambda x: x.weekday())
+    year['weekday_name'] = year['weekday'].replace(translation['weekday_mapping'])
+    year['month_name'] = year['month'].replace(translation['month_mapping'])
+
+    windows = {
+        'current_week':(time.date_by_weekday(today, 6, -1), today.replace(hour=23, minute=59, second=59), "weekday_name"),
+        'last_week':(time.date_by_weekday(today, 6, -2), time.date_by_weekday(today, 6, -1).replace(hour=23, minute=59, second=59), "weekday_name"),
+        'month':(today.replace(day=1), today.replace(hour=23, minute=59, second=59), "day"),
+        'year':(today.replace(day=1, month=1), today.replace(hour=23, minute=59, second=59), "month_name")
+    }
+
+    report = {}
+    for name, (start, end, grouper) in windows.items():
+
+        tmp = year[(year['date'] >= start) & (year['date'] <= end)]
+
+        report[name] = {}
+        for key, by, col in [('selling_overview', 'product_name', 'quantity'), ('revenue_sources', 'category', 'total'), ('earnings', grouper, 'total')]:
+
+            calc = tmp.groupby(by)[col].sum()
+            report[name][key] = {'index':calc.index.tolist(), 'values':calc.tolist()}
+
+    return report
+
+#endregion
+
+# class
+class TestReporting(unittest.TestCase):
+    """Tests the reporting functions & aggregates
+
+    methods:
+    --------
+    setUp
+        Tests setup
+    tearDown
+        Clean after test
+    test_aggregates
+        Tests the incremental aggregation
+    test_get_report
+        Tests the report against the raw orders
+
+    """
+
+    def setUp(self):
+        """Prepare test """
+
+        # copy engine to self.
+        self.testEngine = testEngine
+
+        # create db
+        base.metadata.create_all(self.testEngine)
+
+        # random orders (quarter prices -> exact float sums)
+        rng = random.Random(7)
+        now = time.utcnow()
+        products = [(1, "Sonnenkernbrot", "Brot"), (2, "Fitnessbrot", "Brot"), (4, "Kaisersemmel", "Semmel"), (5, "Doppelweck", "Semmel")]
+
+        # the referenced customers & products (explicit ids)
+        with self.testEngine.begin() as connection:
+            connection.execute(Category.__table__.insert(), [{'id':1, 'name':"Brot"}, {'id':2, 'name':"Semmel"}])
+            connection.execute(Products.__table__.insert(), [{
+                'id':idx, 'name':name, 'category':1 if category == "Brot" else 2,
+                'purchase_price':1., 'selling_price':2., 'margin':.5, 'store':"", 'phone':""
+            } for idx, name, category in products])
+            connection.execute(Customers.__table__.insert(), [{
+                'id':idx, 'name':"Name", 'surname':"Surname", 'street':"Street",
+                'nr':idx, 'postal':"0000", 'town':"Town", 'approach':idx
+            } for idx in range(1, 7)])
+
+        init_database.sync_sequences(self.testEngine)
+
+        self.orders = []
+        for i in range(400):
+
+            product = rng.choice(products)
+            quantity = rng.randint(1, 10)
+            price = rng.randint(1, 20) / 4
+
+            self.orders.append({
+                'customer_id':rng.randint(1, 6),
+                'date':now - datetime.timedelta(days=rng.randint(0, 60), hours=rng.randint(0, 12)),
+                'product':product[0],
+                'product_name':product[1],
+                'category':product[2],
+                'subcategory':"Ganz",
+                'quantity':quantity,
+                'price':price,
+                'total':price * quantity
+            })
+
+        return
+
+    def tearDown(self):
+        """Cleanup after test """
+
+        testSession.remove()
+        base.metadata.drop_all(self.testEngine)
+        self.testEngine = None
+
+    #region 'helpers'
+    def _sales(self, session) -> dict:
+        """Returns the aggregates as {key:(quantity, total, orders)} """
+
+        return {
+            (row.date, row.product, row.product_name, row.category, row.customer_id):(row.quantity, row.total, row.orders)
+            for row in session.query(SalesDaily).all()
+        }
+
+    #endregion
+
+    #region 'tests'
+    def test_aggregates(self):
+        """Tests the incremental aggregation """
+
+        with Session(self.testEngine) as session:
+
+            # book in several batches -> increments existing keys
+            for idx in range(0, len(self.orders), 50):
+
+                batch = self.orders[idx:idx+50]
+
+                session.execute(Orders.__table__.insert(), batch)
+                aggregates.upsert_sales(session, aggregates.aggregate_orders(pd.DataFrame(batch)))
+                session.commit()
+
+            incremental = self._sales(session)
+
+            # rebuild from the orders
+            rows = aggregates.rebuild_sales(session, chunk_size=64)
+            session.commit()
+
+            rebuilt = self._sales(session)
+
+        # assert
+        self.assertEqual(rows, len(rebuilt))
+        self.assertEqual(incremental, rebuilt)
+        self.assertEqual(sum([val[2] for val in rebuilt.values()]), len(self.orders))
+        self.assertEqual(sum([val[0] for val in rebuilt.values()]), sum([order['quantity'] for order in self.orders]))
+
+        # keyed by the delivery day
+        self.assertTrue(all([key[0] == key[0].replace(hour=0, minute=0, second=0, microsecond=0) for key in rebuilt]))
+        self.assertEqual(min([key[0] for key in rebuilt]), min([order['date'] for order in self.orders]).replace(hour=0, minute=0, second=0, microsecond=0) + datetime.timedelta(days=1))
+
+    @patch('miniMoi.logic.functions.reporting.Session', testSession)
+    def test_get_report(self):
+        """Tests the report against the raw orders """
+
+        with Session(self.testEngine) as session:
+
+            session.execute(Orders.__table__.insert(), self.orders)
+            aggregates.rebuild_sales(session)
+            session.commit()
+
+        # run
+        result = reporting.get_report()
+
+        # assert
+        self.assertTrue(result['success'])
+
+        expected = _legacy_report(pd.DataFrame(self.orders), language_files['EN'])
+        for name, data in expected.items():
+            self.assertEqual(result['data'][name]['data'], data, name)
+
+    #endregion
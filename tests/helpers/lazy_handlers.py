@@ -0,0 +1,11 @@
+"""
+Handler module for the lazy registration test
+(see 'test_router.py').
+
+"""
+
+# imports
+from miniMoi.logic.helpers import router
+
+@router.route("lazyTest/get", value = router.param(coerce=int))
+def get(value): return {'success':True, 'error':"", 'data':{'value':value}}
@@ -0,0 +1,169 @@
+"""
+Tests the audit.py from helpers.
+
+"""
+
+# imports
+import os
+import json
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from miniMoi import base
+from miniMoi.models.Models import Log, Category
+from miniMoi.logic.db import sqlite
+from miniMoi.logic.helpers import audit, tools
+
+# class
+class TestAudit(unittest.TestCase):
+    """Tests the audit.py functions
+
+    methods:
+    --------
+    setUp
+        Tests setup
+    tearDown
+        Clean after test
+    test_payload
+        Tests the size capped payload
+    test_log
+        Tests the batched writes
+    test_shutdown
+        Tests the flush on shutdown
+    test_update_logs
+        Tests the tools wrapper
+    test_shared_connection
+        Tests the synchronous writes (in memory dbs)
+
+    """
+
+    def setUp(self):
+        """Prepare test """
+
+        # file db -> the flusher thread sees the same db
+        self.tmp = tempfile.TemporaryDirectory()
+        url = "sqlite:///" + os.path.join(self.tmp.name, "app.db")
+
+        self.testEngine = create_engine(url, echo=False, future=False, **sqlite.engine_options(url))
+        base.metadata.create_all(self.testEngine)
+
+        return
+
+    def tearDown(self):
+        """Cleanup after test """
+
+        audit.shutdown()
+
+        self.testEngine.dispose()
+        self.tmp.cleanup()
+
+    #region 'helpers'
+    def _logs(self) -> list:
+        """Returns the (ressource, action) of all logs """
+
+        with Session(self.testEngine) as session:
+            return [(row.ressource, row.action) for row in session.query(Log).order_by(Log.id)]
+
+    #endregion
+
+    #region 'tests'
+    def test_payload(self):
+        """Tests the size capped payload """
+
+        # small payloads stay complete
+        self.assertEqual(json.loads(audit.payload({'customer_id':1, 'data':{'name':"Fritz"}})), {'customer_id':1, 'data':{'name':"Fritz"}})
+        self.assertEqual(audit.payload("See orders"), "See orders")
+
+        # long lists are reduced to the length & the first items
+        result = json.loads(audit.payload({'customers':[{'id':idx} for idx in range(10000)]}, max_size=10000))
+
+        self.assertEqual(result['customers']['len'], 10000)
+        self.assertEqual(result['customers']['head'], [{'id':idx} for idx in range(audit.MAX_ITEMS)])
+
+        # objects are named only
+        self.assertEqual(json.loads(audit.payload({'session':Session()})), {'session':"<Session>"})
+
+        # the cap
+        result = audit.payload({'text':["x" * 100] * 10})
+        self.assertEqual(len(result), audit.MAX_PAYLOAD)
+        self.assertTrue(result.endswith("..."))
+
+    def test_log(self):
+        """Tests the batched writes """
+
+        for idx in range(25):
+            self.assertTrue(audit.log(self.testEngine, "miniMoi.logic.functions.customer.add", {'customers':[idx]}))
+
+        audit.flush()
+
+        logs = self._logs()
+        self.assertEqual(len(logs), 25)
+        self.assertEqual(logs[3], ("miniMoi.logic.functions.customer.add", '{"customers":[3]}'))
+
+    def test_shutdown(self):
+        """Tests the flush on shutdown """
+
+        audit.log(self.testEngine, "first", "1")
+        audit.shutdown()
+
+        self.assertEqual(self._logs(), [("first", "1")])
+
+        # the flusher restarts on the next action
+        audit.log(self.testEngine, "second", "2")
+        audit.flush()
+
+        self.assertEqual(self._logs(), [("first", "1"), ("second", "2")])
+
+    def test_update_logs(self):
+        """Tests the tools wrapper """
+
+        def update(customer_id:int, data:dict, language:str = "EN"):
+            session = Session(self.testEngine)
+            unrelated = "not logged"
+            tools._update_logs(session, "update", tools._arguments(update, locals()))
+
+        update(1, {'name':"Fritz"})
+        audit.flush()
+
+        self.assertEqual(json.loads(self._logs()[0][1]), {'customer_id':1, 'data':{'name':"Fritz"}, 'language':"EN"})
+
+    def test_shared_connection(self):
+        """Tests the synchronous writes (in memory dbs) """
+
+        engine = create_engine("sqlite://", echo=False, future=False, **sqlite.engine_options("sqlite://"))
+        base.metadata.create_all(engine)
+        self.assertTrue(sqlite.shares_connection(engine))
+        self.assertFalse(sqlite.shares_connection(self.testEngine))
+
+        with Session(engine) as session:
+
+            # rolled back with the open transaction
+            session.add(Category(name="Brot"))
+            session.flush()
+
+            tools._update_logs(session, "rolled back", "1")
+            audit.flush()
+            session.rollback()
+
+            self.assertEqual(session.query(Category).count(), 0)
+            self.assertEqual(session.query(Log).count(), 0)
+
+            # committed with it
+            session.add(Category(name="Brot"))
+            session.flush()
+            tools._update_logs(session, "committed", "2")
+            session.commit()
+
+            # no open transaction -> committed right away
+            tools._update_logs(session, "after commit", "3")
+            session.rollback()
+
+            self.assertEqual(session.query(Category.name).all(), [("Brot",)])
+            self.assertEqual([row.ressource for row in session.query(Log).order_by(Log.id)], ["committed", "after commit"])
+
+        engine.dispose()
+
+    #endregion
@@ -0,0 +1,229 @@
+"""
+Tests the batch.py from helpers & the 'batch' ressource.
+
+"""
+
+# imports
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy import event, select
+
+import miniMoi
+from miniMoi import create_app, handlers
+from miniMoi.logic.helpers import audit, batch
+from miniMoi.models.Models import Category, Log
+
+# class
+class TestBatch(unittest.TestCase):
+    """Tests the batch requests
+
+    methods:
+    --------
+    setUp
+        Tests setup
+    tearDown
+        Clean after test
+    test_partial
+        Tests the batch with failing items
+    test_atomic
+        Tests the all-or-nothing mode
+    test_invalid
+        Tests the rejected batches
+    test_route
+        Tests the '/api/batch' route
+    test_logging
+        Tests the audit logs of the batch
+
+    """
+
+    def setUp(self):
+        """Prepare test """
+
+        # app with a sqlite file (real transactions & savepoints)
+        self.home = tempfile.TemporaryDirectory()
+        self.app = create_app({'HOME':self.home.name, 'DATABASE_URL':"sqlite:///" + str(Path(self.home.name) / "app.db")})
+        self.engine = self.app.extensions['miniMoi']['engine']
+
+        # the audit flusher commits too (see 'test_logging')
+        self.app.config['ACTION_LOGGING'] = False
+
+        with self.app.app_context():
+
+            session = miniMoi.Session()
+            session.add_all([Category(name="Brot"), Category(name="Brötchen"), Category(name="Kuchen")])
+            session.commit()
+            miniMoi.Session.remove()
+
+        # count the commits
+        self.commits = 0
+        event.listen(self.engine, "commit", self._count)
+
+        return
+
+    def tearDown(self):
+        """Cleanup after test """
+
+        event.remove(self.engine, "commit", self._count)
+
+        # write the pending logs before the db is removed
+        audit.flush()
+
+        self.engine.dispose()
+        self.home.cleanup()
+
+    #region 'helpers'
+    def _count(self, connection) -> None:
+        """Counts the commits """
+
+        self.commits += 1
+
+    def _names(self) -> list:
+        """Returns the category names """
+
+        with self.app.app_context():
+
+            names = [row.name for row in miniMoi.Session().query(Category).order_by(Category.id)]
+            miniMoi.Session.remove()
+
+        return names
+
+    def _items(self) -> list:
+        """Returns the test batch (the 3rd item fails) """
+
+        return [
+            {'ressource':"category/update", 'data':{'id':1, 'name':"Vollkornbrot"}},
+            {'ressource':"category/add", 'data':{'to_add':[{'name':"Torte"}]}},
+            {'ressource':"category/update", 'data':{'id':3, 'name':"Brötchen"}}, # -> not unique
+            {'ressource':"category/update", 'data':{'id':99, 'name':"Unknown"}}, # -> not found
+            {'ressource':"category/update", 'data':{'id':2, 'name':"Semmel"}}
+        ]
+
+    def _logs(self) -> list:
+        """Returns the written audit log ressources """
+
+        audit.flush()
+
+        # (own connection -> not the session of a running batch)
+        with self.engine.connect() as connection:
+            return [row.ressource for row in connection.execute(select(Log.ressource).order_by(Log.id))]
+
+    #endregion
+
+    #region 'tests'
+    def test_partial(self):
+        """Tests the batch with failing items """
+
+        with self.app.app_context():
+            response = handlers.api({'ressource':"batch", 'data':{'items':self._items()}})
+
+        # assert
+        self.assertTrue(response['success'])
+        self.assertTrue(response['data']['committed'])
+        self.assertEqual([result['success'] for result in response['data']['results']], [True, True, False, False, True])
+        self.assertIn("not unique", response['data']['results'][2]['error'])
+
+        # one commit, the failed items are rolled back
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(self._names(), ["Vollkornbrot", "Semmel", "Kuchen", "Torte"])
+
+    def test_atomic(self):
+        """Tests the all-or-nothing mode """
+
+        with self.app.app_context():
+            response = handlers.api({'ressource':"batch", 'data':{'items':json.dumps(self._items()), 'atomic':"true"}})
+
+        # assert
+        self.assertFalse(response['success'])
+        self.assertFalse(response['data']['committed'])
+        self.assertEqual(response['error'], "Item 2 ('category/update') failed. No changes were saved.")
+
+        # stopped at the failed item
+        self.assertEqual([result['success'] for result in response['data']['results']], [True, True, False])
+
+        # nothing saved
+        self.assertEqual(self.commits, 0)
+        self.assertEqual(self._names(), ["Brot", "Brötchen", "Kuchen"])
+
+        # without failures everything is saved
+        with self.app.app_context():
+            response = handlers.api({'ressource':"batch", 'data':{'items':self._items()[:2], 'atomic':True}})
+
+        self.assertTrue(response['data']['committed'])
+        self.assertEqual(self._names(), ["Vollkornbrot", "Brötchen", "Kuchen", "Torte"])
+
+    def test_invalid(self):
+        """Tests the rejected batches """
+
+        with self.app.app_context():
+
+            # not a list
+            response = handlers.api({'ressource':"batch", 'data':{'items':{'ressource':"category/get"}}})
+            self.assertEqual(response['error'], "'items' needs to be a(n) list[dict].")
+
+            # too large
+            self.app.config['BATCH_MAX_ITEMS'] = 1
+            response = handlers.api({'ressource':"batch", 'data':{'items':self._items()}})
+            self.assertEqual(response['error'], "The batch contains too many items (max. 1).")
+            self.app.config['BATCH_MAX_ITEMS'] = 1000
+
+            # only db edits
+            response = handlers.api({'ressource':"batch", 'data':{'items':[{'ressource':"system/dbBackup", 'data':{}}]}})
+            self.assertEqual(response['data']['results'][0]['error'], "'system/dbBackup' can not be used within a batch.")
+
+        self.assertEqual(list((Path(self.home.name) / "mini-moi").glob("backups/*")), [])
+
+    def test_route(self):
+        """Tests the '/api/batch' route """
+
+        response = self.app.test_client().post("/api/batch", json={'items':self._items()[:2]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['success'] for result in response.get_json()['data']['results']], [True, True])
+        self.assertEqual(self._names(), ["Vollkornbrot", "Brötchen", "Kuchen", "Torte"])
+
+    def test_logging(self):
+        """Tests the audit logs of the batch """
+
+        self.app.config['ACTION_LOGGING'] = True
+        update = "miniMoi.logic.functions.categories.update"
+
+        #region 'atomic rollback -> no logs'
+        with self.app.app_context():
+            response = handlers.api({'ressource':"batch", 'data':{'items':self._items(), 'atomic':True}})
+
+        self.assertFalse(response['data']['committed'])
+        self.assertEqual(self._logs(), [])
+
+        #endregion
+
+        #region 'item rollback -> the log of the item is dropped'
+        with self.app.app_context(), batch.session(miniMoi.Session) as session:
+
+            with session.item(): session.log("kept", {})
+
+            with session.item() as state:
+                session.log("dropped", {})
+                state['success'] = False
+
+            # nothing is queued before the commit
+            self.assertEqual(self._logs(), [])
+
+            session.commit()
+
+        self.assertEqual(self._logs(), ["kept"])
+
+        #endregion
+
+        #region 'partial batch -> the logs of the successful items'
+        with self.app.app_context():
+            response = handlers.api({'ressource':"batch", 'data':{'items':self._items()}})
+
+        self.assertTrue(response['data']['committed'])
+        self.assertEqual(self._logs(), ["kept", update, "miniMoi.logic.functions.categories.add", update])
+
+        #endregion
+
+    #endregion
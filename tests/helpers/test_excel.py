@@ -0,0 +1,68 @@
+"""
+Tests the excel.py from helpers.
+
+"""
+
+# imports
+import os
+import tempfile
+import unittest
+
+import openpyxl
+
+import miniMoi.logic.helpers.excel as excel
+
+from tests.benchmarks.bench_excel import order_list, peak_memory
+
+# class
+class TestExcel(unittest.TestCase):
+    """Tests the excel.py functions
+
+    CAUTION:
+    The layout of 'print_cover()' is only
+    checked visually (see 'excel.test_cover()').
+
+    methods:
+    --------
+    test_print_order_list
+        Tests the row ordered order list
+    test_memory
+        Tests the bounded peak memory
+
+    """
+
+    #region 'tests'
+    def test_print_order_list(self):
+        """Tests the row ordered order list """
+
+        data = order_list(6, towns=2)
+
+        with tempfile.TemporaryDirectory() as tmp:
+
+            path = os.path.join(tmp, "orders.xlsx")
+            excel.print_order_list(data, path)
+
+            worksheet = openpyxl.load_workbook(path).active
+
+            # town titles & heads
+            self.assertEqual(sorted([str(val) for val in worksheet.merged_cells.ranges]), ['A12:L12', 'A2:F3', 'A5:L5'])
+            self.assertEqual(worksheet['A5'].value, "Town 0")
+            self.assertEqual(worksheet['A12'].value, "Town 1")
+            self.assertEqual(worksheet['A6'].font.sz, 9)
+            self.assertTrue(worksheet['L6'].value is not None)
+
+            # repeated values are blank, groups end with a separator
+            self.assertEqual([worksheet.cell(row, 1).value for row in range(7, 10)], ["customer_street 0", None, None])
+            self.assertEqual([worksheet.cell(row, 5).value for row in range(7, 10)], [0, 1, 2])
+            self.assertEqual([worksheet.cell(row, 12).border.bottom.style for row in range(7, 10)], ["dotted", "dotted", "thin"])
+
+    def test_memory(self):
+        """Tests the bounded peak memory """
+
+        small = peak_memory(order_list(300, towns=30))
+        large = peak_memory(order_list(3_000, towns=30))
+
+        # ten times the rows, (almost) the same peak
+        self.assertLess(large, small * 1.5 + 0.5)
+
+    #endregion
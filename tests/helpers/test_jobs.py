@@ -0,0 +1,137 @@
+"""
+Tests the jobs.py from helpers.
+
+"""
+
+# imports
+import threading
+import unittest
+from unittest.mock import patch
+
+from miniMoi import app
+from miniMoi.logic.helpers import jobs
+
+# class
+@patch.dict(app.config, {'JOB_WORKERS':1, 'JOB_QUEUE_SIZE':2, 'JOB_HISTORY':5})
+class TestJobs(unittest.TestCase):
+    """Tests the jobs.py functions
+
+    methods:
+    --------
+    setUp
+        Setsup the testcase
+    tearDown
+        Cleaning after tests
+    test_submit
+        Tests the job lifecycle & de-duplication
+    test_bounds
+        Tests the bounded queue & history
+    test_failures
+        Tests failing jobs
+
+    """
+
+    def setUp(self):
+        """Setup for each test"""
+
+        jobs._jobs.clear()
+        jobs._inflight.clear()
+
+        self.release = threading.Event()
+
+        return super().setUp()
+
+    def tearDown(self):
+        """Cleans certain attributes after tests"""
+
+        self.release.set()
+        jobs.shutdown()
+
+        return super().tearDown()
+
+    #region 'helpers'
+    def _blocking(self, value:int) -> dict:
+        """Job which waits for 'self.release' """
+
+        self.release.wait(5)
+
+        return {'success':True, 'error':"", 'data':{'msg':value}}
+
+    def _wait(self, job_id:str) -> dict:
+        """Waits until the job is finished """
+
+        self.release.set()
+        jobs.shutdown()
+
+        return jobs.status(job_id)
+
+    #endregion
+
+    #region 'tests'
+    def test_submit(self):
+        """Tests the job lifecycle & de-duplication """
+
+        first = jobs.submit("delivery/book", self._blocking, {'value':1}, payload="[1]")
+
+        self.assertTrue(first['success'])
+        self.assertFalse(first['data']['duplicate'])
+        self.assertIn(jobs.status(first['data']['job_id'])['data']['status'], [jobs.QUEUED, jobs.RUNNING])
+
+        # identical request -> same job
+        second = jobs.submit("delivery/book", self._blocking, {'value':1}, payload="[1]")
+
+        self.assertTrue(second['data']['duplicate'])
+        self.assertEqual(second['data']['job_id'], first['data']['job_id'])
+
+        # other ressource -> new job
+        third = jobs.submit("delivery/saveData", self._blocking, {'value':2}, payload="[1]")
+        self.assertNotEqual(third['data']['job_id'], first['data']['job_id'])
+
+        # finished
+        result = self._wait(first['data']['job_id'])
+
+        self.assertEqual(result['data']['status'], jobs.DONE)
+        self.assertEqual(result['data']['result'], {'success':True, 'error':"", 'data':{'msg':1}})
+
+        # finished jobs are not de-duplicated anymore
+        fourth = jobs.submit("delivery/book", self._blocking, {'value':1}, payload="[1]")
+        self.assertFalse(fourth['data']['duplicate'])
+
+        # unknown id
+        self.assertEqual(jobs.status("unknown")['error'], "The job was not found (id = 'unknown').")
+
+    def test_bounds(self):
+        """Tests the bounded queue & history """
+
+        submitted = [jobs.submit("delivery/saveData", self._blocking, {'value':i}, payload=str(i)) for i in range(3)]
+
+        # queue size is two
+        self.assertTrue(submitted[0]['success'])
+        self.assertTrue(submitted[1]['success'])
+        self.assertFalse(submitted[2]['success'])
+        self.assertEqual(submitted[2]['error'], "There are too many running jobs. Please try again in a moment.")
+
+        # history keeps the last finished job
+        with patch.dict(app.config, {'JOB_HISTORY':1}): self._wait(submitted[1]['data']['job_id'])
+
+        self.assertFalse(jobs.status(submitted[0]['data']['job_id'])['success'])
+        self.assertEqual(jobs.status(submitted[1]['data']['job_id'])['data']['result']['data']['msg'], 1)
+
+    def test_failures(self):
+        """Tests failing jobs """
+
+        def _raise(): raise KeyError("broken")
+
+        failed = jobs.submit("delivery/book", lambda: {'success':False, 'error':"no", 'data':{}})
+        raised = jobs.submit("delivery/book", _raise)
+
+        # no payload -> never de-duplicated
+        self.assertNotEqual(failed['data']['job_id'], raised['data']['job_id'])
+
+        self._wait(raised['data']['job_id'])
+
+        self.assertEqual(jobs.status(failed['data']['job_id'])['data']['status'], jobs.FAILED)
+        self.assertEqual(jobs.status(raised['data']['job_id'])['data']['status'], jobs.FAILED)
+        self.assertEqual(jobs.status(raised['data']['job_id'])['data']['result']['error'], "An error occured: KeyError: 'broken'")
+
+    #endregion
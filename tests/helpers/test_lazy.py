@@ -0,0 +1,53 @@
+"""
+Tests the lazy.py from helpers.
+
+"""
+
+# imports
+import sys
+import unittest
+
+from miniMoi.logic.helpers import lazy
+
+from tests.benchmarks.bench_startup import measure, STARTUP_BUDGET
+
+# class
+class TestLazy(unittest.TestCase):
+    """Tests the lazy.py functions & the startup
+
+    methods:
+    --------
+    test_module
+        Tests the lazy module proxy
+    test_startup
+        Tests the startup budget
+
+    """
+
+    #region 'tests'
+    def test_module(self):
+        """Tests the lazy module proxy """
+
+        proxy = lazy.module("miniMoi.logic.helpers.time_module")
+
+        self.assertIn("not loaded", repr(proxy))
+
+        # first access imports
+        self.assertEqual(proxy.today, sys.modules["miniMoi.logic.helpers.time_module"].today)
+        self.assertIn("(loaded)", repr(proxy))
+
+        with self.assertRaises(AttributeError): proxy.unknown_attribute
+
+        # unknown modules fail on first use
+        with self.assertRaises(ModuleNotFoundError): lazy.module("miniMoi.unknown_module").attribute
+
+    def test_startup(self):
+        """Tests the startup budget """
+
+        result = measure()
+
+        self.assertEqual(result['status'], 200)
+        self.assertEqual(result['loaded'], [])
+        self.assertLess(result['first_response'], STARTUP_BUDGET)
+
+    #endregion
@@ -0,0 +1,162 @@
+"""
+Tests the router.py from helpers & the api handlers.
+
+"""
+
+# imports
+import sys
+import unittest
+
+from miniMoi import handlers, base
+from miniMoi.logic.helpers import router
+
+from tests import testApp, testEngine
+
+# class
+class TestRouter(unittest.TestCase):
+    """Tests the router.py functions
+
+    methods:
+    --------
+    test_dispatch
+        Tests the parameter parsing & coercion
+    test_lazy
+        Tests the lazy module registration
+    test_stats
+        Tests the per ressource stats
+    test_api
+        Tests the api handlers
+
+    """
+
+    #region 'tests'
+    def test_dispatch(self):
+        """Tests the parameter parsing & coercion """
+
+        @router.route("test/echo",
+            item_id = router.param('id', coerce=int),
+            cursor = router.param(coerce=router.optional_int, default=None),
+            data = router.param(coerce=router.json_value),
+            raw = router.param('data', source="request"),
+            constant = "fixed"
+        )
+        def echo(item_id, cursor, data, raw, constant): return {'success':True, 'error':"", 'data':locals()}
+
+        @router.route("test/<name>")
+        def named(name): return name
+
+        request = {'ressource':"test/echo", 'data':{'id':"3", 'cursor':"null", 'data':'{"a":[1,2]}'}}
+
+        self.assertEqual(router.dispatch("test/echo", request)['data'], {
+            'item_id':3, 'cursor':None, 'data':{'a':[1, 2]}, 'raw':request['data'], 'constant':"fixed"
+        })
+
+        # path params
+        self.assertEqual(router.dispatch("test/some/path", {'data':{}}), "some/path")
+
+        # typed params raise 'WrongType', others pass the error on
+        @router.route("test/typed",
+            cursor = router.param(coerce=router.optional_int, default=None, dtype="int"),
+            item_id = router.param('id', coerce=int, default=None)
+        )
+        def typed(cursor, item_id): return {'success':True, 'error':"", 'data':{}}
+
+        with self.assertRaises(router.WrongType) as context: router.dispatch("test/typed", {'data':{'cursor':"abc"}})
+        self.assertEqual((context.exception.key, context.exception.dtype), ("cursor", "int"))
+        with self.assertRaises(ValueError): router.dispatch("test/typed", {'data':{'id':"abc"}})
+
+        # missing required params & unknown ressources
+        with self.assertRaises(KeyError): router.dispatch("test/echo", {'data':{}})
+        with self.assertRaises(router.NotFound): router.dispatch("unknown/ressource", {'data':{}})
+
+        # flags
+        self.assertEqual([router.flag(val) for val in ["true", "False", 1, 0]], [True, False, True, False])
+
+    def test_lazy(self):
+        """Tests the lazy module registration """
+
+        sys.modules.pop("tests.helpers.lazy_handlers", None)
+
+        # unknown modules stay registered
+        router.register_lazy("lazyMissing", "tests.helpers.missing_handlers")
+
+        with self.assertRaises(ImportError): router.dispatch("lazyMissing/get", {'data':{}})
+        self.assertIn("lazyMissing/*", router.ressources())
+
+        # imported on the first request
+        router.register_lazy("lazyTest", "tests.helpers.lazy_handlers")
+
+        self.assertIn("lazyTest/*", router.ressources())
+        self.assertNotIn("tests.helpers.lazy_handlers", sys.modules)
+
+        self.assertEqual(router.dispatch("lazyTest/get", {'data':{'value':"5"}})['data'], {'value':5})
+
+        self.assertIn("tests.helpers.lazy_handlers", sys.modules)
+        self.assertEqual([val for val in router.ressources() if val.startswith("lazyTest")], ["lazyTest/get"])
+
+    def test_stats(self):
+        """Tests the per ressource stats """
+
+        @router.route("stats/ok")
+        def ok(): return {'success':True, 'error':"", 'data':{}}
+
+        @router.route("stats/fail")
+        def fail(): raise ValueError("fail")
+
+        router.reset_stats()
+
+        for _ in range(3): router.dispatch("stats/ok", {'data':{}})
+        with self.assertRaises(ValueError): router.dispatch("stats/fail", {'data':{}})
+
+        stats = router.stats()
+
+        self.assertEqual((stats['stats/ok']['calls'], stats['stats/ok']['failures']), (3, 0))
+        self.assertEqual((stats['stats/fail']['calls'], stats['stats/fail']['failures']), (1, 1))
+        self.assertAlmostEqual(stats['stats/ok']['mean'], stats['stats/ok']['total'] / 3)
+        self.assertGreaterEqual(stats['stats/ok']['max'], stats['stats/ok']['mean'])
+
+    def test_api(self):
+        """Tests the api handlers """
+
+        # the tables of server dbs (shared with the app) are dropped by the other tests
+        base.metadata.create_all(testEngine)
+        self.addCleanup(base.metadata.drop_all, testEngine)
+
+        with testApp.app_context():
+
+            # every group can be loaded
+            for ressource, data in [
+                ("customers/get", {'filter_type':None, 'what':None, 'amount':None, 'page_size':"2"}),
+                ("category/get", {'amount':None}),
+                ("subcategory/get", {'amount':None}),
+                ("reporting/get", {}),
+                ("forecast/get", {'days':"7"}),
+                ("system/routeStats", {})
+            ]:
+                self.assertTrue(handlers.api({'ressource':ressource, 'data':data})['success'], ressource)
+
+            for ressource in ["products/get", "abo/get", "delivery/create", "bulk/update", "jobs/unknown"]:
+                self.assertNotIn("An error occured", handlers.api({'ressource':ressource, 'data':{'filter_type':None, 'what':None, 'amount':None}})['error'])
+
+            # errors
+            self.assertEqual(handlers.api({'ressource':"unknown", 'data':{}})['error'], "Endpoint 'unknown' not found.")
+            self.assertEqual(handlers.api({'ressource':"customers/delete", 'data':{}})['error'], "An error occured: KeyError: 'id'")
+
+            # not coercible paging params
+            for ressource in ["customers/get", "products/get", "abo/get"]:
+
+                data = {'filter_type':None, 'what':None, 'amount':None}
+                self.assertEqual(
+                    handlers.api({'ressource':ressource, 'data':dict(data, page_size="ten")})['error'],
+                    "'page_size' needs to be a(n) number (whole)."
+                )
+                self.assertEqual(
+                    handlers.api({'ressource':ressource, 'language':"DE", 'data':dict(data, cursor="1.5")})['error'],
+                    "'cursor' muss vom Typ Zahl (ganz) sein."
+                )
+
+            # stats are available via the api
+            stats = handlers.api({'ressource':"system/routeStats", 'data':{}})['data']['stats']
+            self.assertGreaterEqual(stats['customers/get']['calls'], 1)
+
+    #endregion
@@ -0,0 +1,157 @@
+"""
+Tests the serialize.py from helpers.
+
+"""
+
+# imports
+import gzip
+import json
+import datetime
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from flask import json as flaskJson
+
+from miniMoi import app
+from miniMoi.logic.helpers import serialize
+import miniMoi.routes
+
+from tests.benchmarks.bench_serialize import delivery_frame, legacy_dumps
+
+# class
+class TestSerialize(unittest.TestCase):
+    """Tests the serialize.py functions
+
+    methods:
+    --------
+    test_frame_to_columns
+        Tests the column conversion
+    test_to_native
+        Tests the conversion of nested objects
+    test_dumps
+        Tests the serialization against 'tools.jEncoder'
+    test_dates
+        Tests the dates against flask's json encoder
+    test_to_api
+        Tests the serialized (& gzipped) api response
+
+    """
+
+    #region 'tests'
+    def test_frame_to_columns(self):
+        """Tests the column conversion """
+
+        df = pd.DataFrame({
+            'int':[1, 2, 3],
+            'float':[.5, np.nan, 1.0],
+            'str':["a", None, "c"],
+            'date':pd.to_datetime(["2022-05-01", None, "2022-05-03"]),
+            'mixed':[np.int64(1), "b", datetime.date(2022, 5, 2)]
+        })
+
+        result = serialize.frame_to_columns(df)
+
+        # same as 'to_dict("list")' for the native columns
+        expected = df.to_dict("list")
+        self.assertEqual(result['int'], expected['int'])
+        self.assertEqual(result['str'], expected['str'])
+        self.assertEqual(result['float'][0::2], [.5, 1.0])
+        self.assertTrue(np.isnan(result['float'][1]))
+
+        # dates as in flask's json encoder
+        self.assertEqual(result['date'], ["Sun, 01 May 2022 00:00:00 GMT", None, "Tue, 03 May 2022 00:00:00 GMT"])
+        self.assertEqual(result['mixed'], [1, "b", "Mon, 02 May 2022 00:00:00 GMT"])
+
+        # only native types
+        for col, values in result.items():
+            self.assertTrue(all([type(val) in [int, float, str, type(None)] for val in values]), col)
+
+    def test_to_native(self):
+        """Tests the conversion of nested objects """
+
+        result = serialize.to_native({
+            'frame':pd.DataFrame({'a':[1, 2]}),
+            'series':pd.Series([1.5, 2.5]),
+            'array':np.arange(4).reshape(2, 2),
+            'scalars':(np.int64(3), np.float32(.5), np.bool_(True), pd.NaT, np.datetime64("2022-05-01")),
+            'date':datetime.datetime(2022, 5, 1, 12),
+            'nested':[{'x':np.int32(1)}, "native"]
+        })
+
+        self.assertEqual(result, {
+            'frame':{'a':[1, 2]},
+            'series':[1.5, 2.5],
+            'array':[[0, 1], [2, 3]],
+            'scalars':[3, .5, True, None, "Sun, 01 May 2022 00:00:00 GMT"],
+            'date':"Sun, 01 May 2022 12:00:00 GMT",
+            'nested':[{'x':1}, "native"]
+        })
+        self.assertEqual(type(result['scalars'][0]), int)
+        self.assertEqual(type(result['scalars'][2]), bool)
+
+    def test_dumps(self):
+        """Tests the serialization against 'tools.jEncoder' """
+
+        df = delivery_frame(1_000)
+
+        result = json.loads(serialize.dumps({'success':True, 'error':"", 'data':df}))
+        legacy = json.loads(legacy_dumps(df))
+
+        # the dates are tested in 'test_dates'
+        result['data'].pop('next_delivery')
+        legacy['data'].pop('next_delivery')
+        self.assertEqual(result, legacy)
+
+        # flask settings (sorted keys, compact)
+        self.assertEqual(serialize.dumps({'b':np.int64(1), 'a':"ä"}), b'{"a":"\\u00e4","b":1}')
+
+    def test_dates(self):
+        """Tests the dates against flask's json encoder 
+        
+        The api encoded dates with flask's json encoder
+        (http dates) before the vectorized serialization.
+        
+        """
+
+        berlin = pd.to_datetime(["2022-05-01 12:30", None]).tz_localize("Europe/Berlin")
+        dates = {
+            'datetime':datetime.datetime(2022, 5, 1, 12, 30, 15),
+            'date':datetime.date(2022, 5, 1),
+            'timestamp':pd.Timestamp("2022-05-01 08:00"),
+            'aware':berlin[0].to_pydatetime(),
+            'column':[pd.Timestamp("2022-05-01"), pd.Timestamp("2022-05-02")]
+        }
+
+        with app.app_context(): expected = json.loads(flaskJson.dumps(dates))
+
+        # assert
+        self.assertEqual(json.loads(serialize.dumps(dates)), expected)
+        self.assertEqual(expected['datetime'], "Sun, 01 May 2022 12:30:15 GMT")
+
+        # vectorized columns (tz aware -> utc)
+        self.assertEqual(json.loads(serialize.dumps({'column':pd.Series(dates['column'])})), {'column':expected['column']})
+        self.assertEqual(serialize.frame_to_columns(pd.DataFrame({'aware':berlin}))['aware'], [expected['aware'], None])
+
+    def test_to_api(self):
+        """Tests the serialized (& gzipped) api response """
+
+        response = {'success':True, 'error':"", 'data':{'values':np.arange(1_000)}}
+        client = app.test_client()
+
+        with patch('miniMoi.routes.handlers.api', return_value=response), \
+            patch.dict(app.config, {'API_GZIP_MIN_SIZE':1024}):
+
+            plain = client.post("/api/test", json={})
+            compressed = client.post("/api/test", json={}, headers={'Accept-Encoding':"gzip"})
+
+        # assert
+        self.assertEqual(plain.headers.get('Content-Encoding'), None)
+        self.assertEqual(plain.get_json()['data']['values'], list(range(1_000)))
+
+        self.assertEqual(compressed.headers['Content-Encoding'], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(compressed.data)), plain.get_json())
+
+    #endregion
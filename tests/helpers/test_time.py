@@ -10,6 +10,8 @@ from unittest.mock import patch
 
 import datetime
 
+import pandas as pd
+
 import miniMoi.logic.helpers.time_module as time
 
 # create test class
@@ -38,6 +40,12 @@ class TestTime(unittest.TestCase):
         Calculate date based on interval
     test_clalculate_next_delivery
         Calculate next delivery
+    test_calculate_next_deliveries
+        Calculate next deliveries (vectorized)
+    test_utc_to_local
+        Tests utc to local
+    test_series_conversions
+        Tests the vectorized conversions
     test_parse_UI_date
         Tests the ui parsing
 
@@ -242,6 +250,59 @@ class TestTime(unittest.TestCase):
         self.assertEqual(str(e.exception).split("{")[0], "'cycle_type' needs to be one of the following '")
 
 
+        #endregion
+
+    def test_calculate_next_deliveries(self):
+        """Tests the vectorized next delivery calculation """
+
+        #region 'same as calculate_next_delivery()'
+        # one week of start dates, starting on a Wendsday
+        start = datetime.datetime.strptime("16.03.2022", "%d.%m.%Y")
+
+        dates, cycle_types, intervals = [], [], []
+        for d in range(7):
+            for cycle_type, interval in [("day", i) for i in range(7)] + [("interval", i) for i in range(1, 8)] + [(None, None), ("None", 3)]:
+                dates.append(start + datetime.timedelta(days=d))
+                cycle_types.append(cycle_type)
+                intervals.append(interval)
+
+        result = time.calculate_next_deliveries(dates, cycle_types, intervals, "EN")
+
+        # assert
+        for i, date in enumerate(result.tolist()):
+
+            expected = time.calculate_next_delivery(dates[i], cycle_types[i], intervals[i], "EN")
+
+            if expected is None: self.assertTrue(date is None or date != date)
+            else: self.assertEqual(date.to_pydatetime(), expected)
+
+        #endregion
+
+        #region 'cycle_type = day, interval = None'
+        with self.assertRaises(AssertionError) as e:
+            time.calculate_next_deliveries([start, start], ["interval", "day"], [2, None], "EN")
+        
+        # assert
+        self.assertEqual(str(e.exception), "The 'Interval' is not allowed to be empty if the 'Cycle type' indicates a 'Weekday' or 'Interval'.")
+
+        #endregion
+
+        #region 'cycle_type = day, interval > 6'
+        with self.assertRaises(AssertionError) as e:
+            time.calculate_next_deliveries([start, start], ["interval", "day"], [2, 7], "EN")
+        
+        # assert
+        self.assertEqual(str(e.exception), "'interval for day' needs to be one of the following '{ Monday, Tuesday, Wendsday, Thursday, Friday, Saturday, Sunday }'.")
+
+        #endregion
+
+        #region 'cycle_type = unknown'
+        with self.assertRaises(AssertionError) as e:
+            time.calculate_next_deliveries([start], ["notKnown"], [None], "EN")
+        
+        # assert
+        self.assertEqual(str(e.exception).split("{")[0], "'cycle_type' needs to be one of the following '")
+
         #endregion
 
     def test_utc_to_local(self):
@@ -259,6 +320,46 @@ class TestTime(unittest.TestCase):
 
         self.assertEqual(result.strftime("%Y.%m.%d %H:%M"), "2022.03.23 14:00")
 
+    def test_series_conversions(self):
+        """Tests the vectorized conversions """
+
+        # test data -> includes dst switches & None
+        dates = [
+            datetime.datetime(2022, 3, 27, 0, 30) + datetime.timedelta(minutes=37 * i) for i in range(200)
+        ] + [
+            datetime.datetime(2022, 10, 30, 0, 30) + datetime.timedelta(minutes=13 * i) for i in range(200)
+        ] + [None]
+
+        # cached timezone
+        self.assertIs(time.get_timezone("Europe/Berlin"), time.get_timezone("Europe/Berlin"))
+
+        # utc to local & to string
+        for strFormat in ["%Y.%m.%d", "%Y.%m.%d %H:%M", "%Y.%m.%d %H:%M:%S %Z"]:
+
+            result = time.series_to_string(
+                time.series_utc_to_local(pd.Series(dates, dtype=object), "Europe/Berlin"),
+                strFormat
+            )
+
+            # assert
+            self.assertEqual(result.tolist(), [
+                time.to_string(time.utc_to_local(date, "Europe/Berlin"), strFormat) for date in dates
+            ])
+
+        # local to utc
+        local = [datetime.datetime(2022, 3, 22, 14, 0), datetime.datetime(2022, 7, 1, 0, 15)]
+        result = time.series_local_to_utc(pd.Series(local), "Europe/Berlin")
+
+        # assert
+        self.assertEqual(
+            [date.to_pydatetime() for date in result], 
+            [time.local_to_utc(date, "Europe/Berlin") for date in local]
+        )
+
+        # non existent local time raises like the scalar version
+        with self.assertRaises(Exception):
+            time.series_local_to_utc(pd.Series([datetime.datetime(2022, 3, 27, 2, 30)]), "Europe/Berlin")
+
     def test_parse_UI_date(self):
         """Tests the date parsing """
 
@@ -0,0 +1,66 @@
+"""
+Tests the translation registry from
+    miniMoi.language
+
+"""
+
+# imports
+import unittest
+
+from miniMoi.language import language_files, resolve, get_translation, get_derived
+
+# class
+class TestLanguage(unittest.TestCase):
+    """Tests the translation registry
+
+    methods:
+    --------
+    test_get_translation
+        Tests the language resolution
+    test_get_derived
+        Tests the derived structures
+
+    """
+
+    def test_get_translation(self):
+        """Tests the language resolution """
+
+        # available
+        self.assertIs(get_translation("DE"), language_files['DE'])
+
+        # fallbacks
+        self.assertIs(get_translation("XX", "DE"), language_files['DE'])
+        self.assertIs(get_translation("XX", "YY"), language_files['EN'])
+        self.assertIs(get_translation(None), language_files['EN'])
+        self.assertEqual(resolve(["EN"], "DE"), "DE")
+
+    def test_get_derived(self):
+        """Tests the derived structures """
+
+        derived = get_derived("EN")
+
+        # memoized
+        self.assertIs(derived, get_derived("EN"))
+        self.assertIs(get_derived("XX"), derived)
+
+        # reverse mappings
+        self.assertEqual(
+            dict(derived['reverse_column_mapping']['abo']),
+            {value:key for key, value in language_files['EN']['column_mapping']['abo'].items()}
+        )
+        self.assertEqual(derived['reverse_weekday_mapping']['Monday'], 0)
+        self.assertEqual(
+            dict(derived['reverse_cycle_type_mapping']),
+            {value:key for key, value in language_files['EN']['cycle_type_mapping'].items()}
+        )
+
+        # read only
+        with self.assertRaises(TypeError):
+            derived['reverse_weekday_mapping']['Monday'] = 1
+
+        # formatted errors
+        self.assertEqual(
+            derived['formatted_errors']['weekdayNotAllowed'],
+            "'interval for day' needs to be one of the following '{ Monday, Tuesday, Wendsday, Thursday, Friday, Saturday, Sunday }'."
+        )
+